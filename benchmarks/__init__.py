@@ -0,0 +1,6 @@
+"""End-to-end benchmarks for the devussy pipeline.
+
+Run ``python -m benchmarks run`` to measure the pipeline against a fake LLM
+provider and ``python -m benchmarks compare base.json new.json`` to flag
+regressions between two result files.
+"""
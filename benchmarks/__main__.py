@@ -0,0 +1,152 @@
+"""Command line entry point: ``python -m benchmarks run|compare``."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .compare import compare, format_table, load
+from .fake_provider import FakeProviderConfig
+from .scenarios import REPO_ROOT, SCENARIOS, BenchOptions
+
+
+def _git_head() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def _options(args: argparse.Namespace) -> BenchOptions:
+    return BenchOptions(
+        runs=args.runs,
+        clients=args.clients,
+        drones=args.drones,
+        provider=FakeProviderConfig(
+            latency=args.latency,
+            jitter=args.jitter,
+            chunk_size=args.chunk_size,
+            max_concurrent_requests=args.max_concurrent,
+        ),
+    )
+
+
+def _run_isolated(name: str, argv: List[str]) -> Dict[str, Any]:
+    # A fresh interpreter per scenario keeps peak RSS attributable to it.
+    with tempfile.TemporaryDirectory(prefix="devussy-bench-") as tmp:
+        output = Path(tmp) / "result.json"
+        cmd = [sys.executable, "-m", "benchmarks", "run", "--no-isolate", "--scenario", name, "--output", str(output)]
+        proc = subprocess.run(cmd + argv, cwd=REPO_ROOT, capture_output=True, text=True)
+        if proc.returncode != 0 or not output.exists():
+            lines = proc.stderr.strip().splitlines()
+            return {"error": lines[-1] if lines else f"exit status {proc.returncode}"}
+        return load(output)["scenarios"][name]
+
+
+def _print_summary(name: str, data: Dict[str, Any]) -> None:
+    wall = data.get("wall_s", {})
+    if "p50" in wall:
+        print(f"{name:<32} p50 {wall['p50']:.3f}s  p90 {wall['p90']:.3f}s  {data['runs_per_min']:.1f} runs/min")
+        return
+    nested = {k: v for k, v in data.items() if isinstance(v, dict)}
+    if nested:
+        for key, value in nested.items():
+            _print_summary(f"{name}.{key}", value)
+    else:
+        print(f"{name:<32} {json.dumps(data)}")
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    names = args.scenario or list(SCENARIOS)
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        print(f"Unknown scenario(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    passthrough = [
+        "--runs", str(args.runs), "--latency", str(args.latency), "--jitter", str(args.jitter),
+        "--chunk-size", str(args.chunk_size), "--max-concurrent", str(args.max_concurrent),
+        "--clients", str(args.clients), "--drones", str(args.drones),
+    ]
+    results: Dict[str, Any] = {}
+    for name in names:
+        print(f"Running {name}...", file=sys.stderr)
+        if args.isolate and len(names) > 1:
+            results[name] = _run_isolated(name, passthrough)
+        else:
+            results[name] = asyncio.run(SCENARIOS[name](_options(args)))
+
+    report = {
+        "commit": _git_head(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "options": {k: v for k, v in vars(args).items() if k not in ("func", "output")},
+        "scenarios": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        path = Path(args.output)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        for name, data in results.items():
+            _print_summary(name, data)
+        print(f"Results written to {path}")
+    return 0
+
+
+def cmd_compare(args: argparse.Namespace) -> int:
+    base, new = load(args.base), load(args.new)
+    deltas = compare(base, new)
+    print(f"base {base.get('commit') or '?'}  ->  new {new.get('commit') or '?'}")
+    print(format_table(deltas, args.threshold))
+    regressions = [d for d in deltas if d.regressed(args.threshold)]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Run benchmark scenarios")
+    run.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="Scenario to run (repeatable; default all)")
+    run.add_argument("--runs", type=int, default=3, help="Timed runs per scenario")
+    run.add_argument("--latency", type=float, default=0.02, help="Fake provider latency per call (s)")
+    run.add_argument("--jitter", type=float, default=0.0, help="Extra random latency per call (s)")
+    run.add_argument("--chunk-size", type=int, default=16, help="Characters per streamed chunk")
+    run.add_argument("--max-concurrent", type=int, default=10, help="Concurrent LLM requests")
+    run.add_argument("--clients", type=int, default=10, help="Concurrent SSE clients")
+    run.add_argument("--drones", type=int, default=3, help="HiveMind drones per swarm")
+    run.add_argument("--output", default=os.path.join("benchmarks", "results", "latest.json"), help="Result file ('-' for stdout)")
+    run.add_argument("--no-isolate", dest="isolate", action="store_false", help="Run all scenarios in this process")
+    run.set_defaults(func=cmd_run)
+
+    cmp_ = sub.add_parser("compare", help="Compare two result files")
+    cmp_.add_argument("base")
+    cmp_.add_argument("new")
+    cmp_.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown counted as a regression")
+    cmp_.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
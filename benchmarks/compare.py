@@ -0,0 +1,78 @@
+"""Compare two benchmark result files and flag regressions."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+# Metrics where a larger value is better; everything else is a cost.
+_HIGHER_IS_BETTER = ("runs_per_min", "events_per_s")
+# Ignore differences below this many seconds/MiB; they are timer noise.
+_ABSOLUTE_FLOOR = 0.005
+
+
+@dataclass
+class Delta:
+    """One metric compared between two result files."""
+
+    metric: str
+    base: float
+    new: float
+
+    @property
+    def change(self) -> float:
+        if not self.base:
+            return 0.0
+        return (self.new - self.base) / self.base
+
+    @property
+    def higher_is_better(self) -> bool:
+        return self.metric.rsplit(".", 1)[-1] in _HIGHER_IS_BETTER
+
+    def regressed(self, threshold: float) -> bool:
+        if abs(self.new - self.base) < _ABSOLUTE_FLOOR:
+            return False
+        change = -self.change if self.higher_is_better else self.change
+        return change > threshold
+
+
+def load(path: str | Path) -> Dict[str, Any]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def _flatten(data: Any, prefix: str = "") -> Iterator[Tuple[str, float]]:
+    if isinstance(data, dict):
+        for key, value in data.items():
+            yield from _flatten(value, f"{prefix}.{key}" if prefix else key)
+    elif isinstance(data, (int, float)) and not isinstance(data, bool):
+        yield prefix, float(data)
+
+
+def _tracked(metric: str) -> bool:
+    # Compare summary statistics and throughput, not counts.
+    leaf = metric.rsplit(".", 1)[-1]
+    return leaf in ("p50", "p90", "p99", "mean") + _HIGHER_IS_BETTER or leaf in (
+        "peak_rss_mb",
+        "alloc_peak_mb",
+    )
+
+
+def compare(base: Dict[str, Any], new: Dict[str, Any]) -> List[Delta]:
+    """Return deltas for every tracked metric present in both result files."""
+    base_metrics = dict(_flatten(base.get("scenarios", {})))
+    new_metrics = dict(_flatten(new.get("scenarios", {})))
+    return [
+        Delta(metric, base_metrics[metric], new_metrics[metric])
+        for metric in sorted(base_metrics)
+        if metric in new_metrics and _tracked(metric)
+    ]
+
+
+def format_table(deltas: List[Delta], threshold: float) -> str:
+    lines = [f"{'metric':<60} {'base':>10} {'new':>10} {'change':>8}"]
+    for d in deltas:
+        flag = "  REGRESSION" if d.regressed(threshold) else ""
+        lines.append(f"{d.metric:<60} {d.base:>10.4f} {d.new:>10.4f} {d.change:>+7.1%}{flag}")
+    return "\n".join(lines)
@@ -0,0 +1,143 @@
+"""Deterministic fake LLM provider for benchmarks.
+
+:class:`FakeLLMClient` answers each pipeline prompt with a response the real
+parsers accept (design sections, ``## Phase N: Title`` headings, ``N.M:``
+steps) after a configurable latency, and streams it in fixed-size chunks.
+Only the provider is faked, so template rendering, parsing, file output,
+checkpoints and concurrency all run for real.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import random
+import re
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from src.llm_client import LLMClient
+
+_PHASE_RE = re.compile(r"\*\*Phase (\d+): (.+?)\*\*")
+
+
+@dataclass
+class FakeProviderConfig:
+    """Latency and size knobs for :class:`FakeLLMClient`."""
+
+    latency: float = 0.02
+    jitter: float = 0.0
+    chunk_size: int = 16
+    chunk_delay: float = 0.0
+    phases: int = 5
+    steps_per_phase: int = 8
+    seed: int = 0
+    streaming_enabled: bool = False
+    max_concurrent_requests: int = 10
+
+
+class FakeLLMClient(LLMClient):
+    """LLM client that returns canned, parseable responses."""
+
+    def __init__(self, config: FakeProviderConfig | None = None) -> None:
+        self.fake = config or FakeProviderConfig()
+        super().__init__(self.fake)
+        self._random = random.Random(self.fake.seed)
+        self.calls = 0
+        self.last_usage_metadata = None
+
+    # -- canned responses --
+
+    def _design(self) -> str:
+        return "\n".join(
+            [
+                "# Project Design",
+                "## Objectives",
+                *[f"- Objective {i}: deliver capability {i}" for i in range(1, 6)],
+                "## Technology Stack",
+                "- Python",
+                "- FastAPI",
+                "- SQLite",
+                "## Architecture Overview",
+                "A layered service with an API, a domain core and a storage adapter. " * 20,
+                "## Dependencies",
+                "- fastapi",
+                "- pydantic",
+                "## Challenges",
+                "- Keeping latency low under load",
+                "- Mitigation: cache hot paths",
+                "## Complexity",
+                "- Medium",
+            ]
+        )
+
+    def _basic_devplan(self) -> str:
+        lines = ["# Development Plan", ""]
+        for n in range(1, self.fake.phases + 1):
+            lines += [
+                f"## Phase {n}: Component {n}",
+                f"Build and test component {n}.",
+                f"- Implement component {n}",
+                f"- Test component {n}",
+                "",
+            ]
+        return "\n".join(lines)
+
+    def _phase_steps(self, number: int) -> str:
+        lines = []
+        for s in range(1, self.fake.steps_per_phase + 1):
+            lines += [
+                f"{number}.{s}: Implement part {s} of phase {number}",
+                f"- Create module_{number}_{s}.py",
+                f"- Add tests for module_{number}_{s}",
+            ]
+        return "\n".join(lines)
+
+    def respond(self, prompt: str) -> str:
+        """Return the canned response for ``prompt``."""
+        head = prompt[:600].lower()
+        match = _PHASE_RE.search(prompt)
+        if match and ("step-by-step" in head or "arbiter" in head):
+            return self._phase_steps(int(match.group(1)))
+        if "high-level development plan" in head:
+            return self._basic_devplan()
+        return self._design()
+
+    # -- LLMClient interface --
+
+    async def _wait(self) -> None:
+        delay = self.fake.latency
+        if self.fake.jitter:
+            delay += self._random.uniform(0, self.fake.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _usage(self, prompt: str, response: str) -> None:
+        self.last_usage_metadata = {
+            "prompt_tokens": len(prompt) // 4,
+            "completion_tokens": len(response) // 4,
+            "total_tokens": (len(prompt) + len(response)) // 4,
+        }
+
+    async def generate_completion(self, prompt: str, **kwargs: Any) -> str:
+        self.calls += 1
+        await self._wait()
+        response = self.respond(prompt)
+        self._usage(prompt, response)
+        return response
+
+    async def generate_completion_streaming(
+        self, prompt: str, callback: Callable[[str], Any], **kwargs: Any
+    ) -> str:
+        self.calls += 1
+        await self._wait()
+        response = self.respond(prompt)
+        size = max(1, self.fake.chunk_size)
+        for i in range(0, len(response), size):
+            result = callback(response[i : i + size])
+            if inspect.isawaitable(result):
+                await result
+            # Yield to the loop like a real network stream would
+            await asyncio.sleep(self.fake.chunk_delay)
+        self._usage(prompt, response)
+        return response
@@ -0,0 +1,97 @@
+"""Timing, memory and allocation helpers for benchmark scenarios."""
+
+from __future__ import annotations
+
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.tracing import Tracer
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values`` (0 when empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    """Return count/mean/p50/p90/p99/max for a list of durations in seconds."""
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values),
+        "p50": percentile(values, 50),
+        "p90": percentile(values, 90),
+        "p99": percentile(values, 99),
+        "max": max(values),
+    }
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MiB, if the platform reports it."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+@contextmanager
+def track_allocations() -> Iterator[Dict[str, float]]:
+    """Measure peak traced memory and allocated blocks inside the block."""
+    result: Dict[str, float] = {}
+    already = tracemalloc.is_tracing()
+    if not already:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot()
+    try:
+        yield result
+    finally:
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        stats = after.compare_to(before, "filename")
+        result["alloc_peak_mb"] = peak / (1024 * 1024)
+        result["alloc_net_blocks"] = float(sum(s.count_diff for s in stats))
+        if not already:
+            tracemalloc.stop()
+
+
+@dataclass
+class ScenarioResult:
+    """Aggregated measurements for one benchmark scenario."""
+
+    name: str
+    runs: int = 0
+    wall: List[float] = field(default_factory=list)
+    first_phase: List[float] = field(default_factory=list)
+    stages: Dict[str, List[float]] = field(default_factory=dict)
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    def add_spans(self, tracer: Tracer, prefixes: tuple[str, ...] = ("stage.", "phase", "llm.", "hivemind.", "render", "parse.", "write")) -> None:
+        for span in tracer.spans:
+            if span.name.startswith(prefixes):
+                self.stages.setdefault(span.name, []).append(span.wall)
+
+    def to_dict(self) -> Dict[str, Any]:
+        total = sum(self.wall)
+        data: Dict[str, Any] = {
+            "runs": self.runs,
+            "runs_per_min": (60.0 * self.runs / total) if total else 0.0,
+            "wall_s": summarize(self.wall),
+            "stages_s": {name: summarize(v) for name, v in sorted(self.stages.items())},
+            "peak_rss_mb": peak_rss_mb(),
+        }
+        if self.first_phase:
+            data["time_to_first_phase_s"] = summarize(self.first_phase)
+        data.update(self.extra)
+        return data
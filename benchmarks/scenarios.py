@@ -0,0 +1,294 @@
+"""Benchmark scenarios.
+
+Each scenario is an async function ``(options) -> dict`` registered in
+:data:`SCENARIOS`. Scenarios run the real pipeline code against
+:class:`~benchmarks.fake_provider.FakeLLMClient` and report results through
+:class:`~benchmarks.metrics.ScenarioResult`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List
+
+from rich.console import Console
+
+from src.concurrency import ConcurrencyManager
+from src.config import GitConfig
+from src.events import PhaseReady
+from src.file_manager import FileManager
+from src.models import DevPlan, DevPlanPhase
+from src.pipeline.compose import PipelineOrchestrator
+from src.pipeline.detailed_devplan import DetailedDevPlanGenerator
+from src.pipeline.hivemind import HiveMindManager
+from src.progress_reporter import PipelineProgressReporter
+from src.state_manager import StateManager
+from src.tracing import Tracer, disable_tracing, enable_tracing
+
+from .fake_provider import FakeLLMClient, FakeProviderConfig
+from .metrics import ScenarioResult, track_allocations
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+@dataclass
+class BenchOptions:
+    """Options shared by all scenarios."""
+
+    runs: int = 3
+    provider: FakeProviderConfig = field(default_factory=FakeProviderConfig)
+    clients: int = 10
+    drones: int = 3
+
+
+def _orchestrator(client: FakeLLMClient, state_manager: StateManager) -> PipelineOrchestrator:
+    return PipelineOrchestrator(
+        llm_client=client,
+        concurrency_manager=ConcurrencyManager(max_concurrent=client.fake.max_concurrent_requests),
+        file_manager=FileManager(),
+        git_config=GitConfig(enabled=False),
+        state_manager=state_manager,
+        progress_reporter=PipelineProgressReporter(console=Console(file=io.StringIO())),
+    )
+
+
+async def _measure(
+    name: str,
+    options: BenchOptions,
+    run_once: Callable[[Path, Callable[[], None]], Awaitable[Any]],
+) -> Dict[str, Any]:
+    """Time ``options.runs`` runs, then one extra run under tracemalloc.
+
+    ``run_once(workdir, mark_first_phase)`` performs a single run and calls
+    ``mark_first_phase`` when the first phase becomes available.
+    """
+    result = ScenarioResult(name=name)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="devussy-bench-") as tmp:
+        # Some stages write debug files relative to the working directory
+        os.chdir(tmp)
+        try:
+            for i in range(options.runs):
+                workdir = Path(tmp) / f"run{i}"
+                workdir.mkdir()
+                first: List[float] = []
+                tracer = enable_tracing(Tracer())
+                start = time.perf_counter()
+
+                def mark_first_phase() -> None:
+                    if not first:
+                        first.append(time.perf_counter() - start)
+
+                try:
+                    await run_once(workdir, mark_first_phase)
+                finally:
+                    disable_tracing()
+                result.wall.append(time.perf_counter() - start)
+                result.first_phase.extend(first)
+                result.add_spans(tracer)
+                result.runs += 1
+
+            workdir = Path(tmp) / "alloc"
+            workdir.mkdir()
+            with track_allocations() as alloc:
+                await run_once(workdir, lambda: None)
+            result.extra.update(alloc)
+        finally:
+            os.chdir(cwd)
+    return result.to_dict()
+
+
+def _subscribe_first_phase(orchestrator: PipelineOrchestrator, mark: Callable[[], None]) -> None:
+    def on_event(event: Any) -> None:
+        if isinstance(event, PhaseReady):
+            mark()
+
+    orchestrator.event_bus.subscribe(on_event, name="bench")
+
+
+async def bench_full_pipeline(options: BenchOptions) -> Dict[str, Any]:
+    async def run_once(workdir: Path, mark: Callable[[], None]) -> None:
+        with StateManager(str(workdir / "state")) as state_manager:
+            async with _orchestrator(FakeLLMClient(options.provider), state_manager) as orchestrator:
+                _subscribe_first_phase(orchestrator, mark)
+                await orchestrator.run_full_pipeline(
+                    project_name="bench",
+                    languages=["Python"],
+                    requirements="Benchmark project",
+                    output_dir=str(workdir / "docs"),
+                )
+
+    return await _measure("full_pipeline", options, run_once)
+
+
+async def bench_adaptive_pipeline(options: BenchOptions) -> Dict[str, Any]:
+    interview_data = {
+        "project_type": "web_app",
+        "requirements": "Benchmark project with auth, api and storage",
+        "team_size": "3",
+        "frameworks": "fastapi",
+        "apis": "stripe",
+    }
+
+    async def run_once(workdir: Path, mark: Callable[[], None]) -> None:
+        with StateManager(str(workdir / "state")) as state_manager:
+            async with _orchestrator(FakeLLMClient(options.provider), state_manager) as orchestrator:
+                _subscribe_first_phase(orchestrator, mark)
+                await orchestrator.run_adaptive_pipeline(
+                    project_name="bench",
+                    languages=["Python"],
+                    requirements="Benchmark project",
+                    interview_data=interview_data,
+                    output_dir=str(workdir / "docs"),
+                )
+
+    return await _measure("adaptive_pipeline", options, run_once)
+
+
+async def bench_hivemind(options: BenchOptions) -> Dict[str, Any]:
+    prompt = (
+        "You are an expert software developer creating a detailed, step-by-step plan.\n"
+        "**Phase 1: Component 1**\n"
+    )
+
+    async def run_once(workdir: Path, mark: Callable[[], None]) -> None:
+        manager = HiveMindManager(FakeLLMClient(options.provider))
+        await manager.run_swarm(prompt, count=options.drones)
+
+    return await _measure("hivemind_swarm", options, run_once)
+
+
+def _basic_devplan(phases: int) -> DevPlan:
+    return DevPlan(
+        phases=[DevPlanPhase(number=n, title=f"Component {n}") for n in range(1, phases + 1)],
+        summary="Benchmark plan",
+    )
+
+
+def _detailed_scenario(phases: int) -> Callable[[BenchOptions], Awaitable[Dict[str, Any]]]:
+    async def bench(options: BenchOptions) -> Dict[str, Any]:
+        provider = replace(options.provider, phases=phases)
+
+        async def run_once(workdir: Path, mark: Callable[[], None]) -> None:
+            client = FakeLLMClient(provider)
+            generator = DetailedDevPlanGenerator(
+                client, ConcurrencyManager(max_concurrent=provider.max_concurrent_requests)
+            )
+            await generator.generate(
+                _basic_devplan(phases),
+                project_name="bench",
+                on_phase_complete=lambda _result: mark(),
+            )
+
+        return await _measure(f"detailed_devplan_{phases}", options, run_once)
+
+    return bench
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def bench_sse(options: BenchOptions) -> Dict[str, Any]:
+    """Stream /api/design/stream and /api/plan/detail to N concurrent clients."""
+    try:
+        import httpx
+        import uvicorn
+    except ImportError as e:
+        return {"skipped": f"missing dependency: {e.name}"}
+
+    tmp = tempfile.mkdtemp(prefix="devussy-bench-sse-")
+    os.environ.setdefault("DEVUSSY_ANALYTICS_DB", str(Path(tmp) / "analytics.db"))
+    os.environ.setdefault("REQUESTY_API_KEY", "bench-key")
+    web_root = str(REPO_ROOT / "devussy-web")
+    if web_root not in sys.path:
+        sys.path.append(web_root)
+    try:
+        from streaming_server import app as server
+    except SyntaxError as e:
+        return {"skipped": f"streaming server needs a newer Python: {e}"}
+
+    provider = replace(options.provider, streaming_enabled=True)
+    server.create_llm_client = lambda config: FakeLLMClient(provider)
+
+    port = _free_port()
+    uv = uvicorn.Server(uvicorn.Config(server.app, host="127.0.0.1", port=port, log_level="error"))
+    thread = threading.Thread(target=uv.run, daemon=True)
+    thread.start()
+    while not uv.started:
+        await asyncio.sleep(0.01)
+
+    requests = {
+        "design_stream": ("/api/design/stream", {"projectName": "bench", "languages": ["Python"], "requirements": "x"}),
+        "plan_detail": (
+            "/api/plan/detail",
+            {
+                "projectName": "bench",
+                "phaseNumber": 1,
+                "plan": _basic_devplan(3).model_dump(),
+            },
+        ),
+    }
+
+    async def one_client(client: Any, path: str, body: Dict[str, Any]) -> Dict[str, float]:
+        start = time.perf_counter()
+        first = None
+        events = 0
+        async with client.stream("POST", path, json=body) as response:
+            async for line in response.aiter_lines():
+                if line.startswith("data:"):
+                    events += 1
+                    if first is None:
+                        first = time.perf_counter() - start
+        return {"first": first or 0.0, "total": time.perf_counter() - start, "events": events}
+
+    results: Dict[str, Any] = {"clients": options.clients}
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=120) as client:
+            for name, (path, body) in requests.items():
+                first: List[float] = []
+                total: List[float] = []
+                events = 0
+                start = time.perf_counter()
+                for _ in range(options.runs):
+                    runs = await asyncio.gather(
+                        *(one_client(client, path, body) for _ in range(options.clients))
+                    )
+                    first += [r["first"] for r in runs]
+                    total += [r["total"] for r in runs]
+                    events += sum(int(r["events"]) for r in runs)
+                elapsed = time.perf_counter() - start
+                scenario = ScenarioResult(name=name, runs=len(total), wall=total)
+                data = scenario.to_dict()
+                data["runs_per_min"] = 60.0 * len(total) / elapsed if elapsed else 0.0
+                data["time_to_first_event_s"] = ScenarioResult(name=name, wall=first).to_dict()["wall_s"]
+                data["events_per_s"] = events / elapsed if elapsed else 0.0
+                results[name] = data
+    finally:
+        uv.should_exit = True
+        thread.join(10)
+        shutil.rmtree(tmp, ignore_errors=True)
+    return results
+
+
+SCENARIOS: Dict[str, Callable[[BenchOptions], Awaitable[Dict[str, Any]]]] = {
+    "full_pipeline": bench_full_pipeline,
+    "adaptive_pipeline": bench_adaptive_pipeline,
+    "hivemind_swarm": bench_hivemind,
+    "detailed_devplan_5": _detailed_scenario(5),
+    "detailed_devplan_15": _detailed_scenario(15),
+    "detailed_devplan_50": _detailed_scenario(50),
+    "sse": bench_sse,
+}
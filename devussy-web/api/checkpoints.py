@@ -1,16 +1,43 @@
 from http.server import BaseHTTPRequestHandler
 import json
 import os
-import glob
 import time
-from datetime import datetime
+from pathlib import Path
 from .utils import setup_path
 
 # Add project root to sys.path
 setup_path()
 
+from src.checkpoint_store import CATALOG_FILENAME, CheckpointCatalog
+
 CHECKPOINT_DIR = ".checkpoints"
 
+# Legacy JSON checkpoints are imported by the first request of each process
+_legacy_imported = False
+
+
+def _open_catalog():
+    """Open the checkpoint catalog, importing legacy JSON checkpoints once.
+
+    The caller closes the returned catalog (use it in a ``with`` block).
+    """
+    global _legacy_imported
+    os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+    catalog = CheckpointCatalog(Path(CHECKPOINT_DIR) / CATALOG_FILENAME)
+    if not _legacy_imported:
+        catalog.import_json_files(
+            Path(CHECKPOINT_DIR).glob("*.json"),
+            key_for=lambda p: p.stem,
+            metadata_for=lambda data, p: {
+                "stage": data.get("stage", "unknown"),
+                "timestamp": data.get("timestamp", p.stat().st_mtime),
+                "project_name": data.get("projectName", "Unknown Project"),
+                "name": data.get("name", p.stem),
+            },
+        )
+        _legacy_imported = True
+    return catalog
+
 class handler(BaseHTTPRequestHandler):
     def do_OPTIONS(self):
         """Handle CORS preflight requests."""
@@ -32,66 +59,48 @@ class handler(BaseHTTPRequestHandler):
                     key, value = param.split('=')
                     query_params[key] = value
 
-        if not os.path.exists(CHECKPOINT_DIR):
-            os.makedirs(CHECKPOINT_DIR)
+        with _open_catalog() as catalog:
+            if 'id' in query_params:
+                # Load specific checkpoint
+                checkpoint_id = query_params['id']
+                try:
+                    data = catalog.get(checkpoint_id)
+                except Exception as e:
+                    self.send_error(500, str(e))
+                    return
 
-        if 'id' in query_params:
-            # Load specific checkpoint
-            checkpoint_id = query_params['id']
-            filepath = os.path.join(CHECKPOINT_DIR, f"{checkpoint_id}.json")
-            
-            if not os.path.exists(filepath):
-                self.send_error(404, "Checkpoint not found")
-                return
+                if data is None:
+                    self.send_error(404, "Checkpoint not found")
+                    return
 
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
                 self.send_response(200)
                 self.send_header('Content-Type', 'application/json')
                 self.send_header('Access-Control-Allow-Origin', '*')
                 self.end_headers()
                 self.wfile.write(json.dumps(data).encode('utf-8'))
-            except Exception as e:
-                self.send_error(500, str(e))
-        else:
-            # List checkpoints
-            checkpoints = []
-            try:
-                files = glob.glob(os.path.join(CHECKPOINT_DIR, "*.json"))
-                # Sort by modification time, newest first
-                files.sort(key=os.path.getmtime, reverse=True)
-                
-                for filepath in files:
-                    filename = os.path.basename(filepath)
-                    checkpoint_id = filename.replace('.json', '')
-                    
-                    # Read metadata (first few lines or just stat)
-                    # We'll just read the whole file for now as they shouldn't be huge, 
-                    # or better, just rely on filename/stat if we don't need deep details yet.
-                    # Let's peek at the content to get the name/timestamp from the JSON if available
-                    
-                    try:
-                        with open(filepath, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                            checkpoints.append({
-                                "id": checkpoint_id,
-                                "name": data.get("name", checkpoint_id),
-                                "timestamp": data.get("timestamp", os.path.getmtime(filepath)),
-                                "projectName": data.get("projectName", "Unknown Project"),
-                                "stage": data.get("stage", "unknown")
-                            })
-                    except:
-                        continue
+            else:
+                # List checkpoints from the catalog index (payloads are not read)
+                try:
+                    limit = int(query_params['limit']) if 'limit' in query_params else None
+                    offset = int(query_params.get('offset', 0))
+                    checkpoints = [
+                        {
+                            "id": row["key"],
+                            "name": row["name"] or row["key"],
+                            "timestamp": row["created_at"],
+                            "projectName": row["project_name"] or "Unknown Project",
+                            "stage": row["stage"],
+                        }
+                        for row in catalog.list(limit=limit, offset=offset)
+                    ]
 
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(json.dumps({"checkpoints": checkpoints}).encode('utf-8'))
-            except Exception as e:
-                self.send_error(500, str(e))
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Access-Control-Allow-Origin', '*')
+                    self.end_headers()
+                    self.wfile.write(json.dumps({"checkpoints": checkpoints, "total": catalog.count()}).encode('utf-8'))
+                except Exception as e:
+                    self.send_error(500, str(e))
 
     def do_POST(self):
         """Save a new checkpoint."""
@@ -101,9 +110,6 @@ class handler(BaseHTTPRequestHandler):
         try:
             data = json.loads(post_data.decode('utf-8'))
             
-            if not os.path.exists(CHECKPOINT_DIR):
-                os.makedirs(CHECKPOINT_DIR)
-            
             # Generate ID
             timestamp = int(time.time())
             name = data.get("name", "checkpoint").replace(" ", "_")
@@ -113,10 +119,15 @@ class handler(BaseHTTPRequestHandler):
             data["timestamp"] = timestamp
             data["id"] = checkpoint_id
             
-            filepath = os.path.join(CHECKPOINT_DIR, f"{checkpoint_id}.json")
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
+            with _open_catalog() as catalog:
+                catalog.put(
+                    checkpoint_id,
+                    data,
+                    stage=data.get("stage", "unknown"),
+                    timestamp=timestamp,
+                    project_name=data.get("projectName", "Unknown Project"),
+                    name=data.get("name", checkpoint_id),
+                )
             
             self.send_response(200)
             self.send_header('Content-Type', 'application/json')
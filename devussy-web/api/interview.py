@@ -38,7 +38,7 @@ class handler(BaseHTTPRequestHandler):
 
         # Initialize Interview Manager
         # We use a fresh instance for each request, so we need to rehydrate state
-        manager = LLMInterviewManager(config, verbose=True)
+        manager = LLMInterviewManager(config, verbose=True, stateless=True)
         
         # Rehydrate history
         # manager.__init__ adds the system prompt. We append the passed history.
@@ -54,7 +54,7 @@ class handler(BaseHTTPRequestHandler):
             response_text = manager._send_to_llm(user_input)
             
             # Check for structured data (completion)
-            extracted_data = manager._extract_structured_data(response_text)
+            extracted_data = manager.last_structured_data
             is_complete = False
             
             if extracted_data and manager._validate_extracted_data(extracted_data):
@@ -75,3 +75,6 @@ class handler(BaseHTTPRequestHandler):
             self.send_response(500)
             self.end_headers()
             self.wfile.write(json.dumps({"error": str(e)}).encode('utf-8'))
+        finally:
+            # Release the pooled HTTP session and the manager's event loop
+            manager.close()
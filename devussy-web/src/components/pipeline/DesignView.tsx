@@ -2,6 +2,7 @@
 
 import React, { useState, useEffect } from 'react';
 import { Button } from "@/components/ui/button";
+import { streamSSE } from "@/sse";
 import { ScrollArea } from "@/components/ui/scroll-area";
 import { Loader2, Check, ArrowRight, FileCode, LayoutGrid, Edit2, Gauge, AlertCircle, Shield, History, ArrowLeft, MessageSquare } from "lucide-react";
 import { ModelConfig } from './ModelSettings';
@@ -342,7 +343,7 @@ export const DesignView = ({
         abortControllerRef.current = controller;
 
         try {
-            const response = await fetch('/api/design', {
+            const events = streamSSE('/api/design', {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify({
@@ -353,51 +354,25 @@ export const DesignView = ({
                     complexityProfile  // Pass complexity profile to design endpoint
                 }),
                 signal: controller.signal
+            }, {
+                // The server could not resume the dropped stream and started over
+                onRestart: () => setDesignContent("")
             });
 
-            if (!response.ok) throw new Error('Failed to generate design');
-
-            const reader = response.body?.getReader();
-            if (!reader) throw new Error('No response body');
-
-            const decoder = new TextDecoder();
-            let buffer = "";
-
-            while (true) {
-                const { done, value } = await reader.read();
-                if (done) break;
-
-                const chunk = decoder.decode(value, { stream: true });
-                buffer += chunk;
-
-                const parts = buffer.split('\n\n');
-                buffer = parts.pop() || "";
-
-                for (const part of parts) {
-                    const line = part.trim();
-                    if (line.startsWith('data: ')) {
-                        const dataStr = line.slice(6);
-                        try {
-                            const data = JSON.parse(dataStr);
-
-                            if (data.content) {
-                                setDesignContent((prev: string) => prev + data.content);
-                            }
+            for await (const data of events) {
+                if (data.content) {
+                    setDesignContent((prev: string) => prev + data.content);
+                }
 
-                            if (data.done && data.design) {
-                                console.log('[DesignView] Received structured design:', data.design);
-                                console.log('[DesignView] Design fields:', Object.keys(data.design));
-                                setDesignData(data.design);
-                                return;
-                            }
+                if (data.done && data.design) {
+                    console.log('[DesignView] Received structured design:', data.design);
+                    console.log('[DesignView] Design fields:', Object.keys(data.design));
+                    setDesignData(data.design);
+                    return;
+                }
 
-                            if (data.error) {
-                                throw new Error(data.error);
-                            }
-                        } catch (e) {
-                            console.error("Failed to parse SSE JSON:", e);
-                        }
-                    }
+                if (data.error) {
+                    throw new Error(data.error);
                 }
             }
         } catch (err: any) {
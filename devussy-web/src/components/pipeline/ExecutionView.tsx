@@ -2,6 +2,7 @@
 
 import React, { useState, useEffect, useRef } from 'react';
 import { Button } from "@/components/ui/button";
+import { streamSSE } from "@/sse";
 import { ScrollArea } from "@/components/ui/scroll-area";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from "@/components/ui/select";
@@ -184,190 +185,126 @@ export const ExecutionView = ({
                 console.warn('[executePhase] Fetch taking longer than 10s for phase', phase.number);
             }, 10000);
 
-            const response = await fetch(backendUrl, {
+            // Resumes from the last event if the connection drops mid-phase
+            const events = streamSSE(backendUrl, {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify(requestBody),
                 signal: controller.signal
+            }, {
+                // The server could not resume the dropped stream and started over
+                onRestart: () => phaseOutputBuffers.current.set(phase.number, initialOutput)
             });
 
-            clearTimeout(fetchTimeout);
-
-            console.log('[executePhase] Response status:', response.status);
-            console.log('[executePhase] Response headers:', {
-                contentType: response.headers.get('content-type'),
-                cacheControl: response.headers.get('cache-control')
-            });
+            let contentCount = 0;
+            let phaseCompleted = false;
 
-            if (!response.ok) {
-                const errorText = await response.text();
-                console.error('[executePhase] Error response:', errorText);
-                throw new Error(`HTTP ${response.status}: ${errorText || 'Failed to start phase execution'}`);
-            }
+            try {
+                for await (const data of events) {
+                    clearTimeout(fetchTimeout);
 
-            const reader = response.body?.getReader();
-            if (!reader) {
-                console.error('[executePhase] No response body!');
-                throw new Error('No response body');
-            }
+                    if (data.content) {
+                        contentCount++;
+                        if (contentCount <= 5 || contentCount % 50 === 0) {
+                            console.log(`[executePhase] Phase ${phase.number}: Content #${contentCount}:`, data.content.substring(0, 50));
+                        }
 
-            console.log('[executePhase] Got reader, starting to read stream for phase', phase.number);
+                        // Accumulate content in buffer
+                        const currentBuffer = phaseOutputBuffers.current.get(phase.number) || '';
+                        phaseOutputBuffers.current.set(phase.number, currentBuffer + data.content);
 
-            const decoder = new TextDecoder();
-            let buffer = "";
-            let chunkCount = 0;
-            let contentCount = 0;
+                        // Debounce state updates to avoid overwhelming React
+                        const existingTimer = updateTimers.current.get(phase.number);
+                        if (existingTimer) {
+                            clearTimeout(existingTimer);
+                        }
 
-            console.log('[executePhase] Starting to read stream for phase', phase.number);
+                        const timer = setTimeout(() => {
+                            const bufferedContent = phaseOutputBuffers.current.get(phase.number) || '';
+                            setPhases((prev: PhaseStatus[]) => prev.map((p: PhaseStatus) =>
+                                p.number === phase.number
+                                    ? { ...p, output: bufferedContent }
+                                    : p
+                            ));
+
+                            // Auto-scroll to bottom after update
+                            requestAnimationFrame(() => {
+                                const scrollContainer = scrollContainerRefs.current.get(phase.number);
+                                if (scrollContainer) {
+                                    scrollContainer.scrollTop = scrollContainer.scrollHeight;
+                                }
+                            });
 
-            let phaseCompleted = false;
+                            updateTimers.current.delete(phase.number);
+                        }, 50); // Update every 50ms max
 
-            try {
-                while (true) {
-                    const { done, value } = await reader.read();
-                    if (done) {
-                        console.log('[executePhase] Stream done for phase', phase.number);
-                        break;
+                        updateTimers.current.set(phase.number, timer);
                     }
 
-                    chunkCount++;
-                    const chunk = decoder.decode(value, { stream: true });
-                    buffer += chunk;
-
-                    if (chunkCount % 10 === 0) {
-                        console.log(`[executePhase] Phase ${phase.number}: Received ${chunkCount} chunks, ${contentCount} content messages`);
+                    if (data.error) {
+                        console.error('[executePhase] Phase', phase.number, 'error:', data.error);
+                        throw new Error(data.error);
                     }
 
-                    const parts = buffer.split('\n\n');
-                    buffer = parts.pop() || "";
-
-                    for (const part of parts) {
-                        const line = part.trim();
-                        if (line.startsWith('data: ')) {
-                            const dataStr = line.slice(6);
-                            try {
-                                const data = JSON.parse(dataStr);
-
-                                if (data.content) {
-                                    contentCount++;
-                                    if (contentCount <= 5 || contentCount % 50 === 0) {
-                                        console.log(`[executePhase] Phase ${phase.number}: Content #${contentCount}:`, data.content.substring(0, 50));
-                                    }
-
-                                    // Accumulate content in buffer
-                                    const currentBuffer = phaseOutputBuffers.current.get(phase.number) || '';
-                                    phaseOutputBuffers.current.set(phase.number, currentBuffer + data.content);
-
-                                    // Debounce state updates to avoid overwhelming React
-                                    const existingTimer = updateTimers.current.get(phase.number);
-                                    if (existingTimer) {
-                                        clearTimeout(existingTimer);
-                                    }
-
-                                    const timer = setTimeout(() => {
-                                        const bufferedContent = phaseOutputBuffers.current.get(phase.number) || '';
-                                        setPhases((prev: PhaseStatus[]) => prev.map((p: PhaseStatus) =>
-                                            p.number === phase.number
-                                                ? { ...p, output: bufferedContent }
-                                                : p
-                                        ));
-
-                                        // Auto-scroll to bottom after update
-                                        requestAnimationFrame(() => {
-                                            const scrollContainer = scrollContainerRefs.current.get(phase.number);
-                                            if (scrollContainer) {
-                                                scrollContainer.scrollTop = scrollContainer.scrollHeight;
-                                            }
-                                        });
-
-                                        updateTimers.current.delete(phase.number);
-                                    }, 50); // Update every 50ms max
-
-                                    updateTimers.current.set(phase.number, timer);
-                                }
+                    if (data.done) {
+                        console.log('[executePhase] Phase', phase.number, 'done signal received');
+                        phaseCompleted = true;
 
-                                if (data.error) {
-                                    console.error('[executePhase] Phase', phase.number, 'error:', data.error);
-                                    throw new Error(data.error);
-                                }
+                        // Flush any pending updates
+                        const existingTimer = updateTimers.current.get(phase.number);
+                        if (existingTimer) {
+                            clearTimeout(existingTimer);
+                            updateTimers.current.delete(phase.number);
+                        }
 
-                                if (data.done) {
-                                    console.log('[executePhase] Phase', phase.number, 'done signal received');
-                                    phaseCompleted = true;
-
-                                    // Flush any pending updates
-                                    const existingTimer = updateTimers.current.get(phase.number);
-                                    if (existingTimer) {
-                                        clearTimeout(existingTimer);
-                                        updateTimers.current.delete(phase.number);
-                                    }
-
-                                    // Final state update with buffered content AND detailed phase data
-                                    const finalOutput = phaseOutputBuffers.current.get(phase.number) || '';
-                                    setPhases((prev: PhaseStatus[]) => prev.map((p: PhaseStatus) =>
-                                        p.number === phase.number
-                                            ? {
-                                                ...p,
-                                                status: 'complete',
-                                                progress: 100,
-                                                output: finalOutput,
-                                                detailedPhase: data.phase // Store the detailed phase with steps
-                                            }
-                                            : p
-                                    ));
-                                    setCompletedCount(prev => prev + 1);
-
-                                    // Clean up buffer
-                                    phaseOutputBuffers.current.delete(phase.number);
-
-                                    // Close reader to release connection
-                                    reader.cancel();
-                                    console.log('[executePhase] Phase', phase.number, 'reader closed');
-                                    return;
-                                }
-                            } catch (e: any) {
-                                if (e.message && !e.message.includes('Unexpected token')) {
-                                    console.error('[executePhase] Parse error:', e);
-                                    throw e;
+                        // Final state update with buffered content AND detailed phase data
+                        const finalOutput = phaseOutputBuffers.current.get(phase.number) || '';
+                        setPhases((prev: PhaseStatus[]) => prev.map((p: PhaseStatus) =>
+                            p.number === phase.number
+                                ? {
+                                    ...p,
+                                    status: 'complete',
+                                    progress: 100,
+                                    output: finalOutput,
+                                    detailedPhase: data.phase // Store the detailed phase with steps
                                 }
-                            }
-                        }
-                    }
-                }
+                                : p
+                        ));
+                        setCompletedCount(prev => prev + 1);
 
-                // If stream ended without explicit done signal, mark as complete anyway
-                if (!phaseCompleted) {
-                    console.log('[executePhase] Stream ended without done signal for phase', phase.number, '- marking complete');
+                        // Clean up buffer
+                        phaseOutputBuffers.current.delete(phase.number);
 
-                    // Flush any pending updates
-                    const existingTimer = updateTimers.current.get(phase.number);
-                    if (existingTimer) {
-                        clearTimeout(existingTimer);
-                        updateTimers.current.delete(phase.number);
+                        return;
                     }
-
-                    // Final state update with buffered content
-                    const finalOutput = phaseOutputBuffers.current.get(phase.number) || '';
-                    setPhases((prev: PhaseStatus[]) => prev.map((p: PhaseStatus) =>
-                        p.number === phase.number
-                            ? { ...p, status: 'complete', progress: 100, output: finalOutput }
-                            : p
-                    ));
-                    setCompletedCount(prev => prev + 1);
-
-                    // Clean up buffer
-                    phaseOutputBuffers.current.delete(phase.number);
                 }
             } finally {
-                // Always close the reader to release the connection
-                try {
-                    reader.cancel();
-                    console.log('[executePhase] Phase', phase.number, 'reader closed in finally block');
-                } catch (e) {
-                    console.log('[executePhase] Phase', phase.number, 'reader already closed');
-                }
+                clearTimeout(fetchTimeout);
             }
 
+            // If stream ended without explicit done signal, mark as complete anyway
+            if (!phaseCompleted) {
+                console.log('[executePhase] Stream ended without done signal for phase', phase.number, '- marking complete');
+
+                // Flush any pending updates
+                const existingTimer = updateTimers.current.get(phase.number);
+                if (existingTimer) {
+                    clearTimeout(existingTimer);
+                    updateTimers.current.delete(phase.number);
+                }
+
+                // Final state update with buffered content
+                const finalOutput = phaseOutputBuffers.current.get(phase.number) || '';
+                setPhases((prev: PhaseStatus[]) => prev.map((p: PhaseStatus) =>
+                    p.number === phase.number
+                        ? { ...p, status: 'complete', progress: 100, output: finalOutput }
+                        : p
+                ));
+                setCompletedCount(prev => prev + 1);
+
+                // Clean up buffer
+                phaseOutputBuffers.current.delete(phase.number);
+            }
         } catch (err: any) {
             // Clean up timers and buffers
             const existingTimer = updateTimers.current.get(phase.number);
@@ -2,6 +2,7 @@
 
 import React, { useState, useEffect, useRef } from 'react';
 import { Button } from "@/components/ui/button";
+import { streamSSE } from "@/sse";
 import { ScrollArea } from "@/components/ui/scroll-area";
 import { Card, CardContent, CardHeader, CardTitle, CardDescription } from "@/components/ui/card";
 import { Check, Terminal, Play, Loader2, AlertCircle } from "lucide-react";
@@ -74,7 +75,7 @@ export const PhaseDetailView: React.FC<PhaseDetailViewProps> = ({
         setInternalOutput("");
 
         try {
-            const response = await fetch('/api/plan/detail', {
+            const events = streamSSE('/api/plan/detail', {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify({
@@ -83,42 +84,18 @@ export const PhaseDetailView: React.FC<PhaseDetailViewProps> = ({
                     projectName,
                     modelConfig
                 })
+            }, {
+                // The server could not resume the dropped stream and started over
+                onRestart: () => setInternalOutput("")
             });
 
-            if (!response.ok) throw new Error('Failed to start phase execution');
-
-            const reader = response.body?.getReader();
-            if (!reader) return;
-
-            const decoder = new TextDecoder();
-
-            while (true) {
-                const { done, value } = await reader.read();
-                if (done) break;
-
-                const chunk = decoder.decode(value, { stream: true });
-
-                // Parse SSE data
-                const lines = chunk.split('\n');
-                for (const line of lines) {
-                    if (line.startsWith('data: ')) {
-                        const dataStr = line.slice(6);
-                        if (!dataStr.trim()) continue;
-
-                        try {
-                            const data = JSON.parse(dataStr);
-                            if (data.content) {
-                                setInternalOutput(prev => prev + data.content);
-                            } else if (data.error) {
-                                throw new Error(data.error);
-                            } else if (data.done) {
-                                setInternalIsComplete(true);
-                            }
-                        } catch (e) {
-                            // If it's not JSON, just append it (fallback)
-                            console.warn("Failed to parse SSE data:", e);
-                        }
-                    }
+            for await (const data of events) {
+                if (data.content) {
+                    setInternalOutput(prev => prev + data.content);
+                } else if (data.error) {
+                    throw new Error(data.error);
+                } else if (data.done) {
+                    setInternalIsComplete(true);
                 }
             }
 
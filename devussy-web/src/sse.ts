@@ -0,0 +1,97 @@
+/**
+ * Read a POSTed Server-Sent Events stream and yield each `data:` payload as JSON.
+ *
+ * The design and phase-detail streams tag their frames with an `id:`. If such
+ * a connection drops before a `done` or `error` payload arrives, the request
+ * is repeated with a `Last-Event-ID` header and the server replays only the
+ * events that were missed from the generation that is still running.
+ */
+export interface StreamSSEOptions {
+    /** Reconnect attempts after a dropped connection. */
+    retries?: number;
+    retryDelayMs?: number;
+    /** Called when the server could not resume and started a new generation. */
+    onRestart?: () => void;
+}
+
+const sleep = (ms: number) => new Promise(resolve => setTimeout(resolve, ms));
+
+export async function* streamSSE(
+    url: string,
+    init: RequestInit,
+    { retries = 3, retryDelayMs = 1000, onRestart }: StreamSSEOptions = {}
+): AsyncGenerator<any> {
+    let lastEventId: string | null = null;
+    let generationId: string | null = null;
+    let attempt = 0;
+
+    while (true) {
+        const headers = new Headers(init.headers);
+        if (lastEventId) headers.set('Last-Event-ID', lastEventId);
+
+        let finished = false;
+        try {
+            const response = await fetch(url, { ...init, headers });
+            if (!response.ok) {
+                const errorText = await response.text();
+                throw new Error(`HTTP ${response.status}: ${errorText || 'Request failed'}`);
+            }
+
+            const responseGeneration = response.headers.get('X-Generation-Id');
+            if (generationId && responseGeneration !== generationId) {
+                onRestart?.();
+            }
+            generationId = responseGeneration;
+
+            const reader = response.body?.getReader();
+            if (!reader) throw new Error('No response body');
+
+            const decoder = new TextDecoder();
+            let buffer = "";
+            try {
+                while (true) {
+                    const { done, value } = await reader.read();
+                    if (done) break;
+
+                    buffer += decoder.decode(value, { stream: true });
+                    const frames = buffer.split('\n\n');
+                    buffer = frames.pop() || "";
+
+                    for (const frame of frames) {
+                        let id: string | null = null;
+                        let data = "";
+                        for (const line of frame.split('\n')) {
+                            if (line.startsWith('id: ')) id = line.slice(4);
+                            else if (line.startsWith('data: ')) data += line.slice(6);
+                        }
+                        if (!data.trim()) continue;
+
+                        let payload: any;
+                        try {
+                            payload = JSON.parse(data);
+                        } catch (e) {
+                            console.warn("Failed to parse SSE JSON:", e);
+                            continue;
+                        }
+                        if (id) {
+                            lastEventId = id;
+                            attempt = 0;
+                        }
+                        if (payload.done || payload.error) finished = true;
+                        yield payload;
+                    }
+                }
+            } finally {
+                reader.cancel().catch(() => {});
+            }
+        } catch (err: any) {
+            // Only a stream we can resume is retried; anything else is the caller's
+            if (err?.name === 'AbortError' || !lastEventId || attempt >= retries) throw err;
+            console.warn(`SSE connection dropped, resuming after ${lastEventId}:`, err);
+        }
+
+        if (finished || !lastEventId || attempt >= retries) return;
+        attempt++;
+        await sleep(retryDelayMs * attempt);
+    }
+}
@@ -1,12 +1,91 @@
+"""Usage analytics for the streaming server, stored in SQLite.
+
+Request handling never waits on the database: the ``log_*`` functions only
+put a row on a bounded in-memory queue (dropping it if the queue is full),
+and an :class:`AnalyticsWriter` thread drains the queue into SQLite through
+one long-lived WAL-mode connection, one transaction and one ``executemany``
+per table per batch. Without a running writer (scripts, tests) rows are
+written synchronously.
+
+Each batch also updates rollup tables in the same transaction: API call
+counts, errors, bytes and a latency histogram per minute, hour and day, by
+endpoint and model, plus daily session and input counts. The overview reads
+only those, so it stays cheap however many raw rows there are; raw calls,
+inputs and sessions are deleted after ``ANALYTICS_RAW_RETENTION_DAYS``.
+"""
+
 import os
 import hashlib
 import json
+import queue
+import threading
 import time
 import sqlite3
-from typing import Optional, Dict, Any
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple
 
 DB_PATH = os.getenv('DEVUSSY_ANALYTICS_DB', 'analytics.db')
 
+# Row inserts by event kind
+INSERTS = {
+    "session": "INSERT OR IGNORE INTO sessions (session_id, ip_hash, user_agent, created_at) VALUES (?, ?, ?, ?)",
+    "api_call": "INSERT INTO api_calls (session_id, endpoint, method, status_code, duration_ms, request_size, response_size, model_used, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+    "user_input": "INSERT INTO user_inputs (session_id, input_type, project_name, sanitized_requirements, languages, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+}
+
+
+# Upper bounds (ms) of the rollups' latency histogram; a last bucket holds slower calls
+LATENCY_BOUNDS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 120000)
+LATENCY_COLUMNS = [f"lat_{i}" for i in range(len(LATENCY_BOUNDS_MS) + 1)]
+# Rollup granularity -> length of the created_at prefix naming its bucket
+GRANULARITIES = {"minute": 16, "hour": 13, "day": 10}
+# Days each rollup granularity is kept; daily rollups are kept forever
+ROLLUP_RETENTION_DAYS = {"minute": 2, "hour": 90}
+RAW_RETENTION_DAYS = float(os.getenv('ANALYTICS_RAW_RETENTION_DAYS', '30'))
+
+# PRAGMA user_version once the rollups have been built from the raw rows
+ROLLUP_SCHEMA_VERSION = 1
+
+ROLLUP_SCHEMA = f'''
+CREATE TABLE IF NOT EXISTS api_call_rollups (
+    granularity TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    model TEXT NOT NULL DEFAULT '',
+    calls INTEGER NOT NULL DEFAULT 0,
+    errors INTEGER NOT NULL DEFAULT 0,
+    total_duration_ms REAL NOT NULL DEFAULT 0,
+    request_bytes INTEGER NOT NULL DEFAULT 0,
+    response_bytes INTEGER NOT NULL DEFAULT 0,
+    {", ".join(f"{column} INTEGER NOT NULL DEFAULT 0" for column in LATENCY_COLUMNS)},
+    PRIMARY KEY (granularity, bucket, endpoint, model)
+);
+CREATE TABLE IF NOT EXISTS daily_counts (
+    day TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, metric)
+);
+CREATE INDEX IF NOT EXISTS idx_api_calls_created_at ON api_calls(created_at);
+CREATE INDEX IF NOT EXISTS idx_user_inputs_created_at ON user_inputs(created_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_created_at ON sessions(created_at);
+'''
+
+_ROLLUP_VALUES = ["calls", "errors", "total_duration_ms", "request_bytes", "response_bytes", *LATENCY_COLUMNS]
+ROLLUP_UPSERT = (
+    "INSERT INTO api_call_rollups (granularity, bucket, endpoint, model, "
+    + ", ".join(_ROLLUP_VALUES)
+    + ") VALUES ("
+    + ", ".join("?" * (4 + len(_ROLLUP_VALUES)))
+    + ") ON CONFLICT (granularity, bucket, endpoint, model) DO UPDATE SET "
+    + ", ".join(f"{column} = {column} + excluded.{column}" for column in _ROLLUP_VALUES)
+)
+DAILY_UPSERT = (
+    "INSERT INTO daily_counts (day, metric, count) VALUES (?, ?, ?) "
+    "ON CONFLICT (day, metric) DO UPDATE SET count = count + excluded.count"
+)
+
 
 def get_connection():
     conn = sqlite3.connect(DB_PATH)
@@ -16,6 +95,8 @@ def get_connection():
 
 def init_db():
     conn = get_connection()
+    # WAL lets the overview read while the writer appends; the mode is persistent
+    conn.execute('PRAGMA journal_mode=WAL')
     with conn:
         conn.executescript('''
         CREATE TABLE IF NOT EXISTS sessions (
@@ -49,21 +130,275 @@ def init_db():
             FOREIGN KEY (session_id) REFERENCES sessions(session_id)
         );
         ''')
+        conn.executescript(ROLLUP_SCHEMA)
+        # Databases from before the rollups existed: build them from the raw rows
+        # once. Gated on the schema version, not on empty rollups, because a
+        # rebuild after retention has pruned raw rows would lose history.
+        if conn.execute('PRAGMA user_version').fetchone()[0] < ROLLUP_SCHEMA_VERSION:
+            rebuild_rollups(conn)
+            conn.execute(f'PRAGMA user_version = {ROLLUP_SCHEMA_VERSION}')
     conn.close()
 
 
+def _latency_bucket(duration_ms: Optional[float]) -> int:
+    return bisect_left(LATENCY_BOUNDS_MS, duration_ms or 0)
+
+
+def rebuild_rollups(conn: sqlite3.Connection) -> None:
+    """Recompute every rollup from the raw tables (call inside a transaction)."""
+    duration = 'COALESCE(duration_ms, 0)'
+    lower = (None, *LATENCY_BOUNDS_MS)
+    histogram = [
+        f"SUM({duration} > {lower[i]} AND {duration} <= {bound})" if lower[i] is not None
+        else f"SUM({duration} <= {bound})"
+        for i, bound in enumerate(LATENCY_BOUNDS_MS)
+    ] + [f"SUM({duration} > {LATENCY_BOUNDS_MS[-1]})"]
+    conn.execute('DELETE FROM api_call_rollups')
+    conn.execute('DELETE FROM daily_counts')
+    for granularity, length in GRANULARITIES.items():
+        conn.execute(
+            "INSERT INTO api_call_rollups (granularity, bucket, endpoint, model, "
+            + ", ".join(_ROLLUP_VALUES)
+            + f") SELECT ?, substr(created_at, 1, {length}), endpoint, COALESCE(model_used, ''), "
+            "COUNT(*), SUM(status_code >= 400), SUM(" + duration + "), "
+            "COALESCE(SUM(request_size), 0), COALESCE(SUM(response_size), 0), "
+            + ", ".join(histogram)
+            + " FROM api_calls GROUP BY 2, 3, 4",
+            (granularity,),
+        )
+    for table, metric in (('sessions', 'sessions'), ('user_inputs', 'user_inputs')):
+        conn.execute(
+            f"INSERT INTO daily_counts (day, metric, count) "
+            f"SELECT substr(created_at, 1, 10), ?, COUNT(*) FROM {table} GROUP BY 1",
+            (metric,),
+        )
+
+
+def _rollup_deltas(api_calls: List[tuple]) -> List[tuple]:
+    """Aggregate raw API call rows into one rollup increment per bucket and key."""
+    deltas: Dict[tuple, List[float]] = {}
+    for _, endpoint, _, status_code, duration_ms, request_size, response_size, model_used, created_at in api_calls:
+        for granularity, length in GRANULARITIES.items():
+            key = (granularity, created_at[:length], endpoint, model_used or '')
+            delta = deltas.setdefault(key, [0] * len(_ROLLUP_VALUES))
+            delta[0] += 1
+            delta[1] += 1 if (status_code or 0) >= 400 else 0
+            delta[2] += duration_ms or 0
+            delta[3] += request_size or 0
+            delta[4] += response_size or 0
+            delta[5 + _latency_bucket(duration_ms)] += 1
+    return [(*key, *delta) for key, delta in deltas.items()]
+
+
+def _by_day(rows: List[tuple]) -> Dict[str, List[tuple]]:
+    """Group rows by the day of their created_at (their last field)."""
+    days: Dict[str, List[tuple]] = {}
+    for row in rows:
+        days.setdefault(row[-1][:10], []).append(row)
+    return days
+
+
+def _write_batch(conn: sqlite3.Connection, batch: List[Tuple[str, tuple]]) -> None:
+    """Insert queued rows and fold them into the rollups, in one transaction."""
+    rows: Dict[str, List[tuple]] = {kind: [] for kind in INSERTS}
+    for kind, row in batch:
+        rows[kind].append(row)
+    with conn:
+        for day, sessions in _by_day(rows["session"]).items():
+            # Only sessions not seen before count; INSERT OR IGNORE skips the rest
+            before = conn.total_changes
+            conn.executemany(INSERTS["session"], sessions)
+            if conn.total_changes > before:
+                conn.execute(DAILY_UPSERT, (day, "sessions", conn.total_changes - before))
+        if rows["api_call"]:
+            conn.executemany(INSERTS["api_call"], rows["api_call"])
+            conn.executemany(ROLLUP_UPSERT, _rollup_deltas(rows["api_call"]))
+        if rows["user_input"]:
+            conn.executemany(INSERTS["user_input"], rows["user_input"])
+            conn.executemany(
+                DAILY_UPSERT,
+                [(day, "user_inputs", len(inputs)) for day, inputs in _by_day(rows["user_input"]).items()],
+            )
+
+
+def _cutoff(days: float) -> str:
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(time.time() - days * 86400))
+
+
+def apply_retention(conn: sqlite3.Connection, raw_days: Optional[float] = None, chunk: int = 5000) -> int:
+    """Delete raw calls, inputs and sessions, and fine-grained rollups, past their retention.
+
+    Raw rows go in chunks, each in its own short transaction. Returns the
+    number of raw rows deleted.
+    """
+    cutoff = _cutoff(RAW_RETENTION_DAYS if raw_days is None else raw_days)
+    deleted = 0
+    for table in ('api_calls', 'user_inputs', 'sessions'):
+        while True:
+            with conn:
+                count = conn.execute(
+                    f"DELETE FROM {table} WHERE id IN "
+                    f"(SELECT id FROM {table} WHERE created_at < ? LIMIT ?)",
+                    (cutoff, chunk),
+                ).rowcount
+            deleted += count
+            if count < chunk:
+                break
+    with conn:
+        for granularity, days in ROLLUP_RETENTION_DAYS.items():
+            conn.execute(
+                'DELETE FROM api_call_rollups WHERE granularity = ? AND bucket < ?',
+                (granularity, _cutoff(days)[:GRANULARITIES[granularity]]),
+            )
+    return deleted
+
+
+_STOP = object()
+
+
+class AnalyticsWriter:
+    """Drain analytics rows from a bounded queue into SQLite on a background thread."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_queue: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 0.5,
+        retention_interval: float = 3600.0,
+    ) -> None:
+        self.path = path or DB_PATH
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retention_interval = retention_interval
+        self.queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self.dropped = 0
+        self.written = 0
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, kind: str, row: tuple) -> bool:
+        """Queue a row without blocking; returns False (and counts it) if the queue is full."""
+        try:
+            self.queue.put_nowait((kind, row))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="analytics-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Write what is queued, then stop the thread."""
+        if self._thread is None:
+            return
+        try:
+            self.queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        conn = sqlite3.connect(self.path)
+        conn.execute('PRAGMA journal_mode=WAL')
+        # Durable at checkpoints rather than at every commit; fine for analytics
+        conn.execute('PRAGMA synchronous=NORMAL')
+        stopping = False
+        next_retention = time.monotonic()
+        try:
+            while not stopping:
+                if time.monotonic() >= next_retention:
+                    next_retention = time.monotonic() + self.retention_interval
+                    try:
+                        apply_retention(conn)
+                    except sqlite3.Error as e:
+                        print(f"ERROR applying analytics retention: {e}")
+                try:
+                    item = self.queue.get(timeout=self.retention_interval)
+                except queue.Empty:
+                    continue
+                if item is _STOP:
+                    break
+                batch = [item]
+                deadline = time.monotonic() + self.flush_interval
+                while len(batch) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = self.queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    batch.append(item)
+                try:
+                    _write_batch(conn, batch)
+                    self.written += len(batch)
+                except sqlite3.Error as e:
+                    print(f"ERROR writing {len(batch)} analytics rows: {e}")
+        finally:
+            conn.close()
+
+
+_writer: Optional[AnalyticsWriter] = None
+
+
+def start_writer(**kwargs: Any) -> AnalyticsWriter:
+    """Start the background writer; ``log_*`` calls then only enqueue."""
+    global _writer
+    _writer = AnalyticsWriter(**kwargs)
+    _writer.start()
+    return _writer
+
+
+def stop_writer() -> None:
+    """Flush and stop the background writer (blocking; call via a thread from async code)."""
+    global _writer
+    writer, _writer = _writer, None
+    if writer is not None:
+        writer.stop()
+
+
+def _record(kind: str, row: tuple) -> bool:
+    """Queue (or, without a writer, write) a row; False if it was dropped."""
+    if _writer is not None:
+        return _writer.submit(kind, row)
+    conn = get_connection()
+    try:
+        _write_batch(conn, [(kind, row)])
+    finally:
+        conn.close()
+    return True
+
+
+def _now() -> str:
+    # Same format as SQLite's CURRENT_TIMESTAMP, captured when the event happened
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())
+
+
 def hash_ip(ip: str) -> str:
     return hashlib.sha256(ip.encode('utf-8')).hexdigest()
 
 
+# Sessions already logged by this process; skips a queued row per request
+_recent_sessions: "OrderedDict[str, None]" = OrderedDict()
+_RECENT_SESSIONS_MAX = 10000
+
+
 def log_session(session_id: str, ip: str, user_agent: Optional[str] = None):
-    conn = get_connection()
-    with conn:
-        conn.execute(
-            "INSERT OR IGNORE INTO sessions (session_id, ip_hash, user_agent) VALUES (?, ?, ?)",
-            (session_id, hash_ip(ip), user_agent),
-        )
-    conn.close()
+    if session_id in _recent_sessions:
+        _recent_sessions.move_to_end(session_id)
+        return
+    if not _record("session", (session_id, hash_ip(ip), user_agent, _now())):
+        # Dropped from a full queue; try again on the session's next request
+        return
+    _recent_sessions[session_id] = None
+    if len(_recent_sessions) > _RECENT_SESSIONS_MAX:
+        _recent_sessions.popitem(last=False)
 
 
 def log_api_call(
@@ -76,22 +411,20 @@ def log_api_call(
     response_size: int,
     model_used: Optional[str] = None,
 ):
-    conn = get_connection()
-    with conn:
-        conn.execute(
-            "INSERT INTO api_calls (session_id, endpoint, method, status_code, duration_ms, request_size, response_size, model_used) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-            (
-                session_id,
-                endpoint,
-                method,
-                status_code,
-                duration_ms,
-                request_size,
-                response_size,
-                model_used,
-            ),
-        )
-    conn.close()
+    _record(
+        "api_call",
+        (
+            session_id,
+            endpoint,
+            method,
+            status_code,
+            duration_ms,
+            request_size,
+            response_size,
+            model_used,
+            _now(),
+        ),
+    )
 
 
 def sanitize_requirements(req: str) -> str:
@@ -118,39 +451,100 @@ def log_user_input(
     else:
         normalized_languages = str(languages)
 
-    conn = get_connection()
-    with conn:
-        conn.execute(
-            "INSERT INTO user_inputs (session_id, input_type, project_name, sanitized_requirements, languages) VALUES (?, ?, ?, ?, ?)",
-            (
-                session_id,
-                input_type,
-                project_name,
-                sanitize_requirements(requirements or ''),
-                normalized_languages,
-            ),
-        )
-    conn.close()
+    _record(
+        "user_input",
+        (
+            session_id,
+            input_type,
+            project_name,
+            sanitize_requirements(requirements or ''),
+            normalized_languages,
+            _now(),
+        ),
+    )
+
+
+def latency_percentiles(histogram: List[int], quantiles=(0.5, 0.95, 0.99)) -> Dict[str, Optional[float]]:
+    """Approximate latency percentiles from a rollup histogram.
+
+    Each value is the upper bound of the bucket the percentile falls in; the
+    last bound for calls slower than all of them, None without data.
+    """
+    total = sum(histogram)
+    percentiles: Dict[str, Optional[float]] = {}
+    for quantile in quantiles:
+        key = f"p{round(quantile * 100)}"
+        percentiles[key] = None
+        cumulative = 0
+        for index, count in enumerate(histogram):
+            cumulative += count
+            if total and cumulative >= quantile * total:
+                percentiles[key] = float(LATENCY_BOUNDS_MS[min(index, len(LATENCY_BOUNDS_MS) - 1)])
+                break
+    return percentiles
+
+
+def _series(cur: sqlite3.Cursor, granularity: str, since_days: float) -> List[Dict[str, Any]]:
+    cur.execute(
+        'SELECT bucket, SUM(calls), SUM(errors) FROM api_call_rollups '
+        'WHERE granularity = ? AND bucket >= ? GROUP BY bucket ORDER BY bucket',
+        (granularity, _cutoff(since_days)[:GRANULARITIES[granularity]]),
+    )
+    return [{"bucket": row[0], "calls": row[1], "errors": row[2]} for row in cur.fetchall()]
 
 
 def get_overview() -> Dict[str, Any]:
     conn = get_connection()
     cur = conn.cursor()
-    cur.execute('SELECT COUNT(*) FROM sessions')
+    cur.execute("SELECT COALESCE(SUM(count), 0) FROM daily_counts WHERE metric = 'sessions'")
     total_sessions = cur.fetchone()[0]
-    cur.execute('SELECT COUNT(*) FROM api_calls')
-    total_calls = cur.fetchone()[0]
-    cur.execute('SELECT endpoint, COUNT(*) as cnt FROM api_calls GROUP BY endpoint ORDER BY cnt DESC LIMIT 5')
+    # Daily rollups cover all history in a few rows per day
+    cur.execute(
+        "SELECT COALESCE(SUM(calls), 0), SUM(total_duration_ms), "
+        + ", ".join(f"COALESCE(SUM({column}), 0)" for column in LATENCY_COLUMNS)
+        + " FROM api_call_rollups WHERE granularity = 'day'"
+    )
+    row = cur.fetchone()
+    total_calls = row[0]
+    avg_latency = row[1] / total_calls if total_calls else None
+    histogram = list(row[2:])
+    cur.execute(
+        "SELECT endpoint, SUM(calls) as cnt FROM api_call_rollups WHERE granularity = 'day' "
+        "GROUP BY endpoint ORDER BY cnt DESC LIMIT 5"
+    )
     popular = [{"endpoint": row[0], "count": row[1]} for row in cur.fetchall()]
-    cur.execute('SELECT AVG(duration_ms) FROM api_calls')
-    avg_latency = cur.fetchone()[0]
-    cur.execute('SELECT model_used, COUNT(*) FROM api_calls WHERE model_used IS NOT NULL GROUP BY model_used')
+    cur.execute(
+        "SELECT model, SUM(calls) FROM api_call_rollups WHERE granularity = 'day' AND model != '' "
+        "GROUP BY model"
+    )
     model_usage = [{"model": row[0], "count": row[1]} for row in cur.fetchall()]
+    bytes_by = {}
+    for column in ("endpoint", "model"):
+        cur.execute(
+            f"SELECT {column}, SUM(request_bytes), SUM(response_bytes) FROM api_call_rollups "
+            f"WHERE granularity = 'day' GROUP BY {column} ORDER BY SUM(response_bytes) DESC"
+        )
+        bytes_by[column] = [
+            {column: row[0] or None, "request_bytes": row[1], "response_bytes": row[2]}
+            for row in cur.fetchall()
+        ]
+    cur.execute("SELECT COALESCE(SUM(count), 0) FROM daily_counts WHERE metric = 'user_inputs'")
+    total_inputs = cur.fetchone()[0]
+    calls_per_minute = _series(cur, "minute", 1 / 24)
+    calls_per_hour = _series(cur, "hour", 1)
+    calls_per_day = _series(cur, "day", 30)
     conn.close()
     return {
         "total_sessions": total_sessions,
         "total_api_calls": total_calls,
+        "total_user_inputs": total_inputs,
         "popular_endpoints": popular,
         "average_latency_ms": avg_latency,
+        "latency_percentiles_ms": latency_percentiles(histogram),
         "model_usage": model_usage,
+        "bytes_by_endpoint": bytes_by["endpoint"],
+        "bytes_by_model": bytes_by["model"],
+        "calls_per_minute": calls_per_minute,
+        "calls_per_hour": calls_per_hour,
+        "calls_per_day": calls_per_day,
     }
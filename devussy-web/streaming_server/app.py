@@ -10,15 +10,21 @@ import time
 from fastapi import FastAPI, Request, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 import uuid
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
 
 # Handle both package and direct module execution
 try:
-    from .analytics import init_db, log_session, log_api_call, log_user_input, get_overview
+    from .analytics import init_db, start_writer, stop_writer, log_session, log_api_call, log_user_input, get_overview, hash_ip
+    from .sse import SSEEmitter, sse_response
+    from .resumable import GenerationRegistry, parse_last_event_id
+    from .jobs import JobStore, JobWorkerPool, follow_job
 except ImportError:
-    from analytics import init_db, log_session, log_api_call, log_user_input, get_overview
+    from analytics import init_db, start_writer, stop_writer, log_session, log_api_call, log_user_input, get_overview, hash_ip
+    from sse import SSEEmitter, sse_response
+    from resumable import GenerationRegistry, parse_last_event_id
+    from jobs import JobStore, JobWorkerPool, follow_job
 
-from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi.responses import JSONResponse
 import json
 import tempfile
 import shutil
@@ -26,6 +32,8 @@ import requests
 from src.git_manager import GitManager
 import os
 import asyncio
+import hashlib
+from collections import OrderedDict
 from pathlib import Path
 import aiohttp
 
@@ -40,8 +48,20 @@ from src.pipeline.design_validator import DesignValidator
 from src.pipeline.design_correction_loop import DesignCorrectionLoop, LLMDesignCorrectionLoop
 from src.pipeline.llm_sanity_reviewer import LLMSanityReviewer, LLMSanityReviewerWithLLM
 from src.interview.complexity_analyzer import ComplexityAnalyzer, ComplexityProfile, LLMComplexityAnalyzer
+from src.interview.conversation_memory import ConversationMemory
 from src.models import ProjectDesign, DevPlan
 from src.concurrency import ConcurrencyManager
+from src.checkpoint_store import CATALOG_FILENAME, CheckpointCatalog
+from src.events import (
+    BusStreamingHandler,
+    EventBus,
+    EventStream,
+    PipelineFailed,
+    StageEnded,
+    TokenChunk,
+)
+from src.loop_monitor import monitor_from_env
+from src.templates import warm_templates
 import os
 import glob
 import time
@@ -76,17 +96,59 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Optional event-loop lag monitor (DEVUSSY_LOOP_MONITOR=1)
+loop_monitor = monitor_from_env()
+
 # Initialize analytics DB on startup
 @app.on_event("startup")
 async def startup_event():
+    global job_store, job_pool
     init_db()
+    start_writer()
+    job_store = JobStore()
+    job_pool = JobWorkerPool(job_store, JOB_HANDLERS)
+    job_pool.start()
+    # Parse (or load precompiled) templates before the first request needs them
+    warm_templates()
+    if loop_monitor is not None:
+        loop_monitor.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    generations.cancel_all()
+    if job_pool is not None:
+        await job_pool.stop()
+    if job_store is not None:
+        job_store.close()
+    await asyncio.to_thread(stop_writer)
+    await close_interview_clients()
+    if loop_monitor is not None:
+        await loop_monitor.astop()
+        print(loop_monitor.format_report())
 
 # Middleware to log each request and response
-class AnalyticsMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
+class AnalyticsMiddleware:
+    """Record each request's session and API call without touching the response stream.
+
+    A pure ASGI middleware: it observes the messages passing through (status,
+    headers, body sizes) instead of wrapping the response like
+    ``BaseHTTPMiddleware``, so SSE streams are not buffered, and the ``log_*``
+    calls only enqueue rows for the analytics writer.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request = Request(scope)
         analytics_opt_out = request.cookies.get("devussy_analytics_optout")
         if analytics_opt_out and analytics_opt_out.lower() in ("1", "true", "yes"):
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
         # Session handling: use cookie or generate new
         session_id = request.cookies.get("devussy_session_id")
         if not session_id:
@@ -95,50 +157,128 @@ class AnalyticsMiddleware(BaseHTTPMiddleware):
         request.state.session_id = session_id
         # Log session (IP hashing)
         client_ip = request.client.host if request.client else "0.0.0.0"
-        user_agent = request.headers.get("user-agent")
-        log_session(session_id, client_ip, user_agent)
-        # Record request details
+        log_session(session_id, client_ip, request.headers.get("user-agent"))
+
         start = time.time()
-        # DON'T consume request body here - let the endpoint handler read it
-        # This was causing ClientDisconnect errors
-        request_size = 0  # We can't reliably get size without consuming body
-        # Process request
-        response = await call_next(request)
-        # Record response details (duration until response object is ready)
-        duration_ms = (time.time() - start) * 1000
-        # Try to infer response size from Content-Length header if present
-        content_length = response.headers.get("content-length")
+        sizes = {"request": 0, "response": 0}
+        response_info = {"status_code": 500, "model_used": None}
+
+        async def receive_counting():
+            # Count the body as the endpoint reads it; never consume it here
+            message = await receive()
+            if message["type"] == "http.request":
+                sizes["request"] += len(message.get("body", b""))
+            return message
+
+        async def send_logging(message):
+            if message["type"] == "http.response.start":
+                response_info["status_code"] = message["status"]
+                headers = MutableHeaders(scope=message)
+                # Determine model used from response header if provided
+                response_info["model_used"] = headers.get("x-model-used")
+                # Set session cookie in response
+                headers.append(
+                    "set-cookie", f"devussy_session_id={session_id}; HttpOnly; Path=/; SameSite=lax"
+                )
+            elif message["type"] == "http.response.body":
+                sizes["response"] += len(message.get("body", b""))
+            await send(message)
+
         try:
-            response_size = int(content_length) if content_length is not None else 0
-        except ValueError:
-            response_size = 0
-        # Determine model used from response header if provided
-        model_used = response.headers.get("x-model-used")
-        # Log API call
-        log_api_call(
-            session_id=session_id,
-            endpoint=str(request.url.path),
-            method=request.method,
-            status_code=response.status_code,
-            duration_ms=duration_ms,
-            request_size=request_size,
-            response_size=response_size,
-            model_used=model_used,
-        )
-        # Set session cookie in response
-        response.set_cookie(key="devussy_session_id", value=session_id, httponly=True, samesite="lax")
-        return response
+            await self.app(scope, receive_counting, send_logging)
+        finally:
+            # Duration covers the whole response, including streamed bodies
+            log_api_call(
+                session_id=session_id,
+                endpoint=scope["path"],
+                method=scope["method"],
+                status_code=response_info["status_code"],
+                duration_ms=(time.time() - start) * 1000,
+                request_size=sizes["request"],
+                response_size=sizes["response"],
+                model_used=response_info["model_used"],
+            )
 
 app.add_middleware(AnalyticsMiddleware)
 
+def _sse_payload(event, result_key: str) -> dict | None:
+    """Map a pipeline event onto the wire format the web client expects."""
+    if isinstance(event, TokenChunk):
+        return {'content': event.text}
+    if isinstance(event, StageEnded) and event.result is not None:
+        return {'done': True, result_key: event.result}
+    if isinstance(event, PipelineFailed):
+        return {'error': event.message}
+    return None
+
+
+async def _stream_stage_events(stage: str, result_key: str, produce):
+    """Run one generation stage on an event bus and yield its SSE payloads.
+
+    ``produce`` receives a streaming handler and returns the stage result (a
+    pydantic model). Tokens reach the client through the same event stream the
+    CLI renders, so a slow client gets coalesced token chunks instead of
+    holding back the generator. Wrap with :meth:`SSEEmitter.stream` for framing.
+    """
+    bus = EventBus()
+    stream = EventStream(bus)
+    handler = BusStreamingHandler(bus, stage=stage)
+
+    async def run():
+        try:
+            result = await produce(handler)
+            bus.publish(StageEnded(stage=stage, result=result.model_dump()))
+        except Exception as e:
+            print(f"ERROR in {stage} generation: {e}")
+            bus.publish(PipelineFailed(message=str(e)))
+        await bus.drain()
+        stream.close()
+
+    task = asyncio.create_task(run())
+    try:
+        async for event in stream:
+            payload = _sse_payload(event, result_key)
+            if payload is not None:
+                yield payload
+    except asyncio.CancelledError:
+        # client disconnected
+        task.cancel()
+        stream.close()
+        return
+
+
+# Design and phase-detail generations outlive their connection; a client that
+# reconnects with Last-Event-ID reattaches instead of starting a new LLM call
+generations = GenerationRegistry()
+
+
+def _resume_stream(request: Request, kind: str):
+    """Reattach to the ``kind`` generation named by the request's ``Last-Event-ID``, if it is still known."""
+    found = generations.resume(request.headers.get("last-event-id"), kind)
+    if found is None:
+        return None
+    generation, seq = found
+    return sse_response(generation.follow(seq), request, headers={"X-Generation-Id": generation.id})
+
+
+def _resumable_response(request: Request, source, kind: str):
+    """Stream the payloads of ``source`` as a new resumable ``kind`` generation."""
+    generation = generations.start(source, kind)
+    return sse_response(generation.follow(), request, headers={"X-Generation-Id": generation.id})
+
+
 @app.post("/api/design/stream")
 async def design_stream(request: Request, x_streaming_proxy_key: str | None = Header(None)):
     _validate_incoming_request(x_streaming_proxy_key)
+    resumed = _resume_stream(request, "design")
+    if resumed is not None:
+        return resumed
 
     body = await request.json()
     project_name = body.get("projectName") or body.get("project_name") or "Unnamed"
     languages = body.get("languages", [])
     requirements = body.get("requirements") or body.get("description", "")
+    source = _design_payloads(body)
     # Log user input for analytics
     analytics_opt_out = request.cookies.get("devussy_analytics_optout")
     if not (analytics_opt_out and analytics_opt_out.lower() in ("1", "true", "yes")):
@@ -155,6 +295,15 @@ async def design_stream(request: Request, x_streaming_proxy_key: str | None = He
             languages=languages,
         )
 
+    return _resumable_response(request, source, "design")
+
+
+def _design_payloads(body: dict):
+    """Validate a design request and return the async generator of its SSE payloads."""
+    project_name = body.get("projectName") or body.get("project_name") or "Unnamed"
+    languages = body.get("languages", [])
+    requirements = body.get("requirements") or body.get("description", "")
+
     # Load config
     config = load_config()
     incoming_api_key = (
@@ -179,75 +328,15 @@ async def design_stream(request: Request, x_streaming_proxy_key: str | None = He
 
     generator = ProjectDesignGenerator(llm_client)
 
-    async def event_generator():
-        try:
-            # Create an async queue where the handler will push tokens.
-            queue: asyncio.Queue[str | None] = asyncio.Queue()
-
-            class QueueStreamingHandler:
-                def __init__(self, queue: asyncio.Queue):
-                    self._queue = queue
-                    # Use the existing StreamingHandler's helpers if needed
-
-                async def on_token_async(self, token: str) -> None:
-                    await self._queue.put(token)
-
-                async def on_completion_async(self, full_response: str) -> None:
-                    # Signal completion
-                    await self._queue.put(None)
-
-                async def __aenter__(self):
-                    return self
-
-                async def __aexit__(self, exc_type, exc, tb):
-                    return False
-
-            streaming_handler = QueueStreamingHandler(queue)
-
-            # Launch a task to run the generator with streaming handler
-            async def run_generation():
-                try:
-                    # Generate returns the structured ProjectDesign object
-                    design_result = await generator.generate(
-                        project_name=project_name,
-                        languages=languages,
-                        requirements=requirements,
-                        streaming_handler=streaming_handler,
-                    )
-                    # Send the structured design object as the final event
-                    await queue.put({'done': True, 'design': design_result.model_dump()})
-                except Exception as e:
-                    # Log the error and push it to the queue so the client knows something went wrong
-                    print(f"ERROR in run_generation: {e}")
-                    import traceback
-                    traceback.print_exc()
-                    await queue.put({'error': str(e)})
-                    await queue.put(None) # Signal end of stream on error
-                finally:
-                    # Ensure the queue gets termination signal if generator finishes
-                    await queue.put(None)
-
-            generation_task = asyncio.create_task(run_generation())
-
-            # Yield tokens as SSE
-            while True:
-                item = await queue.get()
-                if item is None:
-                    break
-                elif isinstance(item, dict):
-                    # Handle done/error messages with full design object
-                    yield f"data: {json.dumps(item)}\n\n"
-                else:
-                    # Regular token
-                    yield f"data: {json.dumps({'content': item})}\n\n"
-                # Yield a newline to flush the buffer immediately
-                yield ":\n\n"
-
-        except asyncio.CancelledError:
-            # client disconnected
-            return
+    async def produce(streaming_handler):
+        return await generator.generate(
+            project_name=project_name,
+            languages=languages,
+            requirements=requirements,
+            streaming_handler=streaming_handler,
+        )
 
-    return StreamingResponse(event_generator(), media_type="text/event-stream")
+    return _stream_stage_events("design", "design", produce)
 
 
 @app.post("/api/design")
@@ -259,7 +348,16 @@ async def design_stream_alias(request: Request, x_streaming_proxy_key: str | Non
 # Analytics overview endpoint
 @app.get("/api/analytics/overview")
 async def analytics_overview():
-    return get_overview()
+    # Reads SQLite; keep it off the event loop
+    return await asyncio.to_thread(get_overview)
+
+
+@app.get("/api/diagnostics/loop")
+async def loop_diagnostics():
+    """Event-loop lag percentiles and blocking-call offenders."""
+    if loop_monitor is None:
+        raise HTTPException(status_code=404, detail="Loop monitor disabled (set DEVUSSY_LOOP_MONITOR=1)")
+    return loop_monitor.report()
 
 @app.post("/api/design/hivemind")
 async def design_hivemind(request: Request):
@@ -278,18 +376,19 @@ async def design_hivemind(request: Request):
     if model_config.get('temperature') is not None:
         config.llm.temperature = float(model_config.get('temperature'))
 
-    async def event_generator():
+    emitter = SSEEmitter()
+
+    async def run_hivemind():
         llm_client = create_llm_client(config)
         hivemind = HiveMindManager(llm_client)
-        queue: asyncio.Queue = asyncio.Queue()
 
         class DroneHandler:
             def __init__(self, drone_id: str):
                 self.drone_id = drone_id
             async def on_token_async(self, token: str):
-                await queue.put({'type': self.drone_id, 'content': token})
+                emitter.send({'type': self.drone_id, 'content': token})
             async def on_completion_async(self, full_response: str):
-                await queue.put({'type': f'{self.drone_id}_complete'})
+                emitter.send({'type': f'{self.drone_id}_complete'})
 
         try:
             prompt_context = {
@@ -313,24 +412,13 @@ async def design_hivemind(request: Request):
                     drone_callbacks=drone_handlers,
                     arbiter_callback=arbiter_handler,
                 )
-                await queue.put({'done': True, 'design': {'project_name': project_name, 'raw_response': final_response}})
-
-            task = asyncio.create_task(run_swarm())
-
-            while True:
-                item = await queue.get()
-                if item.get('content'):
-                    # drone or arbiter token
-                    yield f"data: {json.dumps({'type': item['type'], 'content': item['content']})}\n\n"
-                elif item.get('type') and item['type'].endswith('_complete'):
-                    yield f"data: {json.dumps({'type': item['type']})}\n\n"
-                elif item.get('done'):
-                    yield f"data: {json.dumps({'done': True, 'design': item.get('design')})}\n\n"
-                    break
+                emitter.send({'done': True, 'design': {'project_name': project_name, 'raw_response': final_response}})
+
+            await run_swarm()
         except asyncio.CancelledError:
             return
 
-    return StreamingResponse(event_generator(), media_type='text/event-stream')
+    return sse_response(emitter.run(run_hivemind()), request)
 
 
 @app.post("/api/plan/hivemind")
@@ -350,18 +438,19 @@ async def plan_hivemind(request: Request):
     if model_config.get('temperature') is not None:
         config.llm.temperature = float(model_config.get('temperature'))
 
-    async def event_generator():
+    emitter = SSEEmitter()
+
+    async def run_hivemind():
         llm_client = create_llm_client(config)
         hivemind = HiveMindManager(llm_client)
-        queue: asyncio.Queue = asyncio.Queue()
 
         class DroneHandler:
             def __init__(self, drone_id: str):
                 self.drone_id = drone_id
             async def on_token_async(self, token: str):
-                await queue.put({'type': self.drone_id, 'content': token})
+                emitter.send({'type': self.drone_id, 'content': token})
             async def on_completion_async(self, full_response: str):
-                await queue.put({'type': f'{self.drone_id}_complete'})
+                emitter.send({'type': f'{self.drone_id}_complete'})
 
         try:
             # Build prompt from plan JSON by summarizing phases
@@ -386,23 +475,84 @@ async def plan_hivemind(request: Request):
                     drone_callbacks=drone_handlers,
                     arbiter_callback=arbiter_handler,
                 )
-                await queue.put({'done': True, 'design': {'project_name': project_name, 'raw_response': final_response}})
-
-            task = asyncio.create_task(run_swarm())
-
-            while True:
-                item = await queue.get()
-                if item.get('content'):
-                    yield f"data: {json.dumps({'type': item['type'], 'content': item['content']})}\n\n"
-                elif item.get('type') and item['type'].endswith('_complete'):
-                    yield f"data: {json.dumps({'type': item['type']})}\n\n"
-                elif item.get('done'):
-                    yield f"data: {json.dumps({'done': True, 'design': item.get('design')})}\n\n"
-                    break
+                emitter.send({'done': True, 'design': {'project_name': project_name, 'raw_response': final_response}})
+
+            await run_swarm()
         except asyncio.CancelledError:
             return
 
-    return StreamingResponse(event_generator(), media_type='text/event-stream')
+    return sse_response(emitter.run(run_hivemind()), request)
+
+
+# LLM clients for /api/interview, keyed by provider settings (the API key only
+# by its hash). Each keeps one HTTP session open on the server loop so turns
+# reuse pooled connections. Once more than _INTERVIEW_CLIENT_LIMIT settings
+# are in use the least recently used client is evicted; requests hold a lease
+# on their client, and an evicted one is closed when its last lease ends.
+_INTERVIEW_CLIENT_LIMIT = 32
+_interview_clients: "OrderedDict[tuple, object]" = OrderedDict()
+_interview_client_leases: "dict[object, int]" = {}
+
+
+def _interview_client_key(llm) -> tuple:
+    api_key = getattr(llm, "api_key", None)
+    return (
+        llm.provider,
+        llm.model,
+        getattr(llm, "base_url", None),
+        hashlib.sha256(api_key.encode("utf-8")).hexdigest() if api_key else None,
+        getattr(llm, "temperature", None),
+        getattr(llm, "max_tokens", None),
+        getattr(llm, "reasoning_effort", None),
+    )
+
+
+async def _close_interview_client(client) -> None:
+    try:
+        await client.aclose()
+    except Exception as e:
+        print(f"Warning: failed to close interview client: {e}")
+
+
+async def get_interview_client(config):
+    """Lease the shared interview client for ``config``'s LLM settings.
+
+    Pair every call with :func:`release_interview_client`.
+    """
+    key = _interview_client_key(config.llm)
+    client = _interview_clients.get(key)
+    if client is None:
+        client = create_llm_client(config)
+        _interview_clients[key] = client
+    else:
+        _interview_clients.move_to_end(key)
+    _interview_client_leases[client] = _interview_client_leases.get(client, 0) + 1
+    try:
+        while len(_interview_clients) > _INTERVIEW_CLIENT_LIMIT:
+            _, evicted = _interview_clients.popitem(last=False)
+            if evicted not in _interview_client_leases:
+                await _close_interview_client(evicted)
+        await client.open_session()
+    except BaseException:
+        await release_interview_client(client)
+        raise
+    return client
+
+
+async def release_interview_client(client) -> None:
+    """End a lease; close the client if it was evicted and is now idle."""
+    leases = _interview_client_leases.pop(client) - 1
+    if leases:
+        _interview_client_leases[client] = leases
+    elif client not in _interview_clients.values():
+        await _close_interview_client(client)
+
+
+async def close_interview_clients() -> None:
+    clients = list(_interview_clients.values())
+    _interview_clients.clear()
+    for client in clients:
+        await _close_interview_client(client)
 
 
 @app.post("/api/interview")
@@ -428,95 +578,119 @@ async def interview_endpoint(request: Request):
     if model_config.get("reasoning_effort"):
         config.llm.reasoning_effort = model_config.get("reasoning_effort")
 
-    # Use LLMInterviewManager but call in executor to avoid blocking
-    manager = None
+    # LLMInterviewManager is async-native: await it on the server loop with a
+    # pooled client instead of tying up an executor thread per turn
     try:
         from src.llm_interview import LLMInterviewManager
-        manager = LLMInterviewManager(config, verbose=False)
+        client = await get_interview_client(config)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to initialize interview manager: {e}")
-
-    # Important: conversation_history starts with system prompt
-    # We need to append history AFTER system prompt but BEFORE user message
-    if history:
+    try:
         try:
-            # Validate history format
-            if not isinstance(history, list):
-                raise ValueError("history must be a list")
-            
-            # Filter out system messages from frontend history
-            user_history = [msg for msg in history if isinstance(msg, dict) and msg.get("role") != "system"]
-            
-            # Extend conversation history (after system prompt which is already added in __init__)
-            manager.conversation_history.extend(user_history)
+            manager = LLMInterviewManager(config, verbose=False, llm_client=client, stateless=True)
         except Exception as e:
-            print(f"Warning: Failed to process history: {e}")
-            # Continue without history rather than failing
+            raise HTTPException(status_code=500, detail=f"Failed to initialize interview manager: {e}")
 
-    loop = asyncio.get_running_loop()
-    try:
-        response_text = await loop.run_in_executor(None, manager._send_to_llm, user_input)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"LLM call failed: {str(e)}")
+        # Important: conversation_history starts with system prompt
+        # We need to append history AFTER system prompt but BEFORE user message
+        if history:
+            try:
+                # Validate history format
+                if not isinstance(history, list):
+                    raise ValueError("history must be a list")
+
+                # Filter out system messages from frontend history
+                user_history = [msg for msg in history if isinstance(msg, dict) and msg.get("role") != "system"]
 
-    extracted = manager._extract_structured_data(response_text)
+                # Extend conversation history (after system prompt which is already added in __init__)
+                manager.conversation_history.extend(user_history)
+            except Exception as e:
+                print(f"Warning: Failed to process history: {e}")
+                # Continue without history rather than failing
+
+        # LLM errors come back as a friendly fallback reply, as before
+        response_text = await manager.send(user_input)
+    finally:
+        await release_interview_client(client)
+
+    extracted = manager.last_structured_data
     is_complete = manager._validate_extracted_data(extracted) if extracted else False
     return JSONResponse(status_code=200, content={"response": response_text, "extractedData": extracted, "isComplete": is_complete})
 
+CHECKPOINT_DIR = ".checkpoints"
+_checkpoint_catalog: CheckpointCatalog | None = None
+
+
+def _web_checkpoint_metadata(data: dict, path: Path) -> dict:
+    return {
+        "stage": data.get("stage", "unknown"),
+        "timestamp": data.get("timestamp", path.stat().st_mtime),
+        "project_name": data.get("projectName", "Unknown Project"),
+        "name": data.get("name", path.stem),
+    }
+
+
+def get_checkpoint_catalog() -> CheckpointCatalog:
+    """Return the shared checkpoint catalog, importing legacy JSON files once."""
+    global _checkpoint_catalog
+    if _checkpoint_catalog is None:
+        os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+        catalog = CheckpointCatalog(Path(CHECKPOINT_DIR) / CATALOG_FILENAME)
+        catalog.import_json_files(
+            Path(CHECKPOINT_DIR).glob("*.json"),
+            key_for=lambda p: p.stem,
+            metadata_for=_web_checkpoint_metadata,
+        )
+        _checkpoint_catalog = catalog
+    return _checkpoint_catalog
+
 
 @app.get("/api/checkpoints")
-async def checkpoints_get(id: str | None = None):
-    CHECKPOINT_DIR = ".checkpoints"
-    if not os.path.exists(CHECKPOINT_DIR):
-        os.makedirs(CHECKPOINT_DIR)
+async def checkpoints_get(id: str | None = None, limit: int | None = None, offset: int = 0):
+    catalog = get_checkpoint_catalog()
 
     if id:
-        filepath = os.path.join(CHECKPOINT_DIR, f"{id}.json")
-        if not os.path.exists(filepath):
-            raise HTTPException(status_code=404, detail="Checkpoint not found")
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            return JSONResponse(status_code=200, content=data)
+            data = catalog.get(id)
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
+        if data is None:
+            raise HTTPException(status_code=404, detail="Checkpoint not found")
+        return JSONResponse(status_code=200, content=data)
     else:
-        files = glob.glob(os.path.join(CHECKPOINT_DIR, "*.json"))
-        files.sort(key=os.path.getmtime, reverse=True)
-        checkpoints = []
-        for filepath in files:
-            filename = os.path.basename(filepath)
-            checkpoint_id = filename.replace('.json', '')
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    checkpoints.append({
-                        "id": checkpoint_id,
-                        "name": data.get("name", checkpoint_id),
-                        "timestamp": data.get("timestamp", os.path.getmtime(filepath)),
-                        "projectName": data.get("projectName", "Unknown Project"),
-                        "stage": data.get("stage", "unknown")
-                    })
-            except Exception:
-                continue
-        return JSONResponse(status_code=200, content={"checkpoints": checkpoints})
+        checkpoints = [
+            {
+                "id": row["key"],
+                "name": row["name"] or row["key"],
+                "timestamp": row["created_at"],
+                "projectName": row["project_name"] or "Unknown Project",
+                "stage": row["stage"],
+            }
+            for row in catalog.list(limit=limit, offset=offset)
+        ]
+        return JSONResponse(
+            status_code=200,
+            content={"checkpoints": checkpoints, "total": catalog.count()},
+        )
 
 
 @app.post("/api/checkpoints")
 async def checkpoints_post(request: Request):
     data = await request.json()
-    CHECKPOINT_DIR = ".checkpoints"
-    if not os.path.exists(CHECKPOINT_DIR):
-        os.makedirs(CHECKPOINT_DIR)
     timestamp = int(time.time())
     name = data.get("name", "checkpoint").replace(' ', '_')
     checkpoint_id = f"{timestamp}_{name}"
     data["timestamp"] = timestamp
     data["id"] = checkpoint_id
-    filepath = os.path.join(CHECKPOINT_DIR, f"{checkpoint_id}.json")
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+        get_checkpoint_catalog().put(
+            checkpoint_id,
+            data,
+            stage=data.get("stage", "unknown"),
+            timestamp=timestamp,
+            project_name=data.get("projectName", "Unknown Project"),
+            name=data.get("name", checkpoint_id),
+        )
         return JSONResponse(status_code=200, content={"success": True, "id": checkpoint_id})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -665,59 +839,47 @@ async def plan_basic(request: Request):
         config.llm.temperature = float(model_config.get('temperature'))
 
     # Stream as SSE
-    async def event_generator():
+    emitter = SSEEmitter()
+
+    async def run_plan():
         llm_client = create_llm_client(config)
         generator = BasicDevPlanGenerator(llm_client)
 
-        class StreamHandler:
-            def __init__(self):
-                pass
-
-            async def on_token_async(self, token: str):
-                yield_token = f"data: {json.dumps({'content': token})}\n\n"
-                yield yield_token
-
-            async def on_completion_async(self, full_response: str):
-                return
-
         # Streaming via async call
         try:
-            # We will emulate an async streaming handler by writing to queue
-            queue: asyncio.Queue = asyncio.Queue()
-
+            # Tokens are coalesced into frames by the emitter; the first
+            # 'done' ends the stream
             class APIHandler:
                 async def on_token_async(self, token: str):
-                    await queue.put({'content': token})
+                    emitter.send({'content': token})
 
                 async def on_completion_async(self, full_response: str):
-                    await queue.put({'done': True, 'plan': full_response})
+                    emitter.send({'done': True, 'plan': full_response})
+                    emitter.close()
 
             api_handler = APIHandler()
 
-            async def run_generation():
-                result = await generator.generate(project_design=design, streaming_handler=api_handler)
-                # Put final plan data
-                await queue.put({'done': True, 'plan': result.model_dump()})
-
-            task = asyncio.create_task(run_generation())
-
-            while True:
-                item = await queue.get()
-                if 'content' in item:
-                    yield f"data: {json.dumps({'content': item['content']})}\n\n"
-                elif item.get('done'):
-                    yield f"data: {json.dumps({'done': True, 'plan': item.get('plan')})}\n\n"
-                    break
+            result = await generator.generate(project_design=design, streaming_handler=api_handler)
+            # Final plan data
+            emitter.send({'done': True, 'plan': result.model_dump()})
         except asyncio.CancelledError:
             return
 
-    return StreamingResponse(event_generator(), media_type='text/event-stream')
+    return sse_response(emitter.run(run_plan()), request)
 
 
 @app.post("/api/plan/detail")
 async def plan_detail(request: Request):
     _validate_incoming_request(request.headers.get('x-streaming-proxy-key'))
+    resumed = _resume_stream(request, "plan_detail")
+    if resumed is not None:
+        return resumed
     data = await request.json()
+    return _resumable_response(request, _plan_detail_payloads(data), "plan_detail")
+
+
+def _plan_detail_payloads(data: dict):
+    """Validate a phase-detail request and return the async generator of its SSE payloads."""
     plan_data = data.get('plan') or data.get('basicPlan')
     phase_number = data.get('phaseNumber')
     project_name = data.get('projectName')
@@ -749,48 +911,121 @@ async def plan_detail(request: Request):
     # Force streaming enabled for this endpoint
     config.llm.streaming_enabled = True
 
-    async def event_generator():
+    async def payloads():
         llm_client = create_llm_client(config)
         # Explicitly set streaming_enabled on the client instance
         llm_client.streaming_enabled = True
 
         concurrency_manager = ConcurrencyManager(config)
         generator = DetailedDevPlanGenerator(llm_client, concurrency_manager)
-        queue: asyncio.Queue = asyncio.Queue()
 
-        class APIHandler:
-            async def on_token_async(self, token: str):
-                await queue.put({'content': token})
-
-            async def on_completion_async(self, full_response: str):
-                await queue.put({'done': True, 'phase': full_response})
-
-        api_handler = APIHandler()
-
-        async def run_gen():
+        async def produce(streaming_handler):
             detailed_phase = await generator._generate_phase_details(
                 phase=target_phase,
                 project_name=project_name,
                 tech_stack=[],
                 task_group_size=3,
-                streaming_handler=api_handler,
+                streaming_handler=streaming_handler,
             )
-            await queue.put({'done': True, 'phase': detailed_phase.phase.model_dump()})
+            return detailed_phase.phase
 
-        task = asyncio.create_task(run_gen())
+        async for payload in _stream_stage_events(f"phase_{phase_number}", "phase", produce):
+            yield payload
+
+    return payloads()
+
+
+# Generation jobs are queued in SQLite and run by a worker pool, so clients can
+# poll or stream them by ID from any server process. A job belongs to the
+# session cookie that queued it or, for a request without one, to the client
+# address; only its owner can read or cancel it, and the active-job limit
+# applies per owner.
+JOB_HANDLERS = {
+    "design": _design_payloads,
+    "phase_detail": _plan_detail_payloads,
+}
+MAX_ACTIVE_JOBS_PER_SESSION = int(os.getenv("JOBS_MAX_ACTIVE_PER_SESSION", "4"))
+job_store: JobStore | None = None
+job_pool: JobWorkerPool | None = None
+
+
+def _job_store() -> JobStore:
+    if job_store is None:
+        raise HTTPException(status_code=503, detail="Job queue is not running")
+    return job_store
 
-        try:
-            while True:
-                item = await queue.get()
-                if 'content' in item:
-                    yield f"data: {json.dumps({'content': item['content']})}\n\n"
-                elif item.get('done'):
-                    yield f"data: {json.dumps({'done': True, 'phase': item.get('phase')})}\n\n"
-                    break
-        except asyncio.CancelledError:
-            return
 
-    return StreamingResponse(event_generator(), media_type='text/event-stream')
+def _job_owners(request: Request) -> list:
+    """Owners a request acts for: its session cookie, then its client address."""
+    client_ip = request.client.host if request.client else "0.0.0.0"
+    owners = [f"ip:{hash_ip(client_ip)}"]
+    session_id = request.cookies.get("devussy_session_id")
+    if session_id:
+        owners.insert(0, session_id)
+    return owners
+
+
+async def _get_job(request: Request, job_id: str) -> dict:
+    job = await asyncio.to_thread(_job_store().get, job_id)
+    # Someone else's job is reported as missing, not forbidden
+    if job is None or job["owner"] not in _job_owners(request):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@app.post("/api/jobs", status_code=202)
+async def create_job(request: Request):
+    """Queue a generation job: ``{"kind": "design" | "phase_detail", "params": {...}}``.
+
+    ``params`` is the body the matching streaming endpoint takes.
+    """
+    _validate_incoming_request(request.headers.get('x-streaming-proxy-key'))
+    store = _job_store()
+    data = await request.json()
+    kind = data.get('kind')
+    if kind not in JOB_HANDLERS:
+        raise HTTPException(status_code=400, detail=f"Unknown job kind: {kind}")
+    owner = _job_owners(request)[0]
+    if await asyncio.to_thread(store.active_count, owner) >= MAX_ACTIVE_JOBS_PER_SESSION:
+        raise HTTPException(status_code=429, detail="Too many active jobs")
+    job_id = await asyncio.to_thread(store.create, kind, data.get('params') or {}, owner)
+    return {"id": job_id, "status": "queued"}
+
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(request: Request, job_id: str, after: int = 0):
+    """Poll a job: its status, result and the events after sequence number ``after``."""
+    _validate_incoming_request(request.headers.get('x-streaming-proxy-key'))
+    job = await _get_job(request, job_id)
+    events = await asyncio.to_thread(_job_store().events, job_id, after)
+    return {
+        "id": job_id,
+        "kind": job["kind"],
+        "status": job["status"],
+        "result": job["result"],
+        "error": job["error"],
+        "events": [payload for _, payload in events],
+        "last_seq": events[-1][0] if events else after,
+    }
+
+
+@app.get("/api/jobs/{job_id}/events")
+async def stream_job(request: Request, job_id: str, after: int = 0):
+    """Stream a job's events as SSE, resuming after ``Last-Event-ID`` if sent."""
+    _validate_incoming_request(request.headers.get('x-streaming-proxy-key'))
+    await _get_job(request, job_id)
+    last_event = parse_last_event_id(request.headers.get("last-event-id"))
+    if last_event is not None and last_event[0] == job_id:
+        after = last_event[1]
+    return sse_response(follow_job(_job_store(), job_id, after), request, headers={"X-Job-Id": job_id})
+
+
+@app.delete("/api/jobs/{job_id}")
+async def cancel_job(request: Request, job_id: str):
+    _validate_incoming_request(request.headers.get('x-streaming-proxy-key'))
+    await _get_job(request, job_id)
+    cancelled = await asyncio.to_thread(_job_store().cancel, job_id)
+    return {"id": job_id, "cancelled": cancelled}
 
 
 
@@ -848,6 +1083,51 @@ async def get_models():
 # Design & Plan Refinement Endpoints (Interactive Iteration)
 # =============================================================================
 
+# Rolling summaries of refinement chats. The frontend resends the whole chat
+# each turn; keeping one memory per conversation lets older turns be folded
+# into a summary once (incrementally, in the background) instead of being
+# re-sent verbatim on every turn.
+_REFINE_MEMORY_LIMIT = 128
+_refine_memories: "OrderedDict[tuple, ConversationMemory]" = OrderedDict()
+
+
+def _refine_messages(chat_history: list, user_message: str) -> list:
+    messages = [
+        {"role": msg.get("role", "user"), "content": str(msg.get("content", ""))}
+        for msg in chat_history
+        if isinstance(msg, dict) and msg.get("role") != "system"
+    ]
+    messages.append({"role": "user", "content": user_message})
+    return messages
+
+
+def get_refine_memory(kind: str, project_name: str, messages: list, config, llm_client) -> ConversationMemory:
+    """Return the memory for this refinement conversation, creating it if needed."""
+    opening = messages[0]["content"] if messages else ""
+    key = (kind, project_name, hashlib.sha1(opening.encode("utf-8", "replace")).hexdigest())
+    memory = _refine_memories.get(key)
+    if memory is None:
+        memory = ConversationMemory.from_config(config, summarizer=llm_client.generate_completion)
+        _refine_memories[key] = memory
+        while len(_refine_memories) > _REFINE_MEMORY_LIMIT:
+            _, evicted = _refine_memories.popitem(last=False)
+            evicted.cancel()
+    else:
+        _refine_memories.move_to_end(key)
+    return memory
+
+
+async def _refine_conversation(memory: ConversationMemory, messages: list) -> list:
+    """Prompt lines for a refinement chat: summary of older turns, then recent ones."""
+    summary, recent = await memory.prepare(messages)
+    conversation = []
+    if summary is not None:
+        conversation.append(f"SUMMARY OF EARLIER CONVERSATION:\n{memory.render(summary)}\n")
+    for msg in recent:
+        conversation.append(f"{msg['role'].upper()}: {msg['content']}")
+    return conversation
+
+
 @app.post("/api/design/refine")
 async def design_refine(request: Request):
     """Interactive design refinement via chat interface.
@@ -869,16 +1149,16 @@ async def design_refine(request: Request):
     config = load_config()
     config.llm.streaming_enabled = True
     
-    async def event_generator():
+    emitter = SSEEmitter()
+
+    async def run_refine():
         try:
             llm_client = create_llm_client(config)
             
-            # Build conversation context
-            conversation = []
-            for msg in chat_history:
-                if msg['role'] != 'system':
-                    conversation.append(f"{msg['role'].upper()}: {msg['content']}")
-            conversation.append(f"USER: {user_message}")
+            # Build conversation context (older turns summarized)
+            messages = _refine_messages(chat_history, user_message)
+            memory = get_refine_memory("design", project_name, messages, config, llm_client)
+            conversation = await _refine_conversation(memory, messages)
             
             # Build prompt with design context
             design_summary = f"""
@@ -906,44 +1186,21 @@ Provide helpful, concise responses to guide the user toward a better design. Foc
 
 Respond conversationally and constructively."""
             
-            queue: asyncio.Queue = asyncio.Queue()
-            
-            class StreamHandler:
-                async def on_token_async(self, token: str):
-                    await queue.put({'content': token})
-                async def on_completion_async(self, full_response: str):
-                    await queue.put({'done': True})
-                async def __aenter__(self):
-                    return self
-                async def __aexit__(self, exc_type, exc, tb):
-                    return False
-            
-            handler = StreamHandler()
-            
-            async def run_chat():
-                await llm_client.generate_completion_streaming(
-                    prompt,
-                    callback=lambda token: asyncio.create_task(handler.on_token_async(token)),
-                    streaming_handler=handler
-                )
-            
-            task = asyncio.create_task(run_chat())
-            
-            while True:
-                item = await queue.get()
-                if item.get('content'):
-                    yield f"data: {json.dumps({'content': item['content']})}\n\n"
-                elif item.get('done'):
-                    yield f"data: {json.dumps({'done': True})}\n\n"
-                    break
+            reply = await llm_client.generate_completion_streaming(
+                prompt,
+                callback=lambda token: emitter.send({'content': token}),
+            )
+            emitter.send({'done': True})
+            # Start folding older turns before the user's next message
+            memory.schedule(messages + [{"role": "assistant", "content": reply or ""}])
                     
         except asyncio.CancelledError:
             return
         except Exception as e:
             print(f"Error in design refinement: {e}")
-            yield f"data: {json.dumps({'error': str(e)})}\n\n"
+            emitter.send({'error': str(e)})
     
-    return StreamingResponse(event_generator(), media_type='text/event-stream')
+    return sse_response(emitter.run(run_refine()), request)
 
 
 @app.post("/api/design/review")
@@ -971,7 +1228,7 @@ async def design_automated_review(request: Request):
     config = load_config()
     config.llm.streaming_enabled = True
     
-    async def event_generator():
+    async def payloads():
         try:
             from src.pipeline.design_review import DesignReviewRefiner
             
@@ -983,16 +1240,16 @@ async def design_automated_review(request: Request):
             
             # Stream the report as response
             for char in report:
-                yield f"data: {json.dumps({'content': char})}\n\n"
+                yield {'content': char}
                 await asyncio.sleep(0.001)  # Small delay for readability
             
-            yield f"data: {json.dumps({'done': True, 'changed': changed})}\n\n"
+            yield {'done': True, 'changed': changed}
             
         except Exception as e:
             print(f"Error in automated review: {e}")
-            yield f"data: {json.dumps({'error': str(e)})}\n\n"
+            yield {'error': str(e)}
     
-    return StreamingResponse(event_generator(), media_type='text/event-stream')
+    return sse_response(SSEEmitter().stream(payloads()), request)
 
 
 @app.post("/api/plan/refine")
@@ -1016,16 +1273,16 @@ async def plan_refine(request: Request):
     config = load_config()
     config.llm.streaming_enabled = True
     
-    async def event_generator():
+    emitter = SSEEmitter()
+
+    async def run_refine():
         try:
             llm_client = create_llm_client(config)
             
-            # Build conversation context
-            conversation = []
-            for msg in chat_history:
-                if msg['role'] != 'system':
-                    conversation.append(f"{msg['role'].upper()}: {msg['content']}")
-            conversation.append(f"USER: {user_message}")
+            # Build conversation context (older turns summarized)
+            messages = _refine_messages(chat_history, user_message)
+            memory = get_refine_memory("plan", project_name, messages, config, llm_client)
+            conversation = await _refine_conversation(memory, messages)
             
             # Build prompt with plan context
             phases = plan_data.get('phases', [])
@@ -1056,44 +1313,21 @@ Provide helpful, concise responses to guide the user toward a better plan. Focus
 
 Respond conversationally and constructively."""
             
-            queue: asyncio.Queue = asyncio.Queue()
-            
-            class StreamHandler:
-                async def on_token_async(self, token: str):
-                    await queue.put({'content': token})
-                async def on_completion_async(self, full_response: str):
-                    await queue.put({'done': True})
-                async def __aenter__(self):
-                    return self
-                async def __aexit__(self, exc_type, exc, tb):
-                    return False
-            
-            handler = StreamHandler()
-            
-            async def run_chat():
-                await llm_client.generate_completion_streaming(
-                    prompt,
-                    callback=lambda token: asyncio.create_task(handler.on_token_async(token)),
-                    streaming_handler=handler
-                )
-            
-            task = asyncio.create_task(run_chat())
-            
-            while True:
-                item = await queue.get()
-                if item.get('content'):
-                    yield f"data: {json.dumps({'content': item['content']})}\n\n"
-                elif item.get('done'):
-                    yield f"data: {json.dumps({'done': True})}\n\n"
-                    break
+            reply = await llm_client.generate_completion_streaming(
+                prompt,
+                callback=lambda token: emitter.send({'content': token}),
+            )
+            emitter.send({'done': True})
+            # Start folding older turns before the user's next message
+            memory.schedule(messages + [{"role": "assistant", "content": reply or ""}])
                     
         except asyncio.CancelledError:
             return
         except Exception as e:
             print(f"Error in plan refinement: {e}")
-            yield f"data: {json.dumps({'error': str(e)})}\n\n"
+            emitter.send({'error': str(e)})
     
-    return StreamingResponse(event_generator(), media_type='text/event-stream')
+    return sse_response(emitter.run(run_refine()), request)
 
 
 @app.post("/api/plan/review")
@@ -1111,7 +1345,7 @@ async def plan_automated_review(request: Request):
     config = load_config()
     config.llm.streaming_enabled = True
     
-    async def event_generator():
+    async def payloads():
         try:
             llm_client = create_llm_client(config)
             
@@ -1151,16 +1385,16 @@ Format as a clear, structured review."""
             
             # Stream the response character by character
             for char in response:
-                yield f"data: {json.dumps({'content': char})}\n\n"
+                yield {'content': char}
                 await asyncio.sleep(0.001)
             
-            yield f"data: {json.dumps({'done': True})}\n\n"
+            yield {'done': True}
             
         except Exception as e:
             print(f"Error in plan review: {e}")
-            yield f"data: {json.dumps({'error': str(e)})}\n\n"
+            yield {'error': str(e)}
     
-    return StreamingResponse(event_generator(), media_type='text/event-stream')
+    return sse_response(SSEEmitter().stream(payloads()), request)
 
 
 # =============================================================================
@@ -1214,13 +1448,13 @@ async def complexity_analysis(request: Request):
     use_llm = data.get('use_llm', True)
     model_config = data.get('model_config', {})
 
-    async def event_generator():
+    async def payloads():
         try:
             # Send start event
-            yield f"data: {json.dumps({'type': 'analyzing', 'message': 'Starting complexity analysis...'})}\n\n"
+            yield {'type': 'analyzing', 'message': 'Starting complexity analysis...'}
 
             if use_llm:
-                yield f"data: {json.dumps({'type': 'progress', 'message': 'Using LLM for intelligent complexity analysis...'})}\n\n"
+                yield {'type': 'progress', 'message': 'Using LLM for intelligent complexity analysis...'}
                 
                 # Create LLM client and analyzer
                 llm_client = _create_llm_client_for_adaptive(model_config)
@@ -1246,7 +1480,7 @@ async def complexity_analysis(request: Request):
                 analyzer = ComplexityAnalyzer()
                 profile = analyzer.analyze(interview_data)
 
-                yield f"data: {json.dumps({'type': 'progress', 'message': f'Computed score: {profile.score:.1f}, depth: {profile.depth_level}'})}\n\n"
+                yield {'type': 'progress', 'message': f'Computed score: {profile.score:.1f}, depth: {profile.depth_level}'}
 
                 result = {
                     "project_type_bucket": profile.project_type_bucket,
@@ -1267,15 +1501,15 @@ async def complexity_analysis(request: Request):
             result["needs_clarification"] = len(result.get("follow_up_questions", [])) > 0
 
             # Send final result
-            yield f"data: {json.dumps({'type': 'result', 'profile': result})}\n\n"
-            yield f"data: {json.dumps({'type': 'done', 'success': True})}\n\n"
+            yield {'type': 'result', 'profile': result}
+            yield {'type': 'done', 'success': True}
 
         except Exception as e:
             import traceback
             traceback.print_exc()
-            yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+            yield {'type': 'error', 'message': str(e)}
 
-    return StreamingResponse(event_generator(), media_type='text/event-stream')
+    return sse_response(SSEEmitter().stream(payloads()), request)
 
 
 def _generate_follow_up_questions(profile: ComplexityProfile, interview_data: dict) -> list:
@@ -1317,9 +1551,9 @@ async def design_validation(request: Request):
     use_llm = data.get('use_llm', True)
     model_config = data.get('model_config', {})
 
-    async def event_generator():
+    async def payloads():
         try:
-            yield f"data: {json.dumps({'type': 'validating', 'message': 'Starting design validation...'})}\n\n"
+            yield {'type': 'validating', 'message': 'Starting design validation...'}
 
             # Build complexity profile from data
             profile = ComplexityProfile(
@@ -1339,7 +1573,7 @@ async def design_validation(request: Request):
 
             # Send individual check results
             for check_name, passed in report.checks.items():
-                yield f"data: {json.dumps({'type': 'check', 'check': check_name, 'passed': passed})}\n\n"
+                yield {'type': 'check', 'check': check_name, 'passed': passed}
 
             # Build issues list
             issues = [
@@ -1360,7 +1594,7 @@ async def design_validation(request: Request):
 
             # Run LLM sanity review if enabled
             if use_llm:
-                yield f"data: {json.dumps({'type': 'progress', 'message': 'Running LLM sanity review...'})}\n\n"
+                yield {'type': 'progress', 'message': 'Running LLM sanity review...'}
                 try:
                     llm_client = _create_llm_client_for_adaptive(model_config)
                     llm_reviewer = LLMSanityReviewerWithLLM(llm_client)
@@ -1414,15 +1648,15 @@ async def design_validation(request: Request):
                     "llm_powered": False,
                 }
 
-            yield f"data: {json.dumps({'type': 'result', **result})}\n\n"
-            yield f"data: {json.dumps({'type': 'done', 'success': True})}\n\n"
+            yield {'type': 'result', **result}
+            yield {'type': 'done', 'success': True}
 
         except Exception as e:
             import traceback
             traceback.print_exc()
-            yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+            yield {'type': 'error', 'message': str(e)}
 
-    return StreamingResponse(event_generator(), media_type='text/event-stream')
+    return sse_response(SSEEmitter().stream(payloads()), request)
 
 
 @app.post("/api/adaptive/correct")
@@ -1447,9 +1681,9 @@ async def design_correction(request: Request):
     use_llm = data.get('use_llm', True)
     model_config = data.get('model_config', {})
 
-    async def event_generator():
+    async def payloads():
         try:
-            yield f"data: {json.dumps({'type': 'correcting', 'message': 'Starting design correction loop...', 'max_iterations': max_iterations})}\n\n"
+            yield {'type': 'correcting', 'message': 'Starting design correction loop...', 'max_iterations': max_iterations}
 
             # Build complexity profile if provided
             complexity_profile = None
@@ -1466,7 +1700,7 @@ async def design_correction(request: Request):
                 )
 
             if use_llm:
-                yield f"data: {json.dumps({'type': 'progress', 'message': 'Using LLM for intelligent corrections...'})}\n\n"
+                yield {'type': 'progress', 'message': 'Using LLM for intelligent corrections...'}
                 
                 llm_client = _create_llm_client_for_adaptive(model_config)
                 correction_loop = LLMDesignCorrectionLoop(llm_client)
@@ -1493,7 +1727,7 @@ async def design_correction(request: Request):
                 for change in result.changes_made
             ]
 
-            yield f"data: {json.dumps({
+            yield {
                 'type': 'result', 
                 'final_design': result.design_text, 
                 'iterations': result.iterations_used,
@@ -1502,15 +1736,15 @@ async def design_correction(request: Request):
                 'is_valid': result.validation.is_valid,
                 'changes_made': changes_made,
                 'llm_powered': use_llm,
-            })}\n\n"
-            yield f"data: {json.dumps({'type': 'done', 'success': True})}\n\n"
+            }
+            yield {'type': 'done', 'success': True}
 
         except Exception as e:
             import traceback
             traceback.print_exc()
-            yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+            yield {'type': 'error', 'message': str(e)}
 
-    return StreamingResponse(event_generator(), media_type='text/event-stream')
+    return sse_response(SSEEmitter().stream(payloads()), request)
 
 
 @app.get("/api/adaptive/profile")
@@ -0,0 +1,399 @@
+"""Durable generation jobs for the streaming server.
+
+``POST /api/jobs`` stores a job in a SQLite queue and returns its ID at once.
+A pool of workers claims queued jobs, runs them and appends their payloads
+(coalesced the same way as the SSE endpoints) to the same database. Clients
+stream a job's events, resuming with ``Last-Event-ID``, or poll its status
+and events by ID. Any uvicorn worker (or host) that can open the database
+can serve those reads, so a generation no longer lives and dies with one
+HTTP connection or one process.
+
+A running job whose worker stops sending heartbeats for ``stale_after``
+seconds is marked failed; finished jobs are removed after ``retention``
+seconds.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from . import analytics
+    from .sse import SSEEmitter, sse_frame
+except ImportError:
+    import analytics
+    from sse import SSEEmitter, sse_frame
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = (DONE, FAILED, CANCELLED)
+
+DEFAULT_STALE_AFTER = 60.0
+DEFAULT_RETENTION = 24 * 3600.0
+
+# A job handler turns the job's params into an async generator of SSE payloads
+JobHandler = Callable[[Dict[str, Any]], AsyncIterator[Dict[str, Any]]]
+
+
+def default_jobs_path() -> str:
+    """``DEVUSSY_JOBS_DB``, or ``jobs.db`` next to the analytics database."""
+    path = os.getenv("DEVUSSY_JOBS_DB")
+    if path:
+        return path
+    return os.path.join(os.path.dirname(os.path.abspath(analytics.DB_PATH)), "jobs.db")
+
+
+class JobStore:
+    """SQLite-backed job queue, event log and results.
+
+    One connection per store, in WAL mode so readers in other processes are
+    not blocked by a writing worker. Methods block; call them from a thread
+    (``asyncio.to_thread``) when on the event loop.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        stale_after: float = DEFAULT_STALE_AFTER,
+        retention: float = DEFAULT_RETENTION,
+    ) -> None:
+        self.path = path or default_jobs_path()
+        self.stale_after = stale_after
+        self.retention = retention
+        self._lock = threading.Lock()
+        # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(
+            self.path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript('''
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            params TEXT NOT NULL,
+            owner TEXT,
+            status TEXT NOT NULL,
+            worker TEXT,
+            result TEXT,
+            error TEXT,
+            created_at REAL NOT NULL,
+            started_at REAL,
+            heartbeat_at REAL,
+            finished_at REAL
+        );
+        CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, created_at);
+        CREATE INDEX IF NOT EXISTS idx_jobs_owner ON jobs(owner, status);
+        CREATE TABLE IF NOT EXISTS job_events (
+            job_id TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            payload TEXT NOT NULL,
+            PRIMARY KEY (job_id, seq)
+        );
+        ''')
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _append(self, conn: sqlite3.Connection, job_id: str, events: List[Tuple[int, Dict[str, Any]]]) -> None:
+        conn.executemany(
+            "INSERT INTO job_events (job_id, seq, payload) VALUES (?, ?, ?)",
+            [(job_id, seq, json.dumps(payload)) for seq, payload in events],
+        )
+
+    def _next_seq(self, conn: sqlite3.Connection, job_id: str) -> int:
+        row = conn.execute("SELECT MAX(seq) FROM job_events WHERE job_id = ?", (job_id,)).fetchone()
+        return (row[0] or 0) + 1
+
+    def create(self, kind: str, params: Dict[str, Any], owner: Optional[str] = None) -> str:
+        """Queue a job and return its ID."""
+        job_id = uuid.uuid4().hex
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, params, owner, status, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, kind, json.dumps(params), owner, QUEUED, time.time()),
+            )
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job's row (params and result decoded), or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["params"] = json.loads(job["params"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def claim(self, worker: str) -> Optional[Dict[str, Any]]:
+        """Atomically take the oldest queued job for ``worker``."""
+        now = time.time()
+        with self._transaction() as conn:
+            self._fail_stale(conn, now)
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1", (QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker = ?, started_at = ?, heartbeat_at = ? WHERE id = ?",
+                (RUNNING, worker, now, now, row["id"]),
+            )
+        return self.get(row["id"])
+
+    def _fail_stale(self, conn: sqlite3.Connection, now: float) -> None:
+        stale = conn.execute(
+            "SELECT id FROM jobs WHERE status = ? AND heartbeat_at < ?",
+            (RUNNING, now - self.stale_after),
+        ).fetchall()
+        for row in stale:
+            self._finish(conn, row["id"], FAILED, error="Worker stopped responding")
+
+    def _finish(
+        self,
+        conn: sqlite3.Connection,
+        job_id: str,
+        status: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+        error_event: bool = True,
+    ) -> None:
+        if error and error_event:
+            # Followers learn about the failure from the event stream itself
+            self._append(conn, job_id, [(self._next_seq(conn, job_id), {"error": error})])
+        conn.execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+            (status, json.dumps(result) if result is not None else None, error, time.time(), job_id),
+        )
+
+    def append_events(
+        self, job_id: str, worker: str, events: List[Tuple[int, Dict[str, Any]]]
+    ) -> bool:
+        """Store ``(seq, payload)`` events and refresh the heartbeat.
+
+        Returns False (and stores nothing) once the job no longer belongs to
+        ``worker``, e.g. because it was cancelled.
+        """
+        with self._transaction() as conn:
+            if not self._owned(conn, job_id, worker):
+                return False
+            if events:
+                self._append(conn, job_id, events)
+            conn.execute("UPDATE jobs SET heartbeat_at = ? WHERE id = ?", (time.time(), job_id))
+        return True
+
+    def heartbeat(self, job_id: str, worker: str) -> bool:
+        """Mark ``worker`` as still running the job; False if it should stop."""
+        return self.append_events(job_id, worker, [])
+
+    def _owned(self, conn: sqlite3.Connection, job_id: str, worker: str) -> bool:
+        row = conn.execute("SELECT status, worker FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row is not None and row["status"] == RUNNING and row["worker"] == worker
+
+    def finish(
+        self,
+        job_id: str,
+        worker: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+        error_event: bool = True,
+    ) -> None:
+        """Record the outcome of a job ``worker`` ran, unless it was taken away."""
+        with self._transaction() as conn:
+            if self._owned(conn, job_id, worker):
+                self._finish(conn, job_id, FAILED if error else DONE, result, error, error_event)
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job; its worker stops at the next heartbeat."""
+        with self._transaction() as conn:
+            row = conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None or row["status"] in FINISHED:
+                return False
+            self._finish(conn, job_id, CANCELLED, error="Job cancelled")
+        return True
+
+    def events(self, job_id: str, after: int = 0) -> List[Tuple[int, Dict[str, Any]]]:
+        """Return the job's events with a sequence number above ``after``."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, payload FROM job_events WHERE job_id = ? AND seq > ? ORDER BY seq",
+                (job_id, after),
+            ).fetchall()
+        return [(row["seq"], json.loads(row["payload"])) for row in rows]
+
+    def active_count(self, owner: str) -> int:
+        """Number of queued or running jobs submitted by ``owner``."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE owner = ? AND status IN (?, ?)",
+                (owner, QUEUED, RUNNING),
+            ).fetchone()
+        return row[0]
+
+    def prune(self) -> int:
+        """Delete finished jobs (and their events) older than the retention period."""
+        cutoff = time.time() - self.retention
+        with self._transaction() as conn:
+            conn.execute(
+                "DELETE FROM job_events WHERE job_id IN "
+                "(SELECT id FROM jobs WHERE status IN (?, ?, ?) AND finished_at < ?)",
+                (*FINISHED, cutoff),
+            )
+            deleted = conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?, ?) AND finished_at < ?",
+                (*FINISHED, cutoff),
+            ).rowcount
+        return deleted
+
+
+class JobWorkerPool:
+    """Claim jobs from a :class:`JobStore` and run them on this event loop."""
+
+    def __init__(
+        self,
+        store: JobStore,
+        handlers: Dict[str, JobHandler],
+        concurrency: Optional[int] = None,
+        poll_interval: float = 0.5,
+    ) -> None:
+        if concurrency is None:
+            concurrency = int(os.getenv("JOBS_WORKERS", "2"))
+        self.store = store
+        self.handlers = handlers
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.name = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        for index in range(self.concurrency):
+            self._tasks.append(asyncio.create_task(self._work(f"{self.name}/{index}")))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _work(self, worker: str) -> None:
+        last_prune = 0.0
+        while True:
+            if time.monotonic() - last_prune > 3600:
+                last_prune = time.monotonic()
+                await asyncio.to_thread(self.store.prune)
+            try:
+                job = await asyncio.to_thread(self.store.claim, worker)
+            except sqlite3.Error as e:
+                print(f"ERROR claiming job: {e}")
+                job = None
+            if job is None:
+                await asyncio.sleep(self.poll_interval)
+                continue
+            await self.run_job(job, worker)
+
+    async def run_job(self, job: Dict[str, Any], worker: str) -> None:
+        """Run one claimed job to completion, storing its events and outcome."""
+        job_id = job["id"]
+        handler = self.handlers.get(job["kind"])
+        if handler is None:
+            await asyncio.to_thread(self.store.finish, job_id, worker, error=f"Unknown job kind: {job['kind']}")
+            return
+
+        emitter = SSEEmitter()
+        outcome: Dict[str, Any] = {}
+
+        async def pump() -> None:
+            try:
+                async for payload in handler(job["params"]):
+                    emitter.send(payload)
+                    if payload.get("error"):
+                        outcome["error"] = payload["error"]
+                    elif payload.get("done"):
+                        outcome["result"] = payload
+            finally:
+                emitter.close()
+
+        async def keep_alive() -> None:
+            while await asyncio.to_thread(self.store.heartbeat, job_id, worker):
+                await asyncio.sleep(self.store.stale_after / 4)
+            stop()
+
+        def stop() -> None:
+            # Cancelled (or failed as stale) elsewhere: the store already has its outcome
+            outcome["stopped"] = True
+            task.cancel()
+
+        task = asyncio.create_task(pump())
+        beat = asyncio.create_task(keep_alive())
+        error_event = False
+        try:
+            async for batch in emitter.batches():
+                if not await asyncio.to_thread(self.store.append_events, job_id, worker, batch):
+                    stop()
+                    break
+            await task
+        except asyncio.CancelledError:
+            if outcome.get("stopped"):
+                return
+            # The pool is shutting down; don't leave the job running in the store
+            await asyncio.to_thread(self.store.finish, job_id, worker, error="Job runner shut down")
+            raise
+        except Exception as e:
+            # e.g. an HTTPException from validating the job's params
+            outcome["error"] = str(getattr(e, "detail", None) or e)
+            error_event = True
+        finally:
+            beat.cancel()
+            if not task.done():
+                task.cancel()
+        await asyncio.to_thread(
+            self.store.finish,
+            job_id,
+            worker,
+            outcome.get("result"),
+            outcome.get("error"),
+            error_event,
+        )
+
+
+async def follow_job(
+    store: JobStore, job_id: str, after: int = 0, poll_interval: float = 0.25
+) -> AsyncIterator[str]:
+    """Yield a job's events as SSE frames (``id: <job>:<seq>``) until it finishes."""
+    seq = after
+    while True:
+        # Status first: once it reads finished, every event is already stored
+        job = await asyncio.to_thread(store.get, job_id)
+        events = await asyncio.to_thread(store.events, job_id, seq)
+        if events:
+            seq = events[-1][0]
+            yield "".join(sse_frame(payload, f"{job_id}:{s}") for s, payload in events)
+            continue
+        if job is None or job["status"] in FINISHED:
+            return
+        await asyncio.sleep(poll_interval)
@@ -0,0 +1,226 @@
+"""Resumable generations behind the design and phase-detail SSE streams.
+
+A generation runs as a task of its own, detached from the request that
+started it. Every frame it writes carries an ``id:`` of ``<generation>:<seq>``
+and is kept in a bounded replay buffer, so a client whose connection dropped
+can POST again with a ``Last-Event-ID`` header and receive only the frames
+after that ID from the same (still running or just finished) generation,
+instead of starting a new LLM call.
+
+A generation that nobody follows is cancelled once it has been idle for
+``SSE_RESUME_TTL`` seconds; finished ones are forgotten after the same delay,
+whether or not anyone ever followed them, so an idle server does not keep
+their replay buffers.
+If the replay buffer (``SSE_REPLAY_EVENTS`` frames) has already dropped some
+of the missed frames, the client still gets everything that is left,
+including the final ``done`` payload, which carries the complete result.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+import uuid
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Optional, Tuple
+
+try:
+    from .sse import SSEEmitter
+except ImportError:
+    from sse import SSEEmitter
+
+DEFAULT_REPLAY_EVENTS = 1024
+DEFAULT_RESUME_TTL = 120.0
+
+
+def parse_last_event_id(value: Optional[str]) -> Optional[Tuple[str, int]]:
+    """Split a ``<generation>:<seq>`` event ID; None if it is not one of ours."""
+    if not value:
+        return None
+    generation_id, _, seq = value.strip().rpartition(":")
+    if not generation_id or not seq.isdigit():
+        return None
+    return generation_id, int(seq)
+
+
+class Generation:
+    """One streamed generation, its replay buffer and its followers."""
+
+    def __init__(
+        self,
+        generation_id: str,
+        replay_size: int,
+        idle_timeout: float,
+        kind: Optional[str] = None,
+        on_expire: Optional[Callable[["Generation"], None]] = None,
+    ) -> None:
+        self.id = generation_id
+        self.kind = kind
+        self.idle_timeout = idle_timeout
+        self.finished = False
+        self.followers = 0
+        self.idle_since: Optional[float] = time.monotonic()
+        self._events: Deque[Tuple[int, str]] = deque(maxlen=replay_size)
+        self._changed = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._on_expire = on_expire
+
+    def start(self, source: AsyncIterator[Dict[str, Any]]) -> None:
+        """Run ``source`` (an async generator of payloads) in the background."""
+        self._task = asyncio.create_task(self._run(source))
+        # Covers a generation whose client never starts following it
+        self._arm_expiry()
+
+    async def _run(self, source: AsyncIterator[Dict[str, Any]]) -> None:
+        emitter = SSEEmitter(id_prefix=f"{self.id}:")
+
+        async def pump() -> None:
+            try:
+                async for payload in source:
+                    emitter.send(payload)
+            finally:
+                emitter.close()
+
+        task = asyncio.create_task(pump())
+        try:
+            async for batch in emitter.batches():
+                self._events.extend((seq, emitter.frame(seq, payload)) for seq, payload in batch)
+                self._notify()
+            await task
+        except Exception as e:
+            print(f"ERROR in resumable generation {self.id}: {e}")
+        finally:
+            if not task.done():
+                task.cancel()
+            self.finished = True
+            if self.followers == 0:
+                self.idle_since = time.monotonic()
+                self._arm_expiry()
+            self._notify()
+
+    def _notify(self) -> None:
+        # Wake current followers; later waits use a fresh event
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def cancel(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+    def expired(self, now: Optional[float] = None) -> bool:
+        """True once nobody has followed this generation for ``idle_timeout``."""
+        if self.followers or self.idle_since is None:
+            return False
+        return (now or time.monotonic()) - self.idle_since >= self.idle_timeout
+
+    def _arm_expiry(self, delay: Optional[float] = None) -> None:
+        asyncio.get_running_loop().call_later(
+            self.idle_timeout if delay is None else delay, self._expire_if_idle
+        )
+
+    def _expire_if_idle(self) -> None:
+        if self.followers or self.idle_since is None:
+            return
+        remaining = self.idle_since + self.idle_timeout - time.monotonic()
+        if remaining > 0:
+            # Idle again since this timer was armed
+            self._arm_expiry(remaining)
+            return
+        if not self.finished:
+            print(f"Cancelling abandoned generation {self.id}")
+            self.cancel()
+        self._events.clear()
+        if self._on_expire is not None:
+            self._on_expire(self)
+
+    async def follow(self, after: int = 0) -> AsyncIterator[str]:
+        """Yield the frames after sequence number ``after``, then live ones.
+
+        Ends when the generation has finished and every frame was yielded.
+        Leaving early (client disconnect) does not stop the generation.
+        """
+        self.followers += 1
+        self.idle_since = None
+        seq = after
+        try:
+            while True:
+                changed = self._changed
+                frames = [(s, frame) for s, frame in self._events if s > seq]
+                if frames:
+                    if frames[0][0] > seq + 1:
+                        print(f"Generation {self.id}: replay buffer dropped {frames[0][0] - seq - 1} frames")
+                    seq = frames[-1][0]
+                    yield "".join(frame for _, frame in frames)
+                    continue
+                if self.finished:
+                    return
+                await changed.wait()
+        finally:
+            self.followers -= 1
+            if self.followers == 0:
+                self.idle_since = time.monotonic()
+                self._arm_expiry()
+
+
+class GenerationRegistry:
+    """Running and recently finished generations, by ID."""
+
+    def __init__(self, replay_size: Optional[int] = None, idle_timeout: Optional[float] = None) -> None:
+        if replay_size is None:
+            replay_size = int(os.getenv("SSE_REPLAY_EVENTS", DEFAULT_REPLAY_EVENTS))
+        if idle_timeout is None:
+            idle_timeout = float(os.getenv("SSE_RESUME_TTL", DEFAULT_RESUME_TTL))
+        self.replay_size = replay_size
+        self.idle_timeout = idle_timeout
+        self._generations: Dict[str, Generation] = {}
+
+    def start(self, source: AsyncIterator[Dict[str, Any]], kind: Optional[str] = None) -> Generation:
+        """Start a new generation streaming the payloads of ``source``.
+
+        ``kind`` names the endpoint that started it, so an event ID from one
+        stream cannot be replayed on another.
+        """
+        self.prune()
+        generation = Generation(
+            uuid.uuid4().hex, self.replay_size, self.idle_timeout, kind, on_expire=self._forget
+        )
+        generation.start(source)
+        self._generations[generation.id] = generation
+        return generation
+
+    def resume(
+        self, last_event_id: Optional[str], kind: Optional[str] = None
+    ) -> Optional[Tuple[Generation, int]]:
+        """Find the generation and sequence number a ``Last-Event-ID`` refers to.
+
+        None if the ID is unknown or belongs to a generation of another ``kind``.
+        """
+        self.prune()
+        parsed = parse_last_event_id(last_event_id)
+        if parsed is None:
+            return None
+        generation = self._generations.get(parsed[0])
+        if generation is None or generation.kind != kind:
+            return None
+        return generation, parsed[1]
+
+    def prune(self) -> None:
+        """Drop generations nobody has followed for the idle timeout."""
+        now = time.monotonic()
+        for generation_id, generation in list(self._generations.items()):
+            if generation.expired(now):
+                generation.cancel()
+                del self._generations[generation_id]
+
+    def _forget(self, generation: Generation) -> None:
+        if self._generations.get(generation.id) is generation:
+            del self._generations[generation.id]
+
+    def cancel_all(self) -> None:
+        for generation in self._generations.values():
+            generation.cancel()
+        self._generations.clear()
+
+    def __len__(self) -> int:
+        return len(self._generations)
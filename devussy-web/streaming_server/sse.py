@@ -0,0 +1,237 @@
+"""Coalesced Server-Sent Events framing for the streaming endpoints.
+
+Writing one ``data:`` frame per LLM token costs a ``json.dumps``, a queue hop
+and a socket write (plus proxy work) for every few bytes of text.
+:class:`SSEEmitter` buffers token payloads and writes them as one frame per
+stream every ``flush_ms`` milliseconds, or sooner once ``max_bytes`` of text
+is pending. Any other payload (``done``, errors, stage or drone completion)
+is a boundary: pending tokens and the boundary are written immediately.
+
+A token payload is a dict whose ``content`` is a string; consecutive tokens
+are merged when their other keys match (e.g. the same hivemind drone), so
+the client-side parsers see the same event shapes, just fewer of them.
+
+With ``id_prefix`` set, every frame carries an ``id:`` line of
+``<prefix><seq>`` so clients can resume with ``Last-Event-ID`` (see
+``resumable.py``).
+
+Responses can optionally be gzip-compressed with a sync flush per write, so
+compression never delays delivery.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+import zlib
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+DEFAULT_FLUSH_MS = 50
+DEFAULT_MAX_BYTES = 4096
+
+# Headers that keep proxies (nginx) from buffering or caching the stream
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+
+def sse_frame(payload: Dict[str, Any], event_id: Optional[str] = None) -> str:
+    """Format one payload as an SSE ``data:`` frame, optionally with an ``id:``."""
+    if event_id is not None:
+        return f"id: {event_id}\ndata: {json.dumps(payload)}\n\n"
+    return f"data: {json.dumps(payload)}\n\n"
+
+
+def _token_shape(payload: Dict[str, Any]) -> Optional[Tuple]:
+    """Merge key for token payloads; None for boundaries."""
+    if not isinstance(payload.get("content"), str):
+        return None
+    return tuple(sorted((k, repr(v)) for k, v in payload.items() if k != "content"))
+
+
+class SSEEmitter:
+    """Buffer payloads and yield them as coalesced SSE frames.
+
+    Producers call :meth:`send` (non-blocking, from the event loop) while the
+    response iterates :meth:`run`, which drives the producing coroutine, or
+    :meth:`stream` for sources that are async generators of payloads.
+    """
+
+    def __init__(
+        self,
+        flush_ms: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        id_prefix: Optional[str] = None,
+    ) -> None:
+        if flush_ms is None:
+            flush_ms = float(os.getenv("SSE_FLUSH_MS", DEFAULT_FLUSH_MS))
+        if max_bytes is None:
+            max_bytes = int(os.getenv("SSE_MAX_BYTES", DEFAULT_MAX_BYTES))
+        self.flush_interval = max(0.0, flush_ms / 1000)
+        self.max_bytes = max_bytes
+        self.id_prefix = id_prefix
+        # Pending token runs, one per shape, in order of first appearance
+        self._tokens: Dict[Tuple, Tuple[Dict[str, Any], List[str]]] = {}
+        # (seq, payload) pairs that must go out now, in order (flushed tokens, boundaries)
+        self._ready: List[Tuple[int, Dict[str, Any]]] = []
+        self._seq = 0
+        self._pending_bytes = 0
+        self._first_token_at: Optional[float] = None
+        self._wakeup = asyncio.Event()
+        self._closed = False
+        self.frames_written = 0
+
+    def send(self, payload: Dict[str, Any]) -> None:
+        """Queue a payload; tokens are coalesced, anything else flushes."""
+        if self._closed:
+            return
+        shape = _token_shape(payload)
+        if shape is None:
+            self._flush_tokens()
+            self._ready.append(self._next(payload))
+            self._wakeup.set()
+            return
+        if not payload["content"]:
+            return
+        if shape in self._tokens:
+            self._tokens[shape][1].append(payload["content"])
+        else:
+            self._tokens[shape] = (payload, [payload["content"]])
+        self._pending_bytes += len(payload["content"])
+        if self._first_token_at is None:
+            self._first_token_at = time.monotonic()
+            self._wakeup.set()
+        if self._pending_bytes >= self.max_bytes:
+            self._wakeup.set()
+
+    def close(self) -> None:
+        """End the stream after pending payloads are written."""
+        self._closed = True
+        self._wakeup.set()
+
+    def _next(self, payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        self._seq += 1
+        return self._seq, payload
+
+    def frame(self, seq: int, payload: Dict[str, Any]) -> str:
+        """Format a payload from :meth:`batches`, with its ``id:`` if enabled."""
+        event_id = None if self.id_prefix is None else f"{self.id_prefix}{seq}"
+        return sse_frame(payload, event_id)
+
+    def _flush_tokens(self) -> None:
+        for template, parts in self._tokens.values():
+            self._ready.append(self._next({**template, "content": "".join(parts)}))
+        self._tokens = {}
+        self._pending_bytes = 0
+        self._first_token_at = None
+
+    def _drain(self) -> List[Tuple[int, Dict[str, Any]]]:
+        self._flush_tokens()
+        frames, self._ready = self._ready, []
+        self.frames_written += len(frames)
+        return frames
+
+    def _due(self) -> Optional[float]:
+        """Seconds until pending output must be written (0 = now, None = nothing pending)."""
+        if self._ready or self._closed or self._pending_bytes >= self.max_bytes:
+            return 0.0 if (self._ready or self._tokens) else None
+        if self._first_token_at is None:
+            return None
+        return max(0.0, self._first_token_at + self.flush_interval - time.monotonic())
+
+    async def batches(self) -> AsyncIterator[List[Tuple[int, Dict[str, Any]]]]:
+        """Yield ``(seq, payload)`` batches, one per write, until closed."""
+        while True:
+            due = self._due()
+            if due is None:
+                if self._closed:
+                    return
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            if due > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=due)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            yield self._drain()
+
+    async def frames(self) -> AsyncIterator[str]:
+        """Yield coalesced frames, one string per socket write, until closed."""
+        async for batch in self.batches():
+            yield "".join(self.frame(seq, payload) for seq, payload in batch)
+
+    async def run(self, work: Awaitable[Any]) -> AsyncIterator[str]:
+        """Run ``work`` (which calls :meth:`send`) and yield frames until it ends.
+
+        The emitter is closed when ``work`` finishes; if the client goes away
+        first, ``work`` is cancelled.
+        """
+
+        async def runner() -> None:
+            try:
+                await work
+            finally:
+                self.close()
+
+        task = asyncio.create_task(runner())
+        try:
+            async for chunk in self.frames():
+                yield chunk
+            await task  # Surface errors raised by ``work``
+        finally:
+            if not task.done():
+                task.cancel()
+
+    def stream(self, source: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+        """Coalesce the payloads of an async generator into frames."""
+
+        async def pump() -> None:
+            async for payload in source:
+                self.send(payload)
+
+        return self.run(pump())
+
+
+def _accepts_gzip(request: Optional[Request]) -> bool:
+    if request is None:
+        return False
+    return "gzip" in request.headers.get("accept-encoding", "").lower()
+
+
+async def _gzip_chunks(chunks: AsyncIterator[str]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)  # gzip container
+    async for chunk in chunks:
+        # Sync flush: each write is decodable as soon as it arrives
+        yield compressor.compress(chunk.encode("utf-8")) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+def sse_response(
+    chunks: AsyncIterator[str],
+    request: Optional[Request] = None,
+    compress: Optional[bool] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> StreamingResponse:
+    """Wrap SSE text chunks in a streaming response.
+
+    Compression is used when ``compress`` (default: ``SSE_COMPRESSION=gzip``
+    in the environment) is set and the client accepts gzip.
+    """
+    if compress is None:
+        compress = os.getenv("SSE_COMPRESSION", "").lower() == "gzip"
+    response_headers = dict(SSE_HEADERS)
+    response_headers.update(headers or {})
+    if compress and _accepts_gzip(request):
+        response_headers["Content-Encoding"] = "gzip"
+        response_headers["Vary"] = "Accept-Encoding"
+        chunks = _gzip_chunks(chunks)
+    return StreamingResponse(chunks, media_type="text/event-stream", headers=response_headers)
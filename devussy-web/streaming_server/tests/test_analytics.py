@@ -0,0 +1,196 @@
+import sqlite3
+import uuid
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.responses import StreamingResponse
+from starlette.routing import Route
+
+import streaming_server.analytics as analytics
+
+
+@pytest.fixture
+def db_path(monkeypatch, tmp_path):
+    path = str(tmp_path / "analytics.db")
+    monkeypatch.setattr(analytics, "DB_PATH", path)
+    analytics.init_db()
+    return path
+
+
+def _count(path, table):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_writer_batches_queued_rows(db_path):
+    writer = analytics.AnalyticsWriter(batch_size=100, flush_interval=0.05)
+    writer.start()
+    for i in range(250):
+        writer.submit("api_call", ("s", f"/api/{i}", "GET", 200, 1.0, 0, 10, None, "2026-01-01 00:00:00"))
+    writer.submit("session", ("s", "hash", None, "2026-01-01 00:00:00"))
+    writer.stop()
+
+    assert writer.written == 251
+    assert _count(db_path, "api_calls") == 250
+    assert _count(db_path, "sessions") == 1
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    conn.close()
+
+
+def test_full_queue_drops_instead_of_blocking(db_path):
+    writer = analytics.AnalyticsWriter(max_queue=2)  # Not started: nothing drains
+    assert writer.submit("session", ("a", "h", None, ""))
+    assert writer.submit("session", ("b", "h", None, ""))
+    assert not writer.submit("session", ("c", "h", None, ""))
+    assert writer.dropped == 1
+
+
+
+def test_dropped_session_row_is_retried_on_the_next_request(db_path, monkeypatch):
+    writer = analytics.AnalyticsWriter(max_queue=1)  # Not started: nothing drains
+    monkeypatch.setattr(analytics, "_writer", writer)
+    session_id = uuid.uuid4().hex
+    writer.submit("api_call", ("s", "/", "GET", 200, 1.0, 0, 0, None, ""))
+
+    analytics.log_session(session_id, "127.0.0.1")
+    assert writer.dropped == 1
+    assert session_id not in analytics._recent_sessions
+
+    writer.queue.get_nowait()
+    analytics.log_session(session_id, "127.0.0.1")
+    assert session_id in analytics._recent_sessions
+    assert writer.queue.get_nowait()[1][0] == session_id
+
+@pytest.mark.asyncio
+async def test_middleware_logs_streamed_response_through_writer(db_path):
+    from streaming_server.app import AnalyticsMiddleware
+
+    async def stream(request):
+        await request.body()
+
+        async def chunks():
+            for _ in range(3):
+                yield b"data: {}\n\n"
+
+        return StreamingResponse(chunks(), media_type="text/event-stream", headers={"X-Model-Used": "m1"})
+
+    app = Starlette(routes=[Route("/s", stream, methods=["POST"])], middleware=[Middleware(AnalyticsMiddleware)])
+    session_id = str(uuid.uuid4())
+    analytics.start_writer(flush_interval=0.01)
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            client.cookies.set("devussy_session_id", session_id)
+            resp = await client.post("/s", content=b"x" * 42)
+    finally:
+        analytics.stop_writer()
+
+    assert resp.status_code == 200
+    assert f"devussy_session_id={session_id}" in resp.headers["set-cookie"]
+    conn = sqlite3.connect(db_path)
+    row = conn.execute(
+        "SELECT session_id, endpoint, status_code, request_size, response_size, model_used FROM api_calls"
+    ).fetchone()
+    conn.close()
+    assert row == (session_id, "/s", 200, 42, 30, "m1")
+    assert _count(db_path, "sessions") == 1
+
+
+def _log_calls():
+    for i, (endpoint, duration, model) in enumerate([
+        ("/api/design", 40, "m1"),
+        ("/api/design", 900, "m1"),
+        ("/api/design", 200_000, None),
+        ("/api/models", 5, None),
+    ]):
+        analytics.log_api_call("s", endpoint, "POST", 500 if i == 3 else 200, duration, 10, 100 * (i + 1), model)
+    analytics.log_session(str(uuid.uuid4()), "127.0.0.1")
+    analytics.log_user_input("s", "design_input", "Ledger", "reqs", ["Python"])
+
+
+def test_overview_is_served_from_rollups(db_path):
+    _log_calls()
+    overview = analytics.get_overview()
+
+    assert overview["total_api_calls"] == 4
+    assert overview["total_sessions"] == 1
+    assert overview["total_user_inputs"] == 1
+    assert overview["popular_endpoints"][0] == {"endpoint": "/api/design", "count": 3}
+    assert overview["average_latency_ms"] == pytest.approx((40 + 900 + 200_000 + 5) / 4)
+    assert overview["latency_percentiles_ms"] == {"p50": 50.0, "p95": 120000.0, "p99": 120000.0}
+    assert overview["model_usage"] == [{"model": "m1", "count": 2}]
+    assert overview["bytes_by_endpoint"][0] == {"endpoint": "/api/design", "request_bytes": 30, "response_bytes": 600}
+    assert overview["calls_per_minute"][0]["calls"] == 4
+    assert overview["calls_per_minute"][0]["errors"] == 1
+
+    # Raw rows are not needed once rolled up, and a rebuild from them agrees
+    conn = sqlite3.connect(db_path)
+    with conn:
+        analytics.rebuild_rollups(conn)
+    assert analytics.get_overview() == overview
+    with conn:
+        conn.execute("DELETE FROM api_calls")
+    conn.close()
+    assert analytics.get_overview() == overview
+
+
+
+@pytest.mark.asyncio
+async def test_overview_endpoint_reads_off_the_event_loop(db_path, monkeypatch):
+    import threading
+
+    import streaming_server.app as server
+
+    loop_thread = threading.get_ident()
+    threads = []
+
+    def overview():
+        threads.append(threading.get_ident())
+        return {"total_api_calls": 0}
+
+    monkeypatch.setattr(server, "get_overview", overview)
+    monkeypatch.setattr(server, "STREAMING_SECRET", None)
+    async with AsyncClient(transport=ASGITransport(app=server.app), base_url="http://test") as client:
+        response = await client.get("/api/analytics/overview")
+
+    assert response.json() == {"total_api_calls": 0}
+    assert threads and threads[0] != loop_thread
+
+def test_retention_drops_old_raw_rows_and_minute_rollups(db_path):
+    analytics._record("api_call", ("s", "/old", "GET", 200, 1.0, 0, 0, None, "2020-01-01 00:00:00"))
+    analytics._record("session", ("old-session", "hash", None, "2020-01-01 00:00:00"))
+    _log_calls()
+
+    conn = sqlite3.connect(db_path)
+    assert analytics.apply_retention(conn, raw_days=30, chunk=2) == 2
+    granularities = {
+        row[0] for row in conn.execute("SELECT granularity FROM api_call_rollups WHERE endpoint = '/old'")
+    }
+    conn.close()
+
+    assert _count(db_path, "api_calls") == 4
+    assert _count(db_path, "sessions") == 1
+    assert granularities == {"day"}
+    overview = analytics.get_overview()
+    assert overview["total_api_calls"] == 5
+    assert overview["total_sessions"] == 2
+
+
+def test_init_db_does_not_rebuild_rollups_after_migration(db_path):
+    analytics._record("session", ("old-session", "hash", None, "2020-01-01 00:00:00"))
+    conn = sqlite3.connect(db_path)
+    analytics.apply_retention(conn, raw_days=30)
+    # Pruned minute/hour rollups can leave api_call_rollups empty
+    with conn:
+        conn.execute("DELETE FROM api_call_rollups")
+    conn.close()
+
+    analytics.init_db()
+
+    assert _count(db_path, "sessions") == 0
+    assert analytics.get_overview()["total_sessions"] == 1
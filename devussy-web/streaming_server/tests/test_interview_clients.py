@@ -0,0 +1,63 @@
+from types import SimpleNamespace
+
+import pytest
+
+from streaming_server import app as server
+
+
+class FakeClient:
+    def __init__(self):
+        self.opened = 0
+        self.closed = 0
+
+    async def open_session(self):
+        self.opened += 1
+
+    async def aclose(self):
+        self.closed += 1
+
+
+def _config(api_key, model="m"):
+    return SimpleNamespace(llm=SimpleNamespace(provider="openai", model=model, api_key=api_key))
+
+
+@pytest.fixture
+def clients(monkeypatch):
+    monkeypatch.setattr(server, "_INTERVIEW_CLIENT_LIMIT", 2)
+    monkeypatch.setattr(server, "_interview_clients", server.OrderedDict())
+    monkeypatch.setattr(server, "_interview_client_leases", {})
+    monkeypatch.setattr(server, "create_llm_client", lambda config: FakeClient())
+
+
+async def _use(config):
+    client = await server.get_interview_client(config)
+    await server.release_interview_client(client)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_interview_clients_are_bounded_and_closed_on_eviction(clients):
+    first = await _use(_config("sk-one"))
+    second = await _use(_config("sk-two"))
+    assert await _use(_config("sk-one")) is first
+    third = await _use(_config("sk-three"))
+
+    # "sk-two" was least recently used
+    assert second.closed == 1 and not first.closed and not third.closed
+    assert len(server._interview_clients) == 2
+    assert not any("sk-" in str(part) for key in server._interview_clients for part in key)
+
+    await server.close_interview_clients()
+    assert first.closed == third.closed == 1
+
+
+@pytest.mark.asyncio
+async def test_evicted_client_stays_open_until_its_requests_finish(clients):
+    busy = await server.get_interview_client(_config("sk-one"))
+    await _use(_config("sk-two"))
+    await _use(_config("sk-three"))  # Evicts "sk-one" while a request holds it
+
+    assert busy.closed == 0
+    await server.release_interview_client(busy)
+    assert busy.closed == 1
+    assert server._interview_client_leases == {}
@@ -0,0 +1,163 @@
+import asyncio
+import json
+
+import pytest
+from httpx import AsyncClient
+
+import streaming_server.analytics as analytics
+from streaming_server.jobs import CANCELLED, DONE, FAILED, JobStore, JobWorkerPool, default_jobs_path, follow_job
+
+
+def _events(chunk):
+    events = []
+    for frame in chunk.split("\n\n"):
+        if frame:
+            fields = dict(line.split(": ", 1) for line in frame.split("\n"))
+            events.append((fields["id"], json.loads(fields["data"])))
+    return events
+
+
+async def _design_job(params):
+    yield {"content": "Hello "}
+    yield {"content": params["name"]}
+    yield {"done": True, "design": {"project_name": params["name"]}}
+
+
+def test_jobs_db_defaults_next_to_the_analytics_db(monkeypatch, tmp_path):
+    monkeypatch.delenv("DEVUSSY_JOBS_DB", raising=False)
+    monkeypatch.setattr(analytics, "DB_PATH", str(tmp_path / "data" / "analytics.db"))
+    assert default_jobs_path() == str(tmp_path / "data" / "jobs.db")
+
+    monkeypatch.setenv("DEVUSSY_JOBS_DB", str(tmp_path / "queue.db"))
+    assert default_jobs_path() == str(tmp_path / "queue.db")
+
+
+def test_claim_hands_each_job_to_one_worker(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    other = JobStore(str(tmp_path / "jobs.db"))  # E.g. a second uvicorn worker
+    job_id = store.create("design", {"name": "Ledger"}, owner="s1")
+
+    assert store.claim("a")["params"] == {"name": "Ledger"}
+    assert other.claim("b") is None
+    assert store.append_events(job_id, "a", [(1, {"content": "x"})])
+    assert not other.append_events(job_id, "b", [(2, {"content": "y"})])
+    assert store.active_count("s1") == 1
+
+    assert other.cancel(job_id)
+    assert not store.append_events(job_id, "a", [(2, {"content": "z"})])
+    assert store.get(job_id)["status"] == CANCELLED
+    assert store.events(job_id) == [(1, {"content": "x"}), (2, {"error": "Job cancelled"})]
+    assert store.active_count("s1") == 0
+
+
+def test_stale_running_job_is_failed(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"), stale_after=0)
+    job_id = store.create("design", {})
+    store.claim("crashed-worker")
+
+    assert store.claim("a") is None
+    assert store.get(job_id)["status"] == FAILED
+    assert store.events(job_id)[-1][1] == {"error": "Worker stopped responding"}
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_runs_job_and_followers_resume(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    pool = JobWorkerPool(store, {"design": _design_job}, concurrency=1, poll_interval=0.01)
+    job_id = store.create("design", {"name": "Ledger"})
+    pool.start()
+    try:
+        frames = "".join([chunk async for chunk in follow_job(store, job_id, poll_interval=0.01)])
+    finally:
+        await pool.stop()
+
+    events = _events(frames)
+    assert "".join(p.get("content", "") for _, p in events) == "Hello Ledger"
+    assert events[-1] == (f"{job_id}:{len(events)}", {"done": True, "design": {"project_name": "Ledger"}})
+    job = store.get(job_id)
+    assert job["status"] == DONE
+    assert job["result"]["design"] == {"project_name": "Ledger"}
+
+    resumed = [chunk async for chunk in follow_job(store, job_id, after=len(events) - 1)]
+    assert _events("".join(resumed)) == events[-1:]
+
+
+@pytest.mark.asyncio
+async def test_job_endpoints(monkeypatch, tmp_path):
+    from httpx import ASGITransport
+
+    import streaming_server.analytics as analytics
+    import streaming_server.app as server
+
+    monkeypatch.setattr(analytics, "DB_PATH", str(tmp_path / "analytics.db"))
+    analytics.init_db()
+    store = JobStore(str(tmp_path / "jobs.db"))
+    pool = JobWorkerPool(store, {"design": _design_job}, concurrency=1, poll_interval=0.01)
+    monkeypatch.setattr(server, "job_store", store)
+    monkeypatch.setattr(server, "JOB_HANDLERS", {"design": _design_job})
+    monkeypatch.setattr(server, "STREAMING_SECRET", None)
+
+    async with AsyncClient(transport=ASGITransport(app=server.app), base_url="http://test") as client:
+        resp = await client.post("/api/jobs", json={"kind": "unknown"})
+        assert resp.status_code == 400
+        resp = await client.post("/api/jobs", json={"kind": "design", "params": {"name": "Ledger"}})
+        assert resp.status_code == 202
+        job_id = resp.json()["id"]
+        assert (await client.get(f"/api/jobs/{job_id}")).json()["status"] == "queued"
+
+        pool.start()
+        try:
+            resp = await client.get(
+                f"/api/jobs/{job_id}/events", headers={"Last-Event-ID": f"{job_id}:1"}
+            )
+        finally:
+            await pool.stop()
+        assert resp.headers["x-job-id"] == job_id
+        assert all(int(event_id.split(":")[1]) > 1 for event_id, _ in _events(resp.text))
+
+        polled = (await client.get(f"/api/jobs/{job_id}", params={"after": 0})).json()
+        assert polled["status"] == "done"
+        assert polled["events"][-1]["done"] is True
+        assert polled["last_seq"] == len(polled["events"])
+        assert (await client.get("/api/jobs/missing")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_jobs_are_limited_and_visible_per_owner(monkeypatch, tmp_path):
+    from httpx import ASGITransport
+
+    import streaming_server.analytics as analytics
+    import streaming_server.app as server
+
+    monkeypatch.setattr(analytics, "DB_PATH", str(tmp_path / "analytics.db"))
+    analytics.init_db()
+    store = JobStore(str(tmp_path / "jobs.db"))
+    monkeypatch.setattr(server, "job_store", store)
+    monkeypatch.setattr(server, "JOB_HANDLERS", {"design": _design_job})
+    monkeypatch.setattr(server, "STREAMING_SECRET", None)
+    monkeypatch.setattr(server, "MAX_ACTIVE_JOBS_PER_SESSION", 2)
+    job = {"kind": "design", "params": {"name": "Ledger"}}
+    transport = ASGITransport(app=server.app)
+
+    async with AsyncClient(transport=transport, base_url="http://test") as anonymous:
+        # Without a session cookie the client address is the owner
+        for _ in range(2):
+            anonymous.cookies.clear()
+            assert (await anonymous.post("/api/jobs", json=job)).status_code == 202
+        anonymous.cookies.clear()
+        assert (await anonymous.post("/api/jobs", json=job)).status_code == 429
+
+    async with AsyncClient(
+        transport=transport, base_url="http://test", cookies={"devussy_session_id": "alice"}
+    ) as alice, AsyncClient(
+        transport=transport, base_url="http://test", cookies={"devussy_session_id": "mallory"}
+    ) as mallory:
+        job_id = (await alice.post("/api/jobs", json=job)).json()["id"]
+
+        assert (await alice.get(f"/api/jobs/{job_id}")).status_code == 200
+        assert (await mallory.get(f"/api/jobs/{job_id}")).status_code == 404
+        assert (await mallory.get(f"/api/jobs/{job_id}/events")).status_code == 404
+        assert (await mallory.delete(f"/api/jobs/{job_id}")).status_code == 404
+        assert store.get(job_id)["status"] == "queued"
+        assert (await alice.delete(f"/api/jobs/{job_id}")).json()["cancelled"] is True
+    store.close()
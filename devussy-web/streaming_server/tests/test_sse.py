@@ -39,3 +39,231 @@ async def test_streaming_endpoint(monkeypatch):
         assert "Hello" in text
         assert "World" in text
         assert resp.status_code == 200
+
+
+def _payloads(chunk):
+    return [json.loads(line[len("data: "):]) for line in chunk.split("\n\n") if line]
+
+
+@pytest.mark.asyncio
+async def test_emitter_coalesces_tokens_and_flushes_at_boundaries():
+    from streaming_server.sse import SSEEmitter
+
+    emitter = SSEEmitter(flush_ms=20, max_bytes=10_000)
+
+    async def work():
+        for i in range(50):
+            emitter.send({"type": "drone1" if i % 2 else "drone2", "content": f"{i},"})
+        emitter.send({"type": "drone1_complete"})
+        emitter.send({"type": "arbiter", "content": "final"})
+        emitter.send({"done": True})
+
+    writes = [chunk async for chunk in emitter.run(work())]
+
+    assert len(writes) == 1  # Ends on a boundary: written at once, no timer wait
+    payloads = _payloads(writes[0])
+    assert payloads == [
+        {"type": "drone2", "content": "".join(f"{i}," for i in range(0, 50, 2))},
+        {"type": "drone1", "content": "".join(f"{i}," for i in range(1, 50, 2))},
+        {"type": "drone1_complete"},
+        {"type": "arbiter", "content": "final"},
+        {"done": True},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_emitter_flushes_on_interval_and_size():
+    from streaming_server.sse import SSEEmitter
+
+    emitter = SSEEmitter(flush_ms=10, max_bytes=8)
+
+    async def source():
+        yield {"content": "ab"}
+        await asyncio.sleep(0.05)  # Longer than the flush interval
+        yield {"content": "cd"}
+        yield {"content": "efghijkl"}  # Crosses max_bytes
+        await asyncio.sleep(0.05)
+        yield {"content": "mn"}
+
+    writes = [chunk async for chunk in emitter.stream(source())]
+
+    assert [p["content"] for w in writes for p in _payloads(w)] == ["ab", "cdefghijkl", "mn"]
+    assert emitter.frames_written == 3
+
+
+@pytest.mark.asyncio
+async def test_emitter_cancels_work_when_client_disconnects():
+    from streaming_server.sse import SSEEmitter
+
+    emitter = SSEEmitter(flush_ms=0)
+    cancelled = asyncio.Event()
+
+    async def work():
+        try:
+            while True:
+                emitter.send({"content": "x"})
+                await asyncio.sleep(0.01)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    frames = emitter.run(work())
+    assert "x" in await frames.__anext__()
+    await frames.aclose()
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_gzip_sse_response_is_decodable_per_write():
+    import zlib
+
+    from streaming_server.sse import _gzip_chunks
+
+    async def chunks():
+        yield 'data: {"content": "hello"}\n\n'
+        yield 'data: {"done": true}\n\n'
+
+    decoder = zlib.decompressobj(wbits=31)
+    decoded = [decoder.decompress(chunk) async for chunk in _gzip_chunks(chunks())]
+
+    assert decoded[0] == b'data: {"content": "hello"}\n\n'  # Available before the stream ends
+    assert b"".join(decoded) == b'data: {"content": "hello"}\n\ndata: {"done": true}\n\n'
+
+
+def _events(chunk):
+    """(id, payload) pairs of the frames in one write."""
+    events = []
+    for frame in chunk.split("\n\n"):
+        if not frame:
+            continue
+        fields = dict(line.split(": ", 1) for line in frame.split("\n"))
+        events.append((fields.get("id"), json.loads(fields["data"])))
+    return events
+
+
+@pytest.mark.asyncio
+async def test_reconnect_replays_only_missed_events_from_running_generation():
+    from streaming_server.resumable import GenerationRegistry
+
+    registry = GenerationRegistry(replay_size=100, idle_timeout=5)
+    release = asyncio.Event()
+    runs = []
+
+    async def source():
+        runs.append(1)
+        yield {"stage": "design"}
+        await release.wait()
+        yield {"stage": "phase_1"}
+        yield {"done": True}
+
+    generation = registry.start(source())
+    first = generation.follow()
+    [(last_id, payload)] = _events(await first.__anext__())
+    assert payload == {"stage": "design"}
+    await first.aclose()  # Connection dropped mid-generation
+    release.set()
+
+    resumed, after = registry.resume(last_id)
+    writes = [chunk async for chunk in resumed.follow(after)]
+
+    events = [event for chunk in writes for event in _events(chunk)]
+    assert [payload for _, payload in events] == [{"stage": "phase_1"}, {"done": True}]
+    assert [event_id for event_id, _ in events] == [f"{generation.id}:2", f"{generation.id}:3"]
+    assert runs == [1]  # No second generation
+    assert registry.resume("unknown:1") is None
+    assert registry.resume("not-an-id") is None
+
+
+@pytest.mark.asyncio
+async def test_event_id_does_not_resume_a_generation_of_another_kind():
+    from streaming_server.resumable import GenerationRegistry
+
+    registry = GenerationRegistry(idle_timeout=5)
+
+    async def source():
+        yield {"done": True}
+
+    generation = registry.start(source(), "design")
+    last_id = f"{generation.id}:1"
+
+    assert registry.resume(last_id, "plan_detail") is None
+    assert registry.resume(last_id) is None
+    assert registry.resume(last_id, "design") == (generation, 1)
+    generation.cancel()
+
+
+@pytest.mark.asyncio
+async def test_abandoned_generation_is_cancelled_after_idle_timeout():
+    from streaming_server.resumable import GenerationRegistry
+
+    registry = GenerationRegistry(idle_timeout=0.05)
+    cancelled = asyncio.Event()
+
+    async def source():
+        try:
+            yield {"stage": "design"}
+            await asyncio.sleep(60)
+        finally:
+            cancelled.set()
+
+    generation = registry.start(source())
+    frames = generation.follow()
+    await frames.__anext__()
+    await frames.aclose()
+
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+    await asyncio.sleep(0.06)
+    registry.prune()
+    assert len(registry) == 0
+
+
+
+@pytest.mark.asyncio
+async def test_unfollowed_finished_generation_is_forgotten_without_new_requests():
+    from streaming_server.resumable import GenerationRegistry
+
+    registry = GenerationRegistry(idle_timeout=0.05)
+
+    async def source():
+        yield {"done": True}
+
+    generation = registry.start(source())
+    assert len(registry) == 1
+
+    # No follow(), start() or resume() call: only the expiry timer can drop it
+    await asyncio.sleep(0.2)
+    assert generation.finished
+    assert len(registry) == 0
+    assert not generation._events
+
+@pytest.mark.asyncio
+async def test_plan_detail_resumes_with_last_event_id(monkeypatch, tmp_path):
+    from httpx import ASGITransport
+
+    import streaming_server.analytics as analytics
+    import streaming_server.app as server
+    from streaming_server.resumable import GenerationRegistry
+
+    monkeypatch.setattr(analytics, "DB_PATH", str(tmp_path / "analytics.db"))
+    analytics.init_db()
+
+    registry = GenerationRegistry(idle_timeout=5)
+    monkeypatch.setattr(server, "generations", registry)
+    monkeypatch.setattr(server, "STREAMING_SECRET", None)
+
+    async def source():
+        yield {"content": "phase text"}
+        yield {"done": True}
+
+    generation = registry.start(source(), "plan_detail")
+
+    async with AsyncClient(transport=ASGITransport(app=server.app), base_url="http://test") as client:
+        resp = await client.post(
+            "/api/plan/detail",
+            json={},  # Never read: the running generation is reused
+            headers={"Last-Event-ID": f"{generation.id}:1"},
+        )
+
+    assert resp.status_code == 200
+    assert resp.headers["x-generation-id"] == generation.id
+    assert _events(resp.text) == [(f"{generation.id}:2", {"done": True})]
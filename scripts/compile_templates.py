@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""Precompile the Jinja templates into a bundle for fast cold starts.
+
+Run at build/deploy time, then point ``DEVUSSY_COMPILED_TEMPLATES`` at the
+bundle so processes load compiled template modules instead of parsing the
+``.jinja`` sources:
+
+    python scripts/compile_templates.py build/templates.zip
+    export DEVUSSY_COMPILED_TEMPLATES=build/templates.zip
+"""
+
+import sys
+from pathlib import Path
+
+# Allow running from a checkout without installing the package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.templates import compile_templates  # noqa: E402
+
+
+def main():
+    """Compile templates into the path given on the command line."""
+    target = Path(sys.argv[1] if len(sys.argv) > 1 else "build/templates.zip")
+    bundle = compile_templates(target)
+    print(f"Compiled templates written to {bundle}")
+    print(f"Set DEVUSSY_COMPILED_TEMPLATES={bundle.resolve()} to use them")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,7 +14,6 @@ import sys
 from pathlib import Path
 
 from src.config import load_config
-from src.state_manager import StateManager
 from src.pipeline.compose import PipelineOrchestrator
 from src.clients.factory import create_llm_client
 from src.concurrency import ConcurrencyManager
@@ -45,10 +44,10 @@ def main() -> int:
     )
 
     # Load checkpoint data
-    sm = StateManager()
-    ckpt = sm.load_checkpoint(checkpoint_key)
+    ckpt = orch.state_manager.load_checkpoint(checkpoint_key)
     if not ckpt:
         print(f"Checkpoint not found: {checkpoint_key}")
+        orch.close()
         return 1
 
     data = ckpt.get("data", {})
@@ -85,6 +84,8 @@ def main() -> int:
         architecture_notes=design.architecture_overview or "",
     )
     file_mgr.write_markdown(str(output_dir / "handoff_prompt_v2.md"), handoff.content)
+    # Wait for the queued writes before reporting them
+    orch.close()
 
     print("✅ Regeneration complete:")
     print(f" - {devplan_path}")
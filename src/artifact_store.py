@@ -0,0 +1,212 @@
+"""Content-addressed blob store for run artifacts.
+
+Large pieces of generated text (raw LLM responses, design documents, phase
+markdown) tend to be copied into several places during a run: each pipeline
+checkpoint carries the full project design and raw responses again. The
+artifact store hashes each blob once (SHA-256), stores it zlib-compressed under
+``objects/<2-char prefix>/<rest of digest>`` and lets callers keep a small
+reference instead of another copy. Identical content is only ever written once.
+
+References are embedded in JSON documents as ``{"$artifact": "<digest>"}``;
+:func:`externalize` and :func:`internalize` convert between inline strings and
+references, and :meth:`ArtifactStore.collect_garbage` removes blobs that are no
+longer referenced by any live document.
+
+``put`` reuses a blob that already exists, so a document that is being saved
+may point at a blob the last garbage collection saw as unreferenced. Writers
+hold :meth:`ArtifactStore.lock` from storing their blobs until the document is
+committed, and the collector holds it from taking its snapshot of live
+references until it has deleted the rest.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import threading
+import zlib
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Set
+
+try:
+    import fcntl
+except ImportError:  # Windows: the lock only covers this process
+    fcntl = None
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+REF_KEY = "$artifact"
+
+# Strings shorter than this stay inline; a reference would not save anything.
+DEFAULT_MIN_SIZE = 1024
+
+
+class ArtifactStore:
+    """Deduplicating, compressed blob storage addressed by SHA-256 digest."""
+
+    def __init__(self, root: str | Path, compression_level: int = 6):
+        """Initialize the store.
+
+        Args:
+            root: Directory that holds the ``objects/`` tree
+            compression_level: zlib level used when writing blobs (0-9)
+        """
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.compression_level = compression_level
+        self._lock = threading.RLock()
+        self._lock_depth = 0
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        """Return the hex SHA-256 digest used as the address for ``data``."""
+        return hashlib.sha256(data).hexdigest()
+
+    def _path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """Exclude garbage collection (and other writers) while held.
+
+        Reentrant within a thread; across processes it is a ``flock`` on
+        ``<root>/.lock`` where available.
+        """
+        with self._lock, ExitStack() as stack:
+            if self._lock_depth == 0 and fcntl is not None:
+                f = stack.enter_context(open(self.root / ".lock", "a"))
+                fcntl.flock(f, fcntl.LOCK_EX)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+
+    def put(self, data: bytes | str) -> str:
+        """Store a blob (if not already present) and return its digest.
+
+        Writes go to a temporary file in the target directory and are renamed
+        into place, so readers never observe a partially written blob.
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        digest = self.digest(data)
+        path = self._path(digest)
+        with self.lock():
+            if path.exists():
+                return digest
+
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(zlib.compress(data, self.compression_level))
+                os.replace(tmp_name, path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+                raise
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        """Return the blob for ``digest``.
+
+        Raises:
+            KeyError: If no blob with this digest is stored
+        """
+        path = self._path(digest)
+        try:
+            return zlib.decompress(path.read_bytes())
+        except FileNotFoundError:
+            raise KeyError(digest) from None
+
+    def get_text(self, digest: str) -> str:
+        """Return the blob for ``digest`` decoded as UTF-8."""
+        return self.get(digest).decode("utf-8")
+
+    def exists(self, digest: str) -> bool:
+        """Return True if a blob with this digest is stored."""
+        return self._path(digest).exists()
+
+    def iter_digests(self) -> Iterator[str]:
+        """Yield the digest of every stored blob."""
+        for prefix_dir in self.objects_dir.iterdir():
+            if not prefix_dir.is_dir():
+                continue
+            for blob in prefix_dir.iterdir():
+                if not blob.name.startswith(".tmp-"):
+                    yield prefix_dir.name + blob.name
+
+    def collect_garbage(self, live: Iterable[str]) -> int:
+        """Delete every blob whose digest is not in ``live``.
+
+        Callers that snapshot ``live`` from their documents should hold
+        :meth:`lock` from before the snapshot until this returns.
+
+        Args:
+            live: Digests that are still referenced
+
+        Returns:
+            Number of blobs deleted
+        """
+        removed = 0
+        with self.lock():
+            keep: Set[str] = set(live)
+            for digest in list(self.iter_digests()):
+                if digest not in keep:
+                    try:
+                        self._path(digest).unlink()
+                        removed += 1
+                    except FileNotFoundError:
+                        pass
+        if removed:
+            logger.info(f"Artifact GC removed {removed} unreferenced blob(s)")
+        return removed
+
+
+def externalize(obj: Any, store: ArtifactStore, min_size: int = DEFAULT_MIN_SIZE) -> Any:
+    """Return a copy of ``obj`` with large strings replaced by artifact references.
+
+    Walks dicts and lists recursively; strings of at least ``min_size``
+    characters are stored in ``store`` and replaced by ``{"$artifact": digest}``.
+    """
+    if isinstance(obj, str):
+        if len(obj) >= min_size:
+            return {REF_KEY: store.put(obj)}
+        return obj
+    if isinstance(obj, dict):
+        return {k: externalize(v, store, min_size) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [externalize(v, store, min_size) for v in obj]
+    return obj
+
+
+def internalize(obj: Any, store: ArtifactStore) -> Any:
+    """Inverse of :func:`externalize`: resolve artifact references to strings."""
+    if isinstance(obj, dict):
+        if len(obj) == 1 and REF_KEY in obj:
+            return store.get_text(obj[REF_KEY])
+        return {k: internalize(v, store) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [internalize(v, store) for v in obj]
+    return obj
+
+
+def iter_refs(obj: Any) -> Iterator[str]:
+    """Yield every artifact digest referenced from ``obj``."""
+    if isinstance(obj, dict):
+        if len(obj) == 1 and REF_KEY in obj:
+            yield obj[REF_KEY]
+            return
+        for v in obj.values():
+            yield from iter_refs(v)
+    elif isinstance(obj, list):
+        for v in obj:
+            yield from iter_refs(v)
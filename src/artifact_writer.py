@@ -0,0 +1,196 @@
+"""Background artifact writer with atomic, skip-unchanged file writes.
+
+The pipeline writes many small files (devplan dashboard, 20+ phase files,
+handoff prompt, run-directory copies). Doing that synchronously on the event
+loop stalls token streaming, and most re-runs rewrite files whose content has
+not changed. :class:`ArtifactWriter` queues writes onto a small thread pool,
+writes each file atomically (temp file + ``os.replace``), skips writes whose
+content hash matches what is already on disk, and exposes :meth:`flush` /
+:meth:`aflush` as a barrier for stage boundaries (e.g. before a git commit).
+
+Writes to one path run in submission order; when several full writes to the
+same path are queued only the most recent one is written, and :meth:`pending_content` lets readers see content that has been
+queued but not yet written.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import hashlib
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .logger import get_logger
+from .tracing import trace_span
+
+logger = get_logger(__name__)
+
+
+def _hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def atomic_write_text(path: str | Path, content: str, skip_unchanged: bool = True) -> bool:
+    """Write ``content`` to ``path`` atomically.
+
+    The content goes to a temporary file in the same directory which is then
+    renamed over the target, so readers never see a half-written file.
+
+    Args:
+        path: Destination file
+        content: Text to write (UTF-8)
+        skip_unchanged: Leave the file untouched if it already holds ``content``
+
+    Returns:
+        True if the file was written, False if it was skipped as unchanged
+    """
+    return atomic_write_bytes(path, content.encode("utf-8"), skip_unchanged=skip_unchanged)
+
+
+def atomic_write_bytes(path: str | Path, data: bytes, skip_unchanged: bool = True) -> bool:
+    """Write ``data`` to ``path`` atomically; see :func:`atomic_write_text`."""
+    p = Path(path)
+    if skip_unchanged:
+        try:
+            if p.stat().st_size == len(data) and p.read_bytes() == data:
+                return False
+        except OSError:
+            pass
+
+    p.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=p.parent, prefix=f".{p.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_name, p)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+    return True
+
+
+class ArtifactWriter:
+    """Queue file writes onto a thread pool with a flush barrier."""
+
+    def __init__(self, max_workers: int = 4):
+        """Initialize the writer.
+
+        Args:
+            max_workers: Number of background writer threads
+        """
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="artifact-writer"
+        )
+        self._lock = threading.Lock()
+        self._futures: List[Future] = []
+        # Last content queued per path (until written), and the most recently
+        # queued write per path so writes to one file run in submission order
+        self._pending: Dict[Path, str] = {}
+        self._tails: Dict[Path, Future] = {}
+        # Hash of what we last wrote per path, to skip rewrites without reading
+        self._written: Dict[Path, str] = {}
+        self.writes = 0
+        self.skipped = 0
+
+    def _enqueue(self, fn, path: Path, content: str) -> Future:
+        # Caller holds self._lock. The executor queue is FIFO, so the previous
+        # write for this path has already been picked up (or finished) by the
+        # time this one runs; waiting on it cannot deadlock.
+        previous = self._tails.get(path)
+        # Run in a copy of the caller's context so trace spans nest under it
+        ctx = contextvars.copy_context()
+        future = self._executor.submit(ctx.run, fn, path, content, previous)
+        self._tails[path] = future
+        self._futures.append(future)
+        return future
+
+    def submit(self, path: str | Path, content: str) -> Future:
+        """Queue a full-file write of ``content`` to ``path``."""
+        p = Path(path).absolute()
+        with self._lock:
+            self._pending[p] = content
+            return self._enqueue(self._write, p, content)
+
+    def append(self, path: str | Path, content: str) -> Future:
+        """Queue an append of ``content`` to ``path``."""
+        p = Path(path).absolute()
+        with self._lock:
+            return self._enqueue(self._append, p, content)
+
+    def pending_content(self, path: str | Path) -> Optional[str]:
+        """Return content queued for ``path`` that has not been written yet."""
+        with self._lock:
+            return self._pending.get(Path(path).absolute())
+
+    def _write(self, path: Path, content: str, previous: Optional[Future]) -> None:
+        if previous is not None:
+            wait([previous])
+        with self._lock:
+            # A newer write to the same path superseded this one
+            if self._pending.get(path) is not content:
+                return
+        digest = _hash(content.encode("utf-8"))
+        try:
+            if self._written.get(path) == digest and path.exists():
+                written = False
+            else:
+                with trace_span("write", path=path.name, size=len(content)):
+                    written = atomic_write_text(path, content)
+            self._written[path] = digest
+        finally:
+            with self._lock:
+                if self._pending.get(path) is content:
+                    del self._pending[path]
+        with self._lock:
+            if written:
+                self.writes += 1
+            else:
+                self.skipped += 1
+
+    def _append(self, path: Path, content: str, previous: Optional[Future]) -> None:
+        if previous is not None:
+            wait([previous])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with trace_span("write", path=path.name, size=len(content), append=True):
+            with path.open("a", encoding="utf-8") as f:
+                f.write(content)
+        self._written.pop(path, None)
+        with self._lock:
+            self.writes += 1
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Block until every queued write has completed.
+
+        Raises:
+            Exception: The first error raised by any queued write
+        """
+        with self._lock:
+            futures, self._futures = self._futures, []
+        if not futures:
+            return
+        wait(futures, timeout=timeout)
+        errors = [f.exception() for f in futures if f.done() and f.exception()]
+        for err in errors[1:]:
+            logger.error(f"Artifact write failed: {err}")
+        if errors:
+            raise errors[0]
+
+    async def aflush(self) -> None:
+        """Async flush barrier that does not block the event loop."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.flush)
+
+    def close(self) -> None:
+        """Flush pending writes and stop the worker threads."""
+        try:
+            self.flush()
+        finally:
+            self._executor.shutdown(wait=True)
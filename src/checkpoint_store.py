@@ -0,0 +1,374 @@
+"""SQLite-backed checkpoint catalog.
+
+Checkpoints used to live as one JSON file each, which meant listing them
+required reading and parsing every file. The catalog keeps the listing
+metadata (key, stage, timestamp, project, name) in indexed columns and stores
+the full checkpoint payload as a zlib-compressed JSON blob, so listing only
+touches the index and never decodes payloads.
+
+The database runs in WAL mode so readers (e.g. the web checkpoint listing) do
+not block a writer saving a checkpoint mid-pipeline.
+
+Artifact references held by each checkpoint (see
+:mod:`src.artifact_store`) are indexed in ``checkpoint_refs`` when the caller
+passes them to :meth:`CheckpointCatalog.put`, so garbage collection can find
+the live artifacts without decoding any payload.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+CATALOG_FILENAME = "checkpoints.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    key TEXT PRIMARY KEY,
+    group_key TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    project_name TEXT,
+    name TEXT,
+    size INTEGER NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_checkpoints_created ON checkpoints (created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_checkpoints_stage ON checkpoints (stage, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_checkpoints_group ON checkpoints (group_key, created_at DESC);
+CREATE TABLE IF NOT EXISTS checkpoint_refs (
+    key TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    PRIMARY KEY (key, digest)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_checkpoint_refs_digest ON checkpoint_refs (digest);
+"""
+
+# ``PRAGMA user_version`` once ``checkpoint_refs`` covers every stored checkpoint
+_REFS_VERSION = 1
+
+_LIST_COLUMNS = "key, stage, timestamp, created_at, project_name, name, size"
+
+
+def _group_key(key: str) -> str:
+    """Return the retention group for a checkpoint key (its first segment)."""
+    return key.split("_")[0]
+
+
+def _to_epoch(timestamp: Any) -> float:
+    """Best-effort conversion of an ISO string or epoch number to epoch seconds."""
+    if isinstance(timestamp, (int, float)):
+        return float(timestamp)
+    if isinstance(timestamp, str):
+        try:
+            return datetime.fromisoformat(timestamp).timestamp()
+        except ValueError:
+            try:
+                return float(timestamp)
+            except ValueError:
+                pass
+    return time.time()
+
+
+class CheckpointCatalog:
+    """Indexed, compressed checkpoint storage backed by a single SQLite file."""
+
+    def __init__(self, db_path: str | Path, compression_level: int = 6):
+        """Open (and create if needed) the checkpoint catalog.
+
+        Args:
+            db_path: Path to the SQLite database file
+            compression_level: zlib level used for payload blobs (0-9)
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.compression_level = compression_level
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.db_path), check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        logger.debug(f"CheckpointCatalog opened at {self.db_path}")
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "CheckpointCatalog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # --- Writes ---
+    def put(
+        self,
+        key: str,
+        payload: Dict[str, Any],
+        stage: str = "unknown",
+        timestamp: Any = None,
+        project_name: Optional[str] = None,
+        name: Optional[str] = None,
+        refs: Iterable[str] = (),
+    ) -> None:
+        """Insert or replace a checkpoint atomically.
+
+        Args:
+            key: Unique checkpoint key
+            payload: Full checkpoint document (must be JSON-serializable)
+            stage: Pipeline stage the checkpoint was taken at
+            timestamp: ISO string or epoch seconds; defaults to now
+            project_name: Optional project name for listing
+            name: Optional display name for listing
+            refs: Artifact digests referenced by ``payload``
+        """
+        if timestamp is None:
+            timestamp = datetime.now().isoformat()
+        raw = json.dumps(payload).encode("utf-8")
+        blob = zlib.compress(raw, self.compression_level)
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints "
+                "(key, group_key, stage, timestamp, created_at, project_name, name, size, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    _group_key(key),
+                    stage,
+                    str(timestamp),
+                    _to_epoch(timestamp),
+                    project_name,
+                    name,
+                    len(raw),
+                    blob,
+                ),
+            )
+            self._conn.execute("DELETE FROM checkpoint_refs WHERE key = ?", (key,))
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO checkpoint_refs (key, digest) VALUES (?, ?)",
+                ((key, digest) for digest in refs),
+            )
+
+    def delete(self, key: str) -> bool:
+        """Delete a checkpoint. Returns True if a row was removed."""
+        with self._lock, self._conn:
+            cur = self._conn.execute("DELETE FROM checkpoints WHERE key = ?", (key,))
+            self._conn.execute("DELETE FROM checkpoint_refs WHERE key = ?", (key,))
+            return cur.rowcount > 0
+
+    def clear(self) -> int:
+        """Delete every checkpoint and return how many were removed."""
+        with self._lock, self._conn:
+            cur = self._conn.execute("DELETE FROM checkpoints")
+            self._conn.execute("DELETE FROM checkpoint_refs")
+            return cur.rowcount
+
+    # --- Reads ---
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the decoded checkpoint payload, or None if not present."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM checkpoints WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(zlib.decompress(row[0]).decode("utf-8"))
+
+    def exists(self, key: str) -> bool:
+        """Return True if a checkpoint with this key is stored."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM checkpoints WHERE key = ?", (key,)
+            ).fetchone()
+        return row is not None
+
+    def count(self, stage: Optional[str] = None) -> int:
+        """Count checkpoints, optionally restricted to one stage."""
+        query = "SELECT COUNT(*) FROM checkpoints"
+        params: tuple = ()
+        if stage:
+            query += " WHERE stage = ?"
+            params = (stage,)
+        with self._lock:
+            return self._conn.execute(query, params).fetchone()[0]
+
+    def list(
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        stage: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """List checkpoint metadata, newest first, without decoding payloads.
+
+        Args:
+            limit: Maximum number of rows to return (None for all)
+            offset: Number of rows to skip, for pagination
+            stage: Optional stage filter
+
+        Returns:
+            List of metadata dictionaries
+        """
+        query = f"SELECT {_LIST_COLUMNS} FROM checkpoints"
+        params: List[Any] = []
+        if stage:
+            query += " WHERE stage = ?"
+            params.append(stage)
+        query += " ORDER BY created_at DESC"
+        if limit is not None or offset:
+            query += " LIMIT ? OFFSET ?"
+            params.extend([-1 if limit is None else limit, offset])
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [
+            {
+                "key": key,
+                "stage": stage_,
+                "timestamp": timestamp,
+                "created_at": created_at,
+                "project_name": project_name,
+                "name": name,
+                "size": size,
+            }
+            for key, stage_, timestamp, created_at, project_name, name, size in rows
+        ]
+
+    # --- Retention ---
+    def apply_retention(
+        self,
+        keep_latest: Optional[int] = None,
+        max_age_seconds: Optional[float] = None,
+    ) -> int:
+        """Delete checkpoints outside the retention policy.
+
+        Args:
+            keep_latest: Keep only the newest N checkpoints per group (the
+                first ``_``-separated segment of the key)
+            max_age_seconds: Delete checkpoints older than this many seconds
+
+        Returns:
+            Number of checkpoints deleted
+        """
+        deleted = 0
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            if keep_latest is not None:
+                cur = self._conn.execute(
+                    "DELETE FROM checkpoints WHERE key IN ("
+                    " SELECT key FROM ("
+                    "  SELECT key, ROW_NUMBER() OVER ("
+                    "   PARTITION BY group_key ORDER BY created_at DESC"
+                    "  ) AS rn FROM checkpoints"
+                    " ) WHERE rn > ?"
+                    ")",
+                    (keep_latest,),
+                )
+                deleted += cur.rowcount
+            if max_age_seconds is not None:
+                cutoff = time.time() - max_age_seconds
+                cur = self._conn.execute(
+                    "DELETE FROM checkpoints WHERE created_at < ?", (cutoff,)
+                )
+                deleted += cur.rowcount
+            if deleted:
+                self._conn.execute(
+                    "DELETE FROM checkpoint_refs WHERE key NOT IN (SELECT key FROM checkpoints)"
+                )
+        return deleted
+
+    # --- Artifact references ---
+    @property
+    def refs_indexed(self) -> bool:
+        """True once ``checkpoint_refs`` has been built for existing checkpoints."""
+        with self._lock:
+            return self._conn.execute("PRAGMA user_version").fetchone()[0] >= _REFS_VERSION
+
+    def rebuild_refs(self, extract: Callable[[Dict[str, Any]], Iterable[str]]) -> int:
+        """Re-index artifact references by decoding every payload once.
+
+        Used to migrate catalogs written before references were indexed.
+
+        Args:
+            extract: Maps a decoded payload to the digests it references
+
+        Returns:
+            Number of references indexed
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT key, payload FROM checkpoints").fetchall()
+        refs = [
+            (key, digest)
+            for key, blob in rows
+            for digest in set(extract(json.loads(zlib.decompress(blob).decode("utf-8"))))
+        ]
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute("DELETE FROM checkpoint_refs")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO checkpoint_refs (key, digest) VALUES (?, ?)", refs
+            )
+            self._conn.execute(f"PRAGMA user_version = {_REFS_VERSION}")
+        return len(refs)
+
+    def referenced_digests(self) -> Set[str]:
+        """Every artifact digest referenced by a stored checkpoint."""
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT digest FROM checkpoint_refs").fetchall()
+        return {digest for (digest,) in rows}
+
+    # --- Migration ---
+    def import_json_files(
+        self,
+        files: Iterable[Path],
+        key_for: Callable[[Path], str],
+        metadata_for: Callable[[Dict[str, Any], Path], Dict[str, Any]],
+        overwrite: bool = False,
+    ) -> int:
+        """Import existing JSON checkpoint files into the catalog.
+
+        Files that fail to parse are skipped with a warning. Existing keys are
+        left alone unless ``overwrite`` is set.
+
+        Args:
+            files: JSON files to import
+            key_for: Maps a file path to its checkpoint key
+            metadata_for: Maps (document, path) to keyword arguments for
+                :meth:`put` (stage, timestamp, project_name, name)
+            overwrite: Replace checkpoints that already exist in the catalog
+
+        Returns:
+            Number of checkpoints imported
+        """
+        imported = 0
+        for path in files:
+            key = key_for(path)
+            if not overwrite and self.exists(key):
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    document = json.load(f)
+            except Exception as e:
+                logger.warning(f"Skipping unreadable checkpoint file {path}: {e}")
+                continue
+            if not isinstance(document, dict):
+                logger.warning(f"Skipping non-object checkpoint file {path}")
+                continue
+            self.put(key, document, **metadata_for(document, path))
+            imported += 1
+        if imported:
+            logger.info(f"Imported {imported} JSON checkpoint(s) into {self.db_path}")
+        return imported
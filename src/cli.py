@@ -8,8 +8,10 @@ import logging
 import os
 import sys
 import traceback
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Annotated, Optional
+from typing import Any, Annotated, Awaitable, Iterator, Optional, TypeVar
 
 import typer
 from dotenv import load_dotenv
@@ -22,17 +24,20 @@ from .config import AppConfig, load_config
 from .feedback_manager import FeedbackManager
 from .file_manager import FileManager
 from .logger import get_logger, setup_logging
+from .loop_monitor import LoopMonitor, monitor_from_env
 from .ui_tokens import render
 from .markdown_output_manager import MarkdownOutputManager
 from .models import DevPlan, ProjectDesign
-from .interview import RepoAnalysis, RepositoryAnalyzer
+from .interview import RepoAnalysis, RepoAnalysisCache, RepositoryAnalyzer
 from .pipeline.compose import PipelineOrchestrator
+from .pipeline.design_prefetch import DesignPrefetcher
 from .progress_reporter import PipelineProgressReporter
 from .state_manager import StateManager
 from .ui.menu import run_main_menu, run_menu, SessionSettings, apply_settings_to_config, load_last_used_preferences
 from .terminal.terminal_ui import run_terminal_ui
 from .terminal.phase_generator import TerminalPhaseGenerator
 from .streaming import StreamingHandler
+from .tracing import format_summary, profile_session
 
 from rich.console import Console
 from rich.panel import Panel
@@ -49,6 +54,8 @@ app = typer.Typer(
 
 logger = get_logger(__name__)
 
+_T = TypeVar("_T")
+
 
 console = Console()
 
@@ -68,6 +75,15 @@ def _apply_last_prefs_to_config(config: AppConfig) -> None:
         pass
 
 
+def _create_design_prefetcher(config: AppConfig) -> Optional[DesignPrefetcher]:
+    """Create the interview's speculative design generator, if enabled."""
+    try:
+        return DesignPrefetcher.from_config(config)
+    except Exception as e:
+        logger.warning(f"Speculative design generation unavailable: {e}")
+        return None
+
+
 def _find_project_root(start: Path) -> Path:
     """Find project root by looking for markers like pyproject.toml or .git.
 
@@ -370,6 +386,52 @@ def _load_app_config(
     return config
 
 
+@contextmanager
+def _profiling(enabled: bool, label: str) -> Iterator[None]:
+    """Record trace spans and sampled stacks for the block when ``enabled``.
+
+    Output goes to ``outputs/profiles/<label>_<timestamp>/``; spans are also
+    exported to ``OTEL_EXPORTER_OTLP_ENDPOINT`` when that is set.
+    """
+    if not enabled:
+        yield
+        return
+    out_dir = Path("outputs") / "profiles" / f"{label}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    tracer = None
+    try:
+        with profile_session(
+            out_dir, otlp_endpoint=os.environ.get("OTEL_EXPORTER_OTLP_ENDPOINT")
+        ) as tracer:
+            yield
+    finally:
+        if tracer is not None:
+            typer.echo(f"\n[PROFILE] Trace written to {out_dir} (open trace.json in Perfetto)")
+            typer.echo(format_summary(tracer))
+
+
+def _monitored(coro: Awaitable[_T], enabled: bool, label: str) -> Awaitable[_T]:
+    """Run ``coro`` under the event-loop lag monitor when enabled.
+
+    The monitor is also enabled by ``DEVUSSY_LOOP_MONITOR=1``. Its report is
+    printed and written to ``outputs/profiles/loop_<label>_<timestamp>.json``.
+    """
+    monitor = LoopMonitor() if enabled else monitor_from_env()
+    if monitor is None:
+        return coro
+
+    async def run() -> _T:
+        try:
+            return await monitor.watch(coro)
+        finally:
+            path = monitor.write_report(
+                Path("outputs") / "profiles" / f"loop_{label}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            )
+            typer.echo("\n[LOOP] " + monitor.format_report())
+            typer.echo(f"[LOOP] Report written to {path}")
+
+    return run()
+
+
 def _create_orchestrator(
     config: AppConfig,
     repo_analysis: Optional[Any] = None,
@@ -399,9 +461,6 @@ def _create_orchestrator(
     # Create file manager
     file_manager = FileManager()
 
-    # Create state manager
-    state_manager = StateManager()
-    
     # Create progress reporter
     progress_reporter = PipelineProgressReporter(console=console)
 
@@ -412,7 +471,6 @@ def _create_orchestrator(
         file_manager=file_manager,
         git_config=config.git,
         config=config,
-        state_manager=state_manager,
         progress_reporter=progress_reporter,
         repo_analysis=repo_analysis,
         code_samples=code_samples,
@@ -502,6 +560,7 @@ def generate_design(
     ] = False,
 ) -> None:
     """Generate a project design from user inputs."""
+    orchestrator = None
     try:
         # Validate required parameters
         if not project_name or not project_name.strip():
@@ -624,6 +683,10 @@ def generate_design(
             typer.echo("\nDebug traceback:", err=True)
             typer.echo(traceback.format_exc(), err=True)
         raise typer.Exit(code=1)
+    finally:
+        # Flush queued artifact writes and stop the writer thread
+        if orchestrator is not None:
+            orchestrator.close()
 
 def _parse_markdown_design(content: str, project_name: str) -> ProjectDesign:
     """Parse markdown project design into ProjectDesign model.
@@ -773,6 +836,7 @@ def generate_devplan(
     ] = False,
 ) -> None:
     """Generate a development plan from a project design."""
+    orchestrator = None
     try:
         # Load config
         config = _load_app_config(
@@ -905,6 +969,10 @@ def generate_devplan(
             typer.echo("\nDebug traceback:", err=True)
             typer.echo(traceback.format_exc(), err=True)
         raise typer.Exit(code=1)
+    finally:
+        # Flush queued artifact writes and stop the writer thread
+        if orchestrator is not None:
+            orchestrator.close()
 
 
 @app.command()
@@ -949,6 +1017,7 @@ def generate_handoff(
     ] = None,
 ) -> None:
     """Generate a handoff prompt from a development plan."""
+    orchestrator = None
     try:
         # Load config
         config = _load_app_config(
@@ -1050,6 +1119,10 @@ def generate_handoff(
             typer.echo("\nDebug traceback:", err=True)
             typer.echo(traceback.format_exc(), err=True)
         raise typer.Exit(code=1)
+    finally:
+        # Flush queued artifact writes and stop the writer thread
+        if orchestrator is not None:
+            orchestrator.close()
 
 
 @app.command()
@@ -1135,8 +1208,17 @@ def run_full_pipeline(
     debug: Annotated[
         bool, typer.Option("--debug", help="Enable debug mode with full tracebacks")
     ] = False,
+    profile: Annotated[
+        bool,
+        typer.Option("--profile", help="Record trace spans and sampled stacks to outputs/profiles/"),
+    ] = False,
+    monitor_loop: Annotated[
+        bool,
+        typer.Option("--monitor-loop", help="Report event-loop lag and calls that block the loop"),
+    ] = False,
 ) -> None:
     """Run the complete pipeline from inputs to handoff prompt."""
+    orchestrator = None
     try:
         # Validate required parameters
         if not project_name or not project_name.strip():
@@ -1231,14 +1313,19 @@ def run_full_pipeline(
             logger.info(f"Resuming pipeline from checkpoint: {resume_from}")
 
             try:
-                design, devplan, handoff = asyncio.run(
-                    orchestrator.resume_from_checkpoint(
-                        checkpoint_key=resume_from,
-                        output_dir=str(config.output_dir),
-                        save_artifacts=True,
-                        feedback_manager=feedback_manager,
+                with _profiling(profile, "resume"):
+                    design, devplan, handoff = asyncio.run(
+                        _monitored(
+                            orchestrator.resume_from_checkpoint(
+                                checkpoint_key=resume_from,
+                                output_dir=str(config.output_dir),
+                                save_artifacts=True,
+                                feedback_manager=feedback_manager,
+                            ),
+                            monitor_loop,
+                            "resume",
+                        )
                     )
-                )
             except ValueError as e:
                 typer.echo(f"\n[ERROR] Error: {str(e)}", err=True, color=True)
                 typer.echo(
@@ -1251,19 +1338,24 @@ def run_full_pipeline(
             # Run full pipeline from start
             logger.info(f"Starting full pipeline for: {project_name}")
 
-            design, devplan, handoff = asyncio.run(
-                orchestrator.run_full_pipeline(
-                    project_name=project_name,
-                    languages=languages_list,
-                    requirements=requirements,
-                    frameworks=frameworks_list,
-                    apis=apis_list,
-                    output_dir=str(config.output_dir),
-                    save_artifacts=True,
-                    feedback_manager=feedback_manager,
-                    pre_review=pre_review,
+            with _profiling(profile, "run_full_pipeline"):
+                design, devplan, handoff = asyncio.run(
+                    _monitored(
+                        orchestrator.run_full_pipeline(
+                            project_name=project_name,
+                            languages=languages_list,
+                            requirements=requirements,
+                            frameworks=frameworks_list,
+                            apis=apis_list,
+                            output_dir=str(config.output_dir),
+                            save_artifacts=True,
+                            feedback_manager=feedback_manager,
+                            pre_review=pre_review,
+                        ),
+                        monitor_loop,
+                        "run_full_pipeline",
+                    )
                 )
-            )
 
         logger.info("Full pipeline completed successfully")
 
@@ -1280,6 +1372,10 @@ def run_full_pipeline(
             typer.echo("\nDebug traceback:", err=True)
             typer.echo(traceback.format_exc(), err=True)
         raise typer.Exit(code=1)
+    finally:
+        # Flush queued artifact writes and stop the writer thread
+        if orchestrator is not None:
+            orchestrator.close()
 
 
 @app.command()
@@ -1536,6 +1632,7 @@ def list_checkpoints(
     ] = False,
 ) -> None:
     """List all available checkpoints."""
+    state_manager = None
     try:
         # Load minimal config for logging setup
         _load_app_config(config_path, None, None, None, verbose)
@@ -1582,6 +1679,9 @@ def list_checkpoints(
         typer.echo(f"\n[ERROR] Error listing checkpoints: {str(e)}", err=True, color=True)
         logger.error(f"Error listing checkpoints: {e}", exc_info=True)
         raise typer.Exit(code=1)
+    finally:
+        if state_manager is not None:
+            state_manager.close()
 
 
 @app.command()
@@ -1595,6 +1695,7 @@ def delete_checkpoint(
     ] = False,
 ) -> None:
     """Delete a specific checkpoint."""
+    state_manager = None
     try:
         # Load minimal config for logging setup
         _load_app_config(config_path, None, None, None, False)
@@ -1648,6 +1749,9 @@ def delete_checkpoint(
         typer.echo(f"\n[ERROR] Error deleting checkpoint: {str(e)}", err=True, color=True)
         logger.error(f"Error deleting checkpoint: {e}", exc_info=True)
         raise typer.Exit(code=1)
+    finally:
+        if state_manager is not None:
+            state_manager.close()
 
 
 @app.command()
@@ -1666,6 +1770,7 @@ def cleanup_checkpoints(
     ] = False,
 ) -> None:
     """Clean up old checkpoints, keeping only the latest N per project."""
+    state_manager = None
     try:
         # Load minimal config for logging setup
         _load_app_config(config_path, None, None, None, False)
@@ -1709,6 +1814,9 @@ def cleanup_checkpoints(
         typer.echo(f"\n[ERROR] Error during cleanup: {str(e)}", err=True, color=True)
         logger.error(f"Error during checkpoint cleanup: {e}", exc_info=True)
         raise typer.Exit(code=1)
+    finally:
+        if state_manager is not None:
+            state_manager.close()
 
 
 @app.command()
@@ -1786,6 +1894,8 @@ def interactive_design(
     a project design without needing to specify all flags upfront.
     By default, uses an LLM-driven conversational interview.
     """
+    orchestrator = None
+    design_prefetcher = None
     try:
         from .interactive import InteractiveQuestionnaireManager
 
@@ -1835,7 +1945,7 @@ def interactive_design(
                 try:
                     root = Path(repo_dir).resolve()
                     if root.exists() and root.is_dir():
-                        analyzer = RepositoryAnalyzer(root)
+                        analyzer = RepositoryAnalyzer(root, cache=RepoAnalysisCache.from_env())
                         repo_analysis = analyzer.analyze()
                     elif verbose:
                         typer.echo(
@@ -2113,7 +2223,7 @@ Generated by DevPlan Orchestrator.
                                         
                                         # Run repository analysis directly instead of subprocess
                                         try:
-                                            analyzer = RepositoryAnalyzer(repo_root)
+                                            analyzer = RepositoryAnalyzer(repo_root, cache=RepoAnalysisCache.from_env())
                                             analysis = analyzer.analyze()
                                             
                                             # Convert analysis to readable output for user feedback
@@ -2208,11 +2318,13 @@ Generated by DevPlan Orchestrator.
             run_dir = temp_markdown_mgr.create_run_directory(temp_project_name)
             typer.echo(f"[NOTE] Interview outputs will be saved to: {run_dir}\n")
             
+            design_prefetcher = _create_design_prefetcher(config)
             interview_manager = LLMInterviewManager(
                 config,
                 verbose=verbose,
                 repo_analysis=final_repo_analysis,
                 markdown_output_manager=temp_markdown_mgr,
+                design_prefetcher=design_prefetcher,
             )
             typer.echo(f"[NOTE] Logging to: {interview_manager.log_file}")
         else:
@@ -2412,6 +2524,13 @@ Generated by DevPlan Orchestrator.
         )
 
         async def _run():
+            # Usually finished already if the summary was final before /done
+            if design_prefetcher is not None:
+                design = await design_prefetcher.wait(inputs)
+                design_prefetcher.close()
+                if design is not None:
+                    logger.info("Using project design generated during the interview")
+                    return design
             design = await orchestrator.project_design_gen.generate(
                 project_name=inputs["name"],
                 languages=languages_list,
@@ -2860,6 +2979,13 @@ Generated by DevPlan Orchestrator.
             typer.echo(traceback.format_exc(), err=True)
         typer.echo(f"\n[ERROR] Error: {str(e)}", err=True, color=True)
         raise typer.Exit(code=1)
+    finally:
+        # Stop the speculative design loop, whichever way the command ended
+        if design_prefetcher is not None:
+            design_prefetcher.close()
+        # Flush queued artifact writes and stop the writer thread
+        if orchestrator is not None:
+            orchestrator.close()
 
 
 def _serialize_repo_analysis(analysis: RepoAnalysis) -> dict:
@@ -2892,6 +3018,7 @@ def _serialize_repo_analysis(analysis: RepoAnalysis) -> dict:
             "build_tools": analysis.patterns.build_tools,
         },
         "config_files": [str(p) for p in analysis.config_files.files],
+        "packages": [package.to_dict() for package in analysis.packages],
         "errors": analysis.errors,
     }
 
@@ -3035,7 +3162,7 @@ def analyze_repo(
             )
             raise typer.Exit(code=1)
 
-        analyzer = RepositoryAnalyzer(root)
+        analyzer = RepositoryAnalyzer(root, cache=RepoAnalysisCache.from_env())
         analysis = analyzer.analyze()
 
         if json_output:
@@ -3088,6 +3215,17 @@ def analyze_repo(
             for path in analysis.config_files.files:
                 typer.echo(f"  - {path}")
 
+        packages = list(analysis.iter_packages())
+        if packages:
+            typer.echo("")
+            typer.echo(f"Packages ({len(packages)}):")
+            for package in packages:
+                typer.echo(
+                    f"  - {package.path} [{package.project_type}] "
+                    f"{package.code_metrics.total_files} files, "
+                    f"{package.code_metrics.total_lines} lines"
+                )
+
         if analysis.errors:
             typer.echo("")
             typer.echo("Warnings / errors:")
@@ -3354,6 +3492,14 @@ def interactive(
         bool, 
         typer.Option("--debug", help="Enable debug mode with full tracebacks")
     ] = False,
+    profile: Annotated[
+        bool,
+        typer.Option("--profile", help="Record trace spans and sampled stacks to outputs/profiles/"),
+    ] = False,
+    monitor_loop: Annotated[
+        bool,
+        typer.Option("--monitor-loop", help="Report event-loop lag and calls that block the loop"),
+    ] = False,
 ) -> None:
     """Launch interactive mode with real-time streaming in a single window.
     
@@ -3365,6 +3511,8 @@ def interactive(
     Everything runs in terminal UI with full real-time token streaming.
     """
     async def run_interactive():
+        orchestrator = None
+        design_prefetcher = None
         try:
             # Load config
             config = _load_app_config(
@@ -3415,7 +3563,7 @@ def interactive(
                 
                 if repository_tools_enabled:
                     from .interview import RepositoryAnalyzer
-                    analyzer = RepositoryAnalyzer(Path.cwd())
+                    analyzer = RepositoryAnalyzer(Path.cwd(), cache=RepoAnalysisCache.from_env())
                     repo_analysis = analyzer.analyze()
                     if repo_analysis:
                         print(f"[FOLDER] Analyzed repository: {repo_analysis.project_type}")
@@ -3430,11 +3578,13 @@ def interactive(
             # Run interview using the existing console-based LLMInterviewManager
             from .llm_interview import LLMInterviewManager
 
+            design_prefetcher = _create_design_prefetcher(config)
             interview_manager = LLMInterviewManager(
                 config=config,
                 verbose=verbose,
                 repo_analysis=repo_analysis,
                 markdown_output_manager=markdown_output_mgr,
+                design_prefetcher=design_prefetcher,
             )
 
             # Run the (blocking) console interview in a background thread so
@@ -3497,17 +3647,24 @@ def interactive(
                 markdown_output_manager=markdown_output_mgr
             )
             
-            print("[STREAM] Generating project design with real-time streaming...\n")
-            design_stream = StreamingHandler.create_console_handler(prefix="[design] ")
-            design = await orchestrator.project_design_gen.generate(
-                project_name=design_inputs["name"],
-                languages=design_inputs["languages"].split(","),
-                requirements=design_inputs["requirements"],
-                frameworks=design_inputs.get("frameworks", "").split(",") if design_inputs.get("frameworks") else None,
-                apis=design_inputs.get("apis", "").split(",") if design_inputs.get("apis") else None,
-                streaming_handler=design_stream,
-            )
-            print("\n[OK] Project design generated!")
+            design = None
+            if design_prefetcher is not None:
+                design = await design_prefetcher.wait(design_inputs)
+                design_prefetcher.close()
+            if design is not None:
+                print("[OK] Project design was generated during the interview.")
+            else:
+                print("[STREAM] Generating project design with real-time streaming...\n")
+                design_stream = StreamingHandler.create_console_handler(prefix="[design] ")
+                design = await orchestrator.project_design_gen.generate(
+                    project_name=design_inputs["name"],
+                    languages=design_inputs["languages"].split(","),
+                    requirements=design_inputs["requirements"],
+                    frameworks=design_inputs.get("frameworks", "").split(",") if design_inputs.get("frameworks") else None,
+                    apis=design_inputs.get("apis", "").split(",") if design_inputs.get("apis") else None,
+                    streaming_handler=design_stream,
+                )
+                print("\n[OK] Project design generated!")
             
             # Save project design to markdown output manager - RAW LLM RESPONSE
             if design.raw_llm_response:
@@ -3912,9 +4069,16 @@ def interactive(
                 typer.echo(traceback.format_exc(), err=True)
             typer.echo(f"\n[ERROR] Error: {str(e)}", err=True, color=True)
             raise typer.Exit(code=1)
+        finally:
+            if design_prefetcher is not None:
+                design_prefetcher.close()
+            # Flush queued artifact writes and stop the writer thread
+            if orchestrator is not None:
+                orchestrator.close()
     
     # Run the async function
-    asyncio.run(run_interactive())
+    with _profiling(profile, "interactive"):
+        asyncio.run(_monitored(run_interactive(), monitor_loop, "interactive"))
 
 
 @app.command()
@@ -16,6 +16,7 @@ import aiohttp
 from tenacity import AsyncRetrying, stop_after_attempt, wait_exponential
 
 from ..llm_client import LLMClient
+from ..tracing import trace_span
 
 
 class AetherClient(LLMClient):
@@ -122,9 +123,9 @@ class AetherClient(LLMClient):
         )
         
         try:
-            async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with self._pooled_session() as session:
                 async with session.post(
-                    self._endpoint, json=payload, headers=headers
+                    self._endpoint, json=payload, headers=headers, timeout=timeout
                 ) as resp:
                     # IMPROVED ERROR HANDLING - Capture Aether's error details
                     if resp.status >= 400:
@@ -199,7 +200,12 @@ class AetherClient(LLMClient):
                 exp_base=self._exp_base,
             ),
         ):
-            with attempt:
+            with attempt, trace_span(
+                "llm.attempt",
+                client=type(self).__name__,
+                attempt=attempt.retry_state.attempt_number,
+                streaming=False,
+            ):
                 return await self._post_chat(prompt, **kwargs)
 
     async def generate_multiple(self, prompts: Iterable[str]) -> List[str]:
@@ -246,9 +252,9 @@ class AetherClient(LLMClient):
         )
 
         full_content = ""
-        async with aiohttp.ClientSession(timeout=timeout) as session:
+        async with self._pooled_session() as session:
             async with session.post(
-                self._endpoint, json=payload, headers=headers
+                self._endpoint, json=payload, headers=headers, timeout=timeout
             ) as resp:
                 resp.raise_for_status()
 
@@ -291,5 +297,10 @@ class AetherClient(LLMClient):
                 exp_base=self._exp_base,
             ),
         ):
-            with attempt:
+            with attempt, trace_span(
+                "llm.attempt",
+                client=type(self).__name__,
+                attempt=attempt.retry_state.attempt_number,
+                streaming=True,
+            ):
                 return await self._post_chat_streaming(prompt, callback, **kwargs)
@@ -8,6 +8,7 @@ import aiohttp
 from tenacity import AsyncRetrying, stop_after_attempt, wait_exponential
 
 from ..llm_client import LLMClient
+from ..tracing import trace_span
 
 
 class AgentRouterClient(LLMClient):
@@ -134,8 +135,8 @@ class AgentRouterClient(LLMClient):
         )
 
         try:
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(self._endpoint, json=payload, headers=headers) as resp:
+            async with self._pooled_session() as session:
+                async with session.post(self._endpoint, json=payload, headers=headers, timeout=timeout) as resp:
                     if resp.status >= 400:
                         text = await resp.text()
                         self._logger.error(f"[AGENTROUTER ERROR] {resp.status}: {text}")
@@ -175,7 +176,12 @@ class AgentRouterClient(LLMClient):
                 exp_base=self._exp_base,
             ),
         ):
-            with attempt:
+            with attempt, trace_span(
+                "llm.attempt",
+                client=type(self).__name__,
+                attempt=attempt.retry_state.attempt_number,
+                streaming=False,
+            ):
                 return await self._post_chat(prompt, **kwargs)
 
     async def generate_multiple(self, prompts: Iterable[str]) -> List[str]:
@@ -216,8 +222,8 @@ class AgentRouterClient(LLMClient):
         timeout = aiohttp.ClientTimeout(total=getattr(self._config, "api_timeout", 60))
 
         full_content = ""
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.post(self._endpoint, json=payload, headers=headers) as resp:
+        async with self._pooled_session() as session:
+            async with session.post(self._endpoint, json=payload, headers=headers, timeout=timeout) as resp:
                 resp.raise_for_status()
                 async for line in resp.content:
                     line_str = line.decode("utf-8").strip()
@@ -250,5 +256,10 @@ class AgentRouterClient(LLMClient):
                 exp_base=self._exp_base,
             ),
         ):
-            with attempt:
+            with attempt, trace_span(
+                "llm.attempt",
+                client=type(self).__name__,
+                attempt=attempt.retry_state.attempt_number,
+                streaming=True,
+            ):
                 return await self._post_chat_streaming(prompt, callback, **kwargs)
@@ -14,6 +14,7 @@ import aiohttp
 from tenacity import AsyncRetrying, stop_after_attempt, wait_exponential
 
 from ..llm_client import LLMClient
+from ..tracing import trace_span
 
 
 class GenericOpenAIClient(LLMClient):
@@ -101,9 +102,9 @@ class GenericOpenAIClient(LLMClient):
         )
         
         try:
-            async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with self._pooled_session() as session:
                 async with session.post(
-                    self._endpoint, json=payload, headers=headers
+                    self._endpoint, json=payload, headers=headers, timeout=timeout
                 ) as resp:
                     if resp.status >= 400:
                         error_body = await resp.text()
@@ -174,7 +175,12 @@ class GenericOpenAIClient(LLMClient):
                 exp_base=self._exp_base,
             ),
         ):
-            with attempt:
+            with attempt, trace_span(
+                "llm.attempt",
+                client=type(self).__name__,
+                attempt=attempt.retry_state.attempt_number,
+                streaming=False,
+            ):
                 return await self._post_chat(prompt, **kwargs)
 
     async def generate_multiple(self, prompts: Iterable[str]) -> List[str]:
@@ -221,9 +227,9 @@ class GenericOpenAIClient(LLMClient):
 
         full_content = ""
         print(f"DEBUG: Generic client connecting to {self._endpoint}")
-        async with aiohttp.ClientSession(timeout=timeout) as session:
+        async with self._pooled_session() as session:
             async with session.post(
-                self._endpoint, json=payload, headers=headers
+                self._endpoint, json=payload, headers=headers, timeout=timeout
             ) as resp:
                 resp.raise_for_status()
                 print(f"DEBUG: Generic client connected. Status: {resp.status}")
@@ -271,5 +277,10 @@ class GenericOpenAIClient(LLMClient):
                 exp_base=self._exp_base,
             ),
         ):
-            with attempt:
+            with attempt, trace_span(
+                "llm.attempt",
+                client=type(self).__name__,
+                attempt=attempt.retry_state.attempt_number,
+                streaming=True,
+            ):
                 return await self._post_chat_streaming(prompt, callback, **kwargs)
@@ -10,6 +10,7 @@ from tenacity import AsyncRetrying, stop_after_attempt, wait_exponential
 
 from ..llm_client import LLMClient
 from ..rate_limiter import RateLimiter
+from ..tracing import trace_span
 
 
 class OpenAIClient(LLMClient):
@@ -98,7 +99,12 @@ class OpenAIClient(LLMClient):
                 exp_base=self._exp_base,
             ),
         ):
-            with attempt:
+            with attempt, trace_span(
+                "llm.attempt",
+                client=type(self).__name__,
+                attempt=attempt.retry_state.attempt_number,
+                streaming=False,
+            ):
                 return await self._chat_completion(prompt, **kwargs)
 
     async def generate_multiple(self, prompts: Iterable[str]) -> List[str]:
@@ -168,5 +174,10 @@ class OpenAIClient(LLMClient):
                 exp_base=self._exp_base,
             ),
         ):
-            with attempt:
+            with attempt, trace_span(
+                "llm.attempt",
+                client=type(self).__name__,
+                attempt=attempt.retry_state.attempt_number,
+                streaming=True,
+            ):
                 return await self._chat_completion_streaming(prompt, callback, **kwargs)
@@ -16,6 +16,7 @@ import aiohttp
 from tenacity import AsyncRetrying, stop_after_attempt, wait_exponential
 
 from ..llm_client import LLMClient
+from ..tracing import trace_span
 
 
 class RequestyClient(LLMClient):
@@ -189,9 +190,9 @@ class RequestyClient(LLMClient):
         )
         
         try:
-            async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with self._pooled_session() as session:
                 async with session.post(
-                    self._endpoint, json=payload, headers=headers
+                    self._endpoint, json=payload, headers=headers, timeout=timeout
                 ) as resp:
                     # IMPROVED ERROR HANDLING - Capture Requesty's error details
                     if resp.status >= 400:
@@ -343,9 +344,9 @@ class RequestyClient(LLMClient):
         
         print(f"DEBUG: Requesty connecting to {self._endpoint}")
         try:
-            async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with self._pooled_session() as session:
                 async with session.post(
-                    self._endpoint, json=payload, headers=headers
+                    self._endpoint, json=payload, headers=headers, timeout=timeout
                 ) as resp:
                     print(f"DEBUG: Requesty connected. Status: {resp.status}")
                     # IMPROVED ERROR HANDLING - Capture Requesty's error details
@@ -447,7 +448,12 @@ class RequestyClient(LLMClient):
                 exp_base=self._exp_base,
             ),
         ):
-            with attempt:
+            with attempt, trace_span(
+                "llm.attempt",
+                client=type(self).__name__,
+                attempt=attempt.retry_state.attempt_number,
+                streaming=False,
+            ):
                 return await self._post_chat(prompt, **kwargs)
 
     async def generate_completion_streaming(
@@ -476,7 +482,12 @@ class RequestyClient(LLMClient):
                 exp_base=self._exp_base,
             ),
         ):
-            with attempt:
+            with attempt, trace_span(
+                "llm.attempt",
+                client=type(self).__name__,
+                attempt=attempt.retry_state.attempt_number,
+                streaming=True,
+            ):
                 return await self._post_chat_streaming(prompt, callback, **kwargs)
 
     async def generate_multiple(self, prompts: Iterable[str]) -> List[str]:
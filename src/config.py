@@ -162,6 +162,15 @@ class GitConfig(BaseModel):
     auto_push: bool = Field(
         default=False, description="Automatically push commits to remote"
     )
+    background_commits: bool = Field(
+        default=True,
+        description="Queue stage commits on a background thread instead of blocking",
+    )
+    commit_batch_window: float = Field(
+        default=2.0,
+        ge=0.0,
+        description="Seconds to coalesce queued stage commits into one commit",
+    )
 
 
 class DetourConfig(BaseModel):
@@ -198,6 +207,55 @@ class HiveMindConfig(BaseModel):
     )
 
 
+class ContextBudgetConfig(BaseModel):
+    """Token budgets for repository code samples, per stage (0 disables packing)."""
+
+    interview: int = Field(
+        default=4000, ge=0, description="Code sample tokens in interview prompts"
+    )
+    devplan: int = Field(
+        default=3000, ge=0, description="Code sample tokens in the basic devplan prompt"
+    )
+    detailed: int = Field(
+        default=2000, ge=0, description="Code sample tokens in each detailed phase prompt"
+    )
+    handoff: int = Field(
+        default=1500, ge=0, description="Code sample tokens in the handoff prompt"
+    )
+
+
+class ConversationMemoryConfig(BaseModel):
+    """Rolling summarization of long interview and refinement chats."""
+
+    keep_turns: int = Field(
+        default=6, ge=1, description="Most recent user/assistant turns kept verbatim"
+    )
+    max_history_chars: int = Field(
+        default=12000,
+        ge=0,
+        description="Summarize older turns once the history exceeds this size (0 never)",
+    )
+    summarize_with_llm: bool = Field(
+        default=False,
+        description="Update the summary with an LLM call in the background (heuristic otherwise)",
+    )
+    summary_timeout: float = Field(
+        default=20.0, gt=0, description="Seconds to wait for a pending background summary"
+    )
+
+
+class DesignPrefetchConfig(BaseModel):
+    """Speculative project design generation during the LLM interview."""
+
+    enabled: bool = Field(
+        default=True,
+        description="Start generating the design once the interview summary is complete",
+    )
+    delay: float = Field(
+        default=2.0, ge=0, description="Seconds to wait before the speculative LLM call"
+    )
+
+
 class AppConfig(BaseModel):
     """Main application configuration."""
 
@@ -208,6 +266,11 @@ class AppConfig(BaseModel):
     git: GitConfig = Field(default_factory=GitConfig)
     detour: DetourConfig = Field(default_factory=DetourConfig)
     hivemind: HiveMindConfig = Field(default_factory=HiveMindConfig)
+    context_budget: ContextBudgetConfig = Field(default_factory=ContextBudgetConfig)
+    conversation_memory: ConversationMemoryConfig = Field(
+        default_factory=ConversationMemoryConfig
+    )
+    design_prefetch: DesignPrefetchConfig = Field(default_factory=DesignPrefetchConfig)
 
     # Per-stage LLM configurations (optional overrides)
     design_llm: Optional[LLMConfig] = Field(
@@ -574,6 +637,15 @@ def load_config(config_path: Optional[str] = None) -> AppConfig:
             "git_commit_after_handoff"
         ]
 
+    if "git_background_commits" in config_data:
+        env_overrides.setdefault("git", {})["background_commits"] = config_data[
+            "git_background_commits"
+        ]
+    if "git_commit_batch_window" in config_data:
+        env_overrides.setdefault("git", {})["commit_batch_window"] = config_data[
+            "git_commit_batch_window"
+        ]
+
     if os.getenv("GIT_AUTO_PUSH"):
         env_overrides.setdefault("git", {})["auto_push"] = (
             os.getenv("GIT_AUTO_PUSH").lower() == "true"
@@ -618,6 +690,14 @@ def load_config(config_path: Optional[str] = None) -> AppConfig:
             os.getenv("HIVEMIND_DRONE_COUNT")
         )
 
+    # Context budget configuration
+    if "context_budget" in config_data:
+        env_overrides["context_budget"] = config_data["context_budget"]
+    if "conversation_memory" in config_data:
+        env_overrides["conversation_memory"] = config_data["conversation_memory"]
+    if "design_prefetch" in config_data:
+        env_overrides["design_prefetch"] = config_data["design_prefetch"]
+
     if os.getenv("ENABLE_CHECKPOINTS"):
         env_overrides.setdefault("pipeline", {})["enable_checkpoints"] = (
             os.getenv("ENABLE_CHECKPOINTS").lower() == "true"
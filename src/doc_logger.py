@@ -4,26 +4,41 @@ from __future__ import annotations
 
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
+
+from .artifact_writer import ArtifactWriter
 
 
 class DocumentationLogger:
     """Logger for tracking documentation updates with timestamps."""
 
-    def __init__(self, log_path: str | Path = "docs/update_log.md"):
+    def __init__(
+        self,
+        log_path: str | Path = "docs/update_log.md",
+        writer: Optional[ArtifactWriter] = None,
+    ):
         """Initialize the documentation logger.
 
         Args:
             log_path: Path to the update log file
+            writer: Optional background writer used for appends
         """
         self.log_path = Path(log_path)
+        self.writer = writer
         self.log_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Initialize log file if it doesn't exist
         if not self.log_path.exists():
             self._initialize_log()
 
+    def _flush(self) -> None:
+        """Wait for queued appends so reads see every entry."""
+        if self.writer is not None:
+            self.writer.flush()
+
     def _initialize_log(self) -> None:
         """Initialize the update log with header."""
+        self._flush()
         header = """# Documentation Update Log
 
 This log tracks all documentation updates and generation events.
@@ -51,6 +66,9 @@ This log tracks all documentation updates and generation events.
 """
 
         # Append to log file
+        if self.writer is not None:
+            self.writer.append(self.log_path, log_entry)
+            return
         with self.log_path.open("a", encoding="utf-8") as f:
             f.write(log_entry)
 
@@ -110,6 +128,7 @@ This log tracks all documentation updates and generation events.
         Returns:
             List of recent log entries
         """
+        self._flush()
         if not self.log_path.exists():
             return []
 
@@ -135,6 +154,7 @@ This log tracks all documentation updates and generation events.
         Returns:
             Dictionary with counts of different update types
         """
+        self._flush()
         if not self.log_path.exists():
             return {}
 
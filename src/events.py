@@ -0,0 +1,454 @@
+"""Typed in-process event bus for pipeline progress.
+
+The orchestrator publishes small, typed events (stage start/end, token chunks,
+phase ready, checkpoint saved, usage, files created) instead of calling
+renderers inline. Every front end subscribes to the same stream: the Rich
+console renderer, SSE endpoints, a JSONL log file, metrics counters.
+
+Each subscriber has its own bounded buffer drained by its own task, so a slow
+subscriber never blocks the publisher or other subscribers. When a buffer is
+full, consecutive token chunks are merged and usage updates replace older ones
+(``coalescing``); other events displace the oldest coalescable entry, and only
+as a last resort the oldest event.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import json
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    ClassVar,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Union,
+)
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# --- Event types ---
+
+
+@dataclass
+class PipelineEvent:
+    """Base class for all pipeline events."""
+
+    type: ClassVar[str] = "event"
+    timestamp: float = field(default_factory=time.time, init=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serializable dict including the event type."""
+        return {"type": self.type, **asdict(self)}
+
+
+@dataclass
+class PipelineStarted(PipelineEvent):
+    type: ClassVar[str] = "pipeline_started"
+    project_name: str = ""
+
+
+@dataclass
+class PipelineFinished(PipelineEvent):
+    type: ClassVar[str] = "pipeline_finished"
+    success: bool = True
+
+
+@dataclass
+class PipelineFailed(PipelineEvent):
+    type: ClassVar[str] = "pipeline_failed"
+    message: str = ""
+
+
+@dataclass
+class StageStarted(PipelineEvent):
+    type: ClassVar[str] = "stage_started"
+    stage: str = ""
+    number: int = 0
+
+
+@dataclass
+class StageEnded(PipelineEvent):
+    type: ClassVar[str] = "stage_ended"
+    stage: str = ""
+    success: bool = True
+    result: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class TokenChunk(PipelineEvent):
+    type: ClassVar[str] = "token"
+    stage: str = ""
+    text: str = ""
+    phase: Optional[int] = None
+
+
+@dataclass
+class PhaseReady(PipelineEvent):
+    type: ClassVar[str] = "phase_ready"
+    phase_number: int = 0
+    steps: int = 0
+    char_count: Optional[int] = None
+
+
+@dataclass
+class FileCreated(PipelineEvent):
+    type: ClassVar[str] = "file_created"
+    path: str = ""
+    file_type: str = "file"
+    token_count: Optional[int] = None
+
+
+@dataclass
+class CheckpointSaved(PipelineEvent):
+    type: ClassVar[str] = "checkpoint_saved"
+    key: str = ""
+    stage: str = ""
+
+
+@dataclass
+class UsageUpdated(PipelineEvent):
+    type: ClassVar[str] = "usage"
+    usage: Dict[str, Any] = field(default_factory=dict)
+
+
+Handler = Callable[[PipelineEvent], Union[None, Awaitable[None]]]
+
+
+def _coalesce(previous: PipelineEvent, event: PipelineEvent) -> Optional[PipelineEvent]:
+    """Merge ``event`` into ``previous`` if they can be combined, else None."""
+    if (
+        isinstance(previous, TokenChunk)
+        and isinstance(event, TokenChunk)
+        and previous.stage == event.stage
+        and previous.phase == event.phase
+    ):
+        merged = TokenChunk(stage=event.stage, text=previous.text + event.text, phase=event.phase)
+        merged.timestamp = previous.timestamp
+        return merged
+    if isinstance(previous, UsageUpdated) and isinstance(event, UsageUpdated):
+        return event
+    return None
+
+
+# --- Subscriptions ---
+
+
+class Subscription:
+    """A subscriber's bounded, coalescing buffer and its drain task."""
+
+    def __init__(self, bus: "EventBus", handler: Handler, maxsize: int, name: str):
+        self.bus = bus
+        self.handler = handler
+        self.maxsize = maxsize
+        self.name = name
+        self.coalesced = 0
+        self.dropped = 0
+        self._buffer: Deque[PipelineEvent] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._idle: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _push(self, event: PipelineEvent) -> None:
+        if self._buffer:
+            merged = _coalesce(self._buffer[-1], event)
+            if merged is not None:
+                self._buffer[-1] = merged
+                self.coalesced += 1
+                return
+        if len(self._buffer) >= self.maxsize:
+            self._make_room()
+        self._buffer.append(event)
+
+    def _make_room(self) -> None:
+        # Prefer merging adjacent coalescable entries over losing events
+        buf = self._buffer
+        for i in range(len(buf) - 1):
+            merged = _coalesce(buf[i], buf[i + 1])
+            if merged is not None:
+                buf[i] = merged
+                del buf[i + 1]
+                self.coalesced += 1
+                return
+        for i, queued in enumerate(buf):
+            if isinstance(queued, (TokenChunk, UsageUpdated)):
+                del buf[i]
+                self.dropped += 1
+                return
+        buf.popleft()
+        self.dropped += 1
+
+    def _ensure_task(self) -> None:
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._idle = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._drain_loop())
+        self._idle.clear()
+        self._wakeup.set()
+
+    async def _drain_loop(self) -> None:
+        while True:
+            if not self._buffer:
+                self._idle.set()
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            event = self._buffer.popleft()
+            try:
+                result = self.handler(event)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.warning(f"Event subscriber {self.name} failed on {event.type}: {e}")
+
+    def _drain_sync(self) -> None:
+        """Deliver buffered events inline (used when no event loop is running)."""
+        while self._buffer:
+            event = self._buffer.popleft()
+            try:
+                result = self.handler(event)
+                if inspect.isawaitable(result):
+                    # Cannot await without a loop; close to avoid a warning
+                    result.close()
+            except Exception as e:
+                logger.warning(f"Event subscriber {self.name} failed on {event.type}: {e}")
+
+    async def wait_idle(self) -> None:
+        if self._task is None or self._task.done():
+            return
+        await self._idle.wait()
+
+    def cancel(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._buffer.clear()
+        if self._idle is not None:
+            # Release anyone waiting in drain()
+            self._idle.set()
+
+
+class EventBus:
+    """Fan pipeline events out to subscribers without blocking the publisher."""
+
+    def __init__(self, default_maxsize: int = 1000):
+        """Initialize the bus.
+
+        Args:
+            default_maxsize: Buffer size per subscriber before coalescing kicks in
+        """
+        self.default_maxsize = default_maxsize
+        self._subscriptions: List[Subscription] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def subscribe(
+        self,
+        handler: Handler,
+        maxsize: Optional[int] = None,
+        name: Optional[str] = None,
+    ) -> Subscription:
+        """Register a sync or async handler called once per event."""
+        sub = Subscription(
+            self,
+            handler,
+            maxsize or self.default_maxsize,
+            name or getattr(handler, "__name__", type(handler).__name__),
+        )
+        self._subscriptions.append(sub)
+        return sub
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Stop delivering events to ``subscription``."""
+        subscription.cancel()
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+
+    def publish(self, event: PipelineEvent) -> None:
+        """Publish an event. Never blocks and never raises from subscribers.
+
+        Inside a running event loop, delivery happens on each subscriber's
+        drain task. Without a running loop (plain sync callers), handlers are
+        invoked inline.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is not None:
+            self._loop = loop
+        for sub in list(self._subscriptions):
+            sub._push(event)
+            if loop is not None:
+                sub._ensure_task()
+            else:
+                sub._drain_sync()
+
+    def publish_threadsafe(self, event: PipelineEvent) -> None:
+        """Publish from a worker thread onto the loop that last published."""
+        if self._loop is None or self._loop.is_closed():
+            self.publish(event)
+        else:
+            self._loop.call_soon_threadsafe(self.publish, event)
+
+    async def drain(self) -> None:
+        """Wait until every subscriber has processed all buffered events."""
+        for sub in list(self._subscriptions):
+            await sub.wait_idle()
+
+    async def close(self) -> None:
+        """Drain and stop all subscriber tasks."""
+        await self.drain()
+        for sub in list(self._subscriptions):
+            sub.cancel()
+        self._subscriptions.clear()
+
+
+# --- Standard subscribers ---
+
+
+class ConsoleEventRenderer:
+    """Render events through a :class:`PipelineProgressReporter`."""
+
+    def __init__(self, reporter: Any):
+        self.reporter = reporter
+
+    def __call__(self, event: PipelineEvent) -> None:
+        r = self.reporter
+        if isinstance(event, PipelineStarted):
+            r.start_pipeline(event.project_name)
+        elif isinstance(event, StageStarted):
+            r.start_stage(event.stage, event.number)
+        elif isinstance(event, StageEnded):
+            r.end_stage(event.stage, success=event.success)
+        elif isinstance(event, PhaseReady):
+            r.report_phase_ready(
+                phase_number=event.phase_number,
+                steps=event.steps,
+                char_count=event.char_count,
+            )
+        elif isinstance(event, FileCreated):
+            r.report_file_created(event.path, event.file_type, event.token_count)
+        elif isinstance(event, CheckpointSaved):
+            r.show_checkpoint_saved(event.key, event.stage)
+        elif isinstance(event, UsageUpdated):
+            r.update_tokens(event.usage)
+        elif isinstance(event, PipelineFinished):
+            r.display_summary()
+        elif isinstance(event, PipelineFailed):
+            r.display_error(event.message)
+
+
+class JsonlEventLog:
+    """Append each event as one JSON line to a log file."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def __call__(self, event: PipelineEvent) -> None:
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(event.to_dict()) + "\n")
+
+
+class EventMetrics:
+    """Collect counters and stage durations from the event stream."""
+
+    def __init__(self) -> None:
+        self.counts: Dict[str, int] = {}
+        self.token_chars = 0
+        self.stage_durations: Dict[str, float] = {}
+        self._stage_started: Dict[str, float] = {}
+
+    def __call__(self, event: PipelineEvent) -> None:
+        self.counts[event.type] = self.counts.get(event.type, 0) + 1
+        if isinstance(event, TokenChunk):
+            self.token_chars += len(event.text)
+        elif isinstance(event, StageStarted):
+            self._stage_started[event.stage] = event.timestamp
+        elif isinstance(event, StageEnded) and event.stage in self._stage_started:
+            self.stage_durations[event.stage] = (
+                event.timestamp - self._stage_started.pop(event.stage)
+            )
+
+
+class EventStream:
+    """Async iterator over events, for SSE and other pull-based consumers.
+
+    The stream hands over one event at a time, so while the consumer is slow
+    events wait in the subscription's bounded buffer where they are coalesced.
+    Call :meth:`close` when the consumer goes away.
+    """
+
+    def __init__(self, bus: EventBus, maxsize: Optional[int] = None):
+        self._queue: "asyncio.Queue[Optional[PipelineEvent]]" = asyncio.Queue(maxsize=1)
+        self._bus = bus
+        self.subscription = bus.subscribe(self._on_event, maxsize=maxsize, name="stream")
+
+    async def _on_event(self, event: PipelineEvent) -> None:
+        await self._queue.put(event)
+
+    def close(self) -> None:
+        """Unsubscribe and end iteration after already-delivered events."""
+        self._bus.unsubscribe(self.subscription)
+        try:
+            self._queue.put_nowait(None)
+        except asyncio.QueueFull:
+            asyncio.ensure_future(self._queue.put(None))
+
+    def __aiter__(self) -> AsyncIterator[PipelineEvent]:
+        return self
+
+    async def __anext__(self) -> PipelineEvent:
+        event = await self._queue.get()
+        if event is None:
+            raise StopAsyncIteration
+        return event
+
+
+def sse_frame(event: PipelineEvent) -> str:
+    """Format an event as a Server-Sent Events ``data:`` frame."""
+    return f"data: {json.dumps(event.to_dict())}\n\n"
+
+
+class BusStreamingHandler:
+    """StreamingHandler-compatible adapter that publishes tokens to a bus.
+
+    Generators accept any object with ``on_token_async`` /
+    ``on_completion_async`` and async context manager support; this one turns
+    tokens into :class:`TokenChunk` events.
+    """
+
+    def __init__(self, bus: EventBus, stage: str, phase: Optional[int] = None):
+        self.bus = bus
+        self.stage = stage
+        self.phase = phase
+
+    async def __aenter__(self) -> "BusStreamingHandler":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        return None
+
+    def on_token(self, token: str) -> None:
+        self.bus.publish(TokenChunk(stage=self.stage, text=token, phase=self.phase))
+
+    async def on_token_async(self, token: str) -> None:
+        self.on_token(token)
+
+    def on_completion(self, full_text: str) -> None:
+        return None
+
+    async def on_completion_async(self, full_text: str) -> None:
+        return None
@@ -7,7 +7,7 @@ devplans and integrate corrections into regeneration workflows.
 
 import logging
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 
@@ -35,6 +35,8 @@ class FeedbackManager:
         self.feedback_data: Dict[str, Any] = {}
         self.corrections: List[Dict[str, Any]] = []
         self.manual_edits: Dict[str, str] = {}
+        # Rendered corrections section and the rendered fields it was built from
+        self._section_cache: Optional[Tuple[Tuple[Tuple[Any, Any, Any], ...], str]] = None
 
         if feedback_file and feedback_file.exists():
             self.load_feedback()
@@ -71,18 +73,26 @@ class FeedbackManager:
             logger.error(f"Failed to parse feedback YAML: {e}")
             raise
 
-    def apply_corrections_to_prompt(self, prompt: str) -> str:
+    def corrections_section(self) -> str:
         """
-        Apply feedback corrections to a generation prompt.
+        Return the rendered feedback section for the current corrections.
 
-        Args:
-            prompt: Original prompt text
+        The section is built once and reused until the corrections' content
+        changes (including edits made in place), so applying it to many
+        prompts is cheap.
 
         Returns:
-            Modified prompt with feedback instructions injected
+            Feedback section text, or an empty string without corrections
         """
         if not self.corrections:
-            return prompt
+            return ""
+
+        key = tuple(
+            (c.get("type", "general"), c.get("description", ""), c.get("target", ""))
+            for c in self.corrections
+        )
+        if self._section_cache is not None and self._section_cache[0] == key:
+            return self._section_cache[1]
 
         # Build feedback section
         feedback_section = "\n\n## User Feedback and Corrections\n\n"
@@ -107,8 +117,26 @@ class FeedbackManager:
             else:
                 feedback_section += f"{idx}. {description}\n\n"
 
-        # Inject before the final instruction section
-        modified_prompt = prompt + feedback_section
+        self._section_cache = (key, feedback_section)
+        return feedback_section
+
+    def apply_corrections_to_prompt(self, prompt: str) -> str:
+        """
+        Apply feedback corrections to a generation prompt.
+
+        The corrections are appended after the prompt, so prompts that share
+        a prefix keep sharing it.
+
+        Args:
+            prompt: Original prompt text
+
+        Returns:
+            Modified prompt with feedback instructions injected
+        """
+        if not self.corrections:
+            return prompt
+
+        modified_prompt = prompt + self.corrections_section()
         logger.debug(f"Applied {len(self.corrections)} corrections to prompt")
         return modified_prompt
 
@@ -5,24 +5,43 @@ from __future__ import annotations
 import re
 from datetime import datetime
 from pathlib import Path
-from typing import Tuple, List
+from typing import List, Optional, Tuple
 
+from .artifact_writer import ArtifactWriter, atomic_write_text
 from .logger import get_logger
 
 logger = get_logger(__name__)
 
 
 class FileManager:
-    """Utility methods for working with markdown and text files."""
+    """Utility methods for working with markdown and text files.
+
+    Writes are atomic and skip files whose content is unchanged. When an
+    :class:`~src.artifact_writer.ArtifactWriter` is attached, ``write_markdown``
+    queues the write onto its thread pool instead of blocking the caller.
+    """
+
+    def __init__(self, writer: Optional[ArtifactWriter] = None):
+        self.writer = writer
+
+    def flush(self) -> None:
+        """Wait for any queued writes to reach disk."""
+        if self.writer is not None:
+            self.writer.flush()
 
     def read_markdown(self, path: str | Path) -> str:
+        if self.writer is not None:
+            pending = self.writer.pending_content(path)
+            if pending is not None:
+                return pending
         p = Path(path)
         return p.read_text(encoding="utf-8") if p.exists() else ""
 
     def write_markdown(self, path: str | Path, content: str) -> None:
-        p = Path(path)
-        p.parent.mkdir(parents=True, exist_ok=True)
-        p.write_text(content, encoding="utf-8")
+        if self.writer is not None:
+            self.writer.submit(path, content)
+            return
+        atomic_write_text(path, content)
 
     # --- Safe devplan writing helpers ---
     def _validate_devplan_content(self, content: str) -> Tuple[bool, List[str]]:
@@ -55,6 +74,8 @@ class FileManager:
         """
         p = Path(path)
         p.parent.mkdir(parents=True, exist_ok=True)
+        # Make sure a queued write to this path is on disk before backing it up
+        self.flush()
 
         # Create backup if file exists
         if p.exists():
@@ -82,7 +103,7 @@ class FileManager:
 
         # Proceed with normal write
         try:
-            p.write_text(content, encoding="utf-8")
+            atomic_write_text(p, content)
             logger.info(f"Wrote devplan dashboard to {p}")
             return True, str(p)
         except Exception as e:
@@ -95,6 +116,9 @@ class FileManager:
             return False, tmp_path
 
     def append_to_file(self, path: str | Path, content: str) -> None:
+        if self.writer is not None:
+            self.writer.append(path, content)
+            return
         p = Path(path)
         p.parent.mkdir(parents=True, exist_ok=True)
         with p.open("a", encoding="utf-8") as f:
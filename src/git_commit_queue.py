@@ -0,0 +1,150 @@
+"""Background, coalescing commit queue on top of :class:`GitManager`.
+
+With git integration enabled the pipeline commits after design, devplan and
+handoff. Running those commits inline blocks the event loop, and on large
+repositories each one can take seconds. :class:`GitCommitQueue` accepts commit
+requests, waits ``window`` seconds for more requests to arrive, merges them
+into a single commit (union of files, combined message) and performs it on a
+background thread via :meth:`GitManager.commit_paths`, which writes objects
+directly instead of staging through the working tree.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from .git_manager import GitManager
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+_STOP = object()
+_FLUSH = object()
+
+
+@dataclass
+class CommitRequest:
+    """A single queued commit."""
+
+    message: str
+    files: List[str] = field(default_factory=list)
+
+
+def combine_messages(messages: List[str]) -> str:
+    """Build one commit message from several coalesced ones.
+
+    The first message becomes the subject; the rest are listed in the body.
+    """
+    if len(messages) == 1:
+        return messages[0]
+    body = "\n".join(f"- {m}" for m in messages[1:])
+    return f"{messages[0]}\n\nAlso includes:\n{body}"
+
+
+class GitCommitQueue:
+    """Coalesce commit requests and run them on a background thread."""
+
+    def __init__(self, git_manager: GitManager, window: float = 2.0):
+        """Initialize the queue and start its worker thread.
+
+        Args:
+            git_manager: Manager used to create commits
+            window: Seconds to wait for further requests before committing
+        """
+        self.git_manager = git_manager
+        self.window = window
+        self.commits: List[str] = []
+        self.errors: List[Exception] = []
+        self._queue: "queue.Queue[object]" = queue.Queue()
+        self._idle = threading.Condition()
+        self._outstanding = 0
+        self._thread = threading.Thread(
+            target=self._run, name="git-commit-queue", daemon=True
+        )
+        self._thread.start()
+
+    def enqueue(self, message: str, files: Optional[List[str]] = None) -> None:
+        """Queue a commit of ``files`` with ``message``."""
+        with self._idle:
+            self._outstanding += 1
+        self._queue.put(CommitRequest(message, list(files or [])))
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            if item is _FLUSH:
+                continue
+            batch = [item]
+            stop = False
+            deadline = time.monotonic() + self.window
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    nxt = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if nxt is _STOP:
+                    stop = True
+                    break
+                if nxt is _FLUSH:
+                    break
+                batch.append(nxt)
+            self._commit_batch(batch)
+            if stop:
+                return
+
+    def _commit_batch(self, batch: List[CommitRequest]) -> None:
+        files: List[str] = []
+        for request in batch:
+            for f in request.files:
+                if f not in files:
+                    files.append(f)
+        message = combine_messages([r.message for r in batch])
+        try:
+            if files:
+                sha = self.git_manager.commit_paths(message, files)
+            else:
+                self.git_manager.commit_changes(message)
+                sha = None
+            if sha:
+                self.commits.append(sha)
+            logger.info(f"Committed {len(batch)} queued request(s) touching {len(files)} file(s)")
+        except Exception as e:
+            logger.warning(f"Background git commit failed: {e}")
+            self.errors.append(e)
+        finally:
+            with self._idle:
+                self._outstanding -= len(batch)
+                self._idle.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Commit everything queued so far and wait for it to finish.
+
+        Closes the current coalescing window early so pending requests are
+        committed immediately.
+
+        Returns:
+            True if the queue drained within ``timeout``
+        """
+        self._queue.put(_FLUSH)
+        with self._idle:
+            return self._idle.wait_for(lambda: self._outstanding == 0, timeout=timeout)
+
+    async def aflush(self, timeout: Optional[float] = None) -> bool:
+        """Async variant of :meth:`flush` that does not block the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.flush, timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Flush outstanding commits and stop the worker thread."""
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
@@ -1,10 +1,14 @@
 """Git integration wrapper for DevPlan Orchestrator."""
 
 import logging
+import os
+from io import BytesIO
 from pathlib import Path
 from typing import List, Optional
 
-from git import GitCommandError, InvalidGitRepositoryError, Repo
+from git import Blob, Commit, GitCommandError, IndexFile, InvalidGitRepositoryError, Repo
+from git.index.typ import BaseIndexEntry
+from gitdb import IStream
 
 logger = logging.getLogger(__name__)
 
@@ -85,6 +89,69 @@ class GitManager:
             logger.error(f"Git commit failed: {e}")
             raise
 
+    def commit_paths(self, message: str, files: List[str]) -> Optional[str]:
+        """
+        Commit specific files without staging through the working-tree index.
+
+        Blobs are written straight into the object database and a tree is built
+        in a throwaway index seeded from HEAD, so no ``git add`` / status scan
+        of the working tree is needed. The repository index is then updated
+        with the same entries so ``git status`` stays clean.
+
+        Args:
+            message: Commit message.
+            files: File paths (absolute or relative to the repository root).
+
+        Returns:
+            str: The new commit SHA, or None if the tree did not change.
+
+        Raises:
+            InvalidGitRepositoryError: If not a valid Git repository.
+        """
+        if not self.is_repo():
+            raise InvalidGitRepositoryError(
+                f"Cannot commit: {self.repo_path} is not a valid Git repository"
+            )
+
+        root = Path(self.repo.working_tree_dir)
+        entries = []
+        for file in files:
+            path = Path(file)
+            if not path.is_absolute():
+                path = root / path
+            data = path.read_bytes()
+            istream = self.repo.odb.store(IStream(Blob.type, len(data), BytesIO(data)))
+            mode = 0o100755 if os.access(path, os.X_OK) else 0o100644
+            rel = path.resolve().relative_to(root.resolve()).as_posix()
+            entries.append(BaseIndexEntry((mode, istream.binsha, 0, rel)))
+
+        try:
+            parent = self.repo.head.commit
+        except ValueError:
+            parent = None  # Empty repository without HEAD
+
+        if parent is not None:
+            index = IndexFile.from_tree(self.repo, parent.tree)
+        else:
+            index = IndexFile.new(self.repo)
+        index.add(entries, write=False)
+        tree = index.write_tree()
+
+        if parent is not None and tree.binsha == parent.tree.binsha:
+            logger.info("No changes to commit")
+            return None
+
+        commit = Commit.create_from_tree(
+            self.repo,
+            tree,
+            message,
+            parent_commits=[parent] if parent is not None else [],
+            head=True,
+        )
+        self.repo.index.add(entries)
+        logger.info(f"Created commit {commit.hexsha[:7]}: {message.splitlines()[0]}")
+        return commit.hexsha
+
     def create_branch(self, name: str) -> None:
         """
         Create a new branch.
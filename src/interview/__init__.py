@@ -1,3 +1,9 @@
 """Interview-mode support utilities (repository analysis, etc.)."""
 
-from .repository_analyzer import RepoAnalysis, RepositoryAnalyzer
+from .code_index import CodeIndex, SearchHit
+from .conversation_memory import ConversationMemory, ConversationSummary
+from .repo_cache import RepoAnalysisCache
+from .repo_scanner import FileEntry, FileManifest, RepoScanner
+from .repository_analyzer import PackageAnalysis, RepoAnalysis, RepositoryAnalyzer
+from .structured_extractor import StructuredDataExtractor
+from .symbol_index import FileOutline, SymbolIndex
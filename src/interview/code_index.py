@@ -0,0 +1,369 @@
+"""BM25 inverted index over repository code.
+
+:class:`CodeIndex` splits each code file into top-level blocks (functions,
+classes and the module preamble), tokenizes their identifiers and text
+(``parseRepoTree`` and ``parse_repo_tree`` both yield ``parse``, ``repo``,
+``tree``), and ranks blocks for a free-text query with Okapi BM25. Path
+components are indexed with every block of a file so ``auth/session.py``
+matches "auth" even if the word never appears in the code.
+
+The index is updated incrementally from a :class:`FileManifest`: only files
+whose size or mtime changed are re-tokenized. It can be persisted next to the
+repository scan cache so later runs start warm.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+from ..artifact_writer import atomic_write_text
+from .repo_scanner import FileEntry, FileManifest
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+
+# Files larger than this are not indexed (generated bundles, fixtures)
+MAX_INDEXED_FILE_SIZE = 512 * 1024
+
+# Weight of path tokens relative to a single occurrence in the code
+PATH_BOOST = 3
+
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_SUBWORD = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+_TOP_LEVEL_DEF = re.compile(
+    r"^(?:export\s+(?:default\s+)?)?(?:pub(?:\([a-z]+\))?\s+)?(?:async\s+)?"
+    r"(?:def|class|function|func|fn|interface|struct|enum|trait|impl|type)\s+"
+    r"(?:\([^)]*\)\s*)?([A-Za-z_$][\w$]*)"
+)
+
+_STOPWORDS: Set[str] = {
+    # English
+    "the", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with", "by",
+    "from", "as", "is", "was", "are", "were", "be", "been", "it", "this", "that",
+    "these", "those", "an", "we", "you", "they", "our", "your", "their", "my",
+    "want", "need", "should", "would", "could", "will", "can", "into", "all",
+    # Language keywords that occur everywhere
+    "def", "self", "return", "import", "if", "else", "elif", "not", "none",
+    "true", "false", "null", "const", "let", "var", "new", "pass", "async",
+    "await", "try", "except", "finally", "raise", "while", "do", "cls",
+}
+
+
+def _normalize(token: str) -> str:
+    # Fold simple plurals so "models" matches "model"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> Iterator[str]:
+    """Yield normalized search terms for ``text``.
+
+    Identifiers are split on underscores and camelCase boundaries; compound
+    identifiers are also kept whole so exact names rank highest.
+    """
+    for identifier in _IDENTIFIER.findall(text):
+        parts = [p.lower() for p in _SUBWORD.findall(identifier)]
+        for part in parts:
+            if len(part) > 1 and part not in _STOPWORDS:
+                yield _normalize(part)
+        if len(parts) > 1:
+            yield identifier.lower().strip("_")
+
+
+@dataclass
+class Block:
+    """A contiguous, top-level region of a file indexed as one document."""
+
+    symbol: Optional[str]
+    start_line: int
+    end_line: int
+    length: int
+    terms: Dict[str, int]
+
+
+@dataclass
+class SearchHit:
+    """One ranked search result."""
+
+    path: str
+    score: float
+    symbol: Optional[str] = None
+    start_line: int = 1
+    end_line: int = 1
+    matched: List[str] = field(default_factory=list)
+
+
+def split_blocks(text: str) -> List[Tuple[Optional[str], int, int, str]]:
+    """Split source into ``(symbol, start_line, end_line, text)`` blocks.
+
+    A block starts at every unindented function/class-like definition; lines
+    before the first one form an unnamed preamble block.
+    """
+    lines = text.splitlines()
+    starts: List[Tuple[int, Optional[str]]] = [(0, None)]
+    for number, line in enumerate(lines):
+        match = _TOP_LEVEL_DEF.match(line)
+        if match:
+            if number == 0:
+                starts[0] = (0, match.group(1))
+            else:
+                starts.append((number, match.group(1)))
+    blocks = []
+    for i, (start, symbol) in enumerate(starts):
+        end = starts[i + 1][0] if i + 1 < len(starts) else len(lines)
+        body = "\n".join(lines[start:end])
+        if body.strip():
+            blocks.append((symbol, start + 1, max(start + 1, end), body))
+    return blocks
+
+
+class CodeIndex:
+    """Incrementally maintained BM25 index over a repository's code files."""
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        suffixes: Iterable[str],
+        k1: float = 1.2,
+        b: float = 0.75,
+    ) -> None:
+        """Initialize an empty index.
+
+        Args:
+            root: Repository root
+            suffixes: File suffixes to index (e.g. ``{".py", ".ts"}``)
+            k1: BM25 term-frequency saturation
+            b: BM25 length normalization
+        """
+        self.root = Path(root).resolve()
+        self.suffixes = frozenset(suffixes)
+        self.k1 = k1
+        self.b = b
+        # path -> (size, mtime_ns, blocks)
+        self._files: Dict[str, Tuple[int, int, List[Block]]] = {}
+        self._postings: Optional[Dict[str, List[Tuple[int, int]]]] = None
+        self._docs: List[Tuple[str, Block]] = []
+        self._avg_length = 0.0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def _indexable(self, entry: FileEntry) -> bool:
+        return (
+            not entry.is_binary
+            and entry.suffix in self.suffixes
+            and entry.size <= MAX_INDEXED_FILE_SIZE
+        )
+
+    def update(self, manifest: FileManifest) -> int:
+        """Bring the index in line with ``manifest``.
+
+        Returns:
+            Number of files (re-)tokenized or removed
+        """
+        changed = 0
+        with self._lock:
+            live: Set[str] = set()
+            for entry in manifest.files:
+                if not self._indexable(entry):
+                    continue
+                live.add(entry.path)
+                known = self._files.get(entry.path)
+                if known is not None and known[0] == entry.size and known[1] == entry.mtime_ns:
+                    continue
+                self._files[entry.path] = (entry.size, entry.mtime_ns, self._index_file(entry.path))
+                changed += 1
+            for path in [p for p in self._files if p not in live]:
+                del self._files[path]
+                changed += 1
+            if changed:
+                self._postings = None
+        if changed:
+            logger.debug(f"Code index for {self.root}: {changed} files updated, {len(self._files)} total")
+        return changed
+
+    def _index_file(self, rel_path: str) -> List[Block]:
+        try:
+            text = (self.root / rel_path).read_text(encoding="utf-8", errors="ignore")
+        except OSError:
+            return []
+        path_terms = Counter(tokenize(rel_path.replace("/", " ").replace(".", " ")))
+        blocks = []
+        for symbol, start, end, body in split_blocks(text):
+            terms = Counter(tokenize(body))
+            for term, count in path_terms.items():
+                terms[term] += count * PATH_BOOST
+            blocks.append(Block(symbol, start, end, sum(terms.values()), dict(terms)))
+        if not blocks and path_terms:
+            boosted = {term: count * PATH_BOOST for term, count in path_terms.items()}
+            blocks.append(Block(None, 1, 1, sum(boosted.values()), boosted))
+        return blocks
+
+    def _ensure_postings(self) -> Dict[str, List[Tuple[int, int]]]:
+        with self._lock:
+            if self._postings is not None:
+                return self._postings
+            postings: Dict[str, List[Tuple[int, int]]] = {}
+            docs: List[Tuple[str, Block]] = []
+            total = 0
+            for path in sorted(self._files):
+                for block in self._files[path][2]:
+                    doc_id = len(docs)
+                    docs.append((path, block))
+                    total += block.length
+                    for term, count in block.terms.items():
+                        postings.setdefault(term, []).append((doc_id, count))
+            self._docs = docs
+            self._avg_length = total / len(docs) if docs else 0.0
+            self._postings = postings
+            return postings
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        per_file: bool = True,
+        directories: Optional[Sequence[str]] = None,
+    ) -> List[SearchHit]:
+        """Rank indexed blocks against ``query``.
+
+        Args:
+            query: Free text (goals, phase titles, identifiers)
+            limit: Maximum hits returned
+            per_file: Keep only the best block of each file
+            directories: Restrict hits to files under these relative directories
+
+        Returns:
+            Hits ordered by descending BM25 score
+        """
+        terms = set(tokenize(query))
+        postings = self._ensure_postings()
+        if not terms or not self._docs:
+            return []
+        n_docs = len(self._docs)
+        scores: Dict[int, float] = {}
+        for term in terms:
+            matches = postings.get(term)
+            if not matches:
+                continue
+            idf = math.log(1 + (n_docs - len(matches) + 0.5) / (len(matches) + 0.5))
+            for doc_id, tf in matches:
+                length = self._docs[doc_id][1].length
+                norm = self.k1 * (1 - self.b + self.b * length / (self._avg_length or 1))
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        prefixes = [d.strip("/") + "/" for d in directories or [] if d.strip("/") not in ("", ".")]
+        restrict = bool(directories) and len(prefixes) == len(directories or [])
+        hits: List[SearchHit] = []
+        seen: Set[str] = set()
+        for doc_id, score in sorted(scores.items(), key=lambda item: (-item[1], item[0])):
+            path, block = self._docs[doc_id]
+            if restrict and not any(path.startswith(prefix) for prefix in prefixes):
+                continue
+            if per_file:
+                if path in seen:
+                    continue
+                seen.add(path)
+            matched = sorted(term for term in terms if term in block.terms)
+            hits.append(
+                SearchHit(path, score, block.symbol, block.start_line, block.end_line, matched)
+            )
+            if len(hits) >= limit:
+                break
+        return hits
+
+    def to_dict(self) -> Dict[str, object]:
+        with self._lock:
+            files = {
+                path: [
+                    size,
+                    mtime_ns,
+                    [[b.symbol, b.start_line, b.end_line, b.length, b.terms] for b in blocks],
+                ]
+                for path, (size, mtime_ns, blocks) in self._files.items()
+            }
+        return {
+            "version": INDEX_VERSION,
+            "root": str(self.root),
+            "suffixes": sorted(self.suffixes),
+            "files": files,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "CodeIndex":
+        index = cls(str(data["root"]), data["suffixes"])  # type: ignore[arg-type]
+        for path, (size, mtime_ns, blocks) in data["files"].items():  # type: ignore[union-attr]
+            index._files[path] = (size, mtime_ns, [Block(*block) for block in blocks])
+        return index
+
+    def save(self, path: Union[str, Path]) -> bool:
+        """Persist the index. Failures are logged, never raised."""
+        try:
+            atomic_write_text(path, json.dumps(self.to_dict(), separators=(",", ":")))
+        except OSError as e:
+            logger.warning(f"Could not write code index {path}: {e}")
+            return False
+        return True
+
+    @classmethod
+    def load(
+        cls, path: Union[str, Path], root: Union[str, Path], suffixes: Iterable[str]
+    ) -> Optional["CodeIndex"]:
+        """Load a persisted index built for the same root and suffixes."""
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable code index {path}: {e}")
+            return None
+        if (
+            data.get("version") != INDEX_VERSION
+            or data.get("root") != str(Path(root).resolve())
+            or set(data.get("suffixes", [])) != set(suffixes)
+        ):
+            return None
+        try:
+            return cls.from_dict(data)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Ignoring malformed code index {path}: {e}")
+            return None
+
+
+_live_indexes: Dict[Tuple[Path, frozenset], CodeIndex] = {}
+_live_lock = threading.Lock()
+
+
+def get_code_index(
+    manifest: FileManifest,
+    suffixes: Iterable[str],
+    cache_path: Optional[Union[str, Path]] = None,
+) -> CodeIndex:
+    """Return an up-to-date index for ``manifest.root``.
+
+    Indexes are kept per process, so repeated queries in one session only pay
+    for files that changed. With ``cache_path`` the index is also loaded from
+    and saved to disk.
+    """
+    key = (manifest.root, frozenset(suffixes))
+    with _live_lock:
+        index = _live_indexes.get(key)
+        if index is None and cache_path is not None:
+            index = CodeIndex.load(cache_path, manifest.root, key[1])
+        if index is None:
+            index = CodeIndex(manifest.root, key[1])
+        _live_indexes[key] = index
+    if index.update(manifest) and cache_path is not None:
+        index.save(cache_path)
+    return index
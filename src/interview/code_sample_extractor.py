@@ -10,10 +10,15 @@ This module extracts relevant code samples from a repository based on:
 
 import logging
 from pathlib import Path
-from typing import List, Dict, Optional, Set
-from dataclasses import dataclass
+from typing import List, Dict, Optional, Tuple
+from dataclasses import dataclass, replace
 
+from src.interview.code_index import CodeIndex, SearchHit, get_code_index
+from src.interview.context_packer import ContextCandidate, SAMPLE_HEADER, pack
+from src.interview.repo_cache import RepoAnalysisCache
+from src.interview.repo_scanner import DEFAULT_SKIP_DIRS, FileEntry, FileManifest, RepoScanner
 from src.interview.repository_analyzer import RepoAnalysis
+from src.interview.symbol_index import FileOutline, SymbolIndex, get_symbol_index
 
 logger = logging.getLogger(__name__)
 
@@ -28,12 +33,22 @@ class CodeSample:
     category: str  # 'architecture', 'pattern', 'test', 'relevant'
     language: Optional[str] = None
     line_count: int = 0
+    start_line: int = 1  # First line of ``content`` when it is an excerpt
+    representation: str = "source"  # 'source', 'outline' or 'summary'
 
 
 class CodeSampleExtractor:
     """Extracts relevant code samples from a repository."""
     
-    def __init__(self, root_path: str, max_samples: int = 10, max_lines_per_sample: int = 200):
+    def __init__(
+        self,
+        root_path: str,
+        max_samples: int = 10,
+        max_lines_per_sample: int = 200,
+        manifest: Optional[FileManifest] = None,
+        cache: Optional[RepoAnalysisCache] = None,
+        outline_threshold: Optional[int] = 80,
+    ):
         """
         Initialize the code sample extractor.
         
@@ -41,10 +56,19 @@ class CodeSampleExtractor:
             root_path: Root directory of the repository
             max_samples: Maximum number of samples to extract
             max_lines_per_sample: Maximum lines to include per sample
+            manifest: File manifest from a previous scan; defaults to the one
+                attached to the RepoAnalysis, scanning only if neither exists
+            cache: Optional cache used to persist the code search index
+                and symbol outlines
+            outline_threshold: Samples of files longer than this many lines
+                are shown as symbol outlines in prompts (None: never)
         """
         self.root_path = Path(root_path)
         self.max_samples = max_samples
         self.max_lines_per_sample = max_lines_per_sample
+        self.manifest = manifest
+        self.cache = cache
+        self.outline_threshold = outline_threshold
         
         # File extensions to consider for code samples
         self.code_extensions = {
@@ -64,7 +88,8 @@ class CodeSampleExtractor:
         self,
         analysis: RepoAnalysis,
         selected_parts: Optional[List[str]] = None,
-        goals: Optional[str] = None
+        goals: Optional[str] = None,
+        token_budget: Optional[int] = None,
     ) -> List[CodeSample]:
         """
         Extract code samples based on repository analysis and user goals.
@@ -73,6 +98,9 @@ class CodeSampleExtractor:
             analysis: Repository analysis results
             selected_parts: List of specific parts/directories user wants to focus on
             goals: User's stated development goals
+            token_budget: If set, consider every candidate sample and pack the
+                best mix of excerpts, outlines and summaries into this many
+                tokens instead of keeping the first ``max_samples``
             
         Returns:
             List of extracted code samples
@@ -90,7 +118,8 @@ class CodeSampleExtractor:
         
         # Extract goal-relevant samples if goals provided
         if goals:
-            samples.extend(self._extract_goal_relevant_samples(analysis, goals))
+            limit = 3 if token_budget is None else self.max_samples
+            samples.extend(self._extract_goal_relevant_samples(analysis, goals, limit=limit))
         
         # Extract samples from selected parts if specified
         if selected_parts:
@@ -98,10 +127,40 @@ class CodeSampleExtractor:
         
         # Deduplicate and limit samples
         samples = self._deduplicate_samples(samples)
+        if token_budget is not None:
+            return self.pack_samples(samples, token_budget)
         samples = samples[:self.max_samples]
         
         return samples
     
+    def _get_manifest(self, analysis: Optional[RepoAnalysis] = None) -> FileManifest:
+        """Return the shared file manifest for ``self.root_path``."""
+        root = self.root_path.resolve()
+        for candidate in (self.manifest, getattr(analysis, "manifest", None)):
+            if candidate is not None and candidate.root == root:
+                self.manifest = candidate
+                return candidate
+        self.manifest = RepoScanner(root, skip_dirs=DEFAULT_SKIP_DIRS | self.skip_dirs).scan()
+        return self.manifest
+
+    def _find(
+        self, analysis: RepoAnalysis, pattern: str, directory: str
+    ) -> List[Path]:
+        """Text files under ``directory`` matching ``pattern`` (rglob-style)."""
+        return [
+            self.root_path / entry.path
+            for entry in self._get_manifest(analysis).rglob(pattern, directory)
+            if not entry.is_binary
+        ]
+
+    def _code_files(self, analysis: RepoAnalysis, directory: str) -> List[FileEntry]:
+        """Non-binary code files under ``directory`` outside skipped dirs."""
+        return [
+            entry
+            for entry in self._get_manifest(analysis).with_suffix(self.code_extensions, directory)
+            if not entry.is_binary and not any(skip in entry.parts[:-1] for skip in self.skip_dirs)
+        ]
+
     def _extract_architecture_samples(self, analysis: RepoAnalysis) -> List[CodeSample]:
         """Extract key architectural files (entry points, main modules)."""
         samples = []
@@ -119,12 +178,8 @@ class CodeSampleExtractor:
         
         for pattern in patterns:
             for src_dir in analysis.structure.source_dirs:
-                src_path = self.root_path / src_dir
-                if not src_path.exists():
-                    continue
-                
                 # Search for pattern in source directory
-                matches = list(src_path.rglob(pattern))
+                matches = self._find(analysis, pattern, src_dir)
                 for match in matches[:2]:  # Limit to 2 per pattern
                     sample = self._read_file_sample(
                         match,
@@ -152,11 +207,7 @@ class CodeSampleExtractor:
         
         for pattern in pattern_files:
             for src_dir in analysis.structure.source_dirs:
-                src_path = self.root_path / src_dir
-                if not src_path.exists():
-                    continue
-                
-                matches = list(src_path.rglob(pattern))
+                matches = self._find(analysis, pattern, src_dir)
                 for match in matches[:1]:  # One per pattern
                     sample = self._read_file_sample(
                         match,
@@ -172,19 +223,20 @@ class CodeSampleExtractor:
         """Extract representative test files."""
         samples = []
         
+        if analysis.project_type == 'python':
+            test_patterns = ['test_*.py']
+        elif analysis.project_type in ['node', 'typescript']:
+            test_patterns = [
+                f'*.{kind}{ext}' for ext in sorted(self.code_extensions) for kind in ('test', 'spec')
+            ]
+        else:
+            test_patterns = []
+
         for test_dir in analysis.structure.test_dirs:
-            test_path = self.root_path / test_dir
-            if not test_path.exists():
-                continue
-            
             # Find test files
-            test_files = []
-            for ext in self.code_extensions:
-                if analysis.project_type == 'python' and ext == '.py':
-                    test_files.extend(test_path.rglob('test_*.py'))
-                elif analysis.project_type in ['node', 'typescript']:
-                    test_files.extend(test_path.rglob(f'*.test{ext}'))
-                    test_files.extend(test_path.rglob(f'*.spec{ext}'))
+            test_files: List[Path] = []
+            for pattern in test_patterns:
+                test_files.extend(self._find(analysis, pattern, test_dir))
             
             # Take first 2 test files
             for test_file in list(test_files)[:2]:
@@ -198,44 +250,45 @@ class CodeSampleExtractor:
         
         return samples
     
-    def _extract_goal_relevant_samples(self, analysis: RepoAnalysis, goals: str) -> List[CodeSample]:
-        """Extract samples relevant to user's stated goals."""
+    def get_index(self, analysis: Optional[RepoAnalysis] = None) -> CodeIndex:
+        """Return the BM25 index over this repository's code files."""
+        manifest = self._get_manifest(analysis)
+        cache_path = self.cache.index_path_for(manifest.root) if self.cache else None
+        return get_code_index(manifest, self.code_extensions, cache_path)
+
+    def search(
+        self, analysis: Optional[RepoAnalysis], query: str, limit: int = 5
+    ) -> List[SearchHit]:
+        """Rank source files (best-matching block per file) for ``query``.
+
+        Works for goals, phase titles or identifiers; hits are restricted to
+        the analysis' source directories when it has any.
+        """
+        source_dirs = list(analysis.structure.source_dirs) if analysis is not None else []
+        hits = self.get_index(analysis).search(query, limit=limit * 2, directories=source_dirs or None)
+        return [
+            hit for hit in hits
+            if not any(skip in Path(hit.path).parts[:-1] for skip in self.skip_dirs)
+        ][:limit]
+
+    def _extract_goal_relevant_samples(
+        self, analysis: RepoAnalysis, goals: str, limit: int = 3
+    ) -> List[CodeSample]:
+        """Extract samples relevant to user's stated goals, ranked by BM25."""
         samples = []
-        
-        # Simple keyword-based relevance (could be enhanced with embeddings/LLM)
-        keywords = self._extract_keywords_from_goals(goals)
-        
-        if not keywords:
-            return samples
-        
-        # Search for files matching keywords
-        for src_dir in analysis.structure.source_dirs:
-            src_path = self.root_path / src_dir
-            if not src_path.exists():
-                continue
-            
-            for code_file in src_path.rglob('*'):
-                if not code_file.is_file():
-                    continue
-                if code_file.suffix not in self.code_extensions:
-                    continue
-                if any(skip in code_file.parts for skip in self.skip_dirs):
-                    continue
-                
-                # Check if filename or path contains keywords
-                file_str = str(code_file).lower()
-                for keyword in keywords:
-                    if keyword in file_str:
-                        sample = self._read_file_sample(
-                            code_file,
-                            reason=f"Relevant to goal: {keyword}",
-                            category="relevant"
-                        )
-                        if sample:
-                            samples.append(sample)
-                            break  # One sample per file
-        
-        return samples[:3]  # Limit goal-relevant samples
+        for hit in self.search(analysis, goals, limit=limit):
+            reason = f"Relevant to goal: {', '.join(hit.matched[:3])}"
+            if hit.symbol:
+                reason += f" ({hit.symbol})"
+            sample = self._read_file_sample(
+                self.root_path / hit.path,
+                reason=reason,
+                category="relevant",
+                focus=(hit.start_line, hit.end_line),
+            )
+            if sample:
+                samples.append(sample)
+        return samples
     
     def _extract_from_selected_parts(
         self,
@@ -261,17 +314,17 @@ class CodeSampleExtractor:
                     samples.append(sample)
             else:
                 # Directory selected - get representative files
-                code_files = []
-                for ext in self.code_extensions:
-                    code_files.extend(part_path.rglob(f'*{ext}'))
+                try:
+                    rel_part = part_path.resolve().relative_to(self.root_path.resolve()).as_posix()
+                except ValueError:
+                    logger.debug(f"Selected part {part} is outside {self.root_path}")
+                    continue
+                code_files = self._code_files(analysis, rel_part)
                 
                 # Take first 2 files from selected directory
-                for code_file in list(code_files)[:2]:
-                    if any(skip in code_file.parts for skip in self.skip_dirs):
-                        continue
-                    
+                for entry in code_files[:2]:
                     sample = self._read_file_sample(
-                        code_file,
+                        self.root_path / entry.path,
                         reason=f"From selected part: {part}",
                         category="relevant"
                     )
@@ -284,9 +337,15 @@ class CodeSampleExtractor:
         self,
         file_path: Path,
         reason: str,
-        category: str
+        category: str,
+        focus: Optional[Tuple[int, int]] = None,
     ) -> Optional[CodeSample]:
-        """Read a file and create a code sample."""
+        """Read a file and create a code sample.
+
+        When the file is longer than ``max_lines_per_sample`` and ``focus``
+        gives a 1-based ``(start, end)`` line range, the sample is taken from
+        that range instead of the top of the file.
+        """
         try:
             # Make path relative to root
             rel_path = file_path.relative_to(self.root_path)
@@ -295,8 +354,14 @@ class CodeSampleExtractor:
             content = file_path.read_text(encoding='utf-8', errors='ignore')
             lines = content.splitlines()
             
-            # Truncate if too long
-            if len(lines) > self.max_lines_per_sample:
+            start = 1
+            if focus and len(lines) > self.max_lines_per_sample and focus[0] > 1:
+                start, end = focus
+                excerpt = lines[start - 1:min(end, start - 1 + self.max_lines_per_sample)]
+                content = f"# ... lines {start}-{start + len(excerpt) - 1} of {len(lines)}\n"
+                content += '\n'.join(excerpt)
+            elif len(lines) > self.max_lines_per_sample:
+                # Truncate if too long
                 content = '\n'.join(lines[:self.max_lines_per_sample])
                 content += f"\n\n... (truncated, {len(lines) - self.max_lines_per_sample} more lines)"
             
@@ -306,35 +371,14 @@ class CodeSampleExtractor:
                 reason=reason,
                 category=category,
                 language=file_path.suffix[1:] if file_path.suffix else None,
-                line_count=len(lines)
+                line_count=len(lines),
+                start_line=start,
             )
         
         except Exception as e:
             logger.debug(f"Could not read file {file_path}: {e}")
             return None
     
-    def _extract_keywords_from_goals(self, goals: str) -> Set[str]:
-        """Extract relevant keywords from user's goals."""
-        # Simple keyword extraction (could be enhanced)
-        # Remove common words and extract meaningful terms
-        common_words = {
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-            'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'be',
-            'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
-            'would', 'should', 'could', 'may', 'might', 'must', 'can', 'i', 'we',
-            'you', 'they', 'it', 'this', 'that', 'these', 'those', 'my', 'our',
-            'your', 'their', 'want', 'need', 'add', 'create', 'build', 'make'
-        }
-        
-        words = goals.lower().split()
-        keywords = {
-            word.strip('.,!?;:')
-            for word in words
-            if len(word) > 3 and word.lower() not in common_words
-        }
-        
-        return keywords
-    
     def _deduplicate_samples(self, samples: List[CodeSample]) -> List[CodeSample]:
         """Remove duplicate samples based on file path."""
         seen_paths = set()
@@ -347,21 +391,144 @@ class CodeSampleExtractor:
         
         return unique_samples
     
+    def pack_samples(self, samples: List[CodeSample], token_budget: int) -> List[CodeSample]:
+        """Choose how to show each sample so the formatted total fits ``token_budget``.
+
+        Every sample may appear as its source excerpt, a symbol outline or a
+        one-line summary, or be left out. Value favors user-selected and
+        goal-relevant samples, then architecture, patterns and tests, with
+        earlier samples preferred within a category; the combination with
+        the highest total value that fits is kept (multiple-choice knapsack).
+        """
+        candidates: List[ContextCandidate] = []
+        for position, sample in enumerate(samples):
+            weight = _CATEGORY_WEIGHTS.get(sample.category, 0.5) * 0.97 ** position
+            if sample.reason.startswith("User-selected"):
+                weight *= 1.5
+            key = sample.file_path
+            # Each file is outlined once and reused for every variant below
+            outline = self._outline(sample) if sample.representation == "source" else None
+            if outline is not None and not outline.symbols:
+                outline = None
+            rendered = self._render_outline(outline)
+            auto_outline = rendered if self._is_long_file(sample) else None
+            if auto_outline is not None:
+                # Long files are never shown in full; the outline is the best view
+                best = replace(sample, content=auto_outline, representation="outline")
+            else:
+                best = sample
+            candidates.append(ContextCandidate(
+                key,
+                self._format_sample(position + 1, best, best.content, best.representation),
+                weight,
+                payload=best,
+            ))
+            if outline is None:
+                continue
+            if auto_outline is None:
+                candidates.append(ContextCandidate(
+                    key,
+                    self._format_sample(position + 1, sample, rendered, "outline"),
+                    0.6 * weight,
+                    payload=replace(sample, content=rendered, representation="outline"),
+                ))
+            summary = outline.summary()
+            candidates.append(ContextCandidate(
+                key,
+                self._format_sample(position + 1, sample, summary, "summary"),
+                0.25 * weight,
+                payload=replace(sample, content=summary, representation="summary"),
+            ))
+        packed = [candidate.payload for candidate in pack(candidates, token_budget)]
+        logger.debug(
+            f"Packed {len(packed)} of {len(samples)} code samples into {token_budget} tokens "
+            f"({sum(1 for s in packed if s.representation != 'source')} condensed)"
+        )
+        return packed
+
+    def _symbol_index(self) -> SymbolIndex:
+        return get_symbol_index(self.cache.symbols_path(self.root_path) if self.cache else None)
+
+    def _outline(self, sample: CodeSample) -> Optional[FileOutline]:
+        manifest = self._get_manifest()
+        entry = manifest.get(sample.file_path)
+        if entry is not None:
+            # Unchanged files are outlined from the cache without being read
+            return self._symbol_index().outline_file(manifest.root, entry)
+        try:
+            text = (self.root_path / sample.file_path).read_text(encoding='utf-8', errors='ignore')
+        except OSError:
+            text = sample.content
+        return self._symbol_index().outline_text(sample.file_path, text)
+
+    def _is_long_file(self, sample: CodeSample) -> bool:
+        """True for whole-file source samples longer than ``outline_threshold``."""
+        return not (
+            self.outline_threshold is None
+            or sample.representation != "source"
+            or sample.start_line > 1
+            or sample.line_count <= self.outline_threshold
+        )
+
+    def _render_outline(self, outline: Optional[FileOutline]) -> Optional[str]:
+        if outline is None or not outline.symbols:
+            return None
+        return outline.render(max_lines=max(10, self.max_lines_per_sample // 2))
+
+    def _outline_for(self, sample: CodeSample) -> Optional[str]:
+        """Symbol outline for a long, whole-file sample, or None to keep its content."""
+        if not self._is_long_file(sample):
+            return None
+        return self._render_outline(self._outline(sample))
+
+    def _format_sample(
+        self, number: int, sample: CodeSample, body: str, representation: str = "source"
+    ) -> str:
+        lines = [
+            f"{SAMPLE_HEADER}{number}: {sample.file_path}",
+            f"**Reason**: {sample.reason}",
+            f"**Category**: {sample.category}",
+        ]
+        if sample.language:
+            lines.append(f"**Language**: {sample.language}")
+        if representation == "source":
+            lines.append(f"**Lines**: {sample.line_count}")
+        else:
+            lines.append(f"**Lines**: {sample.line_count} ({representation})")
+        if representation == "summary":
+            lines.append(f"**Symbols**: {body}\n")
+        else:
+            lines.append(f"\n```{sample.language or ''}")
+            lines.append(body)
+            lines.append("```\n")
+        return "\n".join(lines)
+
     def format_samples_for_prompt(self, samples: List[CodeSample]) -> str:
-        """Format code samples for inclusion in LLM prompts."""
+        """Format code samples for inclusion in LLM prompts.
+
+        Files longer than ``outline_threshold`` lines are rendered as symbol
+        outlines (signatures and docstring summaries) instead of truncated
+        source, which keeps their structure at a fraction of the tokens.
+        Samples already condensed by :meth:`pack_samples` are shown as packed.
+        """
         if not samples:
             return "No code samples available."
         
         formatted = []
         for i, sample in enumerate(samples, 1):
-            formatted.append(f"### Sample {i}: {sample.file_path}")
-            formatted.append(f"**Reason**: {sample.reason}")
-            formatted.append(f"**Category**: {sample.category}")
-            if sample.language:
-                formatted.append(f"**Language**: {sample.language}")
-            formatted.append(f"**Lines**: {sample.line_count}")
-            formatted.append(f"\n```{sample.language or ''}")
-            formatted.append(sample.content)
-            formatted.append("```\n")
+            outline = self._outline_for(sample)
+            if outline is not None:
+                formatted.append(self._format_sample(i, sample, outline, "outline"))
+            else:
+                formatted.append(self._format_sample(i, sample, sample.content, sample.representation))
         
         return '\n'.join(formatted)
+
+
+# Relative value of sample categories when packing to a token budget
+_CATEGORY_WEIGHTS: Dict[str, float] = {
+    'relevant': 1.0,
+    'architecture': 0.8,
+    'pattern': 0.6,
+    'test': 0.5,
+}
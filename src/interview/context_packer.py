@@ -0,0 +1,130 @@
+"""Token-budgeted packing of prompt context.
+
+Repository context competes for a fixed prompt budget. Instead of taking the
+first N code samples and truncating each one, callers describe every piece of
+context as one or more :class:`ContextCandidate` variants (full excerpt,
+symbol outline, one-line summary), each with an estimated token cost and a
+relevance value. :func:`pack` then solves the multiple-choice knapsack: at
+most one variant per item, total tokens within budget, maximum total value.
+
+Token counts are estimated from character length, which is accurate enough
+for budgeting and needs no tokenizer dependency.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+CHARS_PER_TOKEN = 4
+
+# Largest DP table width; budgets above this are bucketed
+_MAX_CELLS = 512
+
+SAMPLE_HEADER = "### Sample "
+_SAMPLE_SPLIT = re.compile(r"(?m)^(?=### Sample \d+: )")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for ``text`` (about four characters per token)."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+@dataclass
+class ContextCandidate:
+    """One way of including an item in the prompt."""
+
+    key: str  # Item identity; at most one candidate per key is chosen
+    text: str
+    value: float
+    tokens: int = -1
+    payload: Any = None
+
+    def __post_init__(self) -> None:
+        if self.tokens < 0:
+            self.tokens = estimate_tokens(self.text)
+
+
+def pack(candidates: Sequence[ContextCandidate], budget: int) -> List[ContextCandidate]:
+    """Choose at most one candidate per key maximizing value within ``budget`` tokens.
+
+    Returns the chosen candidates in the order their keys first appear.
+    """
+    groups: Dict[str, List[ContextCandidate]] = {}
+    for candidate in candidates:
+        if candidate.value > 0 and candidate.tokens <= budget:
+            groups.setdefault(candidate.key, []).append(candidate)
+    if not groups or budget <= 0:
+        return []
+
+    # Bucket token costs so the table stays small for large budgets; costs
+    # round up, so the chosen set never exceeds the real budget.
+    unit = max(1, -(-budget // _MAX_CELLS))
+    cells = budget // unit
+    keys = list(groups)
+    best = [0.0] * (cells + 1)
+    choices: List[List[int]] = []
+    for key in keys:
+        options = groups[key]
+        weights = [-(-option.tokens // unit) for option in options]
+        new_best = best[:]
+        choice = [-1] * (cells + 1)
+        for capacity in range(cells + 1):
+            for index, option in enumerate(options):
+                weight = weights[index]
+                if weight <= capacity:
+                    value = best[capacity - weight] + option.value
+                    if value > new_best[capacity]:
+                        new_best[capacity] = value
+                        choice[capacity] = index
+        choices.append(choice)
+        best = new_best
+
+    chosen: Dict[str, ContextCandidate] = {}
+    capacity = max(range(cells + 1), key=lambda c: (best[c], -c))
+    for key, choice in zip(reversed(keys), reversed(choices)):
+        index = choice[capacity]
+        if index >= 0:
+            option = groups[key][index]
+            chosen[key] = option
+            capacity -= -(-option.tokens // unit)
+    return [chosen[key] for key in keys if key in chosen]
+
+
+def fit_formatted_samples(text: Optional[str], budget: Optional[int]) -> Optional[str]:
+    """Fit a ``format_samples_for_prompt`` string into ``budget`` tokens.
+
+    Used where only the formatted text is available (e.g. code samples handed
+    to the pipeline). Each sample is kept whole, reduced to its header, or
+    dropped; earlier samples are worth more. Text already within budget is
+    returned unchanged; text without sample sections, or whose pieces do not
+    fit, is truncated to the budget instead.
+    """
+    if not text or not budget or budget <= 0 or estimate_tokens(text) <= budget:
+        return text
+    sections = [s for s in _SAMPLE_SPLIT.split(text) if s.strip()]
+    candidates: List[ContextCandidate] = []
+    for position, section in enumerate(sections):
+        weight = 0.97 ** position
+        key = str(position)
+        candidates.append(ContextCandidate(key, section, weight))
+        header, _, _ = section.partition("\n```")
+        if header != section:
+            candidates.append(ContextCandidate(key, header.rstrip() + "\n", 0.25 * weight))
+    chosen = pack(candidates, budget)
+    if not chosen:
+        return _truncate_to_budget(text, budget)
+    return "\n".join(c.text.rstrip("\n") for c in chosen)
+
+
+def _truncate_to_budget(text: str, budget: int, marker: str = "\n... (truncated)") -> str:
+    """Cut ``text`` to at most ``budget`` tokens, at a line break where possible."""
+    limit = budget * CHARS_PER_TOKEN - len(marker)
+    if limit <= 0:
+        return ""
+    cut = text[:limit]
+    newline = cut.rfind("\n")
+    if newline > limit // 2:
+        cut = cut[:newline]
+    return cut.rstrip() + marker
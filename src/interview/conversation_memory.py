@@ -0,0 +1,362 @@
+"""Rolling memory for long conversations.
+
+Interview and refinement chats resend their whole history on every turn, so
+prompt size and latency grow with the conversation. :class:`ConversationMemory`
+keeps the most recent turns verbatim and folds everything older into a
+:class:`ConversationSummary`: details settled so far, questions still open, and
+one short note per earlier exchange.
+
+Folding is incremental: only messages that have just left the verbatim window
+are summarized. With an LLM summarizer the update runs as a background task
+between user inputs; without one, or when the background update is late, a
+cheap heuristic fold is used so a turn never waits long on summarization.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+Message = Dict[str, str]
+Summarizer = Callable[[str], Awaitable[str]]
+
+NOTE_CHARS = 200
+QUESTION_CHARS = 160
+MAX_NOTES = 40
+MAX_OPEN_QUESTIONS = 8
+
+_QUESTION = re.compile(r"[^.?!\n]*\?")
+_UNSURE = re.compile(
+    r"^\s*(not sure|unsure|idk|i don'?t know|dunno|later|skip|tbd|no idea)\b", re.IGNORECASE
+)
+
+SUMMARY_PROMPT = """You maintain a compact running summary of a project-planning conversation.
+Update the current summary with the new messages and return ONLY a JSON object:
+{{"fields": {{...}}, "open_questions": ["..."], "notes": ["..."]}}
+
+- fields: concrete details the user has settled (project name, languages, frameworks, constraints, ...)
+- open_questions: questions that are still unanswered or were explicitly deferred
+- notes: at most {max_notes} short bullets of other decisions and context, newest last
+
+Current summary:
+{current}
+
+New messages:
+{transcript}
+"""
+
+
+def _clip(text: str, limit: int) -> str:
+    text = " ".join(str(text).split())
+    return text if len(text) <= limit else text[: limit - 1] + "…"
+
+
+def _questions(text: str) -> List[str]:
+    found = []
+    for match in _QUESTION.findall(text):
+        question = match.strip(" -*#>\t")
+        if len(question) > 8:
+            found.append(_clip(question, QUESTION_CHARS))
+    return found
+
+
+def _digest(messages: Sequence[Message]) -> str:
+    digest = hashlib.sha1()
+    for message in messages:
+        digest.update(str(message.get("role", "")).encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(str(message.get("content", "")).encode("utf-8", "replace"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _format_value(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        return ", ".join(str(item) for item in value)
+    return str(value)
+
+
+@dataclass
+class ConversationSummary:
+    """Structured summary of the messages that left the verbatim window."""
+
+    fields: Dict[str, Any] = field(default_factory=dict)
+    open_questions: List[str] = field(default_factory=list)
+    notes: List[str] = field(default_factory=list)
+    messages: int = 0  # Number of messages folded into this summary
+    # Questions from the last folded assistant message, awaiting the user's reply
+    asked: List[str] = field(default_factory=list)
+
+    def copy(self) -> "ConversationSummary":
+        return ConversationSummary(
+            dict(self.fields),
+            list(self.open_questions),
+            list(self.notes),
+            self.messages,
+            list(self.asked),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "fields": self.fields,
+            "open_questions": self.open_questions,
+            "notes": self.notes,
+        }
+
+    def render(self, fields: Optional[Dict[str, Any]] = None, max_chars: int = 4000) -> str:
+        """Render as prompt text; ``fields`` (e.g. already extracted data) take precedence.
+
+        Notes are dropped oldest first to stay within ``max_chars``.
+        """
+        merged = dict(self.fields)
+        for key, value in (fields or {}).items():
+            if value not in (None, "", [], {}):
+                merged[key] = value
+
+        lines = [f"Summary of the {self.messages} earlier messages:"]
+        if merged:
+            lines.append("Known details:")
+            lines.extend(f"- {key}: {_clip(_format_value(value), NOTE_CHARS)}" for key, value in merged.items())
+        if self.open_questions:
+            lines.append("Open questions:")
+            lines.extend(f"- {question}" for question in self.open_questions)
+
+        used = sum(len(line) + 1 for line in lines)
+        kept: List[str] = []
+        for note in reversed(self.notes):
+            if used + len(note) + 3 > max_chars:
+                break
+            kept.append(f"- {note}")
+            used += len(note) + 3
+        if kept:
+            lines.append("Earlier discussion:")
+            omitted = len(self.notes) - len(kept)
+            if omitted:
+                lines.append(f"- ({omitted} earlier exchanges omitted)")
+            lines.extend(reversed(kept))
+        return "\n".join(lines)
+
+
+def fold_messages(summary: ConversationSummary, messages: Sequence[Message]) -> ConversationSummary:
+    """Heuristically fold ``messages`` into a copy of ``summary``.
+
+    Each user reply becomes a note paired with the question it answers;
+    questions the user deferred ("not sure", "later", ...) become open.
+    """
+    folded = summary.copy()
+    for message in messages:
+        role = message.get("role")
+        content = str(message.get("content", ""))
+        if role == "assistant":
+            folded.asked = _questions(content)
+        elif role == "user":
+            if folded.asked and _UNSURE.match(content):
+                for question in folded.asked:
+                    if question not in folded.open_questions:
+                        folded.open_questions.append(question)
+            answer = _clip(content, NOTE_CHARS)
+            if folded.asked:
+                folded.notes.append(f"{folded.asked[-1]} → {answer}")
+            else:
+                folded.notes.append(answer)
+            folded.asked = []
+        elif content.strip():
+            folded.notes.append(f"(context) {_clip(content, NOTE_CHARS)}")
+    folded.open_questions = folded.open_questions[-MAX_OPEN_QUESTIONS:]
+    folded.notes = folded.notes[-MAX_NOTES:]
+    folded.messages += len(messages)
+    return folded
+
+
+def _parse_summary(text: str) -> Dict[str, Any]:
+    start, end = text.find("{"), text.rfind("}")
+    if start < 0 or end <= start:
+        raise ValueError("no JSON object in summary response")
+    data = json.loads(text[start:end + 1])
+    if not isinstance(data, dict):
+        raise ValueError("summary response is not an object")
+    fields = data.get("fields") or {}
+    questions = data.get("open_questions") or []
+    notes = data.get("notes") or []
+    if not isinstance(fields, dict) or not isinstance(questions, list) or not isinstance(notes, list):
+        raise ValueError("summary response has the wrong shape")
+    return {
+        "fields": fields,
+        "open_questions": [_clip(q, QUESTION_CHARS) for q in questions if str(q).strip()],
+        "notes": [_clip(n, NOTE_CHARS) for n in notes if str(n).strip()],
+    }
+
+
+class ConversationMemory:
+    """Keep the last turns verbatim and a rolling summary of the rest.
+
+    Callers pass the conversation body (everything after the leading system
+    prompts) on every turn. Nothing is folded until the verbatim part exceeds
+    ``max_chars``; then all but the last ``keep_turns`` user turns are folded.
+    The first ``pinned`` messages (e.g. a design document the chat is about)
+    are never folded.
+    """
+
+    def __init__(
+        self,
+        keep_turns: int = 6,
+        max_chars: int = 12000,
+        summarizer: Optional[Summarizer] = None,
+        pinned: int = 0,
+        timeout: float = 20.0,
+        max_summary_chars: int = 4000,
+    ) -> None:
+        self.keep_turns = max(1, keep_turns)
+        self.max_chars = max_chars
+        self.summarizer = summarizer
+        self.pinned = pinned
+        self.timeout = timeout
+        self.max_summary_chars = max_summary_chars
+        self.summary = ConversationSummary()
+        self._digest = _digest([])
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_config(
+        cls, config: Any, summarizer: Optional[Summarizer] = None, pinned: int = 0
+    ) -> "ConversationMemory":
+        """Build from ``config.conversation_memory``; the summarizer is used only if enabled."""
+        settings = getattr(config, "conversation_memory", None)
+        use_llm = bool(getattr(settings, "summarize_with_llm", False))
+        return cls(
+            keep_turns=getattr(settings, "keep_turns", 6),
+            max_chars=getattr(settings, "max_history_chars", 12000),
+            summarizer=summarizer if use_llm else None,
+            pinned=pinned,
+            timeout=getattr(settings, "summary_timeout", 20.0),
+        )
+
+    def reset(self) -> None:
+        self.cancel()
+        self.summary = ConversationSummary()
+        self._digest = _digest([])
+
+    def cancel(self) -> None:
+        """Cancel a pending background update."""
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+
+    def _folded_end(self) -> int:
+        return self.pinned + self.summary.messages
+
+    def _consistent(self, messages: Sequence[Message]) -> bool:
+        end = self._folded_end()
+        if self.summary.messages == 0:
+            return True
+        return len(messages) >= end and _digest(messages[self.pinned:end]) == self._digest
+
+    def fold_point(self, messages: Sequence[Message]) -> int:
+        """Index before which ``messages`` are summarized instead of sent verbatim."""
+        start = self._folded_end()
+        tail = messages[start:]
+        if self.max_chars <= 0 or sum(len(str(m.get("content", ""))) for m in tail) <= self.max_chars:
+            return start
+        user_indexes = [i for i, m in enumerate(tail) if m.get("role") == "user"]
+        if len(user_indexes) <= self.keep_turns:
+            return start
+        return start + user_indexes[-self.keep_turns]
+
+    def view(self, messages: Sequence[Message]) -> Tuple[Optional[ConversationSummary], List[Message]]:
+        """Fold whatever left the window and return ``(summary, verbatim messages)``.
+
+        ``summary`` is ``None`` while nothing has been folded. The verbatim
+        messages are the pinned ones followed by the recent tail.
+        """
+        if not self._consistent(messages):
+            self.reset()
+        start = self._folded_end()
+        cut = self.fold_point(messages)
+        if cut > start:
+            self.summary = fold_messages(self.summary, messages[start:cut])
+            self._digest = _digest(messages[self.pinned:cut])
+        recent = list(messages[:self.pinned]) + list(messages[self._folded_end():])
+        return (self.summary if self.summary.messages else None), recent
+
+    async def prepare(
+        self, messages: Sequence[Message]
+    ) -> Tuple[Optional[ConversationSummary], List[Message]]:
+        """Like :meth:`view`, but first wait (bounded) for a pending background update."""
+        task, self._task = self._task, None
+        if task is not None:
+            try:
+                await asyncio.wait_for(asyncio.shield(task), self.timeout)
+            except asyncio.TimeoutError:
+                logger.debug("Background conversation summary timed out; folding heuristically")
+                task.cancel()
+            except Exception as exc:
+                logger.debug(f"Background conversation summary failed: {exc}")
+        return self.view(messages)
+
+    def schedule(self, messages: Sequence[Message]) -> None:
+        """Start summarizing messages that have left the window, in the background.
+
+        Does nothing without a summarizer, outside a running event loop, or
+        while an earlier update is still pending.
+        """
+        if self.summarizer is None or (self._task is not None and not self._task.done()):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if not self._consistent(messages):
+            self.reset()
+        start = self._folded_end()
+        cut = self.fold_point(messages)
+        if cut <= start:
+            return
+        base = self.summary.copy()
+        batch = [dict(m) for m in messages[start:cut]]
+        digest = _digest(messages[self.pinned:cut])
+
+        async def update() -> None:
+            summary = await self._summarize(base, batch)
+            # Apply only if nothing was folded in the meantime
+            if self.summary.messages == base.messages:
+                self.summary = summary
+                self._digest = digest
+
+        self._task = loop.create_task(update())
+
+    async def _summarize(
+        self, base: ConversationSummary, batch: Sequence[Message]
+    ) -> ConversationSummary:
+        transcript = "\n\n".join(
+            f"{m.get('role', 'user').capitalize()}: {m.get('content', '')}" for m in batch
+        )
+        prompt = SUMMARY_PROMPT.format(
+            max_notes=MAX_NOTES,
+            current=json.dumps(base.to_dict(), indent=2),
+            transcript=transcript,
+        )
+        try:
+            parsed = _parse_summary(await self.summarizer(prompt))
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.debug(f"LLM conversation summary unusable ({exc}); folding heuristically")
+            return fold_messages(base, batch)
+        heuristic = fold_messages(base, batch)
+        return ConversationSummary(
+            fields={**base.fields, **parsed["fields"]},
+            open_questions=parsed["open_questions"][-MAX_OPEN_QUESTIONS:],
+            notes=parsed["notes"][-MAX_NOTES:],
+            messages=heuristic.messages,
+            asked=heuristic.asked,
+        )
+
+    def render(self, summary: Optional[ConversationSummary], fields: Optional[Dict[str, Any]] = None) -> str:
+        return summary.render(fields, self.max_summary_chars) if summary is not None else ""
@@ -0,0 +1,113 @@
+"""Persistent cache of repository scan manifests.
+
+The expensive part of :meth:`RepositoryAnalyzer.analyze` is the per-file scan
+(stat, binary sniffing, line counting); everything else reads a handful of
+top-level files. :class:`RepoAnalysisCache` stores the :class:`FileManifest`
+from the last scan of each root so that the next ``analyze-repo``, interview
+repo mode or interactive design run can either reuse it outright (unchanged
+git tree) or re-read only the files whose size or mtime changed.
+
+Entries live under ``$DEVUSSY_CACHE_DIR/repo_analysis`` (default
+``$XDG_CACHE_HOME/devussy`` or ``~/.cache/devussy``), one JSON file per root,
+with the root's BM25 code index (see :mod:`src.interview.code_index`) and
+symbol outlines (see :mod:`src.interview.symbol_index`) beside it.
+Set ``DEVUSSY_REPO_CACHE=0`` to disable caching.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Optional, Union
+
+from ..artifact_writer import atomic_write_text
+from .repo_scanner import FileManifest
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+
+
+def default_cache_dir() -> Path:
+    """Base directory for devussy caches."""
+    configured = os.getenv("DEVUSSY_CACHE_DIR")
+    if configured:
+        return Path(configured)
+    xdg = os.getenv("XDG_CACHE_HOME")
+    return (Path(xdg) if xdg else Path.home() / ".cache") / "devussy"
+
+
+class RepoAnalysisCache:
+    """Load and store scan manifests keyed by repository root."""
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None) -> None:
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory for cache files (default: ``default_cache_dir()/repo_analysis``)
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir() / "repo_analysis"
+
+    @classmethod
+    def from_env(cls) -> Optional["RepoAnalysisCache"]:
+        """Return a cache unless ``DEVUSSY_REPO_CACHE`` disables it."""
+        if os.getenv("DEVUSSY_REPO_CACHE", "1").strip().lower() in ("0", "false", "no", "off"):
+            return None
+        return cls()
+
+    def _key(self, root: Union[str, Path]) -> str:
+        return hashlib.sha256(str(Path(root).resolve()).encode("utf-8")).hexdigest()[:24]
+
+    def path_for(self, root: Union[str, Path]) -> Path:
+        return self.cache_dir / f"{self._key(root)}.json"
+
+    def index_path_for(self, root: Union[str, Path]) -> Path:
+        """Where the code search index for ``root`` is persisted."""
+        return self.cache_dir / f"{self._key(root)}.index.json"
+
+    def symbols_path(self, root: Union[str, Path]) -> Path:
+        """Where symbol outlines for ``root`` are persisted."""
+        return self.cache_dir / f"{self._key(root)}.symbols.json"
+
+    def load(self, root: Union[str, Path]) -> Optional[FileManifest]:
+        """Return the cached manifest for ``root``, or None if missing or unusable."""
+        path = self.path_for(root)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable repository cache {path}: {e}")
+            return None
+        if data.get("version") != CACHE_VERSION:
+            return None
+        try:
+            manifest = FileManifest.from_dict(data["manifest"])
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Ignoring malformed repository cache {path}: {e}")
+            return None
+        if manifest.root != Path(root).resolve():
+            return None
+        return manifest
+
+    def save(self, manifest: FileManifest) -> Optional[Path]:
+        """Persist ``manifest``. Failures are logged, never raised."""
+        path = self.path_for(manifest.root)
+        payload = {"version": CACHE_VERSION, "manifest": manifest.to_dict()}
+        try:
+            atomic_write_text(path, json.dumps(payload, separators=(",", ":")))
+        except OSError as e:
+            logger.warning(f"Could not write repository cache {path}: {e}")
+            return None
+        return path
+
+    def clear(self, root: Union[str, Path]) -> None:
+        """Drop the cached manifest, code index and symbol outlines for ``root``."""
+        for path in (self.path_for(root), self.index_path_for(root), self.symbols_path(root)):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
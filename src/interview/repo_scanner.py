@@ -0,0 +1,438 @@
+"""Single-pass, parallel repository scanner.
+
+:class:`RepoScanner` lists a repository once and produces a
+:class:`FileManifest` that :class:`~src.interview.repository_analyzer.RepositoryAnalyzer`
+and :class:`~src.interview.code_sample_extractor.CodeSampleExtractor` both
+query, instead of each walking the tree (and re-walking it per extension and
+keyword) on its own.
+
+Listing uses ``git ls-files`` when the root is inside a git work tree, so
+``.gitignore`` is honored for free, and falls back to an ``os.scandir`` walk
+otherwise. Per-file work (stat, binary sniffing and line counting with
+buffered ``bytes.count``) runs on a thread pool since it is dominated by I/O.
+
+Given the manifest from an earlier scan, :meth:`RepoScanner.scan` returns it
+unchanged when the git tree key and the untracked files it listed are
+unchanged, and otherwise only re-reads files whose size or mtime changed.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import hashlib
+import logging
+import os
+import shutil
+import stat
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SKIP_DIRS: Set[str] = {
+    '.git', '.svn', '.hg', '__pycache__', '.pytest_cache', '.mypy_cache',
+    'node_modules', '.venv', 'venv', 'env', 'build', 'dist', 'target',
+    'coverage', '.coverage', 'htmlcov', '.tox', 'eggs', '.eggs',
+}
+
+# Files larger than this are listed but not read
+DEFAULT_MAX_FILE_SIZE = 10 * 1024 * 1024
+
+_SNIFF_BYTES = 8192
+_READ_BLOCK = 1024 * 1024
+_BATCH_SIZE = 256
+
+
+@dataclass(frozen=True)
+class FileEntry:
+    """One file in the manifest, with its path relative to the scan root."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    is_binary: bool = False
+    line_count: int = 0
+
+    @property
+    def name(self) -> str:
+        return self.path.rsplit("/", 1)[-1]
+
+    @property
+    def suffix(self) -> str:
+        name = self.name
+        dot = name.rfind(".")
+        return name[dot:] if dot > 0 else ""
+
+    @property
+    def parts(self) -> Tuple[str, ...]:
+        return tuple(self.path.split("/"))
+
+
+@dataclass
+class FileManifest:
+    """Every file found by a scan, sorted by relative path."""
+
+    root: Path
+    files: List[FileEntry]
+    source: str = "walk"  # "git", "walk" or "cache"
+    scan_seconds: float = 0.0
+    # Identifies the exact git tree state the manifest was built from
+    tree_key: Optional[str] = None
+    # Entries carried over from a previous manifest without re-reading
+    reused: int = 0
+    # Files git listed as untracked; their stats are folded into tree_key
+    untracked: List[str] = field(default_factory=list)
+    _by_path: Dict[str, FileEntry] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._by_path = {entry.path: entry for entry in self.files}
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def get(self, path: str) -> Optional[FileEntry]:
+        """Look up an entry by relative POSIX path."""
+        return self._by_path.get(path)
+
+    @property
+    def total_lines(self) -> int:
+        return sum(entry.line_count for entry in self.files)
+
+    def under(self, directory: str = "") -> Iterator[FileEntry]:
+        """Yield entries inside ``directory`` (relative; ``""`` for all)."""
+        prefix = directory.strip("/").replace("\\", "/")
+        if not prefix or prefix == ".":
+            yield from self.files
+            return
+        prefix += "/"
+        for entry in self.files:
+            if entry.path.startswith(prefix):
+                yield entry
+
+    def rglob(self, pattern: str, directory: str = "") -> List[FileEntry]:
+        """Entries under ``directory`` matching ``pattern`` like ``Path.rglob``.
+
+        The pattern is matched against the trailing path components, so
+        ``"test_*.py"`` matches at any depth and ``"cmd/main.go"`` matches any
+        ``.../cmd/main.go``.
+        """
+        pattern_parts = pattern.strip("/").split("/")
+        depth = len(pattern_parts)
+        base_depth = len(directory.strip("/").split("/")) if directory.strip("/. ") else 0
+        matches = []
+        for entry in self.under(directory):
+            parts = entry.parts
+            if len(parts) - base_depth < depth:
+                continue
+            tail = parts[-depth:]
+            if all(fnmatch.fnmatchcase(p, pat) for p, pat in zip(tail, pattern_parts)):
+                matches.append(entry)
+        return matches
+
+    def with_suffix(self, suffixes: Iterable[str], directory: str = "") -> List[FileEntry]:
+        """Entries under ``directory`` whose suffix is in ``suffixes``."""
+        wanted = set(suffixes)
+        return [entry for entry in self.under(directory) if entry.suffix in wanted]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "root": str(self.root),
+            "source": self.source,
+            "tree_key": self.tree_key,
+            "untracked": self.untracked,
+            "files": [
+                [e.path, e.size, e.mtime_ns, int(e.is_binary), e.line_count] for e in self.files
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FileManifest":
+        return cls(
+            root=Path(data["root"]),
+            files=[
+                FileEntry(path, size, mtime_ns, bool(is_binary), lines)
+                for path, size, mtime_ns, is_binary, lines in data["files"]
+            ],
+            source=data.get("source", "walk"),
+            tree_key=data.get("tree_key"),
+            untracked=data.get("untracked", []),
+        )
+
+
+def count_lines(path: Union[str, Path], size: Optional[int] = None) -> Tuple[bool, int]:
+    """Return ``(is_binary, line_count)`` for a file.
+
+    A file is binary when its first 8 KiB contain a NUL byte. Lines are
+    counted as newlines plus one for a final unterminated line.
+    """
+    with open(path, "rb") as f:
+        head = f.read(_SNIFF_BYTES)
+        if b"\0" in head:
+            return True, 0
+        if not head:
+            return False, 0
+        lines = head.count(b"\n")
+        last = head[-1:]
+        if size is None or size > len(head):
+            while True:
+                block = f.read(_READ_BLOCK)
+                if not block:
+                    break
+                lines += block.count(b"\n")
+                last = block[-1:]
+    if last != b"\n":
+        lines += 1
+    return False, lines
+
+
+class RepoScanner:
+    """List a repository once and build a :class:`FileManifest`."""
+
+    def __init__(
+        self,
+        root_path: Union[Path, str],
+        skip_dirs: Optional[Set[str]] = None,
+        max_workers: Optional[int] = None,
+        max_file_size: int = DEFAULT_MAX_FILE_SIZE,
+        use_git: bool = True,
+    ) -> None:
+        """
+        Initialize the scanner.
+
+        Args:
+            root_path: Repository root
+            skip_dirs: Directory names never descended into
+            max_workers: Threads for stat/sniff/line counting
+            max_file_size: Files larger than this are not read
+            use_git: List files with ``git ls-files`` when possible
+        """
+        self.root_path = Path(root_path).resolve()
+        self.skip_dirs = DEFAULT_SKIP_DIRS if skip_dirs is None else set(skip_dirs)
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+        self.max_file_size = max_file_size
+        self.use_git = use_git
+
+    def scan(self, previous: Optional[FileManifest] = None) -> FileManifest:
+        """Scan the repository and return its manifest.
+
+        Args:
+            previous: Manifest from an earlier scan of the same root. Returned
+                as-is when the git tree key is unchanged; otherwise its entries
+                are reused for files whose size and mtime did not change.
+        """
+        start = time.perf_counter()
+        if previous is not None and previous.root != self.root_path:
+            previous = None
+        base_key = self.tree_key() if self.use_git else None
+        if (
+            previous is not None
+            and base_key is not None
+            and previous.tree_key == self._with_untracked(base_key, previous.untracked)
+        ):
+            logger.debug(f"Repository {self.root_path} unchanged; reusing cached manifest")
+            previous.source = "cache"
+            previous.reused = len(previous)
+            previous.scan_seconds = time.perf_counter() - start
+            return previous
+
+        listed = self._git_ls_files() if self.use_git else None
+        source = "git"
+        untracked: List[str] = []
+        if listed is None:
+            paths = self._walk()
+            source = "walk"
+        else:
+            paths, untracked = listed
+        paths = [p for p in paths if not self._skipped(p)]
+        untracked = [p for p in untracked if not self._skipped(p)]
+        tree_key = self._with_untracked(base_key, untracked) if base_key is not None else None
+
+        known = previous._by_path if previous is not None else {}
+        batches = [paths[i:i + _BATCH_SIZE] for i in range(0, len(paths), _BATCH_SIZE)]
+        files: List[FileEntry] = []
+        if len(batches) <= 1:
+            for batch in batches:
+                files.extend(self._inspect_batch(batch, known))
+        else:
+            with ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="repo-scan"
+            ) as pool:
+                for result in pool.map(lambda batch: self._inspect_batch(batch, known), batches):
+                    files.extend(result)
+
+        files.sort(key=lambda entry: entry.path)
+        reused = sum(1 for entry in files if known.get(entry.path) is entry)
+        elapsed = time.perf_counter() - start
+        logger.debug(
+            f"Scanned {len(files)} files in {self.root_path} via {source} in {elapsed:.2f}s "
+            f"({reused} unchanged)"
+        )
+        return FileManifest(
+            root=self.root_path,
+            files=files,
+            source=source,
+            scan_seconds=elapsed,
+            tree_key=tree_key,
+            reused=reused,
+            untracked=untracked,
+        )
+
+    def tree_key(self) -> Optional[str]:
+        """Cheap fingerprint of the git tree plus tracked changes, or None.
+
+        Combines the tree hash of the scan root at ``HEAD``, the size and
+        mtime of the index, ``git status --untracked-files=no`` output and the
+        size/mtime of each modified path, so edits to an already-dirty file
+        still change the key. Untracked files are left out because listing
+        them walks the whole work tree; :meth:`scan` adds the stats of the
+        untracked files the previous scan found, so a brand-new untracked
+        file is only noticed once something else changes. Returns None
+        outside a git work tree.
+        """
+        if shutil.which("git") is None:
+            return None
+        try:
+            paths = subprocess.run(
+                ["git", "rev-parse", "--show-toplevel", "--git-path", "index"],
+                cwd=self.root_path, capture_output=True, text=True, timeout=30,
+            )
+            if paths.returncode != 0:
+                return None
+            head = subprocess.run(
+                ["git", "rev-parse", "HEAD:./"],
+                cwd=self.root_path, capture_output=True, timeout=30,
+            )
+            status = subprocess.run(
+                ["git", "status", "--porcelain=v1", "-z", "--untracked-files=no", "--", "."],
+                cwd=self.root_path, capture_output=True, timeout=60,
+            )
+        except (OSError, subprocess.SubprocessError):
+            return None
+        if status.returncode != 0:
+            return None
+        top, index = (Path(line) for line in paths.stdout.splitlines()[:2])
+        if not index.is_absolute():
+            index = self.root_path / index
+        digest = hashlib.sha256()
+        digest.update(head.stdout.strip() if head.returncode == 0 else b"no-head")
+        digest.update(repr((sorted(self.skip_dirs), self.max_file_size)).encode("utf-8"))
+        # Stat the index after ``git status``, which may have refreshed it
+        try:
+            st = index.stat()
+            digest.update(f"index:{st.st_size}:{st.st_mtime_ns}".encode("ascii"))
+        except OSError:
+            digest.update(b"no-index")
+        digest.update(status.stdout)
+        for record in status.stdout.split(b"\0"):
+            if len(record) < 4:
+                continue
+            # Status paths are relative to the top of the work tree
+            path = top / os.fsdecode(record[3:])
+            try:
+                st = path.stat()
+                digest.update(f"{st.st_size}:{st.st_mtime_ns}".encode("ascii"))
+            except OSError:
+                digest.update(b"missing")
+        return digest.hexdigest()
+
+    def _with_untracked(self, base_key: str, untracked: Sequence[str]) -> str:
+        digest = hashlib.sha256(base_key.encode("ascii"))
+        for rel in untracked:
+            digest.update(os.fsencode(rel) + b"\0")
+            try:
+                st = (self.root_path / rel).stat()
+                digest.update(f"{st.st_size}:{st.st_mtime_ns}".encode("ascii"))
+            except OSError:
+                digest.update(b"missing")
+        return digest.hexdigest()
+
+    def _skipped(self, rel_path: str) -> bool:
+        parts = rel_path.split("/")
+        return any(part in self.skip_dirs for part in parts[:-1])
+
+    def _git_ls_files(self) -> Optional[Tuple[List[str], List[str]]]:
+        """Return ``(paths, untracked)`` from ``git ls-files``, or None."""
+        if shutil.which("git") is None:
+            return None
+        try:
+            proc = subprocess.run(
+                ["git", "ls-files", "-z", "-t", "--cached", "--others", "--exclude-standard"],
+                cwd=self.root_path,
+                capture_output=True,
+                timeout=60,
+            )
+        except (OSError, subprocess.SubprocessError):
+            return None
+        if proc.returncode != 0:
+            return None
+        seen: Dict[str, None] = {}
+        untracked: List[str] = []
+        for raw in proc.stdout.split(b"\0"):
+            if len(raw) < 3:
+                continue
+            # Each path carries a status tag; "?" marks an untracked file
+            path = os.fsdecode(raw[2:])
+            if raw[:1] == b"?":
+                untracked.append(path)
+            seen[path] = None
+        return list(seen), untracked
+
+    def _walk(self) -> List[str]:
+        paths: List[str] = []
+        stack: List[Tuple[str, str]] = [(str(self.root_path), "")]
+        while stack:
+            directory, rel = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        rel_path = f"{rel}{entry.name}"
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if entry.name not in self.skip_dirs:
+                                    stack.append((entry.path, rel_path + "/"))
+                            elif entry.is_file():
+                                paths.append(rel_path)
+                        except OSError:
+                            continue
+            except OSError as e:
+                logger.debug(f"Cannot list {directory}: {e}")
+        return paths
+
+    def _inspect_batch(
+        self, rel_paths: Sequence[str], known: Optional[Dict[str, FileEntry]] = None
+    ) -> List[FileEntry]:
+        entries: List[FileEntry] = []
+        root = self.root_path
+        known = known or {}
+        for rel in rel_paths:
+            full = root / rel
+            try:
+                st = full.stat()
+            except OSError:
+                continue  # Deleted but still tracked, or a broken symlink
+            if not stat.S_ISREG(st.st_mode):
+                continue  # Submodule entries from git ls-files
+            cached = known.get(rel)
+            if cached is not None and cached.size == st.st_size and cached.mtime_ns == st.st_mtime_ns:
+                entries.append(cached)
+                continue
+            is_binary, lines = False, 0
+            if st.st_size <= self.max_file_size:
+                try:
+                    is_binary, lines = count_lines(full, st.st_size)
+                except OSError:
+                    pass
+            entries.append(
+                FileEntry(
+                    path=rel,
+                    size=st.st_size,
+                    mtime_ns=st.st_mtime_ns,
+                    is_binary=is_binary,
+                    line_count=lines,
+                )
+            )
+        return entries
@@ -1,17 +1,36 @@
 from __future__ import annotations
 
 import json
+import logging
 import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass, field
+from itertools import repeat
+from multiprocessing import get_context
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Sequence, Union
 import xml.etree.ElementTree as ET
 
+from .repo_cache import RepoAnalysisCache
+from .repo_scanner import FileManifest, RepoScanner
+from .symbol_index import SymbolIndex, get_symbol_index
+
 try:
     import tomllib
 except ModuleNotFoundError:
     tomllib = None
 
+logger = logging.getLogger(__name__)
+
+# Files that mark the root of a (possibly nested) package
+PACKAGE_MANIFESTS = ("package.json", "pyproject.toml", "go.mod", "Cargo.toml", "pom.xml")
+
+# Below this many nested packages, process start-up costs more than it saves
+_POOL_MIN_PACKAGES = 4
+MAX_PACKAGES = 200
+
 
 @dataclass
 class DirectoryStructure:
@@ -61,6 +80,52 @@ class ProjectMetadata:
     homepage: Optional[str] = None
 
 
+@dataclass
+class PackageAnalysis:
+    """A nested package root inside a monorepo."""
+
+    path: str  # Relative POSIX path of the package directory
+    project_type: str
+    dependencies: DependencyInfo
+    patterns: CodePatterns
+    project_metadata: ProjectMetadata = field(default_factory=ProjectMetadata)
+    # Files owned by this package, excluding those of nested packages
+    code_metrics: CodeMetrics = field(default_factory=lambda: CodeMetrics(0, 0))
+    packages: List["PackageAnalysis"] = field(default_factory=list)
+
+    def walk(self):
+        """Yield this package and every package nested inside it."""
+        yield self
+        for child in self.packages:
+            yield from child.walk()
+
+    def to_dict(self) -> dict:
+        deps = self.dependencies
+        return {
+            "path": self.path,
+            "project_type": self.project_type,
+            "name": self.project_metadata.name,
+            "version": self.project_metadata.version,
+            "metrics": {
+                "total_files": self.code_metrics.total_files,
+                "total_lines": self.code_metrics.total_lines,
+            },
+            "dependencies": {
+                "manifests": [str(p) for p in deps.manifests],
+                "python": deps.python,
+                "node": deps.node,
+                "go": deps.go,
+                "rust": deps.rust,
+                "java": deps.java,
+            },
+            "patterns": {
+                "test_frameworks": self.patterns.test_frameworks,
+                "build_tools": self.patterns.build_tools,
+            },
+            "packages": [child.to_dict() for child in self.packages],
+        }
+
+
 @dataclass
 class RepoAnalysis:
     root_path: Path
@@ -72,12 +137,28 @@ class RepoAnalysis:
     config_files: ConfigFiles
     project_metadata: ProjectMetadata = field(default_factory=ProjectMetadata)
     errors: List[str] = field(default_factory=list)
-
-    def to_prompt_context(self) -> dict:
+    # File listing shared with CodeSampleExtractor so the tree is scanned once
+    manifest: Optional[FileManifest] = field(default=None, repr=False, compare=False)
+    # Symbol outlines used for the compact code map in prompts
+    symbol_index: Optional[SymbolIndex] = field(default=None, repr=False, compare=False)
+    # Top-level nested packages (monorepos); each holds its own nested packages
+    packages: List[PackageAnalysis] = field(default_factory=list)
+
+    def iter_packages(self):
+        """Yield every nested package, parents before children."""
+        for package in self.packages:
+            yield from package.walk()
+
+    def to_prompt_context(self, outline_chars: int = 3000) -> dict:
         """Create a trimmed JSON-friendly representation for LLM prompts.
         
         Returns a concise dict with key repo information suitable for
-        injection into devplan/handoff generation prompts.
+        injection into devplan/handoff generation prompts. When the file
+        manifest is available it includes an ``outline``: one line per
+        significant source file listing its top-level symbols, capped at
+        ``outline_chars`` characters (0 disables it). Monorepos also get a
+        flat ``packages`` list with each package's type, size and main
+        dependencies.
         """
         # Get notable dependencies (limit to top 10 per ecosystem)
         notable_deps = {}
@@ -120,19 +201,188 @@ class RepoAnalysis:
             context["version"] = self.project_metadata.version
         if self.project_metadata.author:
             context["author"] = self.project_metadata.author
+
+        packages = list(self.iter_packages())
+        if packages:
+            context["packages"] = [
+                _package_prompt_entry(package) for package in packages[:20]
+            ]
+
+        if self.manifest is not None and outline_chars > 0:
+            index = self.symbol_index or get_symbol_index()
+            outline = index.repo_map(
+                self.manifest, self.structure.source_dirs, max_chars=outline_chars
+            )
+            if outline:
+                context["outline"] = outline
         
         return context
 
 
+def _package_prompt_entry(package: PackageAnalysis) -> dict:
+    deps = package.dependencies
+    entry = {
+        "path": package.path,
+        "project_type": package.project_type,
+        "total_files": package.code_metrics.total_files,
+        "total_lines": package.code_metrics.total_lines,
+    }
+    if package.project_metadata.name:
+        entry["name"] = package.project_metadata.name
+    notable = (deps.python + deps.node + deps.go + deps.rust + deps.java)[:8]
+    if notable:
+        entry["dependencies"] = notable
+    return entry
+
+
+def discover_package_roots(manifest: FileManifest) -> List[str]:
+    """Relative directories below the root that contain a package manifest.
+
+    Vendored and build directories are already excluded by the scanner, so
+    e.g. ``node_modules`` packages never show up here.
+    """
+    roots = {
+        entry.path.rsplit("/", 1)[0]
+        for entry in manifest.files
+        if "/" in entry.path and entry.name in PACKAGE_MANIFESTS
+    }
+    return sorted(roots)[:MAX_PACKAGES]
+
+
+def _analyze_package_root(root: str, relative: str) -> PackageAnalysis:
+    """Analyze one package directory (runs in a worker process)."""
+    analyzer = RepositoryAnalyzer(Path(root) / relative, discover_packages=False)
+    dependencies = analyzer._detect_dependency_manifests()
+    return PackageAnalysis(
+        path=relative,
+        project_type=analyzer._detect_project_type(),
+        dependencies=dependencies,
+        patterns=analyzer._detect_patterns(dependencies),
+        project_metadata=analyzer._extract_project_metadata(),
+    )
+
+
+def analyze_packages(
+    root: Union[Path, str], relatives: Sequence[str], max_workers: Optional[int] = None
+) -> List[PackageAnalysis]:
+    """Analyze package directories, in a process pool when there are many.
+
+    Manifest parsing is CPU-bound (TOML/XML/JSON), so packages are spread
+    over processes rather than threads. Workers are spawned rather than
+    forked since the caller may already run background threads. Falls back
+    to analyzing serially if the pool cannot be started or the worker cannot
+    be pickled. Results keep the order of ``relatives``.
+    """
+    root = str(root)
+    workers = min(len(relatives), max_workers or os.cpu_count() or 1)
+    if workers > 1 and len(relatives) >= _POOL_MIN_PACKAGES:
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as pool:
+                chunksize = max(1, len(relatives) // (workers * 4))
+                return list(
+                    pool.map(_analyze_package_root, repeat(root), relatives, chunksize=chunksize)
+                )
+        except (BrokenProcessPool, OSError, RuntimeError, pickle.PicklingError) as exc:
+            logger.debug(f"Process pool unavailable for package analysis ({exc}); running serially")
+    return [_analyze_package_root(root, relative) for relative in relatives]
+
+
+def _owner(path: str, package_dirs: set) -> str:
+    """Deepest package directory containing ``path`` ("" for the root)."""
+    directory = path
+    while "/" in directory:
+        directory = directory.rsplit("/", 1)[0]
+        if directory in package_dirs:
+            return directory
+    return ""
+
+
+def _nest_packages(
+    packages: List[PackageAnalysis], manifest: FileManifest
+) -> List[PackageAnalysis]:
+    """Attach per-package metrics and arrange packages by directory nesting."""
+    by_path: Dict[str, PackageAnalysis] = {package.path: package for package in packages}
+    package_dirs = set(by_path)
+    files: Dict[str, int] = {}
+    lines: Dict[str, int] = {}
+    for entry in manifest.files:
+        owner = _owner(entry.path, package_dirs)
+        if owner:
+            files[owner] = files.get(owner, 0) + 1
+            lines[owner] = lines.get(owner, 0) + entry.line_count
+
+    top_level: List[PackageAnalysis] = []
+    for package in packages:
+        package.code_metrics = CodeMetrics(
+            total_files=files.get(package.path, 0), total_lines=lines.get(package.path, 0)
+        )
+        parent = _owner(package.path, package_dirs)
+        if parent:
+            by_path[parent].packages.append(package)
+        else:
+            top_level.append(package)
+    return top_level
+
+
+def _merge_dependencies(root: DependencyInfo, packages: Sequence[PackageAnalysis]) -> DependencyInfo:
+    """Root dependencies in their manifest order, then each new package dependency."""
+    merged = DependencyInfo(
+        manifests=list(root.manifests),
+        python=list(root.python),
+        node=list(root.node),
+        go=list(root.go),
+        rust=list(root.rust),
+        java=list(root.java),
+    )
+    for package in packages:
+        merged.manifests.extend(package.dependencies.manifests)
+    for name in ("python", "node", "go", "rust", "java"):
+        names = getattr(merged, name)
+        seen = set(names)
+        for package in packages:
+            for dep in getattr(package.dependencies, name):
+                if dep not in seen:
+                    seen.add(dep)
+                    names.append(dep)
+    return merged
+
+
 class RepositoryAnalyzer:
-    def __init__(self, root_path: Union[Path, str]) -> None:
+    def __init__(
+        self,
+        root_path: Union[Path, str],
+        scanner: Optional[RepoScanner] = None,
+        cache: Optional[RepoAnalysisCache] = None,
+        discover_packages: bool = True,
+        max_workers: Optional[int] = None,
+    ) -> None:
         self.root_path = Path(root_path).resolve()
+        self.scanner = scanner or RepoScanner(self.root_path)
+        # When set, the previous scan is reused and only changed files are re-read
+        self.cache = cache
+        # Look for nested package roots (monorepos) and analyze each of them
+        self.discover_packages = discover_packages
+        self.max_workers = max_workers
 
     def analyze(self) -> RepoAnalysis:
+        previous = self.cache.load(self.root_path) if self.cache else None
+        manifest = self.scanner.scan(previous)
+        if self.cache and manifest.source != "cache":
+            self.cache.save(manifest)
         project_type = self._detect_project_type()
         structure = self._analyze_structure()
         dependencies = self._detect_dependency_manifests()
-        code_metrics = self._compute_code_metrics(structure)
+        code_metrics = self._compute_code_metrics(structure, manifest)
+
+        packages: List[PackageAnalysis] = []
+        if self.discover_packages:
+            relatives = discover_package_roots(manifest)
+            if relatives:
+                flat = analyze_packages(self.root_path, relatives, self.max_workers)
+                packages = _nest_packages(flat, manifest)
+                dependencies = _merge_dependencies(dependencies, flat)
+                if project_type == "unknown":
+                    project_type = self._dominant_package_type(flat)
         patterns = self._detect_patterns(dependencies)
         config_files = self._collect_config_files()
         project_metadata = self._extract_project_metadata()
@@ -148,8 +398,31 @@ class RepositoryAnalyzer:
             config_files=config_files,
             project_metadata=project_metadata,
             errors=errors,
+            manifest=manifest,
+            symbol_index=self._symbol_index(manifest),
+            packages=packages,
         )
 
+    def _symbol_index(self, manifest: FileManifest) -> SymbolIndex:
+        """This root's symbol index, without outlines of files no longer in ``manifest``."""
+        if self.cache is None:
+            return get_symbol_index()
+        index = get_symbol_index(self.cache.symbols_path(self.root_path))
+        if index.prune(manifest):
+            index.save()
+        return index
+
+    @staticmethod
+    def _dominant_package_type(packages: Sequence[PackageAnalysis]) -> str:
+        counts: Dict[str, int] = {}
+        for package in packages:
+            if package.project_type != "unknown":
+                counts[package.project_type] = counts.get(package.project_type, 0) + 1
+        if not counts:
+            return "unknown"
+        # Ties go to the type seen first
+        return max(counts, key=counts.get)
+
     def _detect_project_type(self) -> str:
         markers = {
             "node": ["package.json"],
@@ -235,66 +508,22 @@ class RepositoryAnalyzer:
 
         return DependencyInfo(
             manifests=manifests,
-            python=sorted(set(python_deps)),
-            node=sorted(set(node_deps)),
-            go=sorted(set(go_deps)),
-            rust=sorted(set(rust_deps)),
-            java=sorted(set(java_deps)),
+            # Deduplicated in manifest order
+            python=list(dict.fromkeys(python_deps)),
+            node=list(dict.fromkeys(node_deps)),
+            go=list(dict.fromkeys(go_deps)),
+            rust=list(dict.fromkeys(rust_deps)),
+            java=list(dict.fromkeys(java_deps)),
         )
 
-    def _compute_code_metrics(self, structure: DirectoryStructure) -> CodeMetrics:
-        total_files = 0
-        total_lines = 0
-        
-        # Skip problematic directories
-        skip_dirs = {
-            '.git', '.svn', '.hg', '__pycache__', '.pytest_cache',
-            'node_modules', '.venv', 'venv', '.mypy_cache', 'build', 'dist'
-        }
-        
-        # File extensions to analyze (text files only)
-        code_extensions = {
-            '.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.c', '.cpp', '.h', '.hpp',
-            '.cs', '.go', '.rs', '.php', '.rb', '.swift', '.kt', '.scala', '.clj',
-            '.html', '.css', '.scss', '.sass', '.less', '.xml', '.json', '.yaml', '.yml',
-            '.toml', '.ini', '.cfg', '.conf', '.sh', '.bash', '.zsh', '.fish',
-            '.md', '.rst', '.txt', '.sql', '.r', '.m', '.pl', '.lua', '.vim'
-        }
-        
-        for dirpath, dirnames, filenames in os.walk(self.root_path):
-            # Skip problematic subdirectories
-            dirnames[:] = [d for d in dirnames if d not in skip_dirs]
-            
-            for filename in filenames:
-                total_files += 1
-                
-                # Skip binary files and files without code extensions
-                file_path = Path(dirpath) / filename
-                if file_path.suffix.lower() not in code_extensions:
-                    continue
-                
-                # Skip very large files (>10MB) to prevent hangs
-                try:
-                    if file_path.stat().st_size > 10 * 1024 * 1024:
-                        continue
-                except OSError:
-                    continue
-                
-                # Count lines efficiently
-                try:
-                    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                        line_count = 0
-                        # Read file in chunks to handle large files efficiently
-                        for _ in f:
-                            line_count += 1
-                            # Early exit for very large files (safety check)
-                            if line_count > 100000:
-                                break
-                        total_lines += line_count
-                except (OSError, UnicodeDecodeError):
-                    continue
-
-        return CodeMetrics(total_files=total_files, total_lines=total_lines)
+    def _compute_code_metrics(
+        self, structure: DirectoryStructure, manifest: Optional[FileManifest] = None
+    ) -> CodeMetrics:
+        # Files are listed honoring .gitignore and skip dirs; lines are
+        # counted for every non-binary file under the size limit.
+        if manifest is None:
+            manifest = self.scanner.scan()
+        return CodeMetrics(total_files=len(manifest), total_lines=manifest.total_lines)
 
     def _detect_patterns(self, dependencies: DependencyInfo) -> CodePatterns:
         test_frameworks: List[str] = []
@@ -0,0 +1,173 @@
+"""Incremental extraction of the interview's structured JSON summary.
+
+The interview model ends with a JSON object describing the project, usually
+somewhere inside a longer, streamed reply. :class:`StructuredDataExtractor`
+consumes the reply chunk by chunk in a single pass, tracking brace depth and
+JSON string/escape state, and tries to parse an object only when its closing
+brace arrives. The first object that (after normalization) contains
+``project_name`` is reported immediately, so callers can react before the
+stream ends.
+
+Objects that are not strict JSON (single quotes, trailing commas, comments)
+are retried with ``yaml.safe_load``, which tolerates those. The scanner only
+knows JSON's double-quoted strings, so a stray quote in prose or a brace
+inside a single-quoted value can hide the summary from it; when it finds
+nothing, :meth:`StructuredDataExtractor.extract` falls back to parsing fenced
+blocks and whole-text brace spans of the complete reply.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+import yaml
+
+Normalizer = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+# Cheap pre-check before parsing a closed object: does it name the project?
+_NAME_KEY = re.compile(
+    r"""["']?(?:project_name|name|project|projecttitle|project_title|title)["']?\s*:""",
+    re.IGNORECASE,
+)
+
+_FENCED_OBJECTS = [
+    re.compile(r"```json\s*(\{[\s\S]*?\})\s*```", re.IGNORECASE),
+    re.compile(r"```\s*(\{[\s\S]*?\})\s*```"),
+]
+_ANY_OBJECT = re.compile(r"\{[\s\S]*\}")
+
+
+class StructuredDataExtractor:
+    """Find the first complete object containing ``required_key`` in streamed text."""
+
+    def __init__(
+        self, normalize: Optional[Normalizer] = None, required_key: str = "project_name"
+    ) -> None:
+        self.normalize = normalize
+        self.required_key = required_key
+        self.result: Optional[Dict[str, Any]] = None
+        # First non-empty outermost object that lacked ``required_key``
+        self.first_object: Optional[Dict[str, Any]] = None
+        # Text since the outermost open brace; dropped whenever no object is open
+        self._buffer: List[str] = []
+        self._base = 0  # Offset of the buffer's first character in the stream
+        self._consumed = 0
+        self._starts: List[int] = []  # Stream offsets of currently open braces
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: str) -> Optional[Dict[str, Any]]:
+        """Consume the next piece of text; return the object once found."""
+        if self.result is not None or not chunk:
+            return self.result
+        if not self._starts:
+            self._buffer = []
+            self._base = self._consumed
+        self._buffer.append(chunk)
+        joined: Optional[str] = None
+        offset = self._consumed
+        self._consumed += len(chunk)
+        for index, char in enumerate(chunk):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                # Quotes only matter inside an object; prose may contain stray ones
+                self._in_string = bool(self._starts)
+            elif char == "{":
+                if not self._starts and offset + index > self._base:
+                    # Nothing open: forget the text before this object
+                    self._buffer = [chunk[index:]]
+                    self._base = offset + index
+                    joined = None
+                self._starts.append(offset + index)
+            elif char == "}" and self._starts:
+                start = self._starts.pop()
+                if joined is None:
+                    joined = "".join(self._buffer)
+                    self._buffer = [joined]
+                end = offset + index + 1
+                fragment = joined[start - self._base:end - self._base]
+                outermost = not self._starts and self.first_object is None
+                if not (outermost or _NAME_KEY.search(fragment)):
+                    continue
+                data = self._load(fragment)
+                if data is None:
+                    continue
+                if self.required_key in data:
+                    self.result = data
+                    self._buffer = []
+                    return data
+                if outermost and data:
+                    self.first_object = data
+        return None
+
+    def _load(self, fragment: str) -> Optional[Dict[str, Any]]:
+        try:
+            data: Any = json.loads(fragment)
+        except json.JSONDecodeError:
+            try:
+                data = yaml.safe_load(fragment)
+            except Exception:
+                return None
+        if not isinstance(data, dict):
+            return None
+        if self.normalize is not None:
+            data = self.normalize(data)
+        return data if isinstance(data, dict) else None
+
+    def _parse_whole(self, text: str) -> Optional[Dict[str, Any]]:
+        """Fallback for a complete reply the scanner could not read.
+
+        Tries fenced blocks first, then the widest ``{...}`` span, then every
+        outermost span of a brace scan that ignores quoting.
+        """
+        for pattern in _FENCED_OBJECTS:
+            match = pattern.search(text)
+            if match:
+                try:
+                    data = json.loads(match.group(1))
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(data, dict) and self.normalize is not None:
+                    data = self.normalize(data)
+                if isinstance(data, dict):
+                    return data
+
+        fragments = [m.group(0) for m in _ANY_OBJECT.finditer(text)]
+        depth = 0
+        start = 0
+        for index, char in enumerate(text):
+            if char == "{":
+                if not depth:
+                    start = index
+                depth += 1
+            elif char == "}" and depth:
+                depth -= 1
+                if not depth:
+                    fragments.append(text[start:index + 1])
+        for fragment in fragments:
+            data = self._load(fragment)
+            if data is not None and self.required_key in data:
+                return data
+        return None
+
+    @classmethod
+    def extract(
+        cls, text: str, normalize: Optional[Normalizer] = None, required_key: str = "project_name"
+    ) -> Optional[Dict[str, Any]]:
+        """Extract from a complete response.
+
+        When the single-pass scan finds nothing, the fenced-block and
+        whole-text parse is tried; failing that, the first outermost object in
+        ``text`` is returned even without ``required_key``, so summaries with a
+        different shape still surface.
+        """
+        extractor = cls(normalize, required_key)
+        return extractor.feed(text) or extractor._parse_whole(text) or extractor.first_object
@@ -0,0 +1,504 @@
+"""Symbol-level outlines of source files.
+
+An outline keeps what a model needs to orient itself in a file — module
+docstring, class and function signatures, first docstring lines — and drops
+imports and bodies, typically shrinking a file several times. Python is
+parsed with :mod:`ast`; other languages use small regex grammars that match
+declaration lines and the comment directly above them.
+
+:class:`SymbolIndex` caches outlines by content hash (and maps path, size and
+mtime to that hash so unchanged files are not even read), optionally
+persisting them to disk, one store per repository root.
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+import logging
+import re
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Pattern, Sequence, Tuple, Union
+
+from ..artifact_writer import atomic_write_text
+from .repo_scanner import FileEntry, FileManifest
+
+logger = logging.getLogger(__name__)
+
+OUTLINE_VERSION = 1
+
+# Longest docstring/comment excerpt kept per symbol
+MAX_DOC_CHARS = 100
+
+
+@dataclass
+class Symbol:
+    """A class, function or other declaration in a file."""
+
+    kind: str
+    name: str
+    signature: str
+    line: int
+    doc: str = ""
+    children: List["Symbol"] = field(default_factory=list)
+
+
+@dataclass
+class FileOutline:
+    """Compact structural summary of one file."""
+
+    path: str
+    language: str
+    line_count: int
+    doc: str = ""
+    symbols: List[Symbol] = field(default_factory=list)
+
+    def render(self, max_children: int = 12, max_lines: Optional[int] = None) -> str:
+        """Render as indented signature lines, e.g. ``class A(Base)  # doc``.
+
+        Args:
+            max_children: Members shown per class before eliding the rest
+            max_lines: Stop after this many lines, noting how many symbols
+                were left out (private ``_names`` are dropped first)
+        """
+        symbols = self.symbols
+        if max_lines is not None and self._line_estimate(symbols, max_children) > max_lines:
+            symbols = [s for s in symbols if not s.name.startswith("_")]
+        lines: List[str] = []
+        if self.doc:
+            lines.append(f"# {self.doc}")
+
+        def emit(symbol: Symbol, depth: int) -> None:
+            text = "    " * depth + symbol.signature
+            if symbol.doc:
+                text += f"  # {symbol.doc}"
+            lines.append(text)
+            for child in symbol.children[:max_children]:
+                emit(child, depth + 1)
+            hidden = len(symbol.children) - max_children
+            if hidden > 0:
+                lines.append("    " * (depth + 1) + f"# ... {hidden} more")
+
+        for shown, symbol in enumerate(symbols):
+            if max_lines is not None and len(lines) >= max_lines:
+                lines.append(f"# ... {len(symbols) - shown} more top-level symbols")
+                break
+            emit(symbol, 0)
+        return "\n".join(lines)
+
+    @staticmethod
+    def _line_estimate(symbols: Sequence[Symbol], max_children: int) -> int:
+        return sum(1 + min(len(s.children), max_children) for s in symbols)
+
+    def summary(self, max_names: int = 8) -> str:
+        """One line: ``path: Name, Name, ...``."""
+        names = [s.name for s in self.symbols]
+        text = ", ".join(names[:max_names])
+        if len(names) > max_names:
+            text += f", +{len(names) - max_names}"
+        return f"{self.path}: {text}" if text else self.path
+
+    def to_dict(self) -> Dict[str, object]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "FileOutline":
+        def symbol(raw: Dict[str, object]) -> Symbol:
+            children = [symbol(child) for child in raw.get("children", [])]  # type: ignore[union-attr]
+            return Symbol(**{**raw, "children": children})  # type: ignore[arg-type]
+
+        return cls(
+            path=str(data["path"]),
+            language=str(data["language"]),
+            line_count=int(data["line_count"]),  # type: ignore[arg-type]
+            doc=str(data.get("doc", "")),
+            symbols=[symbol(raw) for raw in data.get("symbols", [])],  # type: ignore[union-attr]
+        )
+
+
+def _first_line(text: Optional[str]) -> str:
+    if not text:
+        return ""
+    for line in text.strip().splitlines():
+        line = line.strip()
+        if line:
+            return line if len(line) <= MAX_DOC_CHARS else line[:MAX_DOC_CHARS - 3] + "..."
+    return ""
+
+
+# ---------------------------------------------------------------------------
+# Python
+# ---------------------------------------------------------------------------
+
+# Signatures longer than this drop annotations and defaults
+MAX_SIGNATURE_CHARS = 120
+
+
+def _python_signature(node: Union[ast.FunctionDef, ast.AsyncFunctionDef]) -> str:
+    prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+    returns = f" -> {ast.unparse(node.returns)}" if node.returns is not None else ""
+    signature = f"{prefix} {node.name}({ast.unparse(node.args)}){returns}"
+    if len(signature) <= MAX_SIGNATURE_CHARS:
+        return signature
+    args = node.args
+    names = [a.arg for a in args.posonlyargs + args.args]
+    if args.vararg:
+        names.append(f"*{args.vararg.arg}")
+    elif args.kwonlyargs:
+        names.append("*")
+    names += [a.arg for a in args.kwonlyargs]
+    if args.kwarg:
+        names.append(f"**{args.kwarg.arg}")
+    signature = f"{prefix} {node.name}({', '.join(names)})"
+    if len(returns) <= 40:
+        signature += returns
+    if len(signature) > MAX_SIGNATURE_CHARS:
+        signature = signature[:MAX_SIGNATURE_CHARS - 4] + "...)"
+    return signature
+
+
+def _python_symbols(body: Sequence[ast.stmt], in_class: bool = False) -> List[Symbol]:
+    symbols: List[Symbol] = []
+    for node in body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            symbols.append(Symbol(
+                kind="method" if in_class else "function",
+                name=node.name,
+                signature=_python_signature(node),
+                line=node.lineno,
+                doc=_first_line(ast.get_docstring(node)),
+            ))
+        elif isinstance(node, ast.ClassDef):
+            bases = ", ".join(ast.unparse(base) for base in node.bases)
+            symbols.append(Symbol(
+                kind="class",
+                name=node.name,
+                signature=f"class {node.name}({bases})" if bases else f"class {node.name}",
+                line=node.lineno,
+                doc=_first_line(ast.get_docstring(node)),
+                children=_python_symbols(node.body, in_class=True),
+            ))
+    return symbols
+
+
+def outline_python(path: str, text: str) -> Optional[FileOutline]:
+    """Outline Python source, or None if it does not parse."""
+    try:
+        tree = ast.parse(text)
+    except (SyntaxError, ValueError):
+        return None
+    return FileOutline(
+        path=path,
+        language="python",
+        line_count=len(text.splitlines()),
+        doc=_first_line(ast.get_docstring(tree)),
+        symbols=_python_symbols(tree.body),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Regex grammars
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class _Grammar:
+    language: str
+    declaration: Pattern[str]
+    comment: Pattern[str]
+
+
+_SLASH_COMMENT = re.compile(r"^\s*(?://+|/\*+|\*+)\s?(.*?)\s*(?:\*/)?$")
+_HASH_COMMENT = re.compile(r"^\s*#+\s?(.*)$")
+
+_GRAMMARS: Dict[str, _Grammar] = {}
+
+
+def _register(suffixes: Sequence[str], grammar: _Grammar) -> None:
+    for suffix in suffixes:
+        _GRAMMARS[suffix] = grammar
+
+
+_register([".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs"], _Grammar(
+    "typescript",
+    re.compile(
+        r"^(?P<indent>\s*)(?:export\s+(?:default\s+)?)?(?:declare\s+)?(?:abstract\s+)?(?:async\s+)?"
+        r"(?P<kind>function\*?|class|interface|type|enum)\s+(?P<name>[A-Za-z_$][\w$]*)"
+        r"|^(?P<indent2>\s*)(?:export\s+)?(?:const|let)\s+(?P<name2>[A-Za-z_$][\w$]*)\s*"
+        r"(?::[^=]+)?=\s*(?:async\s+)?(?:\([^)]*\)|[A-Za-z_$][\w$]*)\s*(?::[^=]+)?=>"
+    ),
+    _SLASH_COMMENT,
+))
+_register([".go"], _Grammar(
+    "go",
+    re.compile(
+        r"^(?P<indent>)(?P<kind>func|type)\s+(?:\([^)]*\)\s*)?(?P<name>[A-Za-z_]\w*)"
+    ),
+    _SLASH_COMMENT,
+))
+_register([".rs"], _Grammar(
+    "rust",
+    re.compile(
+        r"^(?P<indent>\s*)(?:pub(?:\([^)]*\))?\s+)?(?:async\s+)?(?:unsafe\s+)?"
+        r"(?P<kind>fn|struct|enum|trait|impl|mod|type)\s+(?:<[^>]*>\s*)?(?P<name>[A-Za-z_]\w*)"
+    ),
+    _SLASH_COMMENT,
+))
+_register([".java", ".kt", ".scala", ".cs", ".swift"], _Grammar(
+    "jvm",
+    re.compile(
+        r"^(?P<indent>\s*)(?:(?:public|private|protected|internal|static|final|abstract|"
+        r"open|override|sealed|data|suspend|async|virtual|partial)\s+)*"
+        r"(?P<kind>class|interface|enum|record|object|struct|fun|func|def)\s+(?P<name>[A-Za-z_]\w*)"
+    ),
+    _SLASH_COMMENT,
+))
+_register([".rb", ".ex", ".exs"], _Grammar(
+    "ruby",
+    re.compile(r"^(?P<indent>\s*)(?P<kind>def|class|module|defmodule|defp?)\s+(?P<name>[A-Za-z_][\w.?!]*)"),
+    _HASH_COMMENT,
+))
+_register([".php"], _Grammar(
+    "php",
+    re.compile(
+        r"^(?P<indent>\s*)(?:(?:public|private|protected|static|abstract|final)\s+)*"
+        r"(?P<kind>function|class|interface|trait)\s+(?P<name>[A-Za-z_]\w*)"
+    ),
+    _SLASH_COMMENT,
+))
+
+
+_PYTHON_FALLBACK = _Grammar(
+    "python",
+    re.compile(r"^(?P<indent>\s*)(?:async\s+)?(?P<kind>def|class)\s+(?P<name>[A-Za-z_]\w*)"),
+    _HASH_COMMENT,
+)
+
+
+def _signature_text(line: str) -> str:
+    # Drop the body opener and trailing punctuation
+    text = line.strip()
+    for stop in (" {", "{", " =>", " do", ":"):
+        if text.endswith(stop):
+            text = text[: -len(stop)].rstrip()
+    return text if len(text) <= MAX_SIGNATURE_CHARS else text[:MAX_SIGNATURE_CHARS - 3] + "..."
+
+
+def outline_with_grammar(path: str, text: str, grammar: _Grammar) -> FileOutline:
+    """Outline source using a regex grammar (declarations plus leading comments)."""
+    lines = text.splitlines()
+    symbols: List[Symbol] = []
+    # (indent, symbol) of enclosing container declarations
+    stack: List[Tuple[int, Symbol]] = []
+    for number, line in enumerate(lines, 1):
+        match = grammar.declaration.match(line)
+        if not match:
+            continue
+        groups = match.groupdict()
+        indent = len(groups.get("indent") or groups.get("indent2") or "")
+        name = groups.get("name") or groups.get("name2") or ""
+        kind = groups.get("kind") or "function"
+        doc = ""
+        previous = number - 2
+        while previous >= 0 and not lines[previous].strip():
+            previous -= 1
+        if previous >= 0:
+            comment = grammar.comment.match(lines[previous])
+            if comment and comment.group(1):
+                doc = _first_line(comment.group(1))
+        while stack and stack[-1][0] >= indent:
+            stack.pop()
+        if indent and not stack:
+            continue  # Local helper inside a function body
+        symbol = Symbol(kind=kind, name=name, signature=_signature_text(line), line=number, doc=doc)
+        if stack:
+            stack[-1][1].children.append(symbol)
+        else:
+            symbols.append(symbol)
+        if kind in ("class", "interface", "trait", "impl", "struct", "object", "module", "defmodule", "record", "enum"):
+            stack.append((indent, symbol))
+    return FileOutline(path=path, language=grammar.language, line_count=len(lines), symbols=symbols)
+
+
+def outline_source(path: str, text: str) -> Optional[FileOutline]:
+    """Outline ``text`` based on the suffix of ``path``; None if unsupported."""
+    suffix = Path(path).suffix.lower()
+    if suffix in (".py", ".pyi"):
+        outline = outline_python(path, text)
+        if outline is not None:
+            return outline
+        # Fall back to a regex pass for files that do not parse
+        return outline_with_grammar(path, text, _PYTHON_FALLBACK)
+    grammar = _GRAMMARS.get(suffix)
+    if grammar is None:
+        return None
+    return outline_with_grammar(path, text, grammar)
+
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+class SymbolIndex:
+    """Outline files with results cached per content hash."""
+
+    def __init__(self, cache_path: Optional[Union[str, Path]] = None) -> None:
+        """Initialize the index.
+
+        Args:
+            cache_path: Optional JSON file used to persist outlines across runs
+        """
+        self.cache_path = Path(cache_path) if cache_path else None
+        self._by_hash: Dict[str, Dict[str, object]] = {}
+        # (root, path) -> (size, mtime_ns, content hash)
+        self._stat_hashes: Dict[str, Tuple[int, int, str]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        if self.cache_path is not None:
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.cache_path.read_text(encoding="utf-8"))  # type: ignore[union-attr]
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable symbol cache {self.cache_path}: {e}")
+            return
+        if data.get("version") == OUTLINE_VERSION:
+            self._by_hash = data.get("outlines", {})
+            self._stat_hashes = {k: tuple(v) for k, v in data.get("stats", {}).items()}  # type: ignore[misc]
+
+    def save(self) -> bool:
+        """Persist new outlines, if a cache path is configured."""
+        if self.cache_path is None or not self._dirty:
+            return False
+        with self._lock:
+            payload = {
+                "version": OUTLINE_VERSION,
+                "outlines": self._by_hash,
+                "stats": self._stat_hashes,
+            }
+            content = json.dumps(payload, separators=(",", ":"))
+            self._dirty = False
+        try:
+            atomic_write_text(self.cache_path, content)
+        except OSError as e:
+            logger.warning(f"Could not write symbol cache {self.cache_path}: {e}")
+            return False
+        return True
+
+    def outline_text(self, path: str, text: str) -> Optional[FileOutline]:
+        """Outline ``text`` (stored under ``path``), using the hash cache."""
+        digest = hashlib.sha1(text.encode("utf-8", errors="ignore")).hexdigest()
+        return self._outline_for_hash(digest, path, lambda: text)
+
+    def outline_file(self, root: Path, entry: FileEntry) -> Optional[FileOutline]:
+        """Outline a manifest entry; files with unchanged size and mtime are not re-read."""
+        key = f"{root}\0{entry.path}"
+        known = self._stat_hashes.get(key)
+        if known is not None and known[0] == entry.size and known[1] == entry.mtime_ns:
+            cached = self._by_hash.get(known[2])
+            if cached is not None:
+                return FileOutline.from_dict({**cached, "path": entry.path})
+        try:
+            text = (root / entry.path).read_text(encoding="utf-8", errors="ignore")
+        except OSError:
+            return None
+        digest = hashlib.sha1(text.encode("utf-8", errors="ignore")).hexdigest()
+        with self._lock:
+            self._stat_hashes[key] = (entry.size, entry.mtime_ns, digest)
+            self._dirty = True
+        return self._outline_for_hash(digest, entry.path, lambda: text)
+
+    def prune(self, manifest: FileManifest) -> int:
+        """Forget files of ``manifest.root`` that are gone or changed, and their outlines.
+
+        Outlines are kept only while a current file of the manifest (or of
+        another root sharing this index) still has that content hash.
+
+        Returns:
+            Number of outlines dropped
+        """
+        prefix = f"{manifest.root}\0"
+        with self._lock:
+            stats: Dict[str, Tuple[int, int, str]] = {}
+            for key, (size, mtime_ns, digest) in self._stat_hashes.items():
+                if key.startswith(prefix):
+                    entry = manifest.get(key[len(prefix):])
+                    if entry is None or entry.size != size or entry.mtime_ns != mtime_ns:
+                        continue
+                stats[key] = (size, mtime_ns, digest)
+            referenced = {digest for _, _, digest in stats.values()}
+            outlines = {k: v for k, v in self._by_hash.items() if k in referenced}
+            dropped = len(self._by_hash) - len(outlines)
+            if dropped or len(stats) != len(self._stat_hashes):
+                self._stat_hashes = stats
+                self._by_hash = outlines
+                self._dirty = True
+        return dropped
+
+    def _outline_for_hash(self, digest: str, path: str, read) -> Optional[FileOutline]:
+        cached = self._by_hash.get(digest)
+        if cached is not None:
+            return FileOutline.from_dict({**cached, "path": path})
+        outline = outline_source(path, read())
+        if outline is None:
+            return None
+        with self._lock:
+            self._by_hash[digest] = outline.to_dict()
+            self._dirty = True
+        return outline
+
+    def repo_map(
+        self,
+        manifest: FileManifest,
+        directories: Optional[Sequence[str]] = None,
+        max_chars: int = 3000,
+        max_files: int = 60,
+    ) -> List[str]:
+        """One summary line per significant code file, within ``max_chars``.
+
+        Files with the most lines are chosen first (they tend to be the
+        central modules); the result is ordered by path.
+        """
+        roots = [d for d in directories or [] if d not in ("", ".")]
+        entries: List[FileEntry] = []
+        for directory in roots or [""]:
+            entries.extend(
+                e for e in manifest.under(directory)
+                if not e.is_binary and (e.suffix in _GRAMMARS or e.suffix in (".py", ".pyi"))
+            )
+        entries.sort(key=lambda e: (-e.line_count, e.path))
+        chosen: List[str] = []
+        used = 0
+        for entry in entries:
+            if len(chosen) >= max_files:
+                break
+            outline = self.outline_file(manifest.root, entry)
+            if outline is None or not outline.symbols:
+                continue
+            line = outline.summary()
+            if used + len(line) > max_chars:
+                break
+            chosen.append(line)
+            used += len(line) + 1
+        self.save()
+        return sorted(chosen)
+
+
+_shared_indexes: Dict[Optional[Path], SymbolIndex] = {}
+_shared_lock = threading.Lock()
+
+
+def get_symbol_index(cache_path: Optional[Union[str, Path]] = None) -> SymbolIndex:
+    """Return the process-wide index for ``cache_path`` (None: memory only)."""
+    key = Path(cache_path) if cache_path else None
+    with _shared_lock:
+        index = _shared_indexes.get(key)
+        if index is None:
+            index = _shared_indexes[key] = SymbolIndex(key)
+        return index
@@ -4,13 +4,21 @@ This module defines the core asynchronous interface that all concrete
 LLM provider clients must implement. Implementations should be
 non-blocking (async-first) and expose a simple sync wrapper for
 convenience when used outside of async contexts.
+
+HTTP-based clients obtain their ``aiohttp`` session through
+:meth:`LLMClient._pooled_session`. By default every request gets a
+short-lived session, exactly as before; long-lived callers (an interview
+session, the web server) call :meth:`LLMClient.open_session` once so that all
+requests on that event loop share one session and its connection pool, and
+:meth:`LLMClient.aclose` when they are done.
 """
 
 from __future__ import annotations
 
 import abc
 import asyncio
-from typing import Any, Callable, Iterable, List
+import contextlib
+from typing import Any, AsyncIterator, Callable, Iterable, List
 
 
 class LLMClient(abc.ABC):
@@ -22,11 +30,79 @@ class LLMClient(abc.ABC):
     coupling to config models.
     """
 
+    # Shared HTTP session opened by open_session(), and the loop it belongs to
+    _http_session: Any = None
+    _http_session_loop: Any = None
+
     def __init__(self, config: Any) -> None:
         self._config = config
         # Support streaming enabled flag if present in config
         self.streaming_enabled = getattr(config, "streaming_enabled", False)
 
+    def _shared_session(self) -> Any:
+        session = self._http_session
+        if session is None or session.closed:
+            return None
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+        return session if self._http_session_loop is loop else None
+
+    async def open_session(self) -> None:
+        """Keep one HTTP session open for this event loop until :meth:`aclose`.
+
+        Calling it again on the same loop is a no-op. Sessions cannot be
+        shared across loops, so a session left over from another loop is
+        closed and replaced.
+        """
+        if self._shared_session() is not None:
+            return
+        stale = self._http_session
+        if stale is not None and not stale.closed:
+            await self._discard_session(stale, self._http_session_loop)
+        import aiohttp  # Lazy import so dependency is optional unless needed
+
+        self._http_session = aiohttp.ClientSession()
+        self._http_session_loop = asyncio.get_running_loop()
+
+    @staticmethod
+    async def _discard_session(session: Any, loop: Any) -> None:
+        """Close a session that belongs to another event loop."""
+        if loop is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+            return
+        # Its loop has stopped, so nothing else uses the session; closing it
+        # here only marks the connector closed and drops its connections
+        try:
+            await session.close()
+        except Exception:
+            pass
+
+    async def aclose(self) -> None:
+        """Close the session opened by :meth:`open_session`, if any."""
+        session = self._shared_session()
+        self._http_session = None
+        self._http_session_loop = None
+        if session is not None:
+            await session.close()
+
+    @contextlib.asynccontextmanager
+    async def _pooled_session(self) -> AsyncIterator[Any]:
+        """Yield the shared session, or a one-off session when none is open.
+
+        Per-request settings such as timeouts are passed to the request
+        itself so both kinds of session behave the same.
+        """
+        session = self._shared_session()
+        if session is not None:
+            yield session
+            return
+        import aiohttp
+
+        async with aiohttp.ClientSession() as session:
+            yield session
+
     @abc.abstractmethod
     async def generate_completion(self, prompt: str, **kwargs: Any) -> str:
         """Generate a single completion for the provided prompt.
@@ -7,12 +7,14 @@ requirements for the devplan pipeline.
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import re
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional, Literal
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Literal
 import sys
 
 from rich.console import Console
@@ -22,15 +24,20 @@ from rich.panel import Panel
 from rich.prompt import Prompt
 from prompt_toolkit import prompt as pt_prompt
 import shutil
-import yaml
 
 from .clients.factory import create_llm_client
 from .config import AppConfig
+from .llm_client import LLMClient
 from .ui.menu import run_menu, SessionSettings, apply_settings_to_config
-from .interview import RepoAnalysis
+from .interview import RepoAnalysis, RepoAnalysisCache
 from .interview.code_sample_extractor import CodeSampleExtractor, CodeSample
+from .interview.conversation_memory import ConversationMemory, ConversationSummary
+from .interview.structured_extractor import StructuredDataExtractor
 from .markdown_output_manager import MarkdownOutputManager
 
+if TYPE_CHECKING:
+    from .pipeline.design_prefetch import DesignPrefetcher
+
 console = Console()
 logger = logging.getLogger(__name__)
 
@@ -137,6 +144,9 @@ Always output that JSON block clearly (optionally inside ```json fences) once th
         repo_analysis: "RepoAnalysis | None" = None,
         markdown_output_manager: "MarkdownOutputManager | None" = None,
         mode: Literal["initial", "design_review"] = "initial",
+        llm_client: "LLMClient | None" = None,
+        design_prefetcher: "DesignPrefetcher | None" = None,
+        stateless: bool = False,
     ):
         """Initialize with app config containing LLM settings.
 
@@ -149,6 +159,13 @@ Always output that JSON block clearly (optionally inside ```json fences) once th
                 saving responses.
             mode: "initial" for requirements gathering, or "design_review" for
                 review of an existing design/devplan.
+            llm_client: Optional client to use instead of creating one from
+                ``config`` (e.g. a pooled client shared by a server).
+            design_prefetcher: Optional prefetcher that starts generating the
+                project design once the interview summary is complete.
+            stateless: The manager serves a single turn and is then discarded
+                (e.g. one per web request), so turns leaving the window are
+                not summarized in the background for a next turn.
         """
         self.config = config
         self.verbose = verbose
@@ -156,13 +173,36 @@ Always output that JSON block clearly (optionally inside ```json fences) once th
         self.markdown_output_manager = markdown_output_manager
         self.mode: Literal["initial", "design_review"] = mode
 
-        self.llm_client = create_llm_client(config)
+        self.llm_client = llm_client or create_llm_client(config)
+
+        # Persistent event loop for sync callers, and the loop on which the
+        # client's pooled HTTP session was opened
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._client_session_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Set by close(); later sync calls use a loop that is stopped again
+        self._closed = False
+        # Error from the most recent send(), if the LLM call failed
+        self.last_error: Optional[Exception] = None
+        # Structured summary found in the most recent reply, and an optional
+        # hook called with it as soon as its closing brace streams in
+        self.last_structured_data: Optional[Dict[str, Any]] = None
+        self.on_structured_data: Optional[Callable[[Dict[str, Any]], Any]] = None
+        self.design_prefetcher = design_prefetcher
+        self.stateless = stateless
 
         # Apply debug/verbose flag to client (robust attribute discovery)
         self._apply_client_debug(verbose)
 
         # Core interview state
         self.conversation_history = []
+        # Bounds the prompt: recent turns verbatim, older ones summarized. In
+        # design review the first message carries the design and stays pinned.
+        self.memory = ConversationMemory.from_config(
+            config,
+            summarizer=self._complete,
+            pinned=1 if mode == "design_review" else 0,
+        )
         self.extracted_data = {}
         self.code_samples: list[CodeSample] = []
 
@@ -373,6 +413,18 @@ Always output that JSON block clearly (optionally inside ```json fences) once th
                 f"Approx. size: {metrics.total_files} files, {metrics.total_lines} lines"
             )
 
+            # Nested packages (monorepos)
+            packages = list(getattr(analysis, "iter_packages", lambda: [])())
+            if packages:
+                lines.append(f"Packages ({len(packages)}):")
+                for package in packages[:12]:
+                    lines.append(
+                        f"  - {package.path} ({package.project_type}, "
+                        f"{package.code_metrics.total_files} files)"
+                    )
+                if len(packages) > 12:
+                    lines.append(f"  (+{len(packages) - 12} more)")
+
             return "\n".join(lines)
         except Exception:
             # Never let summary building break the interview
@@ -422,9 +474,24 @@ Always output that JSON block clearly (optionally inside ```json fences) once th
     def run(self) -> Dict[str, Any]:
         """Run the conversational interview loop.
 
+        The session loop and pooled connection are released when the
+        interview ends, including via Ctrl-C or an error.
+
         Returns:
             Dict[str, Any]: Answers extracted from conversation
         """
+        try:
+            return self._converse()
+        finally:
+            self.close()
+
+    def __enter__(self) -> "LLMInterviewManager":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _converse(self) -> Dict[str, Any]:
         # Use a plain ASCII title to avoid surrogate emoji issues on some terminals
         console.print(
             Panel.fit(
@@ -536,8 +603,8 @@ Always output that JSON block clearly (optionally inside ```json fences) once th
             # Update token usage snapshot for menu display
             self._refresh_token_usage()
             
-            # Check if LLM provided final JSON data
-            extracted = self._extract_structured_data(response)
+            # Check if LLM provided final JSON data (found while streaming)
+            extracted = self.last_structured_data
             if extracted:
                 self.extracted_data = extracted
                 logger.info("Extracted structured data from LLM response")
@@ -746,36 +813,42 @@ Always output that JSON block clearly (optionally inside ```json fences) once th
         if self.repo_analysis and not self.code_samples:
             self.extract_code_samples()
         
-        # Map extracted data to expected format
+        inputs = self._design_inputs(self.extracted_data)
+
+        # Add code samples context if available
+        if self.code_samples:
+            code_context = self.get_code_samples_context()
+            if code_context:
+                inputs["code_samples"] = code_context
+        
+        return inputs
+
+    @staticmethod
+    def _design_inputs(data: Dict[str, Any]) -> Dict[str, str]:
+        """Map extracted interview data to generate_design inputs."""
         inputs = {
-            "name": self.extracted_data.get("project_name", ""),
-            "languages": self.extracted_data.get("primary_language", ""),
-            "requirements": self.extracted_data.get("requirements", ""),
+            "name": data.get("project_name", ""),
+            "languages": data.get("primary_language", ""),
+            "requirements": data.get("requirements", ""),
         }
-        
+
         # Add optional fields if present
         optional_mappings = {
             "frameworks": "frameworks",
-            "apis": "apis", 
+            "apis": "apis",
             "database": "database",
             "deployment_platform": "deployment_platform",
             "testing_requirements": "testing_requirements",
+            "project_type": "project_type",
         }
-        
+
         for extracted_key, input_key in optional_mappings.items():
-            value = self.extracted_data.get(extracted_key)
+            value = data.get(extracted_key)
             if value:
                 if isinstance(value, list):
                     inputs[input_key] = ",".join(str(v) for v in value)
                 else:
                     inputs[input_key] = str(value)
-        
-        # Add code samples context if available
-        if self.code_samples:
-            code_context = self.get_code_samples_context()
-            if code_context:
-                inputs["code_samples"] = code_context
-        
         return inputs
 
     def _setup_logging(self) -> None:
@@ -1073,81 +1146,72 @@ Always output that JSON block clearly (optionally inside ```json fences) once th
             return base[: max_len - 1] + "…"
         return base
     
-    def _send_to_llm(self, user_input: str) -> str:
-        """Send user input to LLM and get response."""
-        # Add user message to conversation history
+    # ------------------------------------------------------------------
+    # Async engine
+    # ------------------------------------------------------------------
+
+    async def send(
+        self, user_input: str, callback: Optional[Callable[[str], Any]] = None
+    ) -> str:
+        """Send one user turn to the LLM and return the assistant reply.
+
+        This is the async-native core of the interview: the Textual UI and
+        the web server await it directly, and the sync CLI loop runs it on the
+        session's persistent event loop. Tokens are passed to ``callback`` as
+        they stream in; without a callback a single completion is requested.
+        LLM errors do not raise: a fallback reply is returned and the error is
+        kept in :attr:`last_error`. The reply's structured summary, if any, is
+        kept in :attr:`last_structured_data`; it is detected while streaming
+        and reported to :attr:`on_structured_data` before the stream ends.
+        """
         self.conversation_history.append({
             "role": "user",
             "content": user_input
         })
-        
-        # Format conversation for LLM
-        conversation_text = self._format_conversation_for_llm()
-        
+
+        head, body = self._split_history()
+        summary, recent = await self.memory.prepare(body)
+        conversation_text = self._format_messages(head, summary, recent)
+
         if self.verbose:
             console.print("\n[dim]--- API Request ---[/dim]")
             console.print(f"[dim]Provider: {self.config.llm.provider}[/dim]")
             console.print(f"[dim]Model: {self.config.llm.model}[/dim]")
             console.print(f"[dim]Conversation length: {len(conversation_text)} chars[/dim]")
-        
+
         logger.debug(f"Sending to LLM: {conversation_text[:200]}...")
-        
-        # Get LLM response
+
+        self.last_error = None
+        self.last_structured_data = None
+        extractor = StructuredDataExtractor(self._normalize_extracted_data)
         try:
-            # Check if streaming is enabled
-            streaming_enabled = getattr(self.config, 'streaming_enabled', False)
-            
-            if streaming_enabled:
-                # Use streaming for real-time token display
-                console.print("\n[blue]🎵 Devussy[/blue]:")
-                
-                # Collect streaming response
-                response_chunks = []
-                
-                def token_callback(token: str) -> None:
-                    """Callback for each streaming token."""
-                    response_chunks.append(token)
-                    # Display token in real-time (without newlines for smooth streaming)
-                    console.print(token, end="", style="blue")
-                
-                # Make streaming request
-                import asyncio
-                response = asyncio.run(self.llm_client.generate_completion_streaming(
-                    conversation_text, token_callback
-                ))
-                
-                console.print()  # Add newline after streaming
-                console.print()  # Add spacing
-                
-            else:
-                # Use non-streaming fallback
-                # Single-line, non-wrapping status text while spinner is active
-                status_line = Text(self._spinner_status_line(), style="black on white")
-                with console.status(status_line, spinner="dots"):
-                    response = self.llm_client.generate_completion_sync(conversation_text)
-                
-                # Display response normally (ONLY in non-streaming mode)
-                self._display_llm_response(response)
-            
+            response = await self._complete(
+                conversation_text, self._watch_stream(extractor, callback)
+            )
+
             if self.verbose:
                 console.print(f"[dim]Response length: {len(response)} chars[/dim]")
                 console.print("[dim]--- End API Request ---[/dim]\n")
             logger.debug(f"LLM response: {response[:200]}...")
-            
         except Exception as e:
-            console.print(f"[red]❌ Error communicating with LLM: {e}[/red]")
+            self.last_error = e
             logger.error(f"LLM API error: {e}", exc_info=True)
             response = "I'm having trouble connecting right now. Could you try again?"
-            # Display error response (ONLY in non-streaming mode to avoid duplication)
-            if not streaming_enabled:
-                self._display_llm_response(response)
-        
-        # Add LLM response to conversation history
+        else:
+            if extractor.result is None:
+                # Non-streaming reply, or a stream whose chunks were not seen
+                self._structured_data_found(
+                    StructuredDataExtractor.extract(response, self._normalize_extracted_data)
+                )
+
         self.conversation_history.append({
             "role": "assistant",
             "content": response
         })
-        
+        # Fold turns that left the window while the user types the next one
+        if not self.stateless:
+            self.memory.schedule(self._split_history()[1])
+
         # Save this Q&A pair to markdown if output manager is configured
         if self.markdown_output_manager:
             self.question_counter += 1
@@ -1159,83 +1223,204 @@ Always output that JSON block clearly (optionally inside ```json fences) once th
                 )
             except Exception as e:
                 logger.warning(f"Failed to save interview response to markdown: {e}")
-        
-        # Log full conversation exchange
+
         logger.info(f"USER: {user_input}")
         logger.info(f"ASSISTANT: {response[:500]}...")  # Log first 500 chars
-        
+
         return response
 
-    async def _send_to_llm_streaming(self, user_input: str, callback=None) -> str:
-        """Send user input to LLM and get streaming response.
-        
-        Args:
-            user_input: User input message
-            callback: Optional callback function for each token
-            
-        Returns:
-            Complete LLM response
+    def _watch_stream(
+        self,
+        extractor: StructuredDataExtractor,
+        callback: Optional[Callable[[str], Any]],
+    ) -> Optional[Callable[[str], Any]]:
+        """Wrap a streaming callback so tokens also feed ``extractor``."""
+        if callback is None:
+            return None
+
+        def observe(token: str) -> None:
+            if extractor.result is None and extractor.feed(token) is not None:
+                self._structured_data_found(extractor.result)
+
+        if asyncio.iscoroutinefunction(callback):
+            async def watched_async(token: str) -> None:
+                observe(token)
+                await callback(token)
+
+            return watched_async
+
+        def watched(token: str) -> Any:
+            observe(token)
+            return callback(token)
+
+        return watched
+
+    def _structured_data_found(self, data: Optional[Dict[str, Any]]) -> None:
+        if data is None:
+            return
+        self.last_structured_data = data
+        self._prefetch_design(data)
+        if self.on_structured_data is not None:
+            try:
+                self.on_structured_data(data)
+            except Exception as e:
+                logger.warning(f"Structured data hook failed: {e}")
+
+    def _prefetch_design(self, data: Dict[str, Any]) -> None:
+        """Start (or restart) speculative design generation for a complete summary."""
+        if self.design_prefetcher is None or self.mode != "initial":
+            return
+        if not self._validate_extracted_data(data):
+            return
+        try:
+            self.design_prefetcher.update(self._design_inputs(data))
+        except Exception as e:
+            logger.warning(f"Failed to start speculative design generation: {e}")
+
+    async def _complete(
+        self, prompt: str, callback: Optional[Callable[[str], Any]] = None
+    ) -> str:
+        """Request a completion, reusing the client's pooled HTTP session."""
+        await self._ensure_client_session()
+        if callback is not None:
+            return await self.llm_client.generate_completion_streaming(prompt, callback)
+        generate = getattr(self.llm_client, "generate_completion", None)
+        if asyncio.iscoroutinefunction(generate):
+            return await generate(prompt)
+        # Sync-only clients: keep the event loop responsive
+        return await asyncio.to_thread(self.llm_client.generate_completion_sync, prompt)
+
+    async def _ensure_client_session(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._client_session_loop is loop:
+            return
+        open_session = getattr(self.llm_client, "open_session", None)
+        if asyncio.iscoroutinefunction(open_session):
+            await open_session()
+        self._client_session_loop = loop
+
+    def _run(self, coro):
+        """Run ``coro`` to completion on the session's persistent event loop.
+
+        Sync callers share one loop for the whole interview instead of
+        starting a new one per turn, so the client's connections stay open
+        between turns. The loop runs on a background thread, which lets
+        background work (conversation summaries) progress while the user is
+        typing. Async callers await :meth:`send` directly instead.
+
+        After :meth:`close` (e.g. finalizing once the interview has ended),
+        the loop is started for this call only and stopped again.
         """
-        # Add user message to conversation history
-        self.conversation_history.append({
-            "role": "user",
-            "content": user_input
-        })
-        
-        # Format conversation for LLM
-        conversation_text = self._format_conversation_for_llm()
-        
-        if self.verbose:
-            console.print("\n[dim]--- Streaming API Request ---[/dim]")
-            console.print(f"[dim]Provider: {self.config.llm.provider}[/dim]")
-            console.print(f"[dim]Model: {self.config.llm.model}[/dim]")
-            console.print(f"[dim]Conversation length: {len(conversation_text)} chars[/dim]")
-        
-        logger.debug(f"Sending to LLM (streaming): {conversation_text[:200]}...")
-        
-        # Get LLM streaming response
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(
+                target=self._loop.run_forever, name="interview-loop", daemon=True
+            )
+            self._loop_thread.start()
         try:
+            return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+        finally:
+            if self._closed:
+                self.close()
+
+    async def aclose(self) -> None:
+        """Release the client's pooled HTTP session opened by this manager."""
+        self.memory.cancel()
+        if self._client_session_loop is asyncio.get_running_loop():
+            aclose = getattr(self.llm_client, "aclose", None)
+            if asyncio.iscoroutinefunction(aclose):
+                await aclose()
+        self._client_session_loop = None
+
+    def close(self) -> None:
+        """Release the pooled session and stop the persistent event loop.
+
+        Safe to call more than once. Also used as the context-manager exit.
+        """
+        self._closed = True
+        loop, self._loop = self._loop, None
+        thread, self._loop_thread = self._loop_thread, None
+        if loop is None or loop.is_closed():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self.aclose(), loop).result(timeout=10)
+        except Exception as e:
+            logger.debug(f"Failed to release interview client session: {e}")
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            if thread is not None:
+                thread.join(timeout=5)
+            if not loop.is_running():
+                loop.close()
+
+    def _send_to_llm(self, user_input: str) -> str:
+        """Send user input to LLM and display the response (sync CLI path)."""
+        streaming_enabled = getattr(self.config, 'streaming_enabled', False)
+
+        if streaming_enabled:
             # Use streaming for real-time token display
-            response_chunks = []
-            
+            console.print("\n[blue]🎵 Devussy[/blue]:")
+
             def token_callback(token: str) -> None:
-                """Callback for each streaming token."""
-                response_chunks.append(token)
-                # Call custom callback if provided
-                if callback:
-                    callback(token)
-            
-            # Make streaming request
-            response = await self.llm_client.generate_completion_streaming(
-                conversation_text, token_callback
-            )
-            
-            if self.verbose:
-                console.print(f"[dim]Streaming response length: {len(response)} chars[/dim]")
-                console.print("[dim]--- End Streaming API Request ---[/dim]\n")
-            logger.debug(f"LLM streaming response: {response[:200]}...")
-            
-        except Exception as e:
-            console.print(f"[red]❌ Error communicating with LLM: {e}[/red]")
-            logger.error(f"LLM API streaming error: {e}", exc_info=True)
-            response = "I'm having trouble connecting right now. Could you try again?"
-        
-        # Add LLM response to conversation history
-        self.conversation_history.append({
-            "role": "assistant", 
-            "content": response
-        })
-        
-        # Log full conversation exchange
-        logger.info(f"USER: {user_input}")
-        logger.info(f"ASSISTANT (streaming): {response[:500]}...")  # Log first 500 chars
-        
+                # Display token in real-time (without newlines for smooth streaming)
+                console.print(token, end="", style="blue")
+
+            response = self._run(self.send(user_input, token_callback))
+
+            console.print()  # Add newline after streaming
+            console.print()  # Add spacing
+        else:
+            # Single-line, non-wrapping status text while spinner is active
+            status_line = Text(self._spinner_status_line(), style="black on white")
+            with console.status(status_line, spinner="dots"):
+                response = self._run(self.send(user_input))
+
+        if self.last_error is not None:
+            console.print(f"[red]❌ Error communicating with LLM: {self.last_error}[/red]")
+
+        # Display response normally (ONLY in non-streaming mode)
+        if not streaming_enabled:
+            self._display_llm_response(response)
+
         return response
 
+    async def _send_to_llm_streaming(self, user_input: str, callback=None) -> str:
+        """Send user input to LLM and get streaming response.
+
+        Kept for existing callers; equivalent to :meth:`send`.
+        """
+        return await self.send(user_input, callback)
+
+    def _split_history(self) -> tuple[List[Dict[str, str]], List[Dict[str, str]]]:
+        """Split history into the leading system prompts and the conversation body."""
+        history = self.conversation_history
+        index = 0
+        while index < len(history) and history[index].get("role") == "system":
+            index += 1
+        return history[:index], history[index:]
+
     def _format_conversation_for_llm(self) -> str:
-        """Format conversation history for LLM consumption."""
+        """Format conversation history for LLM consumption.
+
+        Once the history outgrows the memory budget, older turns are replaced
+        by the rolling summary so the prompt stays bounded.
+        """
+        head, body = self._split_history()
+        summary, recent = self.memory.view(body)
+        return self._format_messages(head, summary, recent)
+
+    def _format_messages(
+        self,
+        head: List[Dict[str, str]],
+        summary: Optional[ConversationSummary],
+        recent: List[Dict[str, str]],
+    ) -> str:
         messages = []
-        for msg in self.conversation_history:
+        if summary is not None:
+            head = head + [
+                {"role": "system", "content": self.memory.render(summary, self.extracted_data)}
+            ]
+        for msg in head + recent:
             if msg["role"] == "system":
                 messages.append(f"System: {msg['content']}")
             elif msg["role"] == "user":
@@ -1267,20 +1452,8 @@ Always output that JSON block clearly (optionally inside ```json fences) once th
 
             # Respect streaming settings - don't display if streaming is enabled to avoid duplication
             streaming_enabled = getattr(self.config, 'streaming_enabled', False)
-            
-            if streaming_enabled:
-                # Use streaming but don't display (avoid duplication)
-                response_chunks = []
-                def silent_token_callback(token: str) -> None:
-                    response_chunks.append(token)
-                
-                import asyncio
-                response = asyncio.run(self.llm_client.generate_completion_streaming(
-                    prompt, silent_token_callback
-                ))
-            else:
-                # Use non-streaming
-                response = self.llm_client.generate_completion_sync(prompt)
+            silent_callback = (lambda token: None) if streaming_enabled else None
+            response = self._run(self._complete(prompt, silent_callback))
             
             extracted = self._extract_structured_data(response)
             if extracted and self._validate_extracted_data(extracted):
@@ -1299,20 +1472,8 @@ Always output that JSON block clearly (optionally inside ```json fences) once th
             
             # Respect streaming settings to avoid duplication
             streaming_enabled = getattr(self.config, 'streaming_enabled', False)
-            
-            if streaming_enabled:
-                # Use streaming but don't display (avoid duplication during /done processing)
-                response_chunks = []
-                def silent_token_callback(token: str) -> None:
-                    response_chunks.append(token)
-                
-                import asyncio
-                response = asyncio.run(self.llm_client.generate_completion_streaming(
-                    prompt, silent_token_callback
-                ))
-            else:
-                # Use non-streaming
-                response = self.llm_client.generate_completion_sync(prompt)
+            silent_callback = (lambda token: None) if streaming_enabled else None
+            response = self._run(self._complete(prompt, silent_callback))
             
             if self.verbose:
                 console.print(f"[dim]Response length: {len(response)} chars[/dim]")
@@ -1340,69 +1501,8 @@ Always output that JSON block clearly (optionally inside ```json fences) once th
                 console.print()
 
     def _extract_structured_data(self, response: str) -> Optional[Dict[str, Any]]:
-        """Extract JSON data from an LLM response using multiple strategies."""
-        # Try fenced JSON (case-insensitive), allow any whitespace and Windows newlines
-        fenced_patterns = [
-            r"```json\s*(\{[\s\S]*?\})\s*```",
-            r"```\s*(\{[\s\S]*?\})\s*```",
-        ]
-        for pat in fenced_patterns:
-            m = re.search(pat, response, re.DOTALL | re.IGNORECASE)
-            if m:
-                try:
-                    data = json.loads(m.group(1))
-                    data = self._normalize_extracted_data(data)
-                    return data
-                except json.JSONDecodeError:
-                    pass
-
-        # Try plain JSON object anywhere in text using a simple longest-match regex
-        regex_any_obj = r"\{[\s\S]*\}"
-        candidates = list(re.finditer(regex_any_obj, response, re.DOTALL))
-        for m in sorted(candidates, key=lambda mm: len(mm.group(0)), reverse=True):
-            try:
-                data = json.loads(m.group(0))
-                data = self._normalize_extracted_data(data)
-                if isinstance(data, dict) and 'project_name' in data:
-                    return data
-            except json.JSONDecodeError:
-                # YAML fallback for JSON-like content (tolerates comments, trailing commas, single quotes)
-                try:
-                    data = yaml.safe_load(m.group(0))
-                    data = self._normalize_extracted_data(data)
-                    if isinstance(data, dict) and 'project_name' in data:
-                        return data
-                except Exception:
-                    continue
-
-        # Balanced-brace scan to extract valid JSON object
-        stack = []
-        start_idx = None
-        for i, ch in enumerate(response):
-            if ch == '{':
-                if not stack:
-                    start_idx = i
-                stack.append('{')
-            elif ch == '}':
-                if stack:
-                    stack.pop()
-                    if not stack and start_idx is not None:
-                        frag = response[start_idx:i+1]
-                        try:
-                            data = json.loads(frag)
-                            data = self._normalize_extracted_data(data)
-                            if isinstance(data, dict) and 'project_name' in data:
-                                return data
-                        except json.JSONDecodeError:
-                            try:
-                                data = yaml.safe_load(frag)
-                                data = self._normalize_extracted_data(data)
-                                if isinstance(data, dict) and 'project_name' in data:
-                                    return data
-                            except Exception:
-                                pass
-
-        return None
+        """Extract the structured project summary from a complete LLM response."""
+        return StructuredDataExtractor.extract(response, self._normalize_extracted_data)
 
     def _validate_extracted_data(self, data: Dict[str, Any]) -> bool:
         """Validate that required fields are present in extracted data."""
@@ -1544,7 +1644,8 @@ Always output that JSON block clearly (optionally inside ```json fences) once th
             extractor = CodeSampleExtractor(
                 root_path=str(self.repo_analysis.root_path),
                 max_samples=8,  # Reasonable number for interview context
-                max_lines_per_sample=150  # Keep samples concise
+                max_lines_per_sample=150,  # Keep samples concise
+                cache=RepoAnalysisCache.from_env(),
             )
             
             # Extract samples based on analysis and user goals
@@ -1552,7 +1653,8 @@ Always output that JSON block clearly (optionally inside ```json fences) once th
             samples = extractor.extract_samples(
                 analysis=self.repo_analysis,
                 selected_parts=selected_parts,
-                goals=goals
+                goals=goals,
+                token_budget=self._code_sample_budget(),
             )
             
             self.code_samples = samples
@@ -1563,14 +1665,25 @@ Always output that JSON block clearly (optionally inside ```json fences) once th
             logger.warning(f"Failed to extract code samples: {e}")
             return []
     
-    def get_code_samples_context(self) -> str:
+    def _code_sample_budget(self) -> Optional[int]:
+        """Configured interview token budget for code samples, or None."""
+        budget = getattr(getattr(self.config, "context_budget", None), "interview", None)
+        return budget if isinstance(budget, int) and budget > 0 else None
+
+    def get_code_samples_context(self, token_budget: Optional[int] = None) -> str:
         """Format code samples for inclusion in prompts.
         
+        Args:
+            token_budget: Token budget for the samples; defaults to
+                ``config.context_budget.interview`` (0 disables packing)
+        
         Returns:
             Formatted string of code samples ready for LLM context
         """
         if not self.code_samples:
             return ""
+        if token_budget is None:
+            token_budget = self._code_sample_budget()
         
         try:
             # Safeguard: repo_analysis might be None if code_samples were injected externally
@@ -1578,7 +1691,10 @@ Always output that JSON block clearly (optionally inside ```json fences) once th
                 str(getattr(self.repo_analysis, "root_path", "."))
                 if self.repo_analysis is not None else "."
             )
-            extractor = CodeSampleExtractor(root_path=root_path)
-            return extractor.format_samples_for_prompt(self.code_samples)
+            extractor = CodeSampleExtractor(root_path=root_path, cache=RepoAnalysisCache.from_env())
+            samples = self.code_samples
+            if token_budget:
+                samples = extractor.pack_samples(samples, token_budget)
+            return extractor.format_samples_for_prompt(samples)
         except Exception:
             return ""
@@ -0,0 +1,239 @@
+"""Event-loop lag monitor and blocking-call detector.
+
+A watchdog thread pings the event loop with ``call_soon_threadsafe`` every
+``interval`` seconds and measures how long the callback takes to run; that
+delay is the loop lag. When a ping has not run after ``threshold`` seconds the
+loop is blocked by synchronous work, so the watchdog snapshots the loop
+thread's stack, logs it and records how long the block lasted. Blocks are
+aggregated by the innermost project frame on the stack so repeated offenders
+(``load_config()`` on the loop, sqlite writes, blocking HTTP calls) show up as
+one line with a count and total blocked time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sys
+import sysconfig
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Deque, Dict, List, Optional, TypeVar
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+_LIBRARY_PREFIXES = tuple(
+    {p for p in (sysconfig.get_paths().get("stdlib"), sysconfig.get_paths().get("purelib")) if p}
+)
+
+
+@dataclass
+class Offender:
+    """Blocking calls aggregated under one code location."""
+
+    location: str
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    stack: List[str] = field(default_factory=list)
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _location(stack: traceback.StackSummary) -> str:
+    # Innermost frame outside the standard library and site-packages; this is
+    # the project code that made the blocking call.
+    for frame in reversed(stack):
+        if not frame.filename.startswith(_LIBRARY_PREFIXES):
+            return f"{Path(frame.filename).name}:{frame.lineno} ({frame.name})"
+    frame = stack[-1]
+    return f"{Path(frame.filename).name}:{frame.lineno} ({frame.name})"
+
+
+class LoopMonitor:
+    """Measure event-loop lag and capture stacks of blocking callbacks."""
+
+    def __init__(self, threshold: float = 0.1, interval: float = 0.05, max_samples: int = 10000):
+        """Initialize the monitor.
+
+        Args:
+            threshold: Seconds a callback may hold the loop before it is reported
+            interval: Seconds between lag probes
+            max_samples: Lag samples kept for percentile calculation
+        """
+        self.threshold = threshold
+        self.interval = interval
+        self.lags: Deque[float] = deque(maxlen=max_samples)
+        self.offenders: Dict[str, Offender] = {}
+        self.blocked_total = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """Start watching ``loop`` (default: the running loop).
+
+        Must be called from the loop's thread.
+        """
+        if self._thread is not None:
+            return
+        self._loop = loop or asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        # Each watchdog gets its own event so a restart cannot revive one
+        # that is still winding down
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._watch, args=(self._stop,), name="loop-monitor", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the watchdog thread.
+
+        Called from the loop's thread this only signals the watchdog: joining
+        there would block the loop while a pending probe times out.
+        """
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None and threading.get_ident() != self._loop_thread:
+            thread.join()
+
+    async def astop(self) -> None:
+        """Stop the watchdog and wait for it without blocking the loop."""
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            await asyncio.to_thread(thread.join)
+
+    async def watch(self, coro: Awaitable[T]) -> T:
+        """Run ``coro`` with the monitor active on the current loop."""
+        self.start()
+        try:
+            return await coro
+        finally:
+            await self.astop()
+
+    def _watch(self, stop: threading.Event) -> None:
+        loop = self._loop
+        while not stop.wait(self.interval):
+            if loop is None or loop.is_closed():
+                return
+            ran = threading.Event()
+            sent = time.perf_counter()
+            try:
+                loop.call_soon_threadsafe(ran.set)
+            except RuntimeError:
+                return
+            if ran.wait(self.threshold):
+                with self._lock:
+                    self.lags.append(time.perf_counter() - sent)
+                continue
+            if stop.is_set():
+                return
+            # Blocked: capture what the loop thread is doing right now
+            frame = sys._current_frames().get(self._loop_thread)
+            stack = traceback.extract_stack(frame) if frame is not None else traceback.StackSummary()
+            while not ran.wait(self.interval):
+                if stop.is_set() or loop.is_closed():
+                    break
+            blocked = time.perf_counter() - sent
+            with self._lock:
+                self.lags.append(blocked)
+            if stack:
+                self._record(stack, blocked)
+
+    def _record(self, stack: traceback.StackSummary, blocked: float) -> None:
+        location = _location(stack)
+        formatted = traceback.format_list(stack[-12:])
+        with self._lock:
+            offender = self.offenders.get(location)
+            if offender is None:
+                offender = self.offenders[location] = Offender(location=location, stack=formatted)
+            offender.count += 1
+            offender.total += blocked
+            offender.max = max(offender.max, blocked)
+            self.blocked_total += blocked
+        logger.warning(
+            f"Event loop blocked for {blocked * 1000:.0f} ms at {location}\n" + "".join(formatted)
+        )
+
+    def report(self) -> Dict[str, Any]:
+        """Return lag percentiles and offenders sorted by total blocked time."""
+        with self._lock:
+            lags = list(self.lags)
+            offenders = sorted(self.offenders.values(), key=lambda o: o.total, reverse=True)
+        return {
+            "threshold_ms": self.threshold * 1000,
+            "samples": len(lags),
+            "lag_ms": {
+                "p50": _percentile(lags, 50) * 1000,
+                "p95": _percentile(lags, 95) * 1000,
+                "p99": _percentile(lags, 99) * 1000,
+                "max": max(lags, default=0.0) * 1000,
+            },
+            "blocked_total_ms": self.blocked_total * 1000,
+            "offenders": [
+                {
+                    "location": o.location,
+                    "count": o.count,
+                    "total_ms": o.total * 1000,
+                    "max_ms": o.max * 1000,
+                    "stack": o.stack,
+                }
+                for o in offenders
+            ],
+        }
+
+    def format_report(self, limit: int = 10) -> str:
+        """Render :meth:`report` as readable text."""
+        data = self.report()
+        lag = data["lag_ms"]
+        lines = [
+            f"Event loop lag over {data['samples']} probes: p50 {lag['p50']:.1f} ms, "
+            f"p95 {lag['p95']:.1f} ms, p99 {lag['p99']:.1f} ms, max {lag['max']:.1f} ms",
+            f"Blocked > {data['threshold_ms']:.0f} ms: {data['blocked_total_ms']:.0f} ms total",
+        ]
+        for o in data["offenders"][:limit]:
+            lines.append(
+                f"  {o['count']:>4}x  {o['total_ms']:>8.0f} ms total  {o['max_ms']:>7.0f} ms max  {o['location']}"
+            )
+        return "\n".join(lines)
+
+    def write_report(self, path: str | Path) -> Path:
+        """Write :meth:`report` as JSON."""
+        p = Path(path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(json.dumps(self.report(), indent=2), encoding="utf-8")
+        return p
+
+
+def monitor_from_env() -> Optional[LoopMonitor]:
+    """Build a monitor when ``DEVUSSY_LOOP_MONITOR`` is set.
+
+    ``DEVUSSY_LOOP_MONITOR_THRESHOLD_MS`` overrides the blocking threshold.
+    """
+    if os.getenv("DEVUSSY_LOOP_MONITOR", "").lower() not in ("1", "true", "yes"):
+        return None
+    threshold_ms = float(os.getenv("DEVUSSY_LOOP_MONITOR_THRESHOLD_MS", "100"))
+    return LoopMonitor(threshold=threshold_ms / 1000)
@@ -7,6 +7,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from .artifact_writer import ArtifactWriter, atomic_write_text
 from .logger import get_logger
 
 logger = get_logger(__name__)
@@ -15,14 +16,20 @@ logger = get_logger(__name__)
 class MarkdownOutputManager:
     """Manages markdown file outputs for interviews and pipeline stages."""
     
-    def __init__(self, base_output_dir: str | Path = "outputs"):
+    def __init__(
+        self,
+        base_output_dir: str | Path = "outputs",
+        writer: Optional[ArtifactWriter] = None,
+    ):
         """Initialize the markdown output manager.
         
         Args:
             base_output_dir: Base directory for all markdown outputs (default: outputs/)
+            writer: Optional background writer; when set, files are written off-thread
         """
         self.base_output_dir = Path(base_output_dir)
         self.run_dir: Optional[Path] = None
+        self.writer = writer
         
     def create_run_directory(self, project_name: str) -> Path:
         """Create a timestamped directory for this run.
@@ -87,8 +94,10 @@ This directory contains all outputs from the DevUssY planning session.
         new_name = f"{timestamp_part}_{safe_project_name}"
         new_dir = self.base_output_dir / new_name
         
-        # Rename the directory
+        # Rename the directory (queued writes must land in the old path first)
         try:
+            if self.writer is not None:
+                self.writer.flush()
             self.run_dir.rename(new_dir)
             logger.info(f"Renamed run directory from {self.run_dir} to {new_dir}")
             self.run_dir = new_dir
@@ -135,8 +144,9 @@ This directory contains all outputs from the DevUssY planning session.
             "output_directory": str(self.run_dir)
         }
         
-        metadata_file = self.run_dir / "run_metadata.json"
-        metadata_file.write_text(json.dumps(metadata_with_timestamp, indent=2), encoding="utf-8")
+        metadata_file = self._write_file(
+            "run_metadata.json", json.dumps(metadata_with_timestamp, indent=2)
+        )
         logger.info(f"Saved run metadata to {metadata_file}")
     
     def save_interview_response(
@@ -223,11 +233,7 @@ This directory contains all outputs from the DevUssY planning session.
         logger.info("Saved complete interview transcript")
         
         # Save extracted data as both JSON and markdown
-        extracted_json_path = interview_dir / "extracted_data.json"
-        extracted_json_path.write_text(
-            json.dumps(extracted_data, indent=2), 
-            encoding="utf-8"
-        )
+        self._write_file("interview/extracted_data.json", json.dumps(extracted_data, indent=2))
         logger.info("Saved extracted interview data (JSON)")
         
         # Create a readable markdown summary
@@ -336,8 +342,10 @@ This directory contains all outputs from the DevUssY planning session.
             raise ValueError("Run directory not initialized")
         
         file_path = self.run_dir / relative_path
-        file_path.parent.mkdir(parents=True, exist_ok=True)
-        file_path.write_text(content, encoding="utf-8")
+        if self.writer is not None:
+            self.writer.submit(file_path, content)
+        else:
+            atomic_write_text(file_path, content)
         
         return file_path
     
@@ -10,6 +10,7 @@ from ..llm_client import LLMClient
 from ..logger import get_logger
 from ..models import DevPlan, DevPlanPhase, ProjectDesign
 from ..templates import render_template
+from ..tracing import traced
 
 logger = get_logger(__name__)
 
@@ -25,6 +26,7 @@ class BasicDevPlanGenerator:
         """
         self.llm_client = llm_client
 
+    @traced("stage.basic_devplan")
     async def generate(
         self,
         project_design: ProjectDesign,
@@ -147,6 +149,7 @@ class BasicDevPlanGenerator:
 
         return devplan
 
+    @traced("parse.basic_devplan")
     def _parse_response(self, response: str, project_name: str) -> DevPlan:
         """Parse the LLM response into a structured DevPlan.
 
@@ -2,22 +2,40 @@
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import asdict
 from pathlib import Path
-from typing import Any, List, Mapping, Optional, Tuple
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
+from ..artifact_writer import ArtifactWriter
 from ..clients.factory import create_llm_client
 from ..concurrency import ConcurrencyManager
-from ..config import GitConfig
+from ..config import ContextBudgetConfig, GitConfig
 from ..file_manager import FileManager
+from ..git_commit_queue import GitCommitQueue
 from ..git_manager import GitManager
 from ..llm_client import LLMClient
 from ..logger import get_logger
 from ..models import DevPlan, DevPlanPhase, HandoffPrompt, ProjectDesign
+from ..events import (
+    CheckpointSaved,
+    ConsoleEventRenderer,
+    EventBus,
+    FileCreated,
+    PhaseReady,
+    PipelineFailed,
+    PipelineFinished,
+    PipelineStarted,
+    StageEnded,
+    StageStarted,
+    UsageUpdated,
+)
 from ..progress_reporter import PipelineProgressReporter
 from ..state_manager import StateManager
 from ..markdown_output_manager import MarkdownOutputManager
 from ..interview.complexity_analyzer import ComplexityAnalyzer, ComplexityProfile
+from ..interview.context_packer import fit_formatted_samples
+from ..tracing import traced
 from .basic_devplan import BasicDevPlanGenerator
 from .design_correction_loop import DesignCorrectionLoop, DesignCorrectionResult
 from .design_validator import DesignValidator, DesignValidationReport
@@ -25,6 +43,7 @@ from .detailed_devplan import DetailedDevPlanGenerator, PhaseDetailResult
 from .handoff_prompt import HandoffPromptGenerator
 from .design_review import DesignReviewRefiner
 from .llm_sanity_reviewer import LLMSanityReviewer, LLMSanityReviewResult
+from .design_prefetch import DesignPrefetcher
 from .project_design import ProjectDesignGenerator
 
 logger = get_logger(__name__)
@@ -46,6 +65,8 @@ class PipelineOrchestrator:
         repo_analysis: Optional[Any] = None,
         code_samples: Optional[str] = None,
         markdown_output_manager: Optional[MarkdownOutputManager] = None,
+        artifact_writer: Optional[ArtifactWriter] = None,
+        event_bus: Optional[EventBus] = None,
     ):
         """Initialize the orchestrator.
 
@@ -61,25 +82,53 @@ class PipelineOrchestrator:
             repo_analysis: Optional RepoAnalysis for existing project context
             code_samples: Optional formatted code samples string for context
             markdown_output_manager: Optional markdown output manager for saving stage outputs
+            artifact_writer: Optional background writer for artifact files; one is
+                created by default and flushed before git commits and at the end of a run
+            event_bus: Optional event bus for progress events; a console renderer
+                for ``progress_reporter`` is subscribed to it
         """
         self.llm_client = llm_client
         self.concurrency_manager = concurrency_manager
         self.file_manager = file_manager or FileManager()
         self.git_config = git_config or GitConfig()
         self.config = config  # Store config for stage-specific clients
+        self._owns_state_manager = state_manager is None
         self.state_manager = state_manager or StateManager()
         self.progress_reporter = progress_reporter or PipelineProgressReporter()
+        # Progress is published as events; the console is one subscriber among
+        # others (SSE, log file, metrics). Live displays (status bar, spinners,
+        # phase progress) are still driven directly by the reporter.
+        self.event_bus = event_bus or EventBus()
+        self.event_bus.subscribe(ConsoleEventRenderer(self.progress_reporter), name="console")
         self.repo_analysis = repo_analysis  # Store for use in generation stages
         self.code_samples = code_samples  # Store for use in generation stages
+        self._packed_code_samples: Dict[Tuple[str, str], Optional[str]] = {}
         self.markdown_output_manager = markdown_output_manager  # Store for markdown outputs
 
+        # Route artifact writes through a background writer so file I/O does not
+        # block the event loop; flushed at stage boundaries and closed by close().
+        self._owns_artifact_writer = artifact_writer is None
+        self.artifact_writer = artifact_writer or ArtifactWriter()
+        if isinstance(self.file_manager, FileManager) and self.file_manager.writer is None:
+            self.file_manager.writer = self.artifact_writer
+        if (
+            isinstance(self.markdown_output_manager, MarkdownOutputManager)
+            and self.markdown_output_manager.writer is None
+        ):
+            self.markdown_output_manager.writer = self.artifact_writer
+
         # Initialize Git manager if Git is enabled
         self.git_manager = None
+        self.git_commit_queue: Optional[GitCommitQueue] = None
         if self.git_config.enabled:
             self.git_manager = GitManager(repo_path)
             if not self.git_manager.is_repo():
                 logger.warning("Git integration enabled but not in a Git repository")
                 self.git_manager = None
+            elif self.git_config.background_commits:
+                self.git_commit_queue = GitCommitQueue(
+                    self.git_manager, window=self.git_config.commit_batch_window
+                )
 
         # Initialize stage-specific LLM clients
         self._initialize_stage_clients()
@@ -211,6 +260,56 @@ class PipelineOrchestrator:
         except Exception as e:
             logger.warning(f"Failed to write rerun command file: {e}")
 
+    async def _commit_artifacts(self, message: str, files: List[str]) -> None:
+        """Commit generated files, in the background when a commit queue is set.
+
+        Queued artifact writes are flushed first so the commit sees them.
+        """
+        await self.artifact_writer.aflush()
+        if self.git_commit_queue is not None:
+            self.git_commit_queue.enqueue(message, files)
+        else:
+            self.git_manager.commit_changes(message, files=files)
+
+    async def _flush_artifacts(self) -> None:
+        """Stage-boundary barrier: wait for pending file writes, git commits and events."""
+        await self.artifact_writer.aflush()
+        await self.event_bus.drain()
+        if self.git_commit_queue is not None:
+            await self.git_commit_queue.aflush()
+
+    def close(self) -> None:
+        """Flush pending artifact writes and commits, and stop their threads.
+
+        A writer passed in by the caller is flushed but left open, and a
+        state manager passed in is left open too; ones the orchestrator
+        created are closed. The orchestrator should not write artifacts
+        after this; later commits run inline.
+        """
+        try:
+            if self._owns_artifact_writer:
+                self.artifact_writer.close()
+            else:
+                self.artifact_writer.flush()
+        finally:
+            commit_queue, self.git_commit_queue = self.git_commit_queue, None
+            if commit_queue is not None:
+                # Commits everything queued so far before the worker exits
+                commit_queue.close()
+            if self._owns_state_manager:
+                self.state_manager.close()
+
+    async def aclose(self) -> None:
+        """Async :meth:`close` that does not block the event loop."""
+        await self.event_bus.drain()
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    async def __aenter__(self) -> "PipelineOrchestrator":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
     def switch_provider(self, new_provider: str) -> None:
         """Switch to a different LLM provider dynamically.
 
@@ -266,6 +365,7 @@ class PipelineOrchestrator:
 
         return getattr(getattr(self.config, "llm", None), "provider", "unknown")
 
+    @traced("pipeline.run_full_pipeline")
     async def run_full_pipeline(
         self,
         project_name: str,
@@ -302,7 +402,7 @@ class PipelineOrchestrator:
         logger.info(f"Current config.output_dir: {getattr(self.config, 'output_dir', 'Not set')}")
         
         # Show pipeline start
-        self.progress_reporter.start_pipeline(project_name)
+        self.event_bus.publish(PipelineStarted(project_name=project_name))
         # Start persistent status bar at bottom (model/tokens/stage)
         self.progress_reporter.start_status()
 
@@ -312,11 +412,11 @@ class PipelineOrchestrator:
                 self.switch_provider(provider_override)
             except Exception as e:
                 logger.error(f"Failed to switch to provider {provider_override}: {e}")
-                self.progress_reporter.display_error(str(e))
+                self.event_bus.publish(PipelineFailed(message=str(e)))
                 raise
 
         # Stage 1: Generate project design
-        self.progress_reporter.start_stage("Project Design", 1)
+        self.event_bus.publish(StageStarted(stage="Project Design", number=1))
         logger.info("Stage 1/4: Generating project design")
         # Live spinner while LLM works
         with self.progress_reporter.create_spinner_context("Generating project design..."):
@@ -331,7 +431,7 @@ class PipelineOrchestrator:
         
         # Update token usage if available
         self._update_progress_tokens(self.design_client)
-        self.progress_reporter.end_stage("Project Design")
+        self.event_bus.publish(StageEnded(stage="Project Design"))
         
         # Save to markdown output if manager is configured
         if self.markdown_output_manager:
@@ -365,8 +465,8 @@ class PipelineOrchestrator:
                 },
             )
             logger.info("Saved checkpoint after project design")
-            self.progress_reporter.show_checkpoint_saved(
-                f"{project_name}_pipeline", "project_design"
+            self.event_bus.publish(
+                CheckpointSaved(key=f"{project_name}_pipeline", stage="project_design")
             )
         except Exception as e:
             logger.warning(f"Failed to save checkpoint after project design: {e}")
@@ -407,10 +507,12 @@ class PipelineOrchestrator:
                 design_content,
             )
             logger.info("Saved project_design.md")
-            self.progress_reporter.report_file_created(
-                f"{output_dir}/project_design.md",
-                "Project Design",
-                len(design_content)
+            self.event_bus.publish(
+                FileCreated(
+                    path=f"{output_dir}/project_design.md",
+                    file_type="Project Design",
+                    token_count=len(design_content),
+                )
             )
             # Write helper commands to rerun without interview / resume from checkpoint
             try:
@@ -428,7 +530,7 @@ class PipelineOrchestrator:
             # Commit project design if Git integration is enabled
             if self.git_manager and self.git_config.commit_after_design:
                 try:
-                    self.git_manager.commit_changes(
+                    await self._commit_artifacts(
                         "feat: generate project design",
                         files=[f"{output_dir}/project_design.md"],
                     )
@@ -447,8 +549,12 @@ class PipelineOrchestrator:
                     )
                     if save_artifacts:
                         self.file_manager.write_markdown(f"{output_dir}/design_review.md", review_md)
-                        self.progress_reporter.report_file_created(
-                            f"{output_dir}/design_review.md", "Design Review", len(review_md)
+                        self.event_bus.publish(
+                            FileCreated(
+                                path=f"{output_dir}/design_review.md",
+                                file_type="Design Review",
+                                token_count=len(review_md),
+                            )
                         )
                     
                     # Save design review to markdown output if manager is configured
@@ -484,8 +590,8 @@ class PipelineOrchestrator:
                                     "llm_kwargs": llm_kwargs,
                                 },
                             )
-                            self.progress_reporter.show_checkpoint_saved(
-                                f"{project_name}_pipeline", "design_review"
+                            self.event_bus.publish(
+                                CheckpointSaved(key=f"{project_name}_pipeline", stage="design_review")
                             )
                         except Exception:
                             pass
@@ -493,17 +599,18 @@ class PipelineOrchestrator:
                     logger.warning(f"Design pre-review failed: {e}; continuing with original design")
 
         # Stage 2: Generate basic devplan
-        self.progress_reporter.start_stage("Basic DevPlan", 2)
+        self.event_bus.publish(StageStarted(stage="Basic DevPlan", number=2))
         logger.info("Stage 2/4: Generating basic devplan")
         # Add code samples to kwargs if available
-        if self.code_samples:
-            llm_kwargs["code_samples"] = self.code_samples
+        code_samples = self._code_samples_for("devplan")
+        if code_samples:
+            llm_kwargs["code_samples"] = code_samples
         with self.progress_reporter.create_spinner_context("Creating basic development plan..."):
             basic_devplan = await self.basic_devplan_gen.generate(
                 project_design, feedback_manager=feedback_manager, repo_analysis=self.repo_analysis, **llm_kwargs
             )
         self._update_progress_tokens(self.devplan_client)
-        self.progress_reporter.end_stage("Basic DevPlan")
+        self.event_bus.publish(StageEnded(stage="Basic DevPlan"))
 
         # Save checkpoint after basic devplan
         try:
@@ -527,31 +634,33 @@ class PipelineOrchestrator:
                 },
             )
             logger.info("Saved checkpoint after basic devplan")
-            self.progress_reporter.show_checkpoint_saved(
-                f"{project_name}_pipeline", "basic_devplan"
+            self.event_bus.publish(
+                CheckpointSaved(key=f"{project_name}_pipeline", stage="basic_devplan")
             )
         except Exception as e:
             logger.warning(f"Failed to save checkpoint after basic devplan: {e}")
 
         # Stage 3: Generate detailed devplan
-        self.progress_reporter.start_stage("Detailed DevPlan", 3)
+        self.event_bus.publish(StageStarted(stage="Detailed DevPlan", number=3))
         logger.info("Stage 3/4: Generating detailed devplan")
         # Use unique phase numbers to avoid double-counting duplicates from the model.
         total_phases = len({p.number for p in basic_devplan.phases})
+        await self.event_bus.drain()
         self.progress_reporter.show_concurrent_phases(total_phases)
         # Start a progress bar for phases
         self.progress_reporter.start_phase_progress(total_phases, description="Generating detailed phases")
         # Add code samples to kwargs if available
-        if self.code_samples:
-            llm_kwargs["code_samples"] = self.code_samples
+        code_samples = self._code_samples_for("detailed")
+        if code_samples:
+            llm_kwargs["code_samples"] = code_samples
         def _handle_phase_complete(event: PhaseDetailResult) -> None:
             try:
                 self.progress_reporter.advance_phase()
-                self.progress_reporter.report_phase_ready(
+                self.event_bus.publish(PhaseReady(
                     phase_number=event.phase.number,
                     steps=len(event.phase.steps),
                     char_count=event.response_chars,
-                )
+                ))
             except Exception:
                 pass
 
@@ -568,7 +677,7 @@ class PipelineOrchestrator:
         # Ensure progress bar completes
         self.progress_reporter.stop_phase_progress()
         self._update_progress_tokens(self.devplan_client)
-        self.progress_reporter.end_stage("Detailed DevPlan")
+        self.event_bus.publish(StageEnded(stage="Detailed DevPlan"))
 
         # Save checkpoint after detailed devplan
         try:
@@ -593,8 +702,8 @@ class PipelineOrchestrator:
                 },
             )
             logger.info("Saved checkpoint after detailed devplan")
-            self.progress_reporter.show_checkpoint_saved(
-                f"{project_name}_pipeline", "detailed_devplan"
+            self.event_bus.publish(
+                CheckpointSaved(key=f"{project_name}_pipeline", stage="detailed_devplan")
             )
         except Exception as e:
             logger.warning(f"Failed to save checkpoint after detailed devplan: {e}")
@@ -604,17 +713,21 @@ class PipelineOrchestrator:
             ok, written_path = self.file_manager.safe_write_devplan(f"{output_dir}/devplan.md", devplan_md)
             if ok:
                 logger.info("Saved devplan.md dashboard (validated)")
-                self.progress_reporter.report_file_created(
-                    written_path,
-                    "DevPlan Dashboard",
-                    len(devplan_md)
+                self.event_bus.publish(
+                    FileCreated(
+                        path=written_path,
+                        file_type="DevPlan Dashboard",
+                        token_count=len(devplan_md),
+                    )
                 )
             else:
                 logger.warning("Devplan write redirected to tmp due to failed validation: %s", written_path)
-                self.progress_reporter.report_file_created(
-                    written_path,
-                    "DevPlan Dashboard (tmp)",
-                    len(devplan_md)
+                self.event_bus.publish(
+                    FileCreated(
+                        path=written_path,
+                        file_type="DevPlan Dashboard (tmp)",
+                        token_count=len(devplan_md),
+                    )
                 )
             
             # Save detailed devplan to markdown output if manager is configured
@@ -636,7 +749,7 @@ class PipelineOrchestrator:
             if self.git_manager and self.git_config.commit_after_devplan:
                 try:
                     all_files = [f"{output_dir}/devplan.md"] + phase_files
-                    self.git_manager.commit_changes(
+                    await self._commit_artifacts(
                         "feat: generate devplan dashboard with individual phase files",
                         files=all_files,
                     )
@@ -645,15 +758,16 @@ class PipelineOrchestrator:
                     logger.warning(f"Failed to commit devplan files: {e}")
 
         # Stage 4: Generate handoff prompt
-        self.progress_reporter.start_stage("Handoff Prompt", 4)
+        self.event_bus.publish(StageStarted(stage="Handoff Prompt", number=4))
         logger.info("Stage 4/4: Generating handoff prompt")
         # Prepare handoff kwargs with code samples if available
         handoff_kwargs = {
             "project_summary": detailed_devplan.summary or "",
             "architecture_notes": project_design.architecture_overview or "",
         }
-        if self.code_samples:
-            handoff_kwargs["code_samples"] = self.code_samples
+        code_samples = self._code_samples_for("handoff")
+        if code_samples:
+            handoff_kwargs["code_samples"] = code_samples
         with self.progress_reporter.create_spinner_context("Composing handoff prompt..."):
             handoff = self.handoff_gen.generate(
                 devplan=detailed_devplan,
@@ -661,7 +775,7 @@ class PipelineOrchestrator:
                 repo_analysis=self.repo_analysis,
                 **handoff_kwargs,
             )
-        self.progress_reporter.end_stage("Handoff Prompt")
+        self.event_bus.publish(StageEnded(stage="Handoff Prompt"))
 
         # Save checkpoint after handoff prompt
         try:
@@ -687,8 +801,8 @@ class PipelineOrchestrator:
                 },
             )
             logger.info("Saved checkpoint after handoff prompt - pipeline complete")
-            self.progress_reporter.show_checkpoint_saved(
-                f"{project_name}_pipeline", "handoff_prompt"
+            self.event_bus.publish(
+                CheckpointSaved(key=f"{project_name}_pipeline", stage="handoff_prompt")
             )
         except Exception as e:
             logger.warning(f"Failed to save checkpoint after handoff prompt: {e}")
@@ -698,10 +812,12 @@ class PipelineOrchestrator:
                 f"{output_dir}/handoff_prompt.md", handoff.content
             )
             logger.info("Saved handoff_prompt.md")
-            self.progress_reporter.report_file_created(
-                f"{output_dir}/handoff_prompt.md",
-                "Handoff Prompt",
-                len(handoff.content)
+            self.event_bus.publish(
+                FileCreated(
+                    path=f"{output_dir}/handoff_prompt.md",
+                    file_type="Handoff Prompt",
+                    token_count=len(handoff.content),
+                )
             )
             
             # Save handoff prompt to markdown output if manager is configured
@@ -718,7 +834,7 @@ class PipelineOrchestrator:
             # Commit handoff prompt if Git integration is enabled
             if self.git_manager and self.git_config.commit_after_handoff:
                 try:
-                    self.git_manager.commit_changes(
+                    await self._commit_artifacts(
                         "docs: generate handoff prompt",
                         files=[f"{output_dir}/handoff_prompt.md"],
                     )
@@ -727,9 +843,11 @@ class PipelineOrchestrator:
                     logger.warning(f"Failed to commit handoff prompt: {e}")
 
         logger.info("Pipeline complete!")
-        self.progress_reporter.display_summary()
+        self.event_bus.publish(PipelineFinished())
+        await self._flush_artifacts()
         return project_design, detailed_devplan, handoff
 
+    @traced("pipeline.run_devplan_only")
     async def run_devplan_only(
         self,
         project_design: ProjectDesign,
@@ -777,10 +895,11 @@ class PipelineOrchestrator:
                     logger.warning(f"Design pre-review failed: {e}; continuing with original design")
 
         # Stage: Basic DevPlan
-        self.progress_reporter.start_stage("Basic DevPlan", 2)
+        self.event_bus.publish(StageStarted(stage="Basic DevPlan", number=2))
         # Add code samples to kwargs if available
-        if self.code_samples:
-            llm_kwargs["code_samples"] = self.code_samples
+        code_samples = self._code_samples_for("devplan")
+        if code_samples:
+            llm_kwargs["code_samples"] = code_samples
         with self.progress_reporter.create_spinner_context("Creating basic development plan..."):
             basic_devplan = await self.basic_devplan_gen.generate(
                 project_design, 
@@ -790,25 +909,27 @@ class PipelineOrchestrator:
                 **llm_kwargs
             )
         self._update_progress_tokens(self.devplan_client)
-        self.progress_reporter.end_stage("Basic DevPlan")
+        self.event_bus.publish(StageEnded(stage="Basic DevPlan"))
 
         # Stage: Detailed DevPlan with per-phase progress
         # Use unique phase numbers to avoid double-counting duplicates from the model.
         total_phases = len({p.number for p in basic_devplan.phases})
         if total_phases > 0:
+            await self.event_bus.drain()
             self.progress_reporter.show_concurrent_phases(total_phases)
             self.progress_reporter.start_phase_progress(total_phases, description="Generating detailed phases")
         # Add code samples to kwargs if available
-        if self.code_samples:
-            llm_kwargs["code_samples"] = self.code_samples
+        code_samples = self._code_samples_for("detailed")
+        if code_samples:
+            llm_kwargs["code_samples"] = code_samples
         def _handle_phase_complete(event: PhaseDetailResult) -> None:
             try:
                 self.progress_reporter.advance_phase()
-                self.progress_reporter.report_phase_ready(
+                self.event_bus.publish(PhaseReady(
                     phase_number=event.phase.number,
                     steps=len(event.phase.steps),
                     char_count=event.response_chars,
-                )
+                ))
             except Exception:
                 pass
 
@@ -824,10 +945,12 @@ class PipelineOrchestrator:
             )
         self.progress_reporter.stop_phase_progress()
         self._update_progress_tokens(self.devplan_client)
-        self.progress_reporter.end_stage("Detailed DevPlan")
+        self.event_bus.publish(StageEnded(stage="Detailed DevPlan"))
+        await self.event_bus.drain()
 
         return detailed_devplan
 
+    @traced("pipeline.resume_from_checkpoint")
     async def resume_from_checkpoint(
         self,
         checkpoint_key: str,
@@ -939,8 +1062,9 @@ class PipelineOrchestrator:
         # Continue with basic devplan generation
         logger.info("Stage 2/4: Generating basic devplan (resumed)")
         # Add code samples to kwargs if available
-        if self.code_samples:
-            llm_kwargs["code_samples"] = self.code_samples
+        code_samples = self._code_samples_for("devplan")
+        if code_samples:
+            llm_kwargs["code_samples"] = code_samples
         basic_devplan = await self.basic_devplan_gen.generate(
             project_design, feedback_manager=feedback_manager, repo_analysis=self.repo_analysis, **llm_kwargs
         )
@@ -974,8 +1098,9 @@ class PipelineOrchestrator:
         """Resume pipeline from basic devplan stage."""
         logger.info("Stage 3/4: Generating detailed devplan (resumed)")
         # Add code samples to kwargs if available
-        if self.code_samples:
-            llm_kwargs["code_samples"] = self.code_samples
+        code_samples = self._code_samples_for("detailed")
+        if code_samples:
+            llm_kwargs["code_samples"] = code_samples
         detailed_devplan = await self.detailed_devplan_gen.generate(
             basic_devplan,
             project_name,
@@ -1002,7 +1127,7 @@ class PipelineOrchestrator:
             # Commit devplan if Git integration is enabled
             if self.git_manager and self.git_config.commit_after_devplan:
                 try:
-                    self.git_manager.commit_changes(
+                    await self._commit_artifacts(
                         "feat: generate detailed devplan with numbered steps",
                         files=[f"{output_dir}/devplan.md"],
                     )
@@ -1036,8 +1161,9 @@ class PipelineOrchestrator:
             "project_summary": detailed_devplan.summary or "",
             "architecture_notes": project_design.architecture_overview or "",
         }
-        if self.code_samples:
-            handoff_kwargs["code_samples"] = self.code_samples
+        code_samples = self._code_samples_for("handoff")
+        if code_samples:
+            handoff_kwargs["code_samples"] = code_samples
         handoff = self.handoff_gen.generate(
             devplan=detailed_devplan,
             project_name=project_name,
@@ -1060,7 +1186,7 @@ class PipelineOrchestrator:
             # Commit handoff prompt if Git integration is enabled
             if self.git_manager and self.git_config.commit_after_handoff:
                 try:
-                    self.git_manager.commit_changes(
+                    await self._commit_artifacts(
                         "docs: generate handoff prompt",
                         files=[f"{output_dir}/handoff_prompt.md"],
                     )
@@ -1069,6 +1195,7 @@ class PipelineOrchestrator:
                     logger.warning(f"Failed to commit handoff prompt: {e}")
 
         logger.info("Pipeline complete (resumed)!")
+        await self._flush_artifacts()
         return project_design, detailed_devplan, handoff
 
     def _save_basic_devplan_checkpoint(
@@ -1175,13 +1302,15 @@ class PipelineOrchestrator:
         """
         logger.info("Generating handoff prompt from existing devplan")
         # Stage: Handoff Prompt
-        self.progress_reporter.start_stage("Handoff Prompt", 4)
+        self.event_bus.publish(StageStarted(stage="Handoff Prompt", number=4))
         # Add code samples to kwargs if available
-        if self.code_samples:
-            kwargs["code_samples"] = self.code_samples
+        code_samples = self._code_samples_for("handoff")
+        if code_samples:
+            kwargs["code_samples"] = code_samples
         with self.progress_reporter.create_spinner_context("Composing handoff prompt..."):
             handoff = self.handoff_gen.generate(devplan, project_name, repo_analysis=self.repo_analysis, **kwargs)
-        self.progress_reporter.end_stage("Handoff Prompt")
+        self.event_bus.publish(StageEnded(stage="Handoff Prompt"))
+        await self.event_bus.drain()
         return handoff
 
     def _devplan_to_markdown(self, devplan: DevPlan) -> str:
@@ -1304,10 +1433,12 @@ class PipelineOrchestrator:
             )
             
             # Report phase file creation
-            self.progress_reporter.report_file_created(
-                phase_path,
-                f"Phase {phase.number}",
-                len(phase_content)
+            self.event_bus.publish(
+                FileCreated(
+                    path=phase_path,
+                    file_type=f"Phase {phase.number}",
+                    token_count=len(phase_content),
+                )
             )
             
             # Save phase file to markdown output if manager is configured
@@ -1400,6 +1531,28 @@ class PipelineOrchestrator:
         from datetime import datetime
         return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
+    def _code_samples_for(self, stage: str) -> Optional[str]:
+        """Code samples fitted to ``stage``'s token budget (``config.context_budget``).
+
+        Packed once per stage, so every phase of a run sees the same text.
+        """
+        if not self.code_samples:
+            return None
+        key = (stage, self.code_samples)
+        if key not in self._packed_code_samples:
+            budgets = getattr(self.config, "context_budget", None) or ContextBudgetConfig()
+            budget = getattr(budgets, stage, 0)
+            if not isinstance(budget, int):
+                budget = getattr(ContextBudgetConfig(), stage, 0)
+            packed = fit_formatted_samples(self.code_samples, budget)
+            if packed is not self.code_samples:
+                logger.info(
+                    f"Packed code samples for {stage} into {budget} tokens "
+                    f"({len(self.code_samples)} -> {len(packed or '')} chars)"
+                )
+            self._packed_code_samples[key] = packed
+        return self._packed_code_samples[key]
+
     def _update_progress_tokens(self, llm_client: LLMClient) -> None:
         """Update progress reporter with token usage from LLM client.
         
@@ -1409,7 +1562,7 @@ class PipelineOrchestrator:
         try:
             usage = getattr(llm_client, "last_usage_metadata", None)
             if usage:
-                self.progress_reporter.update_tokens(usage)
+                self.event_bus.publish(UsageUpdated(usage=usage))
         except Exception as e:
             logger.debug(f"Could not update progress tokens: {e}")
 
@@ -1434,7 +1587,7 @@ class PipelineOrchestrator:
             ComplexityProfile with score, phase count, and depth level
         """
         logger.info("Analyzing project complexity from interview data")
-        self.progress_reporter.start_stage("Complexity Analysis", 0)
+        self.event_bus.publish(StageStarted(stage="Complexity Analysis", number=0))
         
         analyzer = ComplexityAnalyzer()
         profile = analyzer.analyze(interview_data)
@@ -1443,7 +1596,7 @@ class PipelineOrchestrator:
             f"Complexity analysis complete: score={profile.score:.1f}, "
             f"phases={profile.estimated_phase_count}, depth={profile.depth_level}"
         )
-        self.progress_reporter.end_stage("Complexity Analysis")
+        self.event_bus.publish(StageEnded(stage="Complexity Analysis"))
         
         return profile
 
@@ -1464,7 +1617,7 @@ class PipelineOrchestrator:
             DesignValidationReport with issues and check results
         """
         logger.info("Validating design document")
-        self.progress_reporter.start_stage("Design Validation", 0)
+        self.event_bus.publish(StageStarted(stage="Design Validation", number=0))
         
         validator = DesignValidator()
         report = validator.validate(
@@ -1480,7 +1633,7 @@ class PipelineOrchestrator:
                 f"auto_correctable={report.auto_correctable}"
             )
         
-        self.progress_reporter.end_stage("Design Validation")
+        self.event_bus.publish(StageEnded(stage="Design Validation"))
         return report
 
     def review_design_with_llm(
@@ -1526,7 +1679,7 @@ class PipelineOrchestrator:
             DesignCorrectionResult with final design and status
         """
         logger.info("Starting design correction loop")
-        self.progress_reporter.start_stage("Design Correction", 0)
+        self.event_bus.publish(StageStarted(stage="Design Correction", number=0))
         
         loop = DesignCorrectionLoop()
         result = loop.run(design_text, complexity_profile=complexity_profile)
@@ -1538,9 +1691,10 @@ class PipelineOrchestrator:
         else:
             logger.info("Correction loop completed successfully")
         
-        self.progress_reporter.end_stage("Design Correction")
+        self.event_bus.publish(StageEnded(stage="Design Correction"))
         return result
 
+    @traced("pipeline.run_adaptive_pipeline")
     async def run_adaptive_pipeline(
         self,
         project_name: str,
@@ -1553,6 +1707,7 @@ class PipelineOrchestrator:
         save_artifacts: bool = True,
         enable_validation: bool = True,
         enable_correction: bool = True,
+        design_prefetcher: Optional[DesignPrefetcher] = None,
         **llm_kwargs: Any,
     ) -> Tuple[ProjectDesign, DevPlan, HandoffPrompt, Optional[ComplexityProfile]]:
         """Run the full adaptive pipeline with complexity analysis and validation.
@@ -1574,6 +1729,8 @@ class PipelineOrchestrator:
             save_artifacts: Whether to save intermediate files
             enable_validation: Whether to validate design
             enable_correction: Whether to run correction loop
+            design_prefetcher: Optional prefetcher whose speculative design and
+                complexity profile are reused when they match ``interview_data``
             **llm_kwargs: Additional LLM parameters
 
         Returns:
@@ -1582,11 +1739,15 @@ class PipelineOrchestrator:
         logger.info(f"Starting adaptive pipeline for project: {project_name}")
         
         # Show pipeline start
-        self.progress_reporter.start_pipeline(project_name)
+        self.event_bus.publish(PipelineStarted(project_name=project_name))
         self.progress_reporter.start_status()
 
         # Stage 0: Complexity Analysis
-        complexity_profile = self.analyze_complexity(interview_data)
+        complexity_profile = None
+        if design_prefetcher is not None:
+            complexity_profile = design_prefetcher.complexity(interview_data)
+        if complexity_profile is None:
+            complexity_profile = self.analyze_complexity(interview_data)
         
         # Save checkpoint after complexity analysis
         try:
@@ -1610,8 +1771,8 @@ class PipelineOrchestrator:
                 },
             )
             logger.info("Saved checkpoint after complexity analysis")
-            self.progress_reporter.show_checkpoint_saved(
-                f"{project_name}_adaptive_pipeline", "complexity_analysis"
+            self.event_bus.publish(
+                CheckpointSaved(key=f"{project_name}_adaptive_pipeline", stage="complexity_analysis")
             )
         except Exception as e:
             logger.warning(f"Failed to save checkpoint after complexity analysis: {e}")
@@ -1623,28 +1784,34 @@ class PipelineOrchestrator:
                 f"{output_dir}/complexity_profile.md", complexity_md
             )
             logger.info("Saved complexity_profile.md")
-            self.progress_reporter.report_file_created(
-                f"{output_dir}/complexity_profile.md",
-                "Complexity Profile",
-                len(complexity_md),
+            self.event_bus.publish(
+                FileCreated(
+                    path=f"{output_dir}/complexity_profile.md",
+                    file_type="Complexity Profile",
+                    token_count=len(complexity_md),
+                )
             )
 
         # Stage 1: Generate project design (with complexity awareness)
-        self.progress_reporter.start_stage("Project Design", 1)
+        self.event_bus.publish(StageStarted(stage="Project Design", number=1))
         logger.info("Stage 1/5: Generating project design")
         
         with self.progress_reporter.create_spinner_context("Generating project design..."):
-            project_design = await self.project_design_gen.generate(
-                project_name=project_name,
-                languages=languages,
-                requirements=requirements,
-                frameworks=frameworks,
-                apis=apis,
-                **llm_kwargs,
-            )
+            project_design = None
+            if design_prefetcher is not None and not llm_kwargs:
+                project_design = await design_prefetcher.wait(interview_data)
+            if project_design is None:
+                project_design = await self.project_design_gen.generate(
+                    project_name=project_name,
+                    languages=languages,
+                    requirements=requirements,
+                    frameworks=frameworks,
+                    apis=apis,
+                    **llm_kwargs,
+                )
         
         self._update_progress_tokens(self.design_client)
-        self.progress_reporter.end_stage("Project Design")
+        self.event_bus.publish(StageEnded(stage="Project Design"))
 
         design_text = project_design.architecture_overview or ""
 
@@ -1653,13 +1820,13 @@ class PipelineOrchestrator:
         correction_result: Optional[DesignCorrectionResult] = None
 
         if enable_validation:
-            self.progress_reporter.start_stage("Design Validation", 2)
+            self.event_bus.publish(StageStarted(stage="Design Validation", number=2))
             validation_report = self.validate_design(
                 design_text,
                 requirements_text=requirements,
                 complexity_profile=complexity_profile,
             )
-            self.progress_reporter.end_stage("Design Validation")
+            self.event_bus.publish(StageEnded(stage="Design Validation"))
 
             # Save validation report
             if save_artifacts and validation_report:
@@ -1667,10 +1834,12 @@ class PipelineOrchestrator:
                 self.file_manager.write_markdown(
                     f"{output_dir}/validation_report.md", validation_md
                 )
-                self.progress_reporter.report_file_created(
-                    f"{output_dir}/validation_report.md",
-                    "Validation Report",
-                    len(validation_md),
+                self.event_bus.publish(
+                    FileCreated(
+                        path=f"{output_dir}/validation_report.md",
+                        file_type="Validation Report",
+                        token_count=len(validation_md),
+                    )
                 )
 
             # Stage 3: Correction Loop (if enabled and validation failed)
@@ -1692,10 +1861,12 @@ class PipelineOrchestrator:
                     self.file_manager.write_markdown(
                         f"{output_dir}/correction_history.md", correction_md
                     )
-                    self.progress_reporter.report_file_created(
-                        f"{output_dir}/correction_history.md",
-                        "Correction History",
-                        len(correction_md),
+                    self.event_bus.publish(
+                        FileCreated(
+                            path=f"{output_dir}/correction_history.md",
+                            file_type="Correction History",
+                            token_count=len(correction_md),
+                        )
                     )
 
         # Save checkpoint after design stage
@@ -1757,14 +1928,16 @@ class PipelineOrchestrator:
             self.file_manager.write_markdown(
                 f"{output_dir}/project_design.md", design_content
             )
-            self.progress_reporter.report_file_created(
-                f"{output_dir}/project_design.md",
-                "Project Design",
-                len(design_content),
+            self.event_bus.publish(
+                FileCreated(
+                    path=f"{output_dir}/project_design.md",
+                    file_type="Project Design",
+                    token_count=len(design_content),
+                )
             )
 
         # Stage 4: Generate devplan (with complexity-aware phase count)
-        self.progress_reporter.start_stage("DevPlan Generation", 4)
+        self.event_bus.publish(StageStarted(stage="DevPlan Generation", number=4))
         logger.info(f"Stage 4/5: Generating devplan ({complexity_profile.estimated_phase_count} phases)")
         
         # CRITICAL: Set estimated_phases and complexity on project_design from complexity profile
@@ -1777,8 +1950,9 @@ class PipelineOrchestrator:
         )
         
         # Add code samples to kwargs if available
-        if self.code_samples:
-            llm_kwargs["code_samples"] = self.code_samples
+        code_samples = self._code_samples_for("devplan")
+        if code_samples:
+            llm_kwargs["code_samples"] = code_samples
         
         with self.progress_reporter.create_spinner_context("Creating basic development plan..."):
             basic_devplan = await self.basic_devplan_gen.generate(
@@ -1791,17 +1965,18 @@ class PipelineOrchestrator:
 
         # Generate detailed phases
         total_phases = len({p.number for p in basic_devplan.phases})
+        await self.event_bus.drain()
         self.progress_reporter.show_concurrent_phases(total_phases)
         self.progress_reporter.start_phase_progress(total_phases, description="Generating detailed phases")
         
         def _handle_phase_complete(event: PhaseDetailResult) -> None:
             try:
                 self.progress_reporter.advance_phase()
-                self.progress_reporter.report_phase_ready(
+                self.event_bus.publish(PhaseReady(
                     phase_number=event.phase.number,
                     steps=len(event.phase.steps),
                     char_count=event.response_chars,
-                )
+                ))
             except Exception:
                 pass
 
@@ -1817,7 +1992,7 @@ class PipelineOrchestrator:
         
         self.progress_reporter.stop_phase_progress()
         self._update_progress_tokens(self.devplan_client)
-        self.progress_reporter.end_stage("DevPlan Generation")
+        self.event_bus.publish(StageEnded(stage="DevPlan Generation"))
 
         # Save devplan checkpoint
         try:
@@ -1846,8 +2021,12 @@ class PipelineOrchestrator:
                 f"{output_dir}/devplan.md", devplan_md
             )
             if ok:
-                self.progress_reporter.report_file_created(
-                    written_path, "DevPlan Dashboard", len(devplan_md)
+                self.event_bus.publish(
+                    FileCreated(
+                        path=written_path,
+                        file_type="DevPlan Dashboard",
+                        token_count=len(devplan_md),
+                    )
                 )
             
             # Generate individual phase files
@@ -1855,7 +2034,7 @@ class PipelineOrchestrator:
             logger.info(f"Generated {len(phase_files)} individual phase files")
 
         # Stage 5: Generate handoff prompt
-        self.progress_reporter.start_stage("Handoff Prompt", 5)
+        self.event_bus.publish(StageStarted(stage="Handoff Prompt", number=5))
         logger.info("Stage 5/5: Generating handoff prompt")
         
         handoff_kwargs = {
@@ -1863,8 +2042,9 @@ class PipelineOrchestrator:
             "architecture_notes": project_design.architecture_overview or "",
             "complexity_info": f"Complexity: {complexity_profile.depth_level} ({complexity_profile.score:.1f})",
         }
-        if self.code_samples:
-            handoff_kwargs["code_samples"] = self.code_samples
+        code_samples = self._code_samples_for("handoff")
+        if code_samples:
+            handoff_kwargs["code_samples"] = code_samples
         
         with self.progress_reporter.create_spinner_context("Composing handoff prompt..."):
             handoff = self.handoff_gen.generate(
@@ -1874,21 +2054,24 @@ class PipelineOrchestrator:
                 **handoff_kwargs,
             )
         
-        self.progress_reporter.end_stage("Handoff Prompt")
+        self.event_bus.publish(StageEnded(stage="Handoff Prompt"))
 
         if save_artifacts:
             self.file_manager.write_markdown(
                 f"{output_dir}/handoff_prompt.md", handoff.content
             )
-            self.progress_reporter.report_file_created(
-                f"{output_dir}/handoff_prompt.md",
-                "Handoff Prompt",
-                len(handoff.content),
+            self.event_bus.publish(
+                FileCreated(
+                    path=f"{output_dir}/handoff_prompt.md",
+                    file_type="Handoff Prompt",
+                    token_count=len(handoff.content),
+                )
             )
 
         logger.info("Adaptive pipeline complete!")
-        self.progress_reporter.display_summary()
+        self.event_bus.publish(PipelineFinished())
         
+        await self._flush_artifacts()
         return project_design, detailed_devplan, handoff, complexity_profile
 
     def _complexity_profile_to_markdown(self, profile: ComplexityProfile) -> str:
@@ -0,0 +1,276 @@
+"""Speculative project design generation during the interview.
+
+Once the interview has produced a valid summary (project name, language,
+requirements and type), the design it will lead to is already determined.
+:class:`DesignPrefetcher` starts :meth:`ProjectDesignGenerator.generate` and
+the rule-based :class:`ComplexityAnalyzer` in the background at that point,
+on a low-priority thread of its own, while the user keeps refining or
+confirms. A later summary with different inputs cancels the running job and
+starts a new one; results are only handed out for inputs that match the ones
+they were generated from, so a stale design is never used.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import json
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional
+
+from ..clients.factory import create_llm_client
+from ..interview.complexity_analyzer import ComplexityAnalyzer, ComplexityProfile
+from ..logger import get_logger
+from ..models import ProjectDesign
+from .project_design import ProjectDesignGenerator
+
+logger = get_logger(__name__)
+
+# Interview inputs that change the generated design or complexity profile
+DESIGN_INPUT_KEYS = (
+    "name",
+    "languages",
+    "requirements",
+    "frameworks",
+    "apis",
+    "project_type",
+    "database",
+    "deployment_platform",
+)
+
+
+def _split(value: Any) -> Optional[List[str]]:
+    if not value:
+        return None
+    return [item.strip() for item in str(value).split(",") if item.strip()]
+
+
+def design_kwargs(inputs: Mapping[str, Any]) -> Dict[str, Any]:
+    """Map ``to_generate_design_inputs`` output to ``ProjectDesignGenerator.generate`` kwargs."""
+    return {
+        "project_name": inputs["name"],
+        "languages": _split(inputs.get("languages")) or [],
+        "requirements": inputs["requirements"],
+        "frameworks": _split(inputs.get("frameworks")),
+        "apis": _split(inputs.get("apis")),
+    }
+
+
+def inputs_key(inputs: Mapping[str, Any]) -> str:
+    """Fingerprint of the design-relevant interview inputs."""
+    relevant = {k: str(inputs[k]).strip() for k in DESIGN_INPUT_KEYS if inputs.get(k)}
+    return json.dumps(relevant, sort_keys=True)
+
+
+def design_stage_config(config: Any) -> Any:
+    """Return a copy of ``config`` whose ``llm`` is the design stage's model.
+
+    Mirrors PipelineOrchestrator: design follows the devplan model unless a
+    design-specific model is configured.
+    """
+    stage = "design" if config.design_llm is not None else "devplan"
+    stage_config = config.model_copy()
+    stage_config.llm = config.get_llm_config_for_stage(stage)
+    return stage_config
+
+
+@dataclass
+class PrefetchedDesign:
+    """A background design job for one set of interview inputs."""
+
+    key: str
+    future: Optional[concurrent.futures.Future] = None
+    complexity: Optional[ComplexityProfile] = None
+    started: threading.Event = field(default_factory=threading.Event)
+
+
+async def _cancel_tasks() -> None:
+    """Cancel every other task on the running loop and wait for them to end."""
+    tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class DesignPrefetcher:
+    """Generate the project design speculatively while the interview continues.
+
+    Thread-safe: :meth:`update` may be called from the interview's event loop
+    and :meth:`result` / :meth:`wait` from whichever thread or loop runs the
+    pipeline afterwards.
+    """
+
+    def __init__(
+        self,
+        generate: Callable[..., Awaitable[ProjectDesign]],
+        delay: float = 2.0,
+        analyzer: Optional[ComplexityAnalyzer] = None,
+        config: Any = None,
+    ) -> None:
+        """Initialize the prefetcher.
+
+        Args:
+            generate: Coroutine function with the signature of
+                ``ProjectDesignGenerator.generate``
+            delay: Seconds to wait before calling the LLM, so inputs that are
+                still changing turn by turn don't each cost a generation
+            analyzer: Rule-based complexity analyzer
+            config: Application config; a design made with a model other
+                than the one it currently selects is never handed out
+        """
+        self.generate = generate
+        self.delay = delay
+        self.analyzer = analyzer or ComplexityAnalyzer()
+        self.config = config
+        self._lock = threading.Lock()
+        self._current: Optional[PrefetchedDesign] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, config: Any) -> Optional["DesignPrefetcher"]:
+        """Create a prefetcher using the same model as the pipeline's design stage.
+
+        Returns None when speculative design is disabled in ``config``.
+        """
+        settings = getattr(config, "design_prefetch", None)
+        if settings is None or not settings.enabled:
+            return None
+
+        async def generate(**kwargs: Any) -> ProjectDesign:
+            # Built per job: the model may change from the interview menu
+            client = create_llm_client(design_stage_config(config))
+            return await ProjectDesignGenerator(client).generate(**kwargs)
+
+        return cls(generate, delay=settings.delay, config=config)
+
+    def _key(self, inputs: Mapping[str, Any]) -> str:
+        key = inputs_key(inputs)
+        if self.config is not None:
+            llm = design_stage_config(self.config).llm
+            key += f"|{llm.provider}/{llm.model}"
+        return key
+
+    def update(self, inputs: Mapping[str, Any]) -> bool:
+        """Start generating for ``inputs`` unless that job is already running.
+
+        A job for different inputs is cancelled first. Returns True when a
+        new job was started.
+        """
+        key = self._key(inputs)
+        with self._lock:
+            current = self._current
+            if current is not None and current.key == key and not current.future.cancelled():
+                return False
+            if current is not None:
+                current.future.cancel()
+                logger.info("Interview inputs changed; discarding speculative design")
+            loop = self._ensure_loop()
+            job = PrefetchedDesign(key=key)
+            job.future = asyncio.run_coroutine_threadsafe(self._run(job, dict(inputs)), loop)
+            self._current = job
+        logger.info("Speculatively generating project design")
+        return True
+
+    def invalidate(self) -> None:
+        """Cancel and forget the current job."""
+        with self._lock:
+            current, self._current = self._current, None
+        if current is not None:
+            current.future.cancel()
+
+    def _matching(self, inputs: Mapping[str, Any]) -> Optional[PrefetchedDesign]:
+        with self._lock:
+            current = self._current
+        if current is None or current.key != self._key(inputs) or current.future.cancelled():
+            return None
+        return current
+
+    def complexity(self, inputs: Mapping[str, Any]) -> Optional[ComplexityProfile]:
+        """Return the complexity profile computed for ``inputs``, if any."""
+        job = self._matching(inputs)
+        if job is None:
+            return None
+        job.started.wait(timeout=1.0)
+        return job.complexity
+
+    def result(
+        self, inputs: Mapping[str, Any], timeout: Optional[float] = None
+    ) -> Optional[ProjectDesign]:
+        """Block until the design for ``inputs`` is ready.
+
+        Returns None when no job matches ``inputs``, or it failed or timed
+        out; callers then generate the design themselves.
+        """
+        job = self._matching(inputs)
+        if job is None:
+            return None
+        try:
+            return job.future.result(timeout=timeout)
+        except Exception as e:
+            logger.warning(f"Speculative design unavailable: {e}")
+            return None
+
+    async def wait(
+        self, inputs: Mapping[str, Any], timeout: Optional[float] = None
+    ) -> Optional[ProjectDesign]:
+        """Async variant of :meth:`result` for callers on any event loop."""
+        job = self._matching(inputs)
+        if job is None:
+            return None
+        try:
+            # Shielded: a timeout here must not cancel the shared job
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(job.future)), timeout)
+        except asyncio.CancelledError:
+            if not job.future.cancelled():
+                raise
+            return None
+        except Exception as e:
+            logger.warning(f"Speculative design unavailable: {e}")
+            return None
+
+    def close(self) -> None:
+        """Cancel any running job, then stop and close the background loop.
+
+        Safe to call more than once. Also used as the context-manager exit.
+        """
+        self.invalidate()
+        with self._lock:
+            loop, self._loop = self._loop, None
+            thread, self._thread = self._thread, None
+        if loop is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(_cancel_tasks(), loop).result(timeout=5)
+            except Exception as e:
+                logger.debug(f"Speculative design loop did not wind down cleanly: {e}")
+            loop.call_soon_threadsafe(loop.stop)
+            if thread is not None:
+                thread.join(timeout=5)
+            if not loop.is_running():
+                loop.close()
+
+    def __enter__(self) -> "DesignPrefetcher":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self._loop.run_forever, name="design-prefetch", daemon=True
+            )
+            self._thread.start()
+        return self._loop
+
+    async def _run(self, job: PrefetchedDesign, inputs: Dict[str, Any]) -> ProjectDesign:
+        try:
+            job.complexity = self.analyzer.analyze(inputs)
+        except Exception as e:
+            logger.debug(f"Speculative complexity analysis failed: {e}")
+        finally:
+            job.started.set()
+        await asyncio.sleep(self.delay)
+        return await self.generate(**design_kwargs(inputs))
@@ -12,8 +12,9 @@ from ..concurrency import ConcurrencyManager
 from ..llm_client import LLMClient
 from ..logger import get_logger
 from ..models import DevPlan, DevPlanPhase, DevPlanStep
-from ..templates import render_template
+from ..tracing import traced
 from .hivemind import HiveMindManager
+from .prompt_assembly import PhasePromptAssembler
 from ..config import load_config
 
 logger = get_logger(__name__)
@@ -45,6 +46,7 @@ class DetailedDevPlanGenerator:
         self.concurrency_manager = concurrency_manager
         self.hivemind = HiveMindManager(llm_client)
 
+    @traced("stage.detailed_devplan")
     async def generate(
         self,
         basic_devplan: DevPlan,
@@ -94,6 +96,17 @@ class DetailedDevPlanGenerator:
             seen_numbers[phase.number] = phase
             unique_phases.append(phase)
 
+        # Render the shared context (repo analysis, code samples, project
+        # header) once; every phase prompt starts with these identical bytes
+        prompt_assembler = PhasePromptAssembler(
+            project_name,
+            tech_stack or [],
+            repo_analysis=repo_analysis,
+            code_samples=llm_kwargs.pop("code_samples", None),
+            feedback_manager=feedback_manager,
+            detail_level=llm_kwargs.get("detail_level", "normal"),
+        )
+
         # Generate detailed steps for each unique phase concurrently with progress callbacks
         tasks = [
             asyncio.create_task(
@@ -105,6 +118,7 @@ class DetailedDevPlanGenerator:
                         feedback_manager,
                         task_group_size=task_group_size,
                         repo_analysis=repo_analysis,
+                        prompt_assembler=prompt_assembler,
                         **llm_kwargs,
                     )
                 )
@@ -151,6 +165,7 @@ class DetailedDevPlanGenerator:
 
         return devplan
 
+    @traced("phase", attributes=lambda self, phase, *args, **kwargs: {"phase": phase.number})
     async def _generate_phase_details(
         self,
         phase: DevPlanPhase,
@@ -159,6 +174,7 @@ class DetailedDevPlanGenerator:
         feedback_manager: Optional[Any] = None,
         task_group_size: int = 3,
         repo_analysis: Optional[Any] = None,
+        prompt_assembler: Optional[PhasePromptAssembler] = None,
         **llm_kwargs: Any,
     ) -> DevPlanPhase:
         """Generate detailed steps for a single phase.
@@ -170,6 +186,8 @@ class DetailedDevPlanGenerator:
             feedback_manager: Optional FeedbackManager for iterative refinement
             task_group_size: Number of tasks per group before updating artifacts
             repo_analysis: Optional RepoAnalysis for existing project context
+            prompt_assembler: Per-run assembler holding the shared prompt prefix;
+                built from the other arguments when not given
             **llm_kwargs: Additional kwargs for LLM
 
         Returns:
@@ -177,31 +195,21 @@ class DetailedDevPlanGenerator:
         """
         logger.debug(f"Generating details for Phase {phase.number}: {phase.title}")
 
-        # Prepare template context
-        context = {
-            "phase_number": phase.number,
-            "phase_title": phase.title,
-            "phase_description": "",  # Could add this to the model
-            "project_name": project_name,
-            "tech_stack": tech_stack,
-            "task_group_size": task_group_size,
-            "detail_level": llm_kwargs.get("detail_level", "normal"),  # Control template verbosity
-        }
-        
-        # Add repo context if available
-        if repo_analysis is not None:
-            context["repo_context"] = repo_analysis.to_prompt_context()
-        
-        # Add code samples if available in llm_kwargs
-        if "code_samples" in llm_kwargs:
-            context["code_samples"] = llm_kwargs.pop("code_samples")
-
-        # Render the prompt template
-        prompt = render_template("detailed_devplan.jinja", context)
-
-        # Apply feedback corrections if available
-        if feedback_manager:
-            prompt = feedback_manager.apply_corrections_to_prompt(prompt)
+        # Render the prompt: shared per-run prefix + phase-specific tail
+        if prompt_assembler is None:
+            prompt_assembler = PhasePromptAssembler(
+                project_name,
+                tech_stack,
+                repo_analysis=repo_analysis,
+                code_samples=llm_kwargs.pop("code_samples", None),
+                feedback_manager=feedback_manager,
+                detail_level=llm_kwargs.get("detail_level", "normal"),
+            )
+        else:
+            llm_kwargs.pop("code_samples", None)
+        prompt = prompt_assembler.build(
+            phase.number, phase.title, task_group_size=task_group_size
+        )
 
         logger.debug(f"Rendered prompt for phase {phase.number}")
 
@@ -228,10 +236,10 @@ class DetailedDevPlanGenerator:
                 **llm_kwargs
             )
             response_used = response
-            print(f"[detailed_devplan] HiveMind complete for phase {phase.number}, got {len(response)} chars")
+            logger.debug(f"HiveMind complete for phase {phase.number}, got {len(response)} chars")
 
         elif streaming_enabled and streaming_handler is not None:
-            print(f"[detailed_devplan] Using streaming for phase {phase.number}")
+            logger.debug(f"Using streaming for phase {phase.number}")
             # Use streaming with handler
             response_chunks: list[str] = []
 
@@ -252,9 +260,9 @@ class DetailedDevPlanGenerator:
                 **llm_kwargs,
             )
             response_used = response
-            print(f"[detailed_devplan] Streaming complete for phase {phase.number}, got {len(response)} chars")
+            logger.debug(f"Streaming complete for phase {phase.number}, got {len(response)} chars")
         else:
-            print(f"[detailed_devplan] Using non-streaming for phase {phase.number}")
+            logger.debug(f"Using non-streaming for phase {phase.number}")
             response = await self.llm_client.generate_completion(
                 prompt, **llm_kwargs
             )
@@ -353,6 +361,7 @@ class DetailedDevPlanGenerator:
             response_chars=len(response_used or ""),
         )
 
+    @traced("parse.steps")
     def _parse_steps(self, response: str, phase_number: int) -> List[DevPlanStep]:
         """Parse numbered steps from the LLM response.
 
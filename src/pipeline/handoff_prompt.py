@@ -7,6 +7,7 @@ from typing import Any, Dict, List
 from ..logger import get_logger
 from ..models import DevPlan, DevPlanPhase, HandoffPrompt
 from ..templates import render_template
+from ..tracing import traced
 from ..utils.anchor_utils import ensure_anchors_exist
 
 logger = get_logger(__name__)
@@ -15,6 +16,7 @@ logger = get_logger(__name__)
 class HandoffPromptGenerator:
     """Generate handoff prompts that summarize progress and next steps."""
 
+    @traced("stage.handoff_prompt")
     def generate(
         self,
         devplan: DevPlan,
@@ -6,6 +6,7 @@ from typing import List, Optional, Any, Dict
 
 from ..llm_client import LLMClient
 from ..templates import render_template
+from ..tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +25,7 @@ class HiveMindManager:
         """
         self.llm_client = llm_client
 
+    @traced("hivemind.swarm")
     async def run_swarm(
         self,
         prompt: str,
@@ -9,6 +9,7 @@ from ..llm_client import LLMClient
 from ..logger import get_logger
 from ..models import ProjectDesign
 from ..templates import render_template
+from ..tracing import traced
 
 logger = get_logger(__name__)
 
@@ -24,6 +25,7 @@ class ProjectDesignGenerator:
         """
         self.llm_client = llm_client
 
+    @traced("stage.project_design")
     async def generate(
         self,
         project_name: str,
@@ -129,6 +131,7 @@ class ProjectDesignGenerator:
 
         return design
 
+    @traced("parse.project_design")
     def _parse_response(self, response: str, project_name: str) -> ProjectDesign:
         """Parse the LLM response into a structured ProjectDesign.
 
@@ -0,0 +1,98 @@
+"""Per-run prompt assembly with a shared, byte-identical prefix.
+
+Detailed-phase prompts share most of their context (repository analysis, code
+samples, project header, tech stack) and differ only in the phase being
+detailed. :class:`PhasePromptAssembler` renders the shared part once per run
+and appends a small phase-specific tail, so every phase prompt starts with the
+same bytes. That saves re-rendering the large blocks per phase and lets
+provider-side prompt caching reuse the prefix across phases and HiveMind
+drones.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Dict, List, Optional
+
+from ..logger import get_logger
+from ..templates import render_template
+
+logger = get_logger(__name__)
+
+PREFIX_TEMPLATE = "detailed_devplan_prefix.jinja"
+PHASE_TEMPLATE = "detailed_devplan_phase.jinja"
+
+
+class PhasePromptAssembler:
+    """Build detailed-phase prompts from a cached shared prefix."""
+
+    def __init__(
+        self,
+        project_name: str,
+        tech_stack: Optional[List[str]] = None,
+        repo_analysis: Optional[Any] = None,
+        code_samples: Optional[str] = None,
+        feedback_manager: Optional[Any] = None,
+        detail_level: str = "normal",
+        extra_context: Optional[Dict[str, Any]] = None,
+    ):
+        """Initialize the assembler.
+
+        Args:
+            project_name: Name of the project
+            tech_stack: List of technologies
+            repo_analysis: Optional RepoAnalysis for existing project context
+            code_samples: Optional pre-formatted code samples
+            feedback_manager: Optional FeedbackManager whose corrections are
+                appended to every prompt
+            detail_level: Template verbosity
+            extra_context: Additional run-wide template variables
+        """
+        self.shared_context: Dict[str, Any] = {
+            "project_name": project_name,
+            "tech_stack": tech_stack or [],
+            "detail_level": detail_level,
+            **(extra_context or {}),
+        }
+        if repo_analysis is not None:
+            self.shared_context["repo_context"] = repo_analysis.to_prompt_context()
+        if code_samples:
+            self.shared_context["code_samples"] = code_samples
+        self.feedback_manager = feedback_manager
+        self._prefix: Optional[str] = None
+
+    @property
+    def prefix(self) -> str:
+        """The shared prompt prefix, rendered on first use."""
+        if self._prefix is None:
+            self._prefix = render_template(PREFIX_TEMPLATE, self.shared_context)
+            logger.debug(
+                f"Rendered shared prompt prefix ({len(self._prefix)} chars, "
+                f"sha256 {self.prefix_hash[:12]})"
+            )
+        return self._prefix
+
+    @property
+    def prefix_hash(self) -> str:
+        """SHA-256 of the prefix, useful for checking cache-key stability."""
+        return hashlib.sha256(self.prefix.encode("utf-8")).hexdigest()
+
+    def build(
+        self,
+        phase_number: int,
+        phase_title: str,
+        phase_description: str = "",
+        task_group_size: int = 3,
+    ) -> str:
+        """Return the full prompt for one phase: shared prefix + phase tail."""
+        context = {
+            **self.shared_context,
+            "phase_number": phase_number,
+            "phase_title": phase_title,
+            "phase_description": phase_description,
+            "task_group_size": task_group_size,
+        }
+        prompt = self.prefix + render_template(PHASE_TEMPLATE, context)
+        if self.feedback_manager:
+            prompt = self.feedback_manager.apply_corrections_to_prompt(prompt)
+        return prompt
@@ -1,4 +1,17 @@
-"""State persistence manager for saving and loading pipeline state."""
+"""State persistence manager for saving and loading pipeline state.
+
+Plain state blobs (UI preferences and the like) are stored as JSON files.
+Workflow checkpoints live in an indexed SQLite catalog
+(:class:`~src.checkpoint_store.CheckpointCatalog`) so they can be listed and
+pruned without reading every payload. Legacy ``checkpoint_*.json`` files are
+imported into the catalog on startup.
+
+Large strings inside checkpoints (raw LLM responses, design text) are stored
+once in a content-addressed :class:`~src.artifact_store.ArtifactStore` and the
+checkpoint keeps only a reference, so the successive checkpoints of a run do
+not each carry another copy. The catalog indexes those references, so
+collecting unreferenced blobs never decodes checkpoint payloads.
+"""
 
 from __future__ import annotations
 
@@ -7,6 +20,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from .artifact_store import ArtifactStore, externalize, internalize, iter_refs
+from .checkpoint_store import CATALOG_FILENAME, CheckpointCatalog
 from .logger import get_logger
 
 logger = get_logger(__name__)
@@ -23,8 +38,59 @@ class StateManager:
         """
         self.state_dir = Path(state_dir)
         self.state_dir.mkdir(parents=True, exist_ok=True)
+        self.catalog = CheckpointCatalog(self.state_dir / CATALOG_FILENAME)
+        self.artifacts = ArtifactStore(self.state_dir / "artifacts")
+        if not self.catalog.refs_indexed:
+            self.catalog.rebuild_refs(iter_refs)
+        self.migrate_json_checkpoints()
         logger.debug(f"StateManager initialized with dir: {self.state_dir}")
 
+    def close(self) -> None:
+        """Close the checkpoint catalog's database connection."""
+        self.catalog.close()
+
+    def __enter__(self) -> "StateManager":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def migrate_json_checkpoints(self) -> int:
+        """Import legacy ``checkpoint_*.json`` files into the checkpoint catalog.
+
+        Successfully imported files are renamed with a ``.migrated`` suffix so
+        they are not imported again. Unreadable files are left untouched.
+
+        Returns:
+            Number of checkpoints imported
+        """
+        imported = 0
+        for checkpoint_file in self.state_dir.glob("checkpoint_*.json"):
+            if self._import_legacy_checkpoint(checkpoint_file):
+                imported += 1
+        return imported
+
+    def _import_legacy_checkpoint(self, checkpoint_file: Path) -> bool:
+        key = checkpoint_file.stem[len("checkpoint_"):]
+        count = self.catalog.import_json_files(
+            [checkpoint_file],
+            key_for=lambda _p: key,
+            metadata_for=lambda doc, _p: {
+                "stage": doc.get("stage", "unknown"),
+                "timestamp": doc.get("timestamp"),
+            },
+            overwrite=True,
+        )
+        if not count:
+            return False
+        try:
+            checkpoint_file.rename(
+                checkpoint_file.with_suffix(checkpoint_file.suffix + ".migrated")
+            )
+        except OSError as e:
+            logger.warning(f"Imported {checkpoint_file} but could not rename it: {e}")
+        return True
+
     def save_state(self, key: str, data: Any) -> None:
         """Save state data to a JSON file.
 
@@ -98,8 +164,19 @@ class StateManager:
         for state_file in self.state_dir.glob("*.json"):
             state_file.unlink()
             count += 1
+        count += self.catalog.clear()
+        self.collect_artifact_garbage()
         logger.info(f"Cleared {count} state file(s)")
 
+    def collect_artifact_garbage(self) -> int:
+        """Delete artifact blobs no longer referenced by any checkpoint.
+
+        Returns:
+            Number of blobs removed
+        """
+        with self.artifacts.lock():
+            return self.artifacts.collect_garbage(self.catalog.referenced_digests())
+
     def save_checkpoint(
         self,
         checkpoint_key: str,
@@ -122,11 +199,18 @@ class StateManager:
             "metadata": metadata or {},
         }
 
-        checkpoint_file = self.state_dir / f"checkpoint_{checkpoint_key}.json"
-
         try:
-            with open(checkpoint_file, "w", encoding="utf-8") as f:
-                json.dump(checkpoint_data, f, indent=2)
+            # Reused blobs must stay until the catalog references them
+            with self.artifacts.lock():
+                payload = externalize(checkpoint_data, self.artifacts)
+                self.catalog.put(
+                    checkpoint_key,
+                    payload,
+                    refs=iter_refs(payload),
+                    stage=stage,
+                    timestamp=checkpoint_data["timestamp"],
+                    project_name=data.get("project_name") if isinstance(data, dict) else None,
+                )
             logger.info(f"Saved checkpoint: {checkpoint_key} at stage: {stage}")
         except Exception as e:
             logger.error(f"Failed to save checkpoint {checkpoint_key}: {e}")
@@ -141,15 +225,17 @@ class StateManager:
         Returns:
             Checkpoint data dictionary or None if not found
         """
-        checkpoint_file = self.state_dir / f"checkpoint_{checkpoint_key}.json"
-
-        if not checkpoint_file.exists():
-            logger.warning(f"Checkpoint file not found: {checkpoint_key}")
-            return None
+        # Pick up legacy JSON checkpoints written after startup
+        legacy_file = self.state_dir / f"checkpoint_{checkpoint_key}.json"
+        if legacy_file.exists():
+            self._import_legacy_checkpoint(legacy_file)
 
         try:
-            with open(checkpoint_file, "r", encoding="utf-8") as f:
-                checkpoint_data = json.load(f)
+            checkpoint_data = self.catalog.get(checkpoint_key)
+            if checkpoint_data is None:
+                logger.warning(f"Checkpoint not found: {checkpoint_key}")
+                return None
+            checkpoint_data = internalize(checkpoint_data, self.artifacts)
             stage = checkpoint_data.get("stage")
             logger.info(f"Loaded checkpoint: {checkpoint_key} from stage: {stage}")
             return checkpoint_data
@@ -157,37 +243,33 @@ class StateManager:
             logger.error(f"Failed to load checkpoint {checkpoint_key}: {e}")
             raise
 
-    def list_checkpoints(self) -> List[Dict[str, str]]:
-        """List all available checkpoints with metadata.
+    def list_checkpoints(
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        stage: Optional[str] = None,
+    ) -> List[Dict[str, str]]:
+        """List available checkpoints with metadata, newest first.
+
+        Only the catalog index is read; checkpoint payloads are not decoded.
+
+        Args:
+            limit: Maximum number of checkpoints to return (None for all)
+            offset: Number of checkpoints to skip, for pagination
+            stage: Optional stage name to filter by
 
         Returns:
             List of checkpoint info dictionaries
         """
-        checkpoints = []
-
-        for checkpoint_file in self.state_dir.glob("checkpoint_*.json"):
-            try:
-                with open(checkpoint_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-
-                # Extract checkpoint key from filename
-                key = checkpoint_file.stem.replace("checkpoint_", "")
-
-                checkpoints.append(
-                    {
-                        "key": key,
-                        "stage": data.get("stage", "unknown"),
-                        "timestamp": data.get("timestamp", "unknown"),
-                        "file": str(checkpoint_file),
-                    }
-                )
-            except Exception as e:
-                logger.warning(f"Failed to read checkpoint file {checkpoint_file}: {e}")
-                continue
-
-        # Sort by timestamp (newest first)
-        checkpoints.sort(key=lambda x: x["timestamp"], reverse=True)
-        return checkpoints
+        return [
+            {
+                "key": row["key"],
+                "stage": row["stage"],
+                "timestamp": row["timestamp"],
+                "file": f"{self.catalog.db_path}#{row['key']}",
+            }
+            for row in self.catalog.list(limit=limit, offset=offset, stage=stage)
+        ]
 
     def delete_checkpoint(self, checkpoint_key: str) -> None:
         """Delete a specific checkpoint.
@@ -195,41 +277,33 @@ class StateManager:
         Args:
             checkpoint_key: Unique identifier for the checkpoint to delete
         """
-        checkpoint_file = self.state_dir / f"checkpoint_{checkpoint_key}.json"
-
-        if checkpoint_file.exists():
-            checkpoint_file.unlink()
+        legacy_file = self.state_dir / f"checkpoint_{checkpoint_key}.json"
+        removed = self.catalog.delete(checkpoint_key)
+        if legacy_file.exists():
+            legacy_file.unlink()
+            removed = True
+
+        if removed:
+            self.collect_artifact_garbage()
             logger.info(f"Deleted checkpoint: {checkpoint_key}")
         else:
-            logger.warning(f"Checkpoint file not found for deletion: {checkpoint_key}")
+            logger.warning(f"Checkpoint not found for deletion: {checkpoint_key}")
 
-    def cleanup_old_checkpoints(self, keep_latest: int = 5) -> None:
+    def cleanup_old_checkpoints(
+        self, keep_latest: int = 5, max_age_days: Optional[float] = None
+    ) -> None:
         """Clean up old checkpoints, keeping only the latest N.
 
         Args:
             keep_latest: Number of latest checkpoints to keep per key
+            max_age_days: Optionally also delete checkpoints older than this
         """
-        checkpoints = self.list_checkpoints()
-
-        # Group by base key (without stage info)
-        checkpoint_groups = {}
-        for checkpoint in checkpoints:
-            base_key = checkpoint["key"].split("_")[0]  # Get base key
-            if base_key not in checkpoint_groups:
-                checkpoint_groups[base_key] = []
-            checkpoint_groups[base_key].append(checkpoint)
-
-        deleted_count = 0
-        for base_key, group in checkpoint_groups.items():
-            if len(group) > keep_latest:
-                # Sort by timestamp and keep only the latest N
-                group.sort(key=lambda x: x["timestamp"], reverse=True)
-                to_delete = group[keep_latest:]
-
-                for checkpoint in to_delete:
-                    self.delete_checkpoint(checkpoint["key"])
-                    deleted_count += 1
-
+        deleted_count = self.catalog.apply_retention(
+            keep_latest=keep_latest,
+            max_age_seconds=max_age_days * 86400 if max_age_days is not None else None,
+        )
+        if deleted_count:
+            self.collect_artifact_garbage()
         logger.info(f"Cleaned up {deleted_count} old checkpoints")
 
     def resume_pipeline(self, checkpoint_key: str) -> Optional[Dict[str, Any]]:
@@ -268,10 +342,7 @@ class StateManager:
         Returns:
             Latest checkpoint data or None if no checkpoints found
         """
-        checkpoints = self.list_checkpoints()
-
-        if stage_filter:
-            checkpoints = [cp for cp in checkpoints if cp["stage"] == stage_filter]
+        checkpoints = self.list_checkpoints(limit=1, stage=stage_filter)
 
         if not checkpoints:
             return None
@@ -1,12 +1,51 @@
-"""Template loading and rendering using Jinja2."""
+"""Template loading and rendering using Jinja2.
+
+Two optional features are controlled by environment variables:
+
+* Context capture. ``DEVUSSY_CAPTURE_TEMPLATE_CONTEXT`` (``1`` or a sample
+  rate such as ``0.1``) records render contexts as JSON under
+  ``DevDocs/JINJA_DATA_SAMPLES`` (or ``DEVUSSY_TEMPLATE_CAPTURE_DIR``). It is
+  off by default. Captures are serialized and written by a background thread,
+  so rendering never waits on disk.
+* Precompiled templates. ``DEVUSSY_COMPILED_TEMPLATES`` points at a bundle
+  built by :func:`compile_templates` (``python scripts/compile_templates.py``)
+  and ``DEVUSSY_TEMPLATE_CACHE_DIR`` enables Jinja's bytecode cache. Either
+  one lets cold starts (serverless handlers, fresh CLI processes) skip
+  template parsing. A bundle whose source fingerprint no longer matches the
+  templates on disk is ignored.
+"""
 
 from __future__ import annotations
 
+import hashlib
+import json
+import os
+import queue
+import random
+import threading
+from datetime import datetime
 from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Dict, List, Optional, Tuple
+
+from jinja2 import (
+    BaseLoader,
+    BytecodeCache,
+    ChoiceLoader,
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    ModuleLoader,
+    Template,
+)
+
+from .artifact_writer import atomic_write_bytes, atomic_write_text
+from .logger import get_logger
+from .tracing import traced
 
-from jinja2 import Environment, FileSystemLoader, Template
+logger = get_logger(__name__)
+
+_ENV_OPTIONS = dict(autoescape=False, trim_blocks=True, lstrip_blocks=True)
 
 
 def _templates_dir() -> Path:
@@ -14,12 +53,58 @@ def _templates_dir() -> Path:
     return Path(__file__).resolve().parents[1] / "templates"
 
 
+def _template_sources(templates_dir: Path) -> List[Path]:
+    return sorted(p for p in templates_dir.rglob("*.jinja") if p.is_file())
+
+
+def templates_fingerprint(templates_dir: Optional[Path] = None) -> str:
+    """Hash of every template's relative path and content."""
+    root = templates_dir or _templates_dir()
+    digest = hashlib.sha256()
+    for path in _template_sources(root):
+        digest.update(path.relative_to(root).as_posix().encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _fingerprint_path(bundle: Path) -> Path:
+    return bundle.with_name(bundle.name + ".sha256")
+
+
+def _compiled_loader(templates_dir: Path) -> Optional[BaseLoader]:
+    bundle_env = os.getenv("DEVUSSY_COMPILED_TEMPLATES")
+    if not bundle_env:
+        return None
+    bundle = Path(bundle_env)
+    try:
+        expected = _fingerprint_path(bundle).read_text(encoding="utf-8").strip()
+    except OSError:
+        logger.warning(f"Compiled templates not found at {bundle}; parsing templates from source")
+        return None
+    if expected != templates_fingerprint(templates_dir):
+        logger.warning(f"Compiled templates at {bundle} are stale; parsing templates from source")
+        return None
+    return ModuleLoader(str(bundle))
+
+
+def _bytecode_cache() -> Optional[BytecodeCache]:
+    cache_dir = os.getenv("DEVUSSY_TEMPLATE_CACHE_DIR")
+    if not cache_dir:
+        return None
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    return FileSystemBytecodeCache(cache_dir)
+
+
 @lru_cache(maxsize=1)
 def _env() -> Environment:
-    loader = FileSystemLoader(str(_templates_dir()))
-    env = Environment(
-        loader=loader, autoescape=False, trim_blocks=True, lstrip_blocks=True
-    )
+    templates_dir = _templates_dir()
+    loader: BaseLoader = FileSystemLoader(str(templates_dir))
+    compiled = _compiled_loader(templates_dir)
+    if compiled is not None:
+        # Fall back to source for anything the bundle does not contain
+        loader = ChoiceLoader([compiled, loader])
+    env = Environment(loader=loader, bytecode_cache=_bytecode_cache(), **_ENV_OPTIONS)
     # Add Python builtins to Jinja2 environment
     env.globals["enumerate"] = enumerate
     env.globals["len"] = len
@@ -32,35 +117,175 @@ def load_template(name: str) -> Template:
     return tpl
 
 
-def render_template(name: str, context: dict[str, Any]) -> str:
-    """Render the named template with provided context."""
-    # DEV: Log context to JSON
+def warm_templates() -> int:
+    """Load every template into the environment cache.
+
+    Call at process startup so the first request does not pay for parsing.
+    With a bytecode cache configured this also populates it.
+
+    Returns:
+        Number of templates loaded
+    """
+    root = _templates_dir()
+    names = [p.relative_to(root).as_posix() for p in _template_sources(root)]
+    for name in names:
+        load_template(name)
+    return len(names)
+
+
+def compile_templates(target: str | Path, templates_dir: Optional[Path] = None) -> Path:
+    """Precompile all templates into a zip bundle usable by ``ModuleLoader``.
+
+    A ``<target>.sha256`` file next to the bundle records the fingerprint of
+    the sources it was built from, so a stale bundle is never used.
+
+    Args:
+        target: Path of the zip file to create
+        templates_dir: Source templates (default: the project's templates)
+
+    Returns:
+        Path to the bundle
+    """
+    root = templates_dir or _templates_dir()
+    bundle = Path(target)
+    bundle.parent.mkdir(parents=True, exist_ok=True)
+    env = Environment(loader=FileSystemLoader(str(root)), **_ENV_OPTIONS)
+    env.compile_templates(
+        str(bundle),
+        extensions=["jinja"],
+        zip="deflated",
+        ignore_errors=False,
+    )
+    atomic_write_text(_fingerprint_path(bundle), templates_fingerprint(root), skip_unchanged=False)
+    logger.info(f"Compiled templates from {root} into {bundle}")
+    return bundle
+
+
+def _default_serializer(obj: Any) -> Any:
+    if isinstance(obj, datetime):
+        return obj.isoformat()
     try:
-        import json
-        from datetime import datetime
-        
-        log_dir = Path(__file__).resolve().parents[1] / "DevDocs" / "JINJA_DATA_SAMPLES"
-        log_dir.mkdir(parents=True, exist_ok=True)
-        
-        safe_name = name.replace("/", "_").replace("\\", "_")
-        log_file = log_dir / f"{safe_name}.json"
-        
-        def default_serializer(obj):
-            if isinstance(obj, datetime):
-                return obj.isoformat()
-            try:
-                return obj.model_dump()
-            except AttributeError:
-                pass
+        return obj.model_dump()
+    except AttributeError:
+        pass
+    try:
+        return obj.dict()
+    except AttributeError:
+        pass
+    return str(obj)
+
+
+class ContextRecorder:
+    """Sample render contexts and write them as JSON on a background thread.
+
+    The context is serialized on the rendering thread, so the writer only
+    ever sees finished bytes and never touches objects the caller may go on
+    to mutate. When the queue is full the capture is dropped rather than
+    slowing the render. Only the latest context per template is kept on disk.
+    """
+
+    def __init__(self, output_dir: Path, sample_rate: float = 1.0, max_pending: int = 32):
+        """Initialize the recorder.
+
+        Args:
+            output_dir: Directory for ``<template>.json`` files
+            sample_rate: Fraction of renders to capture (0-1)
+            max_pending: Captures queued before new ones are dropped
+        """
+        self.output_dir = output_dir
+        self.sample_rate = sample_rate
+        self.dropped = 0
+        self.written = 0
+        self._queue: "queue.Queue[Optional[Tuple[str, bytes]]]" = queue.Queue(max_pending)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def capture(self, name: str, context: Dict[str, Any]) -> bool:
+        """Queue ``context`` for ``name`` if sampled. Never blocks."""
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return False
+        try:
+            data = json.dumps(context, indent=2, default=_default_serializer).encode("utf-8")
+        except Exception as e:
+            logger.warning(f"Failed to capture Jinja context for {name}: {e}")
+            return False
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait((name, data))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="template-context-recorder", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
             try:
-                return obj.dict()
-            except AttributeError:
-                pass
-            return str(obj)
+                if item is None:
+                    return
+                self._write(*item)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, name: str, data: bytes) -> None:
+        safe_name = name.replace("/", "_").replace("\\", "_")
+        try:
+            atomic_write_bytes(self.output_dir / f"{safe_name}.json", data)
+            self.written += 1
+        except Exception as e:
+            logger.warning(f"Failed to capture Jinja context for {name}: {e}")
+
+    def flush(self) -> None:
+        """Wait until every queued capture has been written."""
+        if self._thread is not None:
+            self._queue.join()
 
-        with open(log_file, "w", encoding="utf-8") as f:
-            json.dump(context, f, indent=2, default=default_serializer)
-    except Exception as e:
-        print(f"Warning: Failed to log Jinja context: {e}")
+    def close(self) -> None:
+        """Flush and stop the background thread."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+
+def _capture_rate() -> float:
+    raw = os.getenv("DEVUSSY_CAPTURE_TEMPLATE_CONTEXT", "").strip().lower()
+    if raw in ("", "0", "false", "no", "off"):
+        return 0.0
+    if raw in ("1", "true", "yes", "on"):
+        return 1.0
+    try:
+        return min(1.0, max(0.0, float(raw)))
+    except ValueError:
+        logger.warning(f"Ignoring invalid DEVUSSY_CAPTURE_TEMPLATE_CONTEXT={raw!r}")
+        return 0.0
 
+
+@lru_cache(maxsize=1)
+def get_context_recorder() -> Optional[ContextRecorder]:
+    """Return the process-wide recorder, or None when capture is disabled."""
+    rate = _capture_rate()
+    if rate <= 0:
+        return None
+    default_dir = Path(__file__).resolve().parents[1] / "DevDocs" / "JINJA_DATA_SAMPLES"
+    output_dir = Path(os.getenv("DEVUSSY_TEMPLATE_CAPTURE_DIR") or default_dir)
+    return ContextRecorder(output_dir, sample_rate=rate)
+
+
+@traced("render", attributes=lambda name, context: {"template": name})
+def render_template(name: str, context: dict[str, Any]) -> str:
+    """Render the named template with provided context."""
+    recorder = get_context_recorder()
+    if recorder is not None:
+        recorder.capture(name, context)
     return load_template(name).render(**context)
@@ -179,6 +179,8 @@ class InterviewScreen(App):
         self.interview_data = None
         self._logo_text = _load_logo_text()
         self._conversation_display: Optional[Static] = None
+        # Told as soon as a reply's JSON summary closes, mid-stream
+        self.interview_manager.on_structured_data = self._on_structured_data
     
     def on_mount(self) -> None:
         """Initialize the interview when UI is mounted."""
@@ -286,8 +288,10 @@ class InterviewScreen(App):
                 self.call_after_refresh(self._update_conversation_display)
             
             # Get streaming response from LLM
-            full_response = await self.interview_manager._send_to_llm_streaming(
-                user_input, 
+            # Awaited on the app's own loop; the manager keeps one pooled
+            # client session for the whole interview
+            full_response = await self.interview_manager.send(
+                user_input,
                 callback=stream_callback
             )
             
@@ -303,6 +307,15 @@ class InterviewScreen(App):
                 self.conversation_history.pop()
             return f"❌ Error getting response: {e}"
     
+    def _on_structured_data(self, data: dict) -> None:
+        """Announce a complete project summary before the reply finishes."""
+        if self.interview_manager._validate_extracted_data(data):
+            self.interview_manager.extracted_data = data
+            self.notify(
+                "Required info collected. Type /done to finalize, or continue to refine.",
+                severity="information",
+            )
+
     def _add_system_message(self, message: str) -> None:
         """Add a system message to the conversation."""
         self.conversation_history.append(("system", message))
@@ -699,6 +712,8 @@ async def run_interview_ui(
     except Exception as e:
         print(f"❌ Interview UI error: {e}")
         return None
+    finally:
+        await interview_manager.aclose()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,438 @@
+"""Lightweight span tracing and sampling profiler for pipeline runs.
+
+Spans nest through a context variable, so the natural call structure of a run
+(run → stage → phase → LLM attempt → parse/render/write) is captured without
+threading tracer objects through every signature. Each span records wall time,
+CPU time of the executing thread and the difference between the two
+("await time": time spent waiting on the network, disk or other tasks).
+CPU and await time are only measured for spans outside asyncio tasks (sync
+code and worker threads): a task span can suspend, and whatever other tasks
+run on the loop thread meanwhile would be charged to it, so such spans only
+carry wall time.
+
+Until :func:`enable_tracing` is called, :func:`trace_span` and :func:`traced`
+are cheap no-ops. Finished spans can be written as plain
+JSON, as a Chrome trace (``chrome://tracing`` / Perfetto) or sent to an OTLP
+HTTP collector. :class:`StackSampler` adds periodic stack samples in the
+"folded" format understood by flamegraph tools.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+import urllib.request
+import uuid
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "devussy_current_span", default=None
+)
+_tracer: Optional["Tracer"] = None
+
+
+@dataclass
+class Span:
+    """A timed, named unit of work."""
+
+    name: str
+    span_id: str
+    parent_id: Optional[str]
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    start: float = 0.0
+    end: float = 0.0
+    wall: float = 0.0
+    # Thread CPU seconds; None for spans opened inside an asyncio task
+    cpu: Optional[float] = None
+    thread_id: int = 0
+    lane: int = 0
+    status: str = "ok"
+
+    @property
+    def await_time(self) -> Optional[float]:
+        """Wall time not spent on this thread's CPU, if CPU time was measured."""
+        if self.cpu is None:
+            return None
+        return max(0.0, self.wall - self.cpu)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["await_time"] = self.await_time
+        return data
+
+
+def _current_task() -> Optional[asyncio.Task]:
+    try:
+        return asyncio.current_task()
+    except RuntimeError:
+        return None
+
+
+class Tracer:
+    """Collect finished spans for one run."""
+
+    def __init__(self, service_name: str = "devussy"):
+        self.service_name = service_name
+        self.trace_id = uuid.uuid4().hex
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, /, **attributes: Any) -> Iterator[Span]:
+        """Open a span nested under the current one."""
+        parent = _current_span.get()
+        task = _current_task()
+        span = Span(
+            name=name,
+            span_id=uuid.uuid4().hex[:16],
+            parent_id=parent.span_id if parent else None,
+            attributes=attributes,
+            thread_id=threading.get_ident(),
+            # Concurrent asyncio tasks on one thread get separate lanes so their
+            # spans render as parallel tracks instead of overlapping on one row.
+            lane=id(task) if task is not None else threading.get_ident(),
+        )
+        token = _current_span.set(span)
+        span.start = time.time()
+        wall0 = time.perf_counter()
+        cpu0 = time.thread_time() if task is None else None
+        try:
+            yield span
+        except BaseException:
+            span.status = "error"
+            raise
+        finally:
+            span.wall = time.perf_counter() - wall0
+            if cpu0 is not None:
+                span.cpu = time.thread_time() - cpu0
+            span.end = span.start + span.wall
+            _current_span.reset(token)
+            with self._lock:
+                self.spans.append(span)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Aggregate count and total wall/CPU/await seconds per span name.
+
+        CPU and await totals only cover spans that measured CPU time.
+        """
+        totals: Dict[str, Dict[str, float]] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for s in spans:
+            t = totals.setdefault(s.name, {"count": 0, "wall": 0.0, "cpu": 0.0, "await": 0.0})
+            t["count"] += 1
+            t["wall"] += s.wall
+            if s.cpu is not None:
+                t["cpu"] += s.cpu
+                t["await"] += s.await_time
+        return dict(sorted(totals.items(), key=lambda kv: kv[1]["wall"], reverse=True))
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Return spans in the Chrome trace event format."""
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self.spans)
+        events = []
+        for s in spans:
+            args = dict(s.attributes)
+            if s.cpu is not None:
+                args.update(cpu_ms=s.cpu * 1e3, await_ms=s.await_time * 1e3)
+            events.append(
+                {
+                    "name": s.name,
+                    "ph": "X",
+                    "ts": s.start * 1e6,
+                    "dur": s.wall * 1e6,
+                    "pid": pid,
+                    "tid": s.lane,
+                    "args": args,
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_json(self, path: str | Path) -> Path:
+        """Write all spans as a JSON document."""
+        p = Path(path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            spans = [s.to_dict() for s in self.spans]
+        p.write_text(
+            json.dumps({"trace_id": self.trace_id, "spans": spans}, indent=2, default=str),
+            encoding="utf-8",
+        )
+        return p
+
+    def write_chrome_trace(self, path: str | Path) -> Path:
+        """Write spans as a Chrome trace file."""
+        p = Path(path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(json.dumps(self.to_chrome_trace(), default=str), encoding="utf-8")
+        return p
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Return spans as an OTLP/HTTP JSON ``ExportTraceServiceRequest``."""
+
+        def attr(key: str, value: Any) -> Dict[str, Any]:
+            if isinstance(value, bool):
+                v = {"boolValue": value}
+            elif isinstance(value, int):
+                v = {"intValue": str(value)}
+            elif isinstance(value, float):
+                v = {"doubleValue": value}
+            else:
+                v = {"stringValue": str(value)}
+            return {"key": key, "value": v}
+
+        with self._lock:
+            spans = list(self.spans)
+        otlp_spans = []
+        for s in spans:
+            attributes = [attr(k, v) for k, v in s.attributes.items()]
+            if s.cpu is not None:
+                attributes += [attr("cpu_seconds", s.cpu), attr("await_seconds", s.await_time)]
+            item = {
+                "traceId": self.trace_id,
+                "spanId": s.span_id,
+                "name": s.name,
+                "kind": 1,
+                "startTimeUnixNano": str(int(s.start * 1e9)),
+                "endTimeUnixNano": str(int(s.end * 1e9)),
+                "attributes": attributes,
+                "status": {"code": 2 if s.status == "error" else 1},
+            }
+            if s.parent_id:
+                item["parentSpanId"] = s.parent_id
+            otlp_spans.append(item)
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": [attr("service.name", self.service_name)]},
+                    "scopeSpans": [{"scope": {"name": "devussy.tracing"}, "spans": otlp_spans}],
+                }
+            ]
+        }
+
+    def export_otlp(self, endpoint: str, timeout: float = 5.0) -> bool:
+        """POST spans to an OTLP/HTTP collector.
+
+        Args:
+            endpoint: Collector base URL (``/v1/traces`` is appended if missing)
+            timeout: Request timeout in seconds
+
+        Returns:
+            True if the collector accepted the spans
+        """
+        url = endpoint.rstrip("/")
+        if not url.endswith("/v1/traces"):
+            url += "/v1/traces"
+        body = json.dumps(self.to_otlp()).encode("utf-8")
+        request = urllib.request.Request(
+            url, data=body, headers={"Content-Type": "application/json"}, method="POST"
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                return 200 <= response.status < 300
+        except Exception as e:
+            logger.warning(f"OTLP export to {url} failed: {e}")
+            return False
+
+
+def enable_tracing(tracer: Optional[Tracer] = None) -> Tracer:
+    """Install a process-wide tracer and return it."""
+    global _tracer
+    _tracer = tracer or Tracer()
+    return _tracer
+
+
+def disable_tracing() -> Optional[Tracer]:
+    """Remove the process-wide tracer, returning the previous one."""
+    global _tracer
+    previous, _tracer = _tracer, None
+    return previous
+
+
+def get_tracer() -> Optional[Tracer]:
+    """Return the active tracer, or None when tracing is disabled."""
+    return _tracer
+
+
+def trace_span(name: str, /, **attributes: Any):
+    """Context manager for a span on the active tracer (no-op when disabled)."""
+    tracer = _tracer
+    if tracer is None:
+        return nullcontext()
+    return tracer.span(name, **attributes)
+
+
+def traced(
+    name: Optional[str] = None,
+    attributes: Optional[Callable[..., Dict[str, Any]]] = None,
+) -> Callable[[F], F]:
+    """Decorate a sync or async function so each call runs in a span.
+
+    Args:
+        name: Span name (defaults to the function's qualified name)
+        attributes: Optional callable receiving the call's arguments and
+            returning span attributes
+    """
+
+    def decorator(func: F) -> F:
+        span_name = name or func.__qualname__
+
+        def attrs(args: Any, kwargs: Any) -> Dict[str, Any]:
+            if attributes is None:
+                return {}
+            try:
+                return attributes(*args, **kwargs)
+            except Exception:
+                return {}
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if _tracer is None:
+                    return await func(*args, **kwargs)
+                with _tracer.span(span_name, **attrs(args, kwargs)):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _tracer is None:
+                return func(*args, **kwargs)
+            with _tracer.span(span_name, **attrs(args, kwargs)):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+class StackSampler:
+    """Sample a thread's Python stack at a fixed interval.
+
+    Samples are aggregated as "folded" stacks (``frame;frame;frame count``),
+    the input format of flamegraph.pl, speedscope and similar tools.
+    """
+
+    def __init__(self, interval: float = 0.005, thread_id: Optional[int] = None, max_depth: int = 64):
+        """Initialize the sampler.
+
+        Args:
+            interval: Seconds between samples
+            thread_id: Thread to sample (defaults to the thread calling :meth:`start`)
+            max_depth: Maximum frames recorded per sample
+        """
+        self.interval = interval
+        self.thread_id = thread_id
+        self.max_depth = max_depth
+        self.samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self.thread_id is None:
+            self.thread_id = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack: List[str] = []
+            while frame is not None and len(stack) < self.max_depth:
+                code = frame.f_code
+                stack.append(f"{Path(code.co_filename).name}:{code.co_name}")
+                frame = frame.f_back
+            self.samples[";".join(reversed(stack))] += 1
+
+    def top(self, n: int = 10) -> List[tuple[str, int]]:
+        """Return the ``n`` leaf functions seen most often."""
+        leaves: Counter[str] = Counter()
+        for stack, count in self.samples.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        return leaves.most_common(n)
+
+    def write_folded(self, path: str | Path) -> Path:
+        """Write samples in folded-stack format."""
+        p = Path(path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(
+            "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common()),
+            encoding="utf-8",
+        )
+        return p
+
+
+@contextmanager
+def profile_session(
+    output_dir: str | Path,
+    sample_stacks: bool = True,
+    interval: float = 0.005,
+    otlp_endpoint: Optional[str] = None,
+) -> Iterator[Tracer]:
+    """Trace (and optionally sample) everything run inside the block.
+
+    On exit writes ``spans.json``, ``trace.json`` (Chrome trace) and, when
+    sampling, ``stacks.folded`` to ``output_dir``; spans are also sent to
+    ``otlp_endpoint`` if given.
+    """
+    out = Path(output_dir)
+    previous = get_tracer()
+    tracer = enable_tracing()
+    sampler = StackSampler(interval=interval) if sample_stacks else None
+    if sampler is not None:
+        sampler.start()
+    try:
+        with tracer.span("run"):
+            yield tracer
+    finally:
+        if sampler is not None:
+            sampler.stop()
+            sampler.write_folded(out / "stacks.folded")
+        tracer.write_json(out / "spans.json")
+        tracer.write_chrome_trace(out / "trace.json")
+        if otlp_endpoint:
+            tracer.export_otlp(otlp_endpoint)
+        if previous is not None:
+            enable_tracing(previous)
+        else:
+            disable_tracing()
+
+
+def format_summary(tracer: Tracer, limit: int = 15) -> str:
+    """Render the per-span-name summary as a fixed-width table."""
+    lines = [f"{'span':<32} {'count':>6} {'wall s':>9} {'cpu s':>9} {'await s':>9}"]
+    for name, t in list(tracer.summary().items())[:limit]:
+        lines.append(
+            f"{name[:32]:<32} {int(t['count']):>6} {t['wall']:>9.3f} {t['cpu']:>9.3f} {t['await']:>9.3f}"
+        )
+    return "\n".join(lines)
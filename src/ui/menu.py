@@ -170,8 +170,8 @@ def _current_settings_snapshot(config: AppConfig, session: Optional[SessionSetti
 
 def _load_prefs() -> SessionSettings:
     try:
-        sm = StateManager()
-        data = sm.load_state("ui_prefs") or {}
+        with StateManager() as sm:
+            data = sm.load_state("ui_prefs") or {}
         logger.debug(f"_load_prefs: Loaded data from state: {data}")
         result = SessionSettings(**data)
         logger.debug(f"_load_prefs: Created SessionSettings with repository_tools_enabled: {getattr(result, 'repository_tools_enabled', 'NOT_SET')}")
@@ -183,8 +183,8 @@ def _load_prefs() -> SessionSettings:
 
 def _save_prefs(session: SessionSettings) -> None:
     try:
-        sm = StateManager()
-        sm.save_state("ui_prefs", session.model_dump())
+        with StateManager() as sm:
+            sm.save_state("ui_prefs", session.model_dump())
     except Exception:
         pass
 
@@ -372,6 +372,7 @@ def main():
         print("[LIST] Creating basic development plan structure with real-time streaming...")
         # Generate only basic devplan structure (this is fast)
         devplan = await orchestrator.basic_devplan_gen.generate(design)
+        await orchestrator.aclose()
         print("[OK] Development plan structure created!")
         
         # Save devplan immediately for the terminal UI to pick up
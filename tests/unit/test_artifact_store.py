@@ -0,0 +1,129 @@
+"""Tests for the content-addressed artifact store."""
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from src.artifact_store import (
+    REF_KEY,
+    ArtifactStore,
+    externalize,
+    internalize,
+    iter_refs,
+)
+from src.state_manager import StateManager
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> ArtifactStore:
+    return ArtifactStore(tmp_path / "artifacts")
+
+
+def test_put_is_deduplicated(store):
+    first = store.put("same content")
+    second = store.put(b"same content")
+
+    assert first == second
+    assert list(store.iter_digests()) == [first]
+    assert store.get_text(first) == "same content"
+
+
+def test_get_missing_raises_key_error(store):
+    with pytest.raises(KeyError):
+        store.get("0" * 64)
+
+
+def test_externalize_roundtrip_keeps_small_values_inline(store):
+    big = "x" * 5000
+    doc = {"small": "hi", "big": big, "nested": [{"raw": big}], "n": 3}
+
+    stored = externalize(doc, store, min_size=100)
+
+    assert stored["small"] == "hi"
+    assert stored["n"] == 3
+    assert set(stored["big"]) == {REF_KEY}
+    assert stored["big"] == stored["nested"][0]["raw"]
+    assert internalize(stored, store) == doc
+    assert len(set(iter_refs(stored))) == 1
+
+
+def test_collect_garbage_removes_unreferenced(store):
+    keep = store.put("keep me")
+    drop = store.put("drop me")
+
+    assert store.collect_garbage([keep]) == 1
+    assert store.exists(keep)
+    assert not store.exists(drop)
+
+
+def test_save_reusing_a_blob_waits_for_garbage_collection(tmp_path, monkeypatch):
+    manager = StateManager(str(tmp_path))
+    text = "design text " * 500
+    manager.save_checkpoint("old_pipeline", "project_design", {"design": text})
+    manager.catalog.delete("old_pipeline")
+    snapshot = manager.catalog.referenced_digests
+
+    def stale_snapshot():
+        live = snapshot()
+        # A save reusing the unreferenced blob arrives after the snapshot
+        saver.start()
+        time.sleep(0.1)
+        return live
+
+    saver = threading.Thread(
+        target=manager.save_checkpoint, args=("new_pipeline", "project_design", {"design": text})
+    )
+    monkeypatch.setattr(manager.catalog, "referenced_digests", stale_snapshot)
+    assert manager.collect_artifact_garbage() == 1
+    saver.join(5)
+
+    assert manager.load_checkpoint("new_pipeline")["data"]["design"] == text
+
+
+def test_checkpoints_share_artifacts(tmp_path):
+    manager = StateManager(str(tmp_path))
+    design = {"raw_llm_response": "design text " * 500}
+
+    manager.save_checkpoint("proj_pipeline", "project_design", {"project_design": design})
+    manager.save_checkpoint("proj_devplan", "basic_devplan", {"project_design": design})
+
+    assert len(list(manager.artifacts.iter_digests())) == 1
+    loaded = manager.load_checkpoint("proj_devplan")
+    assert loaded["data"]["project_design"] == design
+
+    manager.delete_checkpoint("proj_pipeline")
+    assert len(list(manager.artifacts.iter_digests())) == 1
+    manager.delete_checkpoint("proj_devplan")
+    assert list(manager.artifacts.iter_digests()) == []
+
+
+def test_garbage_collection_uses_the_ref_index(tmp_path, monkeypatch):
+    manager = StateManager(str(tmp_path))
+    text = "design text " * 500
+    manager.save_checkpoint("a_pipeline", "project_design", {"design": text})
+    manager.save_checkpoint("b_pipeline", "project_design", {"design": text + "v2"})
+    digests = set(manager.artifacts.iter_digests())
+    assert manager.catalog.referenced_digests() == digests
+
+    # Payloads are not decoded to find the live artifacts
+    monkeypatch.setattr("src.checkpoint_store.zlib.decompress", None)
+    manager.delete_checkpoint("a_pipeline")
+    assert len(set(manager.artifacts.iter_digests())) == 1
+    assert manager.catalog.referenced_digests() == set(manager.artifacts.iter_digests())
+
+
+def test_ref_index_is_rebuilt_for_older_catalogs(tmp_path):
+    manager = StateManager(str(tmp_path))
+    manager.save_checkpoint("a_pipeline", "project_design", {"design": "design text " * 500})
+    live = manager.catalog.referenced_digests()
+    with manager.catalog._conn:
+        manager.catalog._conn.execute("DELETE FROM checkpoint_refs")
+        manager.catalog._conn.execute("PRAGMA user_version = 0")
+    manager.catalog.close()
+
+    reopened = StateManager(str(tmp_path))
+    assert reopened.catalog.refs_indexed
+    assert reopened.catalog.referenced_digests() == live
+    assert reopened.collect_artifact_garbage() == 0
@@ -0,0 +1,120 @@
+"""Tests for the background artifact writer."""
+
+import asyncio
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.artifact_writer import ArtifactWriter, atomic_write_text
+from src.concurrency import ConcurrencyManager
+from src.file_manager import FileManager
+from src.pipeline.compose import PipelineOrchestrator
+from src.state_manager import StateManager
+
+
+@pytest.fixture
+def writer():
+    w = ArtifactWriter(max_workers=2)
+    yield w
+    w.close()
+
+
+def test_atomic_write_skips_unchanged(tmp_path: Path):
+    target = tmp_path / "out" / "file.md"
+
+    assert atomic_write_text(target, "hello") is True
+    mtime = target.stat().st_mtime_ns
+    assert atomic_write_text(target, "hello") is False
+    assert target.stat().st_mtime_ns == mtime
+    assert atomic_write_text(target, "changed") is True
+    assert target.read_text() == "changed"
+    assert [p.name for p in target.parent.iterdir()] == ["file.md"]
+
+
+def test_submit_and_flush_writes_all_files(tmp_path: Path, writer):
+    for i in range(25):
+        writer.submit(tmp_path / f"phase{i}.md", f"phase {i}")
+    writer.flush()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+        f"phase{i}.md" for i in range(25)
+    )
+    assert (tmp_path / "phase7.md").read_text() == "phase 7"
+
+
+def test_last_write_to_same_path_wins(tmp_path: Path, writer):
+    target = tmp_path / "devplan.md"
+    for i in range(50):
+        writer.submit(target, f"version {i}")
+    writer.flush()
+
+    assert target.read_text() == "version 49"
+
+
+def test_unchanged_rewrites_are_skipped(tmp_path: Path, writer):
+    target = tmp_path / "handoff.md"
+    writer.submit(target, "same")
+    writer.flush()
+    writer.submit(target, "same")
+    writer.flush()
+
+    assert writer.writes == 1
+    assert writer.skipped == 1
+
+
+def test_appends_are_ordered(tmp_path: Path, writer):
+    log = tmp_path / "log.md"
+    for i in range(10):
+        writer.append(log, f"{i}\n")
+    writer.flush()
+
+    assert log.read_text() == "".join(f"{i}\n" for i in range(10))
+
+
+def test_async_flush(tmp_path: Path, writer):
+    async def run():
+        writer.submit(tmp_path / "a.md", "a")
+        await writer.aflush()
+
+    asyncio.run(run())
+    assert (tmp_path / "a.md").read_text() == "a"
+
+
+def test_file_manager_reads_pending_content(tmp_path: Path, writer):
+    fm = FileManager(writer=writer)
+    path = tmp_path / "doc.md"
+
+    fm.write_markdown(path, "# Title\n\nbody\n")
+    assert fm.read_markdown(path) == "# Title\n\nbody\n"
+    fm.update_section(path, "Title", "new body")
+    fm.flush()
+
+    assert "new body" in path.read_text()
+
+
+def test_orchestrator_close_stops_its_own_writer(tmp_path: Path, writer):
+    def make(**kwargs):
+        return PipelineOrchestrator(
+            llm_client=MagicMock(),
+            concurrency_manager=ConcurrencyManager(max_concurrent=1),
+            file_manager=FileManager(),
+            state_manager=StateManager(str(tmp_path / "state")),
+            **kwargs,
+        )
+
+    async def run():
+        async with make() as orchestrator:
+            orchestrator.file_manager.write_markdown(str(tmp_path / "a.md"), "a")
+        return orchestrator
+
+    owned = asyncio.run(run())
+    assert (tmp_path / "a.md").read_text() == "a"
+    with pytest.raises(RuntimeError):
+        owned.artifact_writer.submit(tmp_path / "late.md", "late")
+
+    shared = make(artifact_writer=writer)
+    shared.file_manager.write_markdown(str(tmp_path / "b.md"), "b")
+    shared.close()
+    assert (tmp_path / "b.md").read_text() == "b"
+    writer.submit(tmp_path / "still_open.md", "ok")
@@ -0,0 +1,67 @@
+"""Tests for the benchmark harness."""
+
+import asyncio
+
+from benchmarks.compare import compare
+from benchmarks.fake_provider import FakeLLMClient, FakeProviderConfig
+from benchmarks.metrics import percentile, summarize
+from benchmarks.scenarios import SCENARIOS, BenchOptions
+from src.pipeline.basic_devplan import BasicDevPlanGenerator
+
+
+def test_fake_provider_routes_prompts():
+    client = FakeLLMClient(FakeProviderConfig(latency=0, phases=3, steps_per_phase=2))
+
+    plan = asyncio.run(client.generate_completion("Create a high-level development plan"))
+    assert plan.count("## Phase") == 3
+
+    steps = asyncio.run(
+        client.generate_completion("Write a detailed, step-by-step plan\n**Phase 2: Storage**")
+    )
+    assert steps.startswith("2.1:")
+    assert "2.2:" in steps
+
+    chunks = []
+    streamed = asyncio.run(client.generate_completion_streaming("design", chunks.append))
+    assert "".join(chunks) == streamed
+    assert client.calls == 3
+    assert client.last_usage_metadata["completion_tokens"] > 0
+
+
+def test_fake_devplan_parses_with_real_generator():
+    client = FakeLLMClient(FakeProviderConfig(latency=0, phases=4))
+    devplan = BasicDevPlanGenerator(client)._parse_response(client._basic_devplan(), "bench")
+    assert [p.number for p in devplan.phases] == [1, 2, 3, 4]
+
+
+def test_metrics_summary():
+    assert percentile([], 50) == 0.0
+    stats = summarize([0.1, 0.2, 0.3, 0.4])
+    assert stats["count"] == 4
+    assert stats["max"] == 0.4
+    assert 0.2 <= stats["p50"] <= 0.3
+
+
+def test_compare_flags_regressions():
+    base = {"scenarios": {"s": {"wall_s": {"p50": 1.0, "count": 3}, "runs_per_min": 60.0}}}
+    new = {"scenarios": {"s": {"wall_s": {"p50": 1.5, "count": 9}, "runs_per_min": 40.0}}}
+
+    deltas = {d.metric: d for d in compare(base, new)}
+
+    assert "s.wall_s.count" not in deltas
+    assert deltas["s.wall_s.p50"].regressed(0.1)
+    assert deltas["s.runs_per_min"].regressed(0.1)
+    assert not deltas["s.wall_s.p50"].regressed(0.6)
+
+
+def test_detailed_devplan_scenario_runs(monkeypatch):
+    # Phase generation reads the app config; pin the provider so a stray .env
+    # written by other tests cannot make it invalid
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    options = BenchOptions(runs=1, provider=FakeProviderConfig(latency=0))
+    result = asyncio.run(SCENARIOS["detailed_devplan_5"](options))
+
+    assert result["runs"] == 1
+    assert result["time_to_first_phase_s"]["count"] == 1
+    assert result["stages_s"]["phase"]["count"] == 5
+    assert "alloc_peak_mb" in result
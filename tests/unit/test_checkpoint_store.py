@@ -0,0 +1,142 @@
+"""Tests for the SQLite checkpoint catalog and its StateManager integration."""
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+import pytest
+
+from src.checkpoint_store import CheckpointCatalog
+from src.state_manager import StateManager
+
+
+@pytest.fixture
+def catalog(tmp_path: Path):
+    cat = CheckpointCatalog(tmp_path / "checkpoints.db")
+    yield cat
+    cat.close()
+
+
+def test_put_and_get_roundtrip(catalog):
+    payload = {"stage": "devplan", "data": {"text": "x" * 10_000}}
+    catalog.put("proj_pipeline", payload, stage="devplan")
+
+    assert catalog.get("proj_pipeline") == payload
+    assert catalog.get("missing") is None
+
+
+def test_catalog_closes_as_context_manager(tmp_path):
+    with CheckpointCatalog(tmp_path / "checkpoints.db") as catalog:
+        catalog.put("proj_pipeline", {"stage": "devplan"}, stage="devplan")
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        catalog.count()
+    with CheckpointCatalog(tmp_path / "checkpoints.db") as reopened:
+        assert reopened.count() == 1
+
+
+def test_payload_is_compressed(catalog):
+    payload = {"data": "repeat " * 5_000}
+    catalog.put("big", payload)
+
+    row = catalog._conn.execute(
+        "SELECT size, length(payload) FROM checkpoints WHERE key = 'big'"
+    ).fetchone()
+    assert row[1] < row[0] / 10
+
+
+def test_list_is_newest_first_with_pagination(catalog):
+    for i in range(5):
+        catalog.put(f"p{i}", {"i": i}, stage="s", timestamp=1000 + i)
+
+    keys = [row["key"] for row in catalog.list()]
+    assert keys == ["p4", "p3", "p2", "p1", "p0"]
+
+    page = catalog.list(limit=2, offset=1)
+    assert [row["key"] for row in page] == ["p3", "p2"]
+    assert catalog.count() == 5
+
+
+def test_list_filters_by_stage(catalog):
+    catalog.put("a", {}, stage="design", timestamp=1)
+    catalog.put("b", {}, stage="devplan", timestamp=2)
+
+    assert [row["key"] for row in catalog.list(stage="design")] == ["a"]
+    assert catalog.count(stage="devplan") == 1
+
+
+def test_retention_keeps_latest_per_group(catalog):
+    for i in range(4):
+        catalog.put(f"alpha_{i}", {}, timestamp=100 + i)
+    catalog.put("beta_0", {}, timestamp=50)
+
+    deleted = catalog.apply_retention(keep_latest=2)
+
+    assert deleted == 2
+    remaining = {row["key"] for row in catalog.list()}
+    assert remaining == {"alpha_3", "alpha_2", "beta_0"}
+
+
+def test_retention_by_age(catalog):
+    catalog.put("old", {}, timestamp=time.time() - 3600)
+    catalog.put("new", {}, timestamp=time.time())
+
+    assert catalog.apply_retention(max_age_seconds=60) == 1
+    assert [row["key"] for row in catalog.list()] == ["new"]
+
+
+def test_import_json_files_skips_corrupt(tmp_path, catalog):
+    good = tmp_path / "good.json"
+    good.write_text(json.dumps({"stage": "design", "timestamp": 10}))
+    bad = tmp_path / "bad.json"
+    bad.write_text("not json")
+
+    imported = catalog.import_json_files(
+        [good, bad],
+        key_for=lambda p: p.stem,
+        metadata_for=lambda doc, p: {"stage": doc["stage"], "timestamp": doc["timestamp"]},
+    )
+
+    assert imported == 1
+    assert catalog.get("good")["stage"] == "design"
+    assert catalog.get("bad") is None
+
+
+def test_state_manager_migrates_legacy_json(tmp_path):
+    legacy = {
+        "stage": "basic_devplan",
+        "timestamp": "2024-01-01T00:00:00",
+        "data": {"project_name": "legacy"},
+        "metadata": {},
+    }
+    (tmp_path / "checkpoint_legacy_pipeline.json").write_text(json.dumps(legacy))
+
+    manager = StateManager(str(tmp_path))
+
+    assert manager.load_checkpoint("legacy_pipeline") == legacy
+    assert not (tmp_path / "checkpoint_legacy_pipeline.json").exists()
+    assert (tmp_path / "checkpoint_legacy_pipeline.json.migrated").exists()
+
+
+def test_state_manager_cleanup_uses_catalog(tmp_path):
+    manager = StateManager(str(tmp_path))
+    for i in range(3):
+        manager.save_checkpoint(f"proj_{i}", "project_design", {"i": i})
+        time.sleep(0.01)
+
+    manager.cleanup_old_checkpoints(keep_latest=1)
+
+    checkpoints = manager.list_checkpoints()
+    assert [cp["key"] for cp in checkpoints] == ["proj_2"]
+    assert manager.get_latest_checkpoint()["data"] == {"i": 2}
+
+
+def test_state_manager_closes_its_catalog(tmp_path):
+    with StateManager(str(tmp_path)) as manager:
+        manager.save_checkpoint("proj", "project_design", {"i": 1})
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        manager.catalog.count()
+    with StateManager(str(tmp_path)) as reopened:
+        assert reopened.load_checkpoint("proj")["data"] == {"i": 1}
@@ -0,0 +1,100 @@
+"""Tests for the BM25 code index."""
+
+import os
+from pathlib import Path
+
+from src.interview.code_index import CodeIndex, get_code_index, split_blocks, tokenize
+from src.interview.code_sample_extractor import CodeSampleExtractor
+from src.interview.repo_cache import RepoAnalysisCache
+from src.interview.repo_scanner import RepoScanner
+from src.interview.repository_analyzer import RepositoryAnalyzer
+
+SUFFIXES = {".py", ".ts"}
+
+
+def _make_repo(root: Path) -> None:
+    (root / "src" / "auth").mkdir(parents=True)
+    (root / "src" / "auth" / "session.py").write_text(
+        "import time\n\n"
+        "def create_session(user_id):\n    return {'user': user_id, 'at': time.time()}\n\n"
+        "def refreshToken(token):\n    return token\n"
+    )
+    (root / "src" / "billing.py").write_text(
+        "class InvoiceRenderer:\n    def render_invoice(self, invoice):\n        return str(invoice)\n"
+    )
+    (root / "src" / "client.ts").write_text(
+        "export async function fetchInvoices(customerId: string) {\n  return [];\n}\n"
+    )
+    (root / "README.md").write_text("invoice invoice invoice\n")
+
+
+def test_tokenize_splits_identifiers():
+    terms = list(tokenize("parseRepoTree parse_repo_tree HTTPServer self.models"))
+    assert {"parse", "repo", "tree", "parserepotree", "http", "server", "model"} <= set(terms)
+    assert "self" not in terms
+
+
+def test_split_blocks_by_top_level_definitions():
+    blocks = split_blocks("import os\n\ndef a():\n    pass\n\nclass B:\n    def c(self):\n        pass\n")
+    assert [(symbol, start) for symbol, start, _, _ in blocks] == [(None, 1), ("a", 3), ("B", 6)]
+
+
+def test_search_ranks_files_and_symbols(tmp_path):
+    _make_repo(tmp_path)
+    index = CodeIndex(tmp_path, SUFFIXES)
+    index.update(RepoScanner(tmp_path, use_git=False).scan())
+
+    hits = index.search("render customer invoices")
+    assert {hit.path for hit in hits[:2]} == {"src/billing.py", "src/client.ts"}
+    assert "README.md" not in [hit.path for hit in hits]
+
+    hits = index.search("refresh token", per_file=False)
+    assert hits[0].path == "src/auth/session.py"
+    assert hits[0].symbol == "refreshToken"
+    assert hits[0].start_line == 6
+
+    # Path components are searchable
+    assert index.search("auth")[0].path == "src/auth/session.py"
+    assert index.search("auth", directories=["lib"]) == []
+
+
+def test_incremental_update_and_persistence(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _make_repo(repo)
+    scanner = RepoScanner(repo, use_git=False)
+    index = CodeIndex(repo, SUFFIXES)
+    assert index.update(scanner.scan()) == 3
+
+    billing = repo / "src" / "billing.py"
+    billing.write_text("def charge_card(card):\n    return card\n")
+    st = billing.stat()
+    os.utime(billing, ns=(st.st_atime_ns, st.st_mtime_ns + 2_000_000_000))
+    (repo / "src" / "client.ts").unlink()
+    assert index.update(scanner.scan()) == 2
+    assert index.search("invoice") == []
+    assert index.search("charge card")[0].path == "src/billing.py"
+
+    cache_path = tmp_path / "index.json"
+    assert index.save(cache_path)
+    loaded = CodeIndex.load(cache_path, repo, SUFFIXES)
+    assert loaded is not None and len(loaded) == 2
+    assert loaded.update(scanner.scan()) == 0
+    assert CodeIndex.load(cache_path, repo, {".go"}) is None
+
+
+def test_extractor_uses_index_for_goals(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _make_repo(repo)
+    analysis = RepositoryAnalyzer(repo, scanner=RepoScanner(repo, use_git=False)).analyze()
+    cache = RepoAnalysisCache(tmp_path / "cache")
+    extractor = CodeSampleExtractor(str(repo), cache=cache)
+
+    samples = extractor._extract_goal_relevant_samples(analysis, "Let users refresh their session token")
+
+    assert samples[0].file_path == "src/auth/session.py"
+    assert samples[0].category == "relevant"
+    assert cache.index_path_for(repo).exists()
+    # A fresh process-level lookup reuses the same up-to-date index
+    assert len(get_code_index(analysis.manifest, extractor.code_extensions)) == 3
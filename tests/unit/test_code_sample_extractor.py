@@ -243,24 +243,6 @@ def test_read_file_sample_truncation(temp_repo):
     assert sample.line_count == 100
 
 
-def test_extract_keywords_from_goals():
-    """Test keyword extraction from goals."""
-    extractor = CodeSampleExtractor(".")
-    
-    goals = "I want to add authentication and user management features"
-    keywords = extractor._extract_keywords_from_goals(goals)
-    
-    assert "authentication" in keywords
-    assert "user" in keywords
-    assert "management" in keywords
-    assert "features" in keywords
-    
-    # Common words should be filtered
-    assert "want" not in keywords
-    assert "add" not in keywords
-    assert "the" not in keywords
-
-
 def test_deduplicate_samples():
     """Test sample deduplication."""
     extractor = CodeSampleExtractor(".")
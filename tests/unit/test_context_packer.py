@@ -0,0 +1,145 @@
+"""Tests for token-budgeted context packing."""
+
+from unittest.mock import MagicMock, patch
+
+from src.concurrency import ConcurrencyManager
+from src.config import AppConfig, ContextBudgetConfig
+from src.interview.code_sample_extractor import CodeSample, CodeSampleExtractor
+from src.interview.context_packer import (
+    ContextCandidate,
+    estimate_tokens,
+    fit_formatted_samples,
+    pack,
+)
+from src.interview.repo_scanner import RepoScanner
+from src.interview.repository_analyzer import RepositoryAnalyzer
+from src.pipeline.compose import PipelineOrchestrator
+from src.state_manager import StateManager
+
+
+def test_pack_picks_best_variant_per_item_within_budget():
+    candidates = [
+        ContextCandidate("a", "x" * 400, 1.0),  # 100 tokens
+        ContextCandidate("a", "x" * 80, 0.6),  # 20 tokens
+        ContextCandidate("b", "y" * 320, 0.9),  # 80 tokens
+        ContextCandidate("b", "y" * 40, 0.2),  # 10 tokens
+        ContextCandidate("c", "z" * 2000, 5.0),  # 500 tokens, never fits
+    ]
+
+    chosen = pack(candidates, budget=110)
+
+    # Full "a" + summary "b" (1.2) loses to outline "a" + full "b" (1.5)
+    assert [(c.key, c.tokens) for c in chosen] == [("a", 20), ("b", 80)]
+    assert sum(c.tokens for c in chosen) <= 110
+    assert pack(candidates, budget=0) == []
+
+
+def test_pack_respects_large_budgets_with_bucketing():
+    candidates = [ContextCandidate(str(i), "w" * 4 * (300 + i), 1.0) for i in range(40)]
+    chosen = pack(candidates, budget=5000)
+    assert sum(c.tokens for c in chosen) <= 5000
+    assert len(chosen) == 16
+
+
+def _sample(path, lines, category="pattern"):
+    content = "\n".join(f"def func_{i}(arg):\n    return arg * {i}\n" for i in range(lines // 3))
+    return CodeSample(path, content, "r", category, "py", len(content.splitlines()))
+
+
+def test_pack_samples_condenses_instead_of_dropping(tmp_path):
+    extractor = CodeSampleExtractor(str(tmp_path), outline_threshold=None)
+    samples = [_sample(f"src/mod{i}.py", 150, "relevant" if i == 0 else "pattern") for i in range(4)]
+    for sample in samples:
+        (tmp_path / sample.file_path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / sample.file_path).write_text(sample.content)
+    everything = estimate_tokens(extractor.format_samples_for_prompt(samples))
+    assert all(s.representation == "source" for s in extractor.pack_samples(samples, everything + 50))
+
+    budget = everything // 3
+    packed = extractor.pack_samples(samples, token_budget=budget)
+    formatted = extractor.format_samples_for_prompt(packed)
+
+    assert estimate_tokens(formatted) <= budget + 10
+    assert [s.file_path for s in packed] == [s.file_path for s in samples]
+    assert any(s.representation in ("outline", "summary") for s in packed)
+    assert "func_0" in formatted
+
+
+def test_pack_samples_outlines_each_file_once(tmp_path):
+    extractor = CodeSampleExtractor(str(tmp_path), outline_threshold=50)
+    samples = [_sample(f"mod{i}.py", 150) for i in range(3)]
+    for sample in samples:
+        (tmp_path / sample.file_path).write_text(sample.content)
+
+    with patch.object(extractor, "_outline", wraps=extractor._outline) as outlined:
+        packed = extractor.pack_samples(samples, token_budget=10_000)
+
+    assert outlined.call_count == len(samples)
+    assert all(s.representation == "outline" for s in packed)
+
+
+def test_extract_samples_with_budget(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "requirements.txt").write_text("pytest\n")
+    for name in ("main.py", "models.py", "config.py", "utils.py"):
+        (tmp_path / "src" / name).write_text(_sample(name, 120).content)
+    (tmp_path / "tests" / "test_models.py").write_text("def test_x():\n    pass\n")
+    analysis = RepositoryAnalyzer(tmp_path, scanner=RepoScanner(tmp_path, use_git=False)).analyze()
+    extractor = CodeSampleExtractor(str(tmp_path), max_samples=2)
+
+    unbounded = extractor.extract_samples(analysis, goals="update models config")
+    packed = extractor.extract_samples(analysis, goals="update models config", token_budget=600)
+
+    assert len(unbounded) == 2
+    assert len(packed) > 2
+    assert estimate_tokens(extractor.format_samples_for_prompt(packed)) <= 620
+
+
+def test_fit_formatted_samples_keeps_headers_when_short_on_budget():
+    extractor = CodeSampleExtractor(".", outline_threshold=None)
+    samples = [_sample(f"m{i}.py", 60) for i in range(3)]
+    text = extractor.format_samples_for_prompt(samples)
+
+    assert fit_formatted_samples(text, None) == text
+    assert fit_formatted_samples(text, estimate_tokens(text)) == text
+    fitted = fit_formatted_samples(text, estimate_tokens(text) // 2)
+    assert estimate_tokens(fitted) <= estimate_tokens(text) // 2
+    assert "### Sample 1: m0.py" in fitted
+    assert "### Sample 3: m2.py" in fitted  # Reduced to its header
+
+
+def test_fit_formatted_samples_truncates_text_without_sections():
+    text = "\n".join(f"line {i}: " + "x" * 60 for i in range(100))
+
+    fitted = fit_formatted_samples(text, 200)
+
+    assert fitted is not None and fitted.startswith("line 0: ")
+    assert estimate_tokens(fitted) <= 200
+    assert fitted.endswith("... (truncated)")
+
+
+def test_context_budget_config_defaults():
+    budgets = AppConfig().context_budget
+    assert isinstance(budgets, ContextBudgetConfig)
+    assert budgets.detailed > 0 and budgets.interview > 0
+
+
+def test_orchestrator_fits_code_samples_per_stage(tmp_path):
+    extractor = CodeSampleExtractor(".", outline_threshold=None)
+    text = extractor.format_samples_for_prompt([_sample(f"m{i}.py", 300) for i in range(4)])
+    config = AppConfig(context_budget=ContextBudgetConfig(devplan=0, handoff=500))
+    orchestrator = PipelineOrchestrator(
+        llm_client=MagicMock(),
+        concurrency_manager=ConcurrencyManager(max_concurrent=1),
+        config=config,
+        state_manager=StateManager(str(tmp_path / "state")),
+        code_samples=text,
+    )
+    try:
+        assert orchestrator._code_samples_for("devplan") == text
+        handoff = orchestrator._code_samples_for("handoff")
+        assert estimate_tokens(handoff) <= 500
+        assert orchestrator._code_samples_for("handoff") is handoff
+    finally:
+        orchestrator.close()
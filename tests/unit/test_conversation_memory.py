@@ -0,0 +1,156 @@
+"""Tests for rolling conversation summarization."""
+
+import asyncio
+import json
+
+import pytest
+
+from src.config import AppConfig, ConversationMemoryConfig
+from src.interview.conversation_memory import ConversationMemory
+from src.llm_client import LLMClient
+from src.llm_interview import LLMInterviewManager
+
+
+def _chat(turns, filler=200):
+    messages = []
+    for i in range(turns):
+        messages.append({"role": "user", "content": f"answer {i} " + "x" * filler})
+        messages.append({"role": "assistant", "content": f"Noted {i}. What about topic {i + 1}?"})
+    return messages
+
+
+def test_short_history_is_kept_verbatim():
+    memory = ConversationMemory(keep_turns=2, max_chars=10_000)
+    messages = _chat(3)
+
+    summary, recent = memory.view(messages)
+
+    assert summary is None
+    assert recent == messages
+
+
+def test_long_history_keeps_last_turns_and_folds_incrementally():
+    memory = ConversationMemory(keep_turns=2, max_chars=1000)
+    messages = _chat(8)
+    messages[6]["content"] = "not sure yet"  # Defers "What about topic 3?"
+
+    summary, recent = memory.view(messages)
+
+    assert [m["content"].split(" ")[0:2] for m in recent if m["role"] == "user"] == [
+        ["answer", "6"], ["answer", "7"]
+    ]
+    assert summary.messages == 12
+    assert summary.notes[1].startswith("What about topic 1? → answer 1")
+    assert summary.open_questions == ["What about topic 3?"]
+    rendered = memory.render(summary, {"project_name": "Todo"})
+    assert "- project_name: Todo" in rendered and "Open questions:" in rendered
+
+    # Only the newly aged-out turns are folded next time
+    messages += _chat(11)[16:]
+    summary, recent = memory.view(messages)
+    assert summary.messages == 18
+    assert len([m for m in recent if m["role"] == "user"]) == 2
+
+    # Rewriting folded history starts over
+    messages[0] = {"role": "user", "content": "edited"}
+    summary, _ = memory.view(messages)
+    assert summary.notes[0] == "edited"
+
+
+@pytest.mark.asyncio
+async def test_background_llm_summary_is_applied_between_turns():
+    prompts = []
+
+    async def summarizer(prompt):
+        prompts.append(prompt)
+        return "Here you go: " + json.dumps(
+            {"fields": {"database": "postgres"}, "open_questions": ["Hosting?"], "notes": ["Chose REST"]}
+        )
+
+    memory = ConversationMemory(keep_turns=2, max_chars=1000, summarizer=summarizer)
+    messages = _chat(8)
+    memory.schedule(messages)
+    await asyncio.sleep(0)
+
+    summary, recent = await memory.prepare(messages)
+
+    assert len(prompts) == 1 and "answer 0" in prompts[0]
+    assert summary.fields == {"database": "postgres"}
+    assert summary.notes == ["Chose REST"]
+    assert summary.messages == 12
+    assert len(recent) == 4
+
+
+@pytest.mark.asyncio
+async def test_unusable_llm_summary_falls_back_to_heuristic():
+    async def summarizer(prompt):
+        return "sorry, no JSON"
+
+    memory = ConversationMemory(keep_turns=1, max_chars=500, summarizer=summarizer)
+    messages = _chat(4)
+    memory.schedule(messages)
+
+    summary, _ = await memory.prepare(messages)
+
+    assert summary.messages == 6
+    assert summary.notes[0].startswith("answer 0")
+
+
+class RecordingClient(LLMClient):
+    def __init__(self):
+        super().__init__(AppConfig())
+        self.prompts = []
+
+    async def generate_completion(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        return "Got it. What else?"
+
+
+def test_interview_prompt_stays_bounded(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config = AppConfig(conversation_memory=ConversationMemoryConfig(keep_turns=2, max_history_chars=800))
+    client = RecordingClient()
+    manager = LLMInterviewManager(config, llm_client=client, mode="design_review")
+    try:
+        manager._send_to_llm("DESIGN CONTEXT " + "d" * 2000)
+        for i in range(12):
+            manager._send_to_llm(f"turn {i} " + "y" * 300)
+    finally:
+        manager.close()
+
+    last = client.prompts[-1]
+    assert "Summary of the" in last
+    assert "DESIGN CONTEXT" in last  # Pinned
+    assert "User: turn 0 " not in last and "User: turn 11 " in last
+    assert "→ turn 0 " in last  # Folded into the summary
+    assert len(last) < len(manager._format_conversation_for_llm()) + 1000
+    assert len(client.prompts[-1]) - len(client.prompts[-3]) < 1500
+
+
+class LongReplyClient(RecordingClient):
+    async def generate_completion(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        return "Noted. " + "z" * 400
+
+
+@pytest.mark.asyncio
+async def test_stateless_manager_does_not_summarize_in_the_background(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config = AppConfig(
+        conversation_memory=ConversationMemoryConfig(
+            keep_turns=1, max_history_chars=300, summarize_with_llm=True
+        )
+    )
+    client = LongReplyClient()
+    manager = LLMInterviewManager(config, llm_client=client, stateless=True)
+    manager.conversation_history.extend(
+        {"role": role, "content": f"{role} turn {i}"} for i in range(4) for role in ("user", "assistant")
+    )
+
+    # The long reply pushes earlier turns out of the window
+    await manager.send("next")
+    await asyncio.sleep(0)
+
+    assert manager.memory._task is None
+    assert len(client.prompts) == 1  # Only the reply; no summary call
+    await manager.aclose()
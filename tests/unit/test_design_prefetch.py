@@ -0,0 +1,149 @@
+"""Tests for speculative design generation during the interview."""
+
+import asyncio
+import json
+import threading
+
+import pytest
+
+from src.config import AppConfig, DesignPrefetchConfig
+from src.llm_client import LLMClient
+from src.llm_interview import LLMInterviewManager
+from src.models import ProjectDesign
+from src.pipeline.design_prefetch import DesignPrefetcher
+
+INPUTS = {
+    "name": "Ledger",
+    "languages": "Python, SQL",
+    "requirements": "Track expenses",
+    "project_type": "CLI",
+}
+
+
+class FakeGenerator:
+    def __init__(self, block=False):
+        self.calls = []
+        self.cancelled = []
+        self.release = threading.Event()
+        if not block:
+            self.release.set()
+
+    async def generate(self, **kwargs):
+        self.calls.append(kwargs)
+        try:
+            while not self.release.is_set():
+                await asyncio.sleep(0.01)
+        except asyncio.CancelledError:
+            self.cancelled.append(kwargs["project_name"])
+            raise
+        return ProjectDesign(project_name=kwargs["project_name"])
+
+
+def test_prefetch_reuses_matching_job_and_computes_complexity():
+    generator = FakeGenerator()
+    prefetcher = DesignPrefetcher(generator.generate, delay=0)
+    try:
+        assert prefetcher.update(INPUTS)
+        assert not prefetcher.update(dict(INPUTS))  # Same inputs: keep running job
+
+        design = prefetcher.result(INPUTS, timeout=5)
+
+        assert design.project_name == "Ledger"
+        assert generator.calls == [{
+            "project_name": "Ledger",
+            "languages": ["Python", "SQL"],
+            "requirements": "Track expenses",
+            "frameworks": None,
+            "apis": None,
+        }]
+        assert prefetcher.complexity(INPUTS).score > 0
+        # Inputs that don't match are never served a stale design
+        assert prefetcher.result({**INPUTS, "requirements": "Other"}) is None
+    finally:
+        prefetcher.close()
+
+
+def test_changed_inputs_cancel_running_job():
+    generator = FakeGenerator(block=True)
+    prefetcher = DesignPrefetcher(generator.generate, delay=0)
+    try:
+        prefetcher.update(INPUTS)
+        changed = {**INPUTS, "name": "Budget"}
+        prefetcher.update(changed)
+        generator.release.set()
+
+        assert prefetcher.result(INPUTS) is None
+        assert prefetcher.result(changed, timeout=5).project_name == "Budget"
+        assert asyncio.run(prefetcher.wait(changed)).project_name == "Budget"
+    finally:
+        prefetcher.close()
+    assert generator.cancelled in ([], ["Ledger"])  # Cancelled unless it had not started
+
+
+def test_close_cancels_the_job_and_closes_the_loop():
+    generator = FakeGenerator(block=True)
+    with DesignPrefetcher(generator.generate, delay=0) as prefetcher:
+        prefetcher.update(INPUTS)
+        loop = prefetcher._loop
+        while not generator.calls:
+            threading.Event().wait(0.01)
+
+    assert loop.is_closed()
+    assert generator.cancelled == ["Ledger"]
+    prefetcher.close()  # Idempotent
+
+
+def test_model_change_invalidates_prefetched_design():
+    config = AppConfig(design_prefetch=DesignPrefetchConfig(delay=0))
+    generator = FakeGenerator()
+    prefetcher = DesignPrefetcher(generator.generate, delay=0, config=config)
+    try:
+        prefetcher.update(INPUTS)
+        assert prefetcher.result(INPUTS, timeout=5) is not None
+        config.llm.model = "another-model"
+        assert prefetcher.result(INPUTS) is None
+    finally:
+        prefetcher.close()
+    assert DesignPrefetcher.from_config(AppConfig(design_prefetch=DesignPrefetchConfig(enabled=False))) is None
+
+
+class SummaryClient(LLMClient):
+    def __init__(self, reply):
+        super().__init__(AppConfig())
+        self.reply = reply
+
+    async def generate_completion(self, prompt, **kwargs):
+        return self.reply
+
+    async def generate_completion_streaming(self, prompt, callback, **kwargs):
+        callback(self.reply)
+        return self.reply
+
+
+@pytest.mark.asyncio
+async def test_interview_starts_prefetch_once_summary_is_valid(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # Interview logs are written to ./logs
+    summary = {
+        "project_name": "Ledger",
+        "primary_language": "Python",
+        "requirements": "Track expenses",
+        "project_type": "CLI",
+    }
+    generator = FakeGenerator()
+    prefetcher = DesignPrefetcher(generator.generate, delay=0)
+    client = SummaryClient(json.dumps({"project_name": "Ledger"}))
+    manager = LLMInterviewManager(AppConfig(), llm_client=client, design_prefetcher=prefetcher)
+    try:
+        await manager.send("Ledger")
+        assert generator.calls == []  # Incomplete summary: nothing started
+
+        client.reply = json.dumps(summary)
+        await manager.send("Python CLI to track expenses", callback=lambda token: None)
+        manager.extracted_data = manager.last_structured_data
+
+        design = await prefetcher.wait(manager.to_generate_design_inputs(), timeout=5)
+        assert design.project_name == "Ledger"
+        assert len(generator.calls) == 1
+    finally:
+        prefetcher.close()
+        await manager.aclose()
@@ -0,0 +1,148 @@
+"""Tests for the pipeline event bus."""
+
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+from src.events import (
+    BusStreamingHandler,
+    CheckpointSaved,
+    ConsoleEventRenderer,
+    EventBus,
+    EventMetrics,
+    EventStream,
+    FileCreated,
+    JsonlEventLog,
+    PhaseReady,
+    StageEnded,
+    StageStarted,
+    TokenChunk,
+    sse_frame,
+)
+
+
+def test_publish_without_loop_delivers_inline():
+    bus = EventBus()
+    seen = []
+    bus.subscribe(seen.append)
+
+    bus.publish(StageStarted(stage="Project Design", number=1))
+
+    assert [e.type for e in seen] == ["stage_started"]
+
+
+def test_slow_subscriber_coalesces_tokens_without_blocking_others():
+    bus = EventBus()
+    fast, slow = [], []
+    release = asyncio.Event()
+
+    async def slow_handler(event):
+        await release.wait()
+        slow.append(event)
+
+    async def run():
+        bus.subscribe(fast.append, name="fast")
+        bus.subscribe(slow_handler, maxsize=4, name="slow")
+        bus.publish(StageStarted(stage="design"))
+        for i in range(100):
+            bus.publish(TokenChunk(stage="design", text=str(i % 10)))
+        bus.publish(StageEnded(stage="design"))
+        await asyncio.sleep(0)
+        assert [e.type for e in fast][-1] == "stage_ended"
+        release.set()
+        await bus.drain()
+
+    asyncio.run(run())
+
+    assert [e.type for e in slow] == ["stage_started", "token", "stage_ended"]
+    assert slow[1].text == "".join(str(i % 10) for i in range(100))
+
+
+def test_full_buffer_drops_tokens_before_lifecycle_events():
+    bus = EventBus()
+    sub = bus.subscribe(lambda e: None, maxsize=2)
+
+    sub._push(TokenChunk(stage="a", text="x"))
+    sub._push(StageStarted(stage="b"))
+    sub._push(StageEnded(stage="b"))
+
+    assert [e.type for e in sub._buffer] == ["stage_started", "stage_ended"]
+    assert sub.dropped == 1
+
+
+def test_failing_subscriber_does_not_affect_others():
+    bus = EventBus()
+    seen = []
+
+    def broken(event):
+        raise RuntimeError("boom")
+
+    async def run():
+        bus.subscribe(broken)
+        bus.subscribe(seen.append)
+        bus.publish(CheckpointSaved(key="proj_pipeline", stage="project_design"))
+        await bus.drain()
+
+    asyncio.run(run())
+    assert len(seen) == 1
+
+
+def test_event_stream_and_streaming_handler():
+    bus = EventBus()
+
+    async def run():
+        stream = EventStream(bus)
+        handler = BusStreamingHandler(bus, stage="design")
+
+        async def consume():
+            return [event async for event in stream]
+
+        consumer = asyncio.create_task(consume())
+        async with handler:
+            for token in ["Hel", "lo"]:
+                await handler.on_token_async(token)
+                await asyncio.sleep(0)
+        bus.publish(StageEnded(stage="design", result={"project_name": "x"}))
+        await bus.drain()
+        stream.close()
+        return await consumer
+
+    events = asyncio.run(run())
+
+    assert "".join(e.text for e in events if e.type == "token") == "Hello"
+    assert events[-1].result == {"project_name": "x"}
+    frame = sse_frame(events[-1])
+    assert frame.startswith("data: ") and frame.endswith("\n\n")
+    assert json.loads(frame[6:])["type"] == "stage_ended"
+
+
+def test_console_renderer_maps_events_to_reporter():
+    reporter = MagicMock()
+    bus = EventBus()
+    bus.subscribe(ConsoleEventRenderer(reporter))
+
+    bus.publish(StageStarted(stage="Basic DevPlan", number=2))
+    bus.publish(PhaseReady(phase_number=3, steps=4, char_count=100))
+    bus.publish(FileCreated(path="docs/devplan.md", file_type="DevPlan Dashboard", token_count=10))
+
+    reporter.start_stage.assert_called_once_with("Basic DevPlan", 2)
+    reporter.report_phase_ready.assert_called_once_with(phase_number=3, steps=4, char_count=100)
+    reporter.report_file_created.assert_called_once_with("docs/devplan.md", "DevPlan Dashboard", 10)
+
+
+def test_log_and_metrics_subscribers(tmp_path):
+    bus = EventBus()
+    log = JsonlEventLog(tmp_path / "events.jsonl")
+    metrics = EventMetrics()
+    bus.subscribe(log)
+    bus.subscribe(metrics)
+
+    bus.publish(StageStarted(stage="design", number=1))
+    bus.publish(TokenChunk(stage="design", text="abc"))
+    bus.publish(StageEnded(stage="design"))
+
+    lines = (tmp_path / "events.jsonl").read_text().splitlines()
+    assert [json.loads(line)["type"] for line in lines] == ["stage_started", "token", "stage_ended"]
+    assert metrics.token_chars == 3
+    assert metrics.counts["stage_ended"] == 1
+    assert "design" in metrics.stage_durations
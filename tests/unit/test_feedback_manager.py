@@ -226,6 +226,20 @@ class TestApplyCorrectionsToPrompt:
         assert "Clarify" in result
         assert "Add tests" in result
 
+    def test_section_reflects_corrections_edited_in_place(self):
+        """Test that the cached section is rebuilt when a correction changes."""
+        manager = FeedbackManager()
+        manager.corrections = [{"type": "general", "description": "Add tests"}]
+        first = manager.corrections_section()
+        assert manager.corrections_section() is first
+
+        manager.corrections[0]["description"] = "Add integration tests"
+        assert "Add integration tests" in manager.corrections_section()
+
+        manager.corrections = [{"type": "general", "description": "Add integration tests"}]
+        assert manager.corrections_section() == manager.corrections_section()
+        assert "Add integration tests" in manager.corrections_section()
+
 
 class TestPreserveManualEdits:
     """Tests for preserving manual edits in devplans."""
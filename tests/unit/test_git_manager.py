@@ -292,3 +292,82 @@ def test_tag_release_not_a_repo():
             shutil.rmtree(tmpdir, ignore_errors=True)
         except Exception:
             pass
+
+
+def test_commit_paths_builds_tree_without_staging(git_manager, temp_repo):
+    """Test committing through object plumbing leaves a clean status."""
+    (temp_repo / "a.md").write_text("one")
+    (temp_repo / "docs").mkdir()
+    (temp_repo / "docs" / "b.md").write_text("two")
+    (temp_repo / "untracked.txt").write_text("leave me")
+
+    sha = git_manager.commit_paths("feat: add docs", ["a.md", str(temp_repo / "docs" / "b.md")])
+
+    repo = git_manager.repo
+    assert repo.head.commit.hexsha == sha
+    assert sorted(b.path for b in repo.head.commit.tree.traverse()) == [
+        "a.md",
+        "docs",
+        "docs/b.md",
+    ]
+    assert not repo.index.diff("HEAD")
+    assert repo.untracked_files == ["untracked.txt"]
+
+
+def test_commit_paths_skips_unchanged_tree(git_manager, temp_repo):
+    """Test that committing identical content creates no new commit."""
+    (temp_repo / "a.md").write_text("one")
+    first = git_manager.commit_paths("first", ["a.md"])
+
+    assert git_manager.commit_paths("again", ["a.md"]) is None
+    assert git_manager.repo.head.commit.hexsha == first
+
+
+def test_commit_queue_coalesces_requests(git_manager, temp_repo):
+    """Test that requests within the window become a single commit."""
+    from src.git_commit_queue import GitCommitQueue
+
+    (temp_repo / "design.md").write_text("design")
+    (temp_repo / "devplan.md").write_text("plan")
+    commit_queue = GitCommitQueue(git_manager, window=5.0)
+    try:
+        commit_queue.enqueue("feat: generate project design", ["design.md"])
+        commit_queue.enqueue("feat: generate devplan", ["devplan.md"])
+        assert commit_queue.flush(timeout=10)
+    finally:
+        commit_queue.close(timeout=10)
+
+    commits = list(git_manager.repo.iter_commits())
+    assert len(commits) == 1
+    assert commits[0].message.startswith("feat: generate project design")
+    assert "feat: generate devplan" in commits[0].message
+    assert commit_queue.errors == []
+
+
+def test_orchestrator_close_drains_commit_queue(temp_repo):
+    """Test that closing the orchestrator commits queued requests and stops the queue."""
+    from unittest.mock import MagicMock
+
+    from src.concurrency import ConcurrencyManager
+    from src.config import GitConfig
+    from src.pipeline.compose import PipelineOrchestrator
+    from src.state_manager import StateManager
+
+    orchestrator = PipelineOrchestrator(
+        llm_client=MagicMock(),
+        concurrency_manager=ConcurrencyManager(max_concurrent=1),
+        git_config=GitConfig(enabled=True, background_commits=True, commit_batch_window=30.0),
+        state_manager=StateManager(str(temp_repo / ".state")),
+        repo_path=temp_repo,
+    )
+    commit_queue = orchestrator.git_commit_queue
+    assert commit_queue is not None
+
+    (temp_repo / "design.md").write_text("design")
+    commit_queue.enqueue("feat: generate project design", ["design.md"])
+    orchestrator.close()
+
+    assert orchestrator.git_commit_queue is None
+    assert not commit_queue._thread.is_alive()
+    commits = list(orchestrator.git_manager.repo.iter_commits())
+    assert [c.message for c in commits] == ["feat: generate project design"]
@@ -0,0 +1,167 @@
+"""Tests for the async interview engine and pooled client sessions."""
+
+import asyncio
+import gc
+import warnings
+
+import pytest
+
+from src.config import AppConfig
+from src.llm_client import LLMClient
+from src.llm_interview import LLMInterviewManager
+
+
+class FakeClient(LLMClient):
+    """Client that records the loop and pooled session used for each call."""
+
+    def __init__(self, fail=False):
+        super().__init__(AppConfig())
+        self.fail = fail
+        self.loops = []
+        self.opened = 0
+        self.closed = 0
+        self.prompts = []
+
+    async def open_session(self):
+        if self._shared_session() is None:
+            self.opened += 1
+        await super().open_session()
+
+    async def aclose(self):
+        self.closed += 1
+        await super().aclose()
+
+    async def generate_completion(self, prompt, **kwargs):
+        if self.fail:
+            raise ConnectionError("boom")
+        self.loops.append(asyncio.get_running_loop())
+        self.prompts.append(prompt)
+        return f"reply {len(self.prompts)}"
+
+    async def generate_completion_streaming(self, prompt, callback, **kwargs):
+        reply = await self.generate_completion(prompt)
+        for token in reply.split(" "):
+            callback(token)
+        return reply
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # Interview logs are written to ./logs
+    client = FakeClient()
+    return LLMInterviewManager(AppConfig(), llm_client=client)
+
+
+@pytest.mark.asyncio
+async def test_send_is_async_and_keeps_one_session(manager):
+    tokens = []
+
+    first = await manager.send("Build a todo app", callback=tokens.append)
+    second = await manager.send("In Python")
+
+    assert (first, second) == ("reply 1", "reply 2")
+    assert tokens == ["reply", "1"]
+    assert [m["role"] for m in manager.conversation_history[-4:]] == [
+        "user", "assistant", "user", "assistant"
+    ]
+    assert "User: In Python" in manager.llm_client.prompts[-1]
+    assert manager.llm_client.opened == 1
+
+    await manager.aclose()
+    assert manager.llm_client.closed == 1
+    assert manager.llm_client._shared_session() is None
+
+
+def test_sync_turns_share_a_persistent_loop(manager):
+    manager._send_to_llm("hello")
+    manager._send_to_llm("again")
+    assert manager._generate_direct("direct prompt") == "reply 3"
+
+    client = manager.llm_client
+    assert len(set(client.loops)) == 1
+    assert client.opened == 1
+
+    loop = manager._loop
+    manager.close()
+    assert loop.is_closed() and client.closed == 1
+    manager.close()  # Idempotent
+
+
+def test_interrupted_run_stops_the_session_loop(manager, monkeypatch):
+    def interrupt(*args, **kwargs):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr("src.llm_interview.Prompt.ask", interrupt)
+    monkeypatch.setattr("src.llm_interview.pt_prompt", interrupt)
+
+    with pytest.raises(KeyboardInterrupt):
+        manager.run()
+    assert manager._loop is None and manager.llm_client.closed == 1
+
+    # Finalizing after the interview ended does not leave a loop running
+    assert manager._generate_direct("summarize") == "reply 2"
+    assert manager._loop is None and manager._loop_thread is None
+
+
+def test_manager_is_a_context_manager(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with LLMInterviewManager(AppConfig(), llm_client=FakeClient()) as manager:
+        manager._send_to_llm("hello")
+        thread = manager._loop_thread
+    assert not thread.is_alive() and manager.llm_client.closed == 1
+
+
+@pytest.mark.asyncio
+async def test_send_reports_errors_without_raising(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = LLMInterviewManager(AppConfig(), llm_client=FakeClient(fail=True))
+
+    reply = await manager.send("hi")
+
+    assert "trouble connecting" in reply
+    assert isinstance(manager.last_error, ConnectionError)
+    assert manager.conversation_history[-1]["content"] == reply
+    await manager.aclose()
+
+
+@pytest.mark.asyncio
+async def test_pooled_session_is_shared_until_closed():
+    client = FakeClient()
+
+    async with client._pooled_session() as one_off:
+        pass
+    assert one_off.closed
+
+    await client.open_session()
+    async with client._pooled_session() as first:
+        pass
+    async with client._pooled_session() as second:
+        pass
+    assert first is second and not first.closed
+
+    await client.aclose()
+    assert first.closed
+
+
+def test_session_from_a_finished_loop_is_closed_when_replaced():
+    client = FakeClient()
+
+    async def open_session():
+        await client.open_session()
+        return client._http_session
+
+    stale = asyncio.run(open_session())
+
+    async def reopen():
+        fresh = await open_session()
+        await client.aclose()
+        return fresh
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        fresh = asyncio.run(reopen())
+        assert stale.closed and fresh is not stale
+        del stale
+        gc.collect()
+
+    assert not [w for w in caught if "Unclosed" in str(w.message)]
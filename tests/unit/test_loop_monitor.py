@@ -0,0 +1,76 @@
+"""Tests for the event-loop lag monitor."""
+
+import asyncio
+import time
+
+from src.loop_monitor import LoopMonitor, monitor_from_env
+
+
+def _blocking_helper(seconds):
+    time.sleep(seconds)
+
+
+def test_detects_blocking_call_and_aggregates_offenders():
+    monitor = LoopMonitor(threshold=0.05, interval=0.01)
+
+    async def run():
+        await asyncio.sleep(0.05)
+        for _ in range(2):
+            _blocking_helper(0.15)
+            await asyncio.sleep(0.05)
+
+    asyncio.run(monitor.watch(run()))
+
+    report = monitor.report()
+    assert report["samples"] > 0
+    top = report["offenders"][0]
+    assert "_blocking_helper" in top["location"]
+    assert top["count"] == 2
+    assert top["max_ms"] >= 100
+    assert "_blocking_helper" in monitor.format_report()
+
+
+def test_no_offenders_when_loop_is_responsive(tmp_path):
+    monitor = LoopMonitor(threshold=0.1, interval=0.01)
+
+    async def run():
+        for _ in range(10):
+            await asyncio.sleep(0.01)
+
+    asyncio.run(monitor.watch(run()))
+
+    assert monitor.offenders == {}
+    assert not monitor.running
+    path = monitor.write_report(tmp_path / "loop.json")
+    assert path.exists()
+
+
+def test_stop_on_the_loop_does_not_wait_for_a_pending_probe():
+    monitor = LoopMonitor(threshold=0.5, interval=0.01)
+
+    async def run():
+        monitor.start()
+        thread = monitor._thread
+        # Hold the loop so the watchdog is waiting on an unanswered probe
+        time.sleep(0.05)
+        started = time.perf_counter()
+        monitor.stop()
+        elapsed = time.perf_counter() - started
+        await asyncio.to_thread(thread.join, 1.0)
+        return elapsed, thread.is_alive()
+
+    elapsed, alive = asyncio.run(run())
+
+    assert elapsed < 0.1
+    assert not alive
+    assert not monitor.running
+
+def test_monitor_from_env(monkeypatch):
+    monkeypatch.delenv("DEVUSSY_LOOP_MONITOR", raising=False)
+    assert monitor_from_env() is None
+
+    monkeypatch.setenv("DEVUSSY_LOOP_MONITOR", "1")
+    monkeypatch.setenv("DEVUSSY_LOOP_MONITOR_THRESHOLD_MS", "250")
+    monitor = monitor_from_env()
+    assert monitor is not None
+    assert monitor.threshold == 0.25
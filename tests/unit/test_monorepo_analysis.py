@@ -0,0 +1,141 @@
+"""Tests for monorepo package discovery."""
+
+import json
+from pathlib import Path
+
+from src.interview.repo_scanner import RepoScanner
+from src.interview.repository_analyzer import (
+    CodePatterns,
+    DependencyInfo,
+    PackageAnalysis,
+    RepositoryAnalyzer,
+    _merge_dependencies,
+    analyze_packages,
+    discover_package_roots,
+)
+
+
+def _make_monorepo(root):
+    (root / "README.md").write_text("# Mono\n")
+    web = root / "apps" / "web"
+    web.mkdir(parents=True)
+    (web / "package.json").write_text(
+        json.dumps({"name": "web", "dependencies": {"react": "^18"}, "devDependencies": {"jest": "^29"}})
+    )
+    (web / "index.js").write_text("export const a = 1;\nexport const b = 2;\n")
+    (web / "node_modules" / "react").mkdir(parents=True)
+    (web / "node_modules" / "react" / "package.json").write_text("{}")
+    api = root / "services" / "api"
+    (api / "plugins" / "auth").mkdir(parents=True)
+    (api / "pyproject.toml").write_text(
+        '[project]\nname = "api"\nversion = "0.1.0"\ndependencies = ["fastapi>=0.100", "pytest"]\n'
+    )
+    (api / "main.py").write_text("import fastapi\n\napp = fastapi.FastAPI()\n")
+    (api / "plugins" / "auth" / "pyproject.toml").write_text(
+        '[project]\nname = "auth"\ndependencies = ["pyjwt"]\n'
+    )
+    (api / "plugins" / "auth" / "auth.py").write_text("X = 1\n")
+    worker = root / "services" / "worker"
+    worker.mkdir()
+    (worker / "go.mod").write_text("module example.com/worker\n\nrequire github.com/stretchr/testify v1.8.0\n")
+    (worker / "main.go").write_text("package main\n\nfunc main() {}\n")
+
+
+def test_discovers_nested_package_roots(tmp_path):
+    _make_monorepo(tmp_path)
+    (tmp_path / "package.json").write_text("{}")
+    manifest = RepoScanner(tmp_path, use_git=False).scan()
+
+    assert discover_package_roots(manifest) == [
+        "apps/web",
+        "services/api",
+        "services/api/plugins/auth",
+        "services/worker",
+    ]
+
+
+def test_analysis_is_hierarchical_with_per_package_metrics(tmp_path):
+    _make_monorepo(tmp_path)
+    analysis = RepositoryAnalyzer(
+        tmp_path, scanner=RepoScanner(tmp_path, use_git=False), max_workers=1
+    ).analyze()
+
+    assert [p.path for p in analysis.packages] == ["apps/web", "services/api", "services/worker"]
+    api = analysis.packages[1]
+    assert api.project_type == "python"
+    assert api.project_metadata.name == "api"
+    assert api.dependencies.python == ["fastapi", "pytest"]
+    assert [p.path for p in api.packages] == ["services/api/plugins/auth"]
+    # Nested package files are not counted twice
+    assert api.code_metrics.total_files == 2
+    assert api.packages[0].code_metrics.total_files == 2
+    assert analysis.packages[0].patterns.test_frameworks == ["jest"]
+
+    # The root has no manifest of its own: type and dependencies come from packages
+    assert analysis.project_type == "python"
+    assert {"react", "fastapi", "pyjwt"} <= set(analysis.dependencies.node + analysis.dependencies.python)
+    assert "github.com/stretchr/testify" in analysis.dependencies.go
+    assert "testify" in analysis.patterns.test_frameworks
+
+    context = analysis.to_prompt_context(outline_chars=0)
+    assert [p["path"] for p in context["packages"]] == [
+        "apps/web",
+        "services/api",
+        "services/api/plugins/auth",
+        "services/worker",
+    ]
+    assert context["packages"][0]["dependencies"] == ["react", "jest"]
+
+
+def test_process_pool_matches_serial_analysis(tmp_path):
+    _make_monorepo(tmp_path)
+    relatives = discover_package_roots(RepoScanner(tmp_path, use_git=False).scan())
+
+    pooled = analyze_packages(tmp_path, relatives, max_workers=2)
+    serial = analyze_packages(tmp_path, relatives, max_workers=1)
+
+    assert pooled == serial
+    assert [p.project_type for p in pooled] == ["node", "python", "python", "go"]
+
+
+def test_discovery_can_be_disabled(tmp_path):
+    _make_monorepo(tmp_path)
+    analysis = RepositoryAnalyzer(
+        tmp_path, scanner=RepoScanner(tmp_path, use_git=False), discover_packages=False
+    ).analyze()
+
+    assert analysis.packages == []
+    assert analysis.project_type == "unknown"
+    assert "packages" not in analysis.to_prompt_context(outline_chars=0)
+
+
+def test_merged_dependencies_keep_root_order_and_append_new_ones():
+    root = DependencyInfo(manifests=[Path("pyproject.toml")], python=["requests", "click", "attrs"])
+    package = PackageAnalysis(
+        path="api",
+        project_type="python",
+        dependencies=DependencyInfo(manifests=[Path("api/pyproject.toml")], python=["zlib", "click", "aiohttp"]),
+        patterns=CodePatterns(test_frameworks=[], build_tools=[]),
+    )
+
+    merged = _merge_dependencies(root, [package])
+
+    assert merged.python == ["requests", "click", "attrs", "zlib", "aiohttp"]
+    assert merged.manifests == [Path("pyproject.toml"), Path("api/pyproject.toml")]
+
+
+def test_analysis_keeps_root_manifest_order_before_package_dependencies(tmp_path):
+    (tmp_path / "pyproject.toml").write_text(
+        '[project]\nname = "root"\ndependencies = ["requests", "click", "attrs", "click"]\n'
+    )
+    api = tmp_path / "api"
+    api.mkdir()
+    (api / "pyproject.toml").write_text(
+        '[project]\nname = "api"\ndependencies = ["zlib", "click", "aiohttp"]\n'
+    )
+
+    analysis = RepositoryAnalyzer(
+        tmp_path, scanner=RepoScanner(tmp_path, use_git=False), max_workers=1
+    ).analyze()
+
+    assert analysis.dependencies.python == ["requests", "click", "attrs", "zlib", "aiohttp"]
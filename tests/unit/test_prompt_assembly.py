@@ -0,0 +1,98 @@
+"""Tests for shared-prefix prompt assembly."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.feedback_manager import FeedbackManager
+from src.pipeline.detailed_devplan import DetailedDevPlanGenerator
+from src.pipeline.prompt_assembly import PhasePromptAssembler
+from src.templates import render_template
+
+
+def _repo_analysis():
+    analysis = MagicMock()
+    analysis.to_prompt_context.return_value = {
+        "project_type": "python",
+        "structure": {"source_dirs": ["src"], "test_dirs": ["tests"]},
+        "metrics": {"total_files": 12, "total_lines": 3400},
+        "dependencies": {"python": ["fastapi"]},
+    }
+    return analysis
+
+
+def test_phase_prompts_share_identical_prefix():
+    assembler = PhasePromptAssembler(
+        "demo", ["Python"], repo_analysis=_repo_analysis(), code_samples="def f(): pass"
+    )
+
+    first = assembler.build(1, "Setup")
+    second = assembler.build(2, "Storage")
+
+    assert first.startswith(assembler.prefix)
+    assert second.startswith(assembler.prefix)
+    assert "def f(): pass" in assembler.prefix
+    assert "Phase 1: Setup" in first and "Phase 1" not in assembler.prefix
+    assert "Phase 2: Storage" in second
+
+
+def test_assembled_prompt_matches_full_template():
+    assembler = PhasePromptAssembler("demo", ["Python"], repo_analysis=_repo_analysis())
+
+    context = {
+        **assembler.shared_context,
+        "phase_number": 3,
+        "phase_title": "API",
+        "phase_description": "",
+        "task_group_size": 3,
+    }
+
+    assert assembler.build(3, "API") == render_template("detailed_devplan.jinja", context)
+
+
+@pytest.mark.asyncio
+async def test_generate_renders_shared_context_once(
+    mock_llm_client, concurrency_manager, sample_detailed_devplan, monkeypatch
+):
+    # Phase generation reads the app config; keep a stray .env provider out of it
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    prompts = []
+
+    async def respond(prompt, **kwargs):
+        prompts.append(prompt)
+        number = prompt.split("**Phase ", 1)[1].split(":", 1)[0]
+        return f"{number}.1: Step one\n{number}.2: Step two"
+
+    mock_llm_client.generate_completion = AsyncMock(side_effect=respond)
+    feedback = FeedbackManager()
+    feedback.corrections = [{"type": "general", "description": "Use type hints"}]
+    analysis = _repo_analysis()
+
+    generator = DetailedDevPlanGenerator(mock_llm_client, concurrency_manager)
+    await generator.generate(
+        sample_detailed_devplan,
+        project_name="demo",
+        feedback_manager=feedback,
+        repo_analysis=analysis,
+        code_samples="def f(): pass",
+    )
+
+    analysis.to_prompt_context.assert_called_once()
+    assert len(prompts) == 3
+    prefix = prompts[0][: prompts[0].index("## Phase to Detail")]
+    assert all(p.startswith(prefix) for p in prompts)
+    assert all(p.endswith(feedback.corrections_section()) for p in prompts)
+    assert all("code_samples" not in call.kwargs for call in mock_llm_client.generate_completion.call_args_list)
+
+
+def test_corrections_section_is_cached_until_corrections_change():
+    feedback = FeedbackManager()
+    assert feedback.corrections_section() == ""
+
+    feedback.corrections = [{"type": "phase", "target": "1", "description": "Split it"}]
+    section = feedback.corrections_section()
+    assert "Phase Correction" in section
+    assert feedback.corrections_section() is section
+
+    feedback.corrections.append({"type": "general", "description": "Add docs"})
+    assert "General Correction" in feedback.corrections_section()
@@ -0,0 +1,113 @@
+"""Tests for the persistent repository scan cache."""
+
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.interview import repo_scanner
+from src.interview.repo_cache import RepoAnalysisCache
+from src.interview.repo_scanner import RepoScanner
+from src.interview.repository_analyzer import RepositoryAnalyzer
+
+
+def _make_repo(root: Path) -> None:
+    (root / "src").mkdir()
+    (root / "src" / "a.py").write_text("a = 1\nb = 2\n")
+    (root / "src" / "b.py").write_text("c = 3\n")
+    (root / "requirements.txt").write_text("pytest\n")
+
+
+def _bump(path: Path, content: str) -> None:
+    path.write_text(content)
+    st = path.stat()
+    # Guarantee a visible mtime change even on coarse-grained filesystems
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 2_000_000_000))
+
+
+def test_cache_round_trip(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _make_repo(repo)
+    cache = RepoAnalysisCache(tmp_path / "cache")
+    manifest = RepoScanner(repo, use_git=False).scan()
+
+    assert cache.load(repo) is None
+    cache.save(manifest)
+    loaded = cache.load(repo)
+
+    assert loaded is not None
+    assert loaded.files == manifest.files
+    assert loaded.root == manifest.root
+    cache.clear(repo)
+    assert cache.load(repo) is None
+
+
+def test_symbol_outlines_are_stored_per_root(tmp_path):
+    cache = RepoAnalysisCache(tmp_path / "cache")
+    roots = []
+    for name in ("one", "two"):
+        repo = tmp_path / name
+        repo.mkdir()
+        _make_repo(repo)
+        (repo / "src" / f"{name}.py").write_text(f"def {name}():\n    pass\n")
+        RepositoryAnalyzer(repo, scanner=RepoScanner(repo, use_git=False), cache=cache).analyze().to_prompt_context()
+        roots.append(repo)
+
+    assert cache.symbols_path(roots[0]) != cache.symbols_path(roots[1])
+    assert cache.symbols_path(roots[0]).exists() and cache.symbols_path(roots[1]).exists()
+    cache.clear(roots[0])
+    assert not cache.symbols_path(roots[0]).exists()
+
+
+def test_walk_rescan_only_reads_changed_files(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _make_repo(repo)
+    cache = RepoAnalysisCache(tmp_path / "cache")
+    first = RepositoryAnalyzer(repo, scanner=RepoScanner(repo, use_git=False), cache=cache).analyze()
+    assert first.code_metrics.total_lines == 4
+
+    _bump(repo / "src" / "b.py", "c = 3\nd = 4\ne = 5\n")
+    (repo / "src" / "new.py").write_text("f = 6\n")
+
+    with patch.object(repo_scanner, "count_lines", wraps=repo_scanner.count_lines) as counted:
+        second = RepositoryAnalyzer(repo, scanner=RepoScanner(repo, use_git=False), cache=cache).analyze()
+
+    read = {Path(call.args[0]).name for call in counted.call_args_list}
+    assert read == {"b.py", "new.py"}
+    assert second.manifest.reused == 2
+    assert second.code_metrics.total_files == 4
+    assert second.code_metrics.total_lines == 2 + 3 + 1 + 1
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+def test_unchanged_git_tree_reuses_manifest(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _make_repo(repo)
+    subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+    (repo / "src" / "dirty.py").write_text("x = 1\n")
+    cache = RepoAnalysisCache(tmp_path / "cache")
+    RepositoryAnalyzer(repo, cache=cache).analyze()
+
+    with patch.object(RepoScanner, "_git_ls_files", side_effect=AssertionError("relisted")):
+        again = RepositoryAnalyzer(repo, cache=cache).analyze()
+    assert again.manifest.source == "cache"
+    assert again.code_metrics.total_lines == 5
+
+    # Editing an already-untracked file must still invalidate the key
+    _bump(repo / "src" / "dirty.py", "x = 1\ny = 2\n")
+    changed = RepositoryAnalyzer(repo, cache=cache).analyze()
+    assert changed.manifest.source == "git"
+    assert changed.code_metrics.total_lines == 6
+
+
+def test_from_env_can_disable_cache(monkeypatch, tmp_path):
+    monkeypatch.setenv("DEVUSSY_CACHE_DIR", str(tmp_path))
+    assert RepoAnalysisCache.from_env().cache_dir == tmp_path / "repo_analysis"
+    monkeypatch.setenv("DEVUSSY_REPO_CACHE", "0")
+    assert RepoAnalysisCache.from_env() is None
@@ -0,0 +1,118 @@
+"""Tests for the shared repository scanner."""
+
+import os
+import shutil
+import subprocess
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.interview.code_sample_extractor import CodeSampleExtractor
+from src.interview.repo_scanner import RepoScanner, count_lines
+from src.interview.repository_analyzer import RepositoryAnalyzer
+
+
+def _make_repo(root: Path) -> None:
+    (root / "src" / "pkg").mkdir(parents=True)
+    (root / "tests").mkdir()
+    (root / "node_modules" / "dep").mkdir(parents=True)
+    (root / "src" / "pkg" / "models.py").write_text("class A:\n    pass\n")
+    (root / "src" / "main.py").write_text("print('hi')")  # no trailing newline
+    (root / "src" / "logo.png").write_bytes(b"\x89PNG\r\n\x00\x00binary")
+    (root / "tests" / "test_models.py").write_text("def test():\n    pass\n")
+    (root / "node_modules" / "dep" / "index.js").write_text("x\n")
+    (root / "requirements.txt").write_text("pytest\n")
+
+
+def test_count_lines_and_binary_sniffing(tmp_path):
+    text = tmp_path / "a.txt"
+    text.write_bytes(b"one\ntwo\nthree")
+    assert count_lines(text) == (False, 3)
+
+    empty = tmp_path / "empty.txt"
+    empty.write_bytes(b"")
+    assert count_lines(empty) == (False, 0)
+
+    blob = tmp_path / "b.bin"
+    blob.write_bytes(b"abc\0def\n")
+    assert count_lines(blob) == (True, 0)
+
+
+def test_walk_scan_skips_dirs_and_counts_lines(tmp_path):
+    _make_repo(tmp_path)
+
+    manifest = RepoScanner(tmp_path, use_git=False).scan()
+
+    assert manifest.source == "walk"
+    paths = [entry.path for entry in manifest.files]
+    assert paths == sorted(paths)
+    assert "node_modules/dep/index.js" not in paths
+    assert manifest.get("src/logo.png").is_binary
+    assert manifest.get("src/main.py").line_count == 1
+    assert manifest.total_lines == 2 + 1 + 2 + 1
+    assert [e.path for e in manifest.rglob("test_*.py", "tests")] == ["tests/test_models.py"]
+    assert [e.path for e in manifest.rglob("pkg/models.py")] == ["src/pkg/models.py"]
+    assert {e.path for e in manifest.with_suffix({".py"}, "src")} == {"src/main.py", "src/pkg/models.py"}
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+def test_git_scan_honors_gitignore(tmp_path):
+    _make_repo(tmp_path)
+    (tmp_path / ".gitignore").write_text("*.log\n")
+    (tmp_path / "debug.log").write_text("noise\n")
+    subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+
+    manifest = RepoScanner(tmp_path).scan()
+
+    assert manifest.source == "git"
+    paths = {entry.path for entry in manifest.files}
+    assert "debug.log" not in paths
+    assert "src/pkg/models.py" in paths
+    assert "node_modules/dep/index.js" not in paths
+
+
+def test_tree_key_tracks_commits_and_tracked_edits(tmp_path):
+    _make_repo(tmp_path)
+    # Files modified in the same second as the index make git rewrite it on
+    # every status; backdate them so the key settles as it would in practice
+    past = time.time() - 10
+    for path in tmp_path.rglob("*"):
+        os.utime(path, (past, past))
+    git = ["git", "-c", "user.name=t", "-c", "user.email=t@example.com"]
+    subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+    subprocess.run(git + ["add", "src", "requirements.txt"], cwd=tmp_path, check=True)
+    subprocess.run(git + ["commit", "-qm", "init"], cwd=tmp_path, check=True)
+    scanner = RepoScanner(tmp_path)
+    manifest = scanner.scan()
+    assert manifest.tree_key is not None
+    assert scanner.scan(manifest).source == "cache"
+
+    (tmp_path / "src" / "main.py").write_text("print('changed')\n")
+    dirty = scanner.tree_key()
+    assert dirty != manifest.tree_key
+    # A second edit to an already-dirty file still changes the key
+    (tmp_path / "src" / "main.py").write_text("print('changed again')\n")
+    assert scanner.tree_key() != dirty
+
+    subprocess.run(git + ["commit", "-qam", "edit"], cwd=tmp_path, check=True)
+    committed = scanner.scan(manifest)
+    assert committed.source == "git"
+    assert next(e for e in committed.files if e.path == "src/main.py").line_count == 1
+
+def test_analyzer_and_extractor_share_one_scan(tmp_path):
+    _make_repo(tmp_path)
+    analysis = RepositoryAnalyzer(tmp_path, scanner=RepoScanner(tmp_path, use_git=False)).analyze()
+
+    assert analysis.manifest is not None
+    assert analysis.code_metrics.total_files == len(analysis.manifest)
+
+    with patch.object(RepoScanner, "scan", side_effect=AssertionError("rescanned")):
+        extractor = CodeSampleExtractor(str(tmp_path))
+        samples = extractor.extract_samples(analysis, goals="update models")
+
+    paths = {sample.file_path for sample in samples}
+    assert "src/pkg/models.py" in paths
+    assert "tests/test_models.py" in paths
+    assert "src/logo.png" not in paths
@@ -0,0 +1,101 @@
+"""Tests for incremental extraction of the interview's JSON summary."""
+
+import json
+
+import pytest
+
+from src.config import AppConfig
+from src.interview.structured_extractor import StructuredDataExtractor
+from src.llm_client import LLMClient
+from src.llm_interview import LLMInterviewManager
+
+SUMMARY = {
+    "project_name": "Ledger",
+    "primary_language": "Python",
+    "requirements": "Track {expenses} and \"budgets\"",
+    "project_type": "CLI",
+    "frameworks": {"cli": "click"},
+}
+
+
+def _chunks(text, size=3):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def test_feed_reports_object_as_soon_as_it_closes():
+    reply = "Great! Here is the summary:\n```json\n" + json.dumps(SUMMARY) + "\n```\nAnything else?"
+    extractor = StructuredDataExtractor()
+    closed_at = None
+    for position, chunk in enumerate(_chunks(reply)):
+        if extractor.feed(chunk) is not None and closed_at is None:
+            closed_at = position
+
+    assert extractor.result == SUMMARY
+    assert closed_at < len(_chunks(reply)) - 3  # Before the trailing prose arrived
+
+
+def test_stray_braces_in_prose_and_strings_are_ignored():
+    reply = (
+        "Use a dict like {key: value} or a set }. Quote: \"odd {\n"
+        + json.dumps(SUMMARY, indent=2)
+    )
+    assert StructuredDataExtractor.extract(reply) == SUMMARY
+
+
+def test_unclosed_prose_brace_with_stray_quote_falls_back_to_fenced_block():
+    reply = 'Scope: {web app, "quick\n```json\n' + json.dumps(SUMMARY) + "\n```\nThanks"
+    assert StructuredDataExtractor.extract(reply) == SUMMARY
+
+
+def test_brace_inside_single_quoted_value_falls_back_to_whole_text():
+    reply = "{'project_name':'x','requirements':'a}b'}"
+    assert StructuredDataExtractor.extract(reply) == {"project_name": "x", "requirements": "a}b"}
+
+
+def test_yaml_tolerant_objects_and_synonyms_via_manager(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # Interview logs are written to ./logs
+    manager = LLMInterviewManager(AppConfig(), llm_client=StreamingClient(""))
+    reply = "Done: {'name': 'Ledger', 'language': 'Python', 'type': 'CLI',}"
+
+    data = manager._extract_structured_data(reply)
+
+    assert data == {"project_name": "Ledger", "primary_language": "Python", "project_type": "CLI"}
+    assert manager._extract_structured_data("No summary {yet}") is None
+    # A recognizable object without a name still surfaces for validation
+    assert manager._extract_structured_data('{"language": "Go"}') == {"primary_language": "Go"}
+
+
+class StreamingClient(LLMClient):
+    def __init__(self, reply):
+        super().__init__(AppConfig())
+        self.reply = reply
+
+    async def generate_completion(self, prompt, **kwargs):
+        return self.reply
+
+    async def generate_completion_streaming(self, prompt, callback, **kwargs):
+        for chunk in _chunks(self.reply):
+            callback(chunk)
+        return self.reply
+
+
+@pytest.mark.asyncio
+async def test_send_reports_structured_data_mid_stream(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    reply = json.dumps(SUMMARY) + " Type /done when ready."
+    manager = LLMInterviewManager(AppConfig(), llm_client=StreamingClient(reply))
+    seen = []
+    tokens = []
+    manager.on_structured_data = lambda data: seen.append((data, "".join(tokens)))
+
+    await manager.send("Ledger app", callback=tokens.append)
+
+    assert manager.last_structured_data["project_name"] == "Ledger"
+    data, streamed = seen[0]
+    assert data is manager.last_structured_data
+    assert len(seen) == 1 and not streamed.endswith("ready.")
+
+    await manager.send("Thanks")  # Non-streaming replies are scanned after completion
+    assert manager.last_structured_data["project_name"] == "Ledger"
+    assert len(seen) == 2
+    await manager.aclose()
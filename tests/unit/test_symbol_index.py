@@ -0,0 +1,138 @@
+"""Tests for symbol outlines."""
+
+from unittest.mock import patch
+
+from src.interview import symbol_index
+from src.interview.code_sample_extractor import CodeSample, CodeSampleExtractor
+from src.interview.repo_scanner import RepoScanner
+from src.interview.repository_analyzer import RepositoryAnalyzer
+from src.interview.symbol_index import SymbolIndex, outline_source
+
+PY_SOURCE = '''"""Billing helpers."""
+import os
+import sys
+
+
+class Invoice(Base):
+    """An invoice."""
+
+    def total(self, tax: float = 0.2) -> float:
+        """Total including tax."""
+        return 1.0
+
+    async def send(self):
+        pass
+
+
+def render(invoice, *, fmt="pdf"):
+    def inner():
+        pass
+    return inner
+'''
+
+TS_SOURCE = """import x from 'y';
+
+/** Fetches invoices for a customer. */
+export async function fetchInvoices(customerId: string): Promise<Invoice[]> {
+  const helper = () => 1;
+  return [];
+}
+
+export class InvoiceStore {
+  load(id: string) {}
+}
+
+export const formatAmount = (value: number): string => {
+  return String(value);
+};
+"""
+
+
+def test_python_outline_keeps_signatures_and_docs():
+    outline = outline_source("billing.py", PY_SOURCE)
+
+    assert outline.language == "python"
+    assert outline.doc == "Billing helpers."
+    assert [s.name for s in outline.symbols] == ["Invoice", "render"]
+    assert [c.name for c in outline.symbols[0].children] == ["total", "send"]
+    rendered = outline.render()
+    assert "class Invoice(Base)  # An invoice." in rendered
+    assert "    def total(self, tax: float=0.2) -> float  # Total including tax." in rendered
+    assert "    async def send(self)" in rendered
+    assert "def render(invoice, *, fmt='pdf')" in rendered
+    assert "import" not in rendered
+    assert "inner" not in rendered
+
+
+def test_regex_outline_for_typescript():
+    outline = outline_source("client.ts", TS_SOURCE)
+
+    names = [s.name for s in outline.symbols]
+    assert names == ["fetchInvoices", "InvoiceStore", "formatAmount"]
+    assert outline.symbols[0].doc == "Fetches invoices for a customer."
+    assert outline.symbols[0].signature.startswith("export async function fetchInvoices(")
+    assert outline_source("notes.txt", "hello") is None
+
+
+def test_index_caches_by_content_and_persists(tmp_path):
+    cache_path = tmp_path / "symbols.json"
+    index = SymbolIndex(cache_path)
+    with patch.object(symbol_index, "outline_source", wraps=outline_source) as parsed:
+        first = index.outline_text("a.py", PY_SOURCE)
+        again = index.outline_text("copy/b.py", PY_SOURCE)
+    assert parsed.call_count == 1
+    assert again.path == "copy/b.py"
+    assert again.render() == first.render()
+    assert index.save()
+
+    reloaded = SymbolIndex(cache_path)
+    with patch.object(symbol_index, "outline_source", side_effect=AssertionError("reparsed")):
+        assert reloaded.outline_text("a.py", PY_SOURCE).render() == first.render()
+
+
+def test_prune_drops_outlines_of_removed_and_changed_files(tmp_path):
+    (tmp_path / "keep.py").write_text(PY_SOURCE)
+    (tmp_path / "gone.py").write_text("def gone():\n    pass\n")
+    (tmp_path / "edit.py").write_text("def before():\n    pass\n")
+    index = SymbolIndex(tmp_path / "symbols.json")
+    manifest = RepoScanner(tmp_path, use_git=False).scan()
+    for entry in manifest.files:
+        index.outline_file(manifest.root, entry)
+    assert index.prune(manifest) == 0
+
+    (tmp_path / "gone.py").unlink()
+    (tmp_path / "edit.py").write_text("def after_the_edit():\n    pass\n")
+    rescanned = RepoScanner(tmp_path, use_git=False).scan()
+
+    assert index.prune(rescanned) == 2
+    assert [k.rsplit("\0", 1)[1] for k in index._stat_hashes] == ["keep.py"]
+    assert index.save()
+    assert len(SymbolIndex(tmp_path / "symbols.json")._by_hash) == 1
+
+
+def test_repo_outline_in_prompt_context(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "billing.py").write_text(PY_SOURCE)
+    (tmp_path / "src" / "empty.py").write_text("X = 1\n")
+    (tmp_path / "requirements.txt").write_text("pytest\n")
+    analysis = RepositoryAnalyzer(tmp_path, scanner=RepoScanner(tmp_path, use_git=False)).analyze()
+
+    context = analysis.to_prompt_context()
+
+    assert context["outline"] == ["src/billing.py: Invoice, render"]
+    assert "outline" not in analysis.to_prompt_context(outline_chars=0)
+
+
+def test_long_samples_are_formatted_as_outlines(tmp_path):
+    body = PY_SOURCE + "\n".join(f"VALUE_{i} = {i}" for i in range(100))
+    (tmp_path / "billing.py").write_text(body)
+    extractor = CodeSampleExtractor(str(tmp_path), outline_threshold=50)
+    long_sample = extractor._read_file_sample(tmp_path / "billing.py", reason="r", category="pattern")
+    short_sample = CodeSample("short.py", "def f():\n    pass", "r", "pattern", "py", 2)
+
+    formatted = extractor.format_samples_for_prompt([long_sample, short_sample])
+
+    assert "**Lines**: 120 (outline)" in formatted
+    assert "class Invoice(Base)" in formatted
+    assert "VALUE_1" not in formatted
+    assert "def f():\n    pass" in formatted
@@ -1,14 +1,31 @@
 """Template loading and rendering tests for DevPlan Orchestrator."""
 
+import json
 import tempfile
+import threading
+from datetime import datetime
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 from jinja2 import TemplateNotFound
 
+from src import templates
 from src.citations import CitationManager
-from src.templates import load_template, render_template
+from src.templates import ContextRecorder, compile_templates, load_template, render_template
+
+
+@pytest.fixture(autouse=True)
+def fresh_template_env():
+    """Give each test its own template environment.
+
+    Autouse fixtures are torn down after ``monkeypatch`` and ``@patch``, so an
+    environment built from a patched templates directory is never cached for
+    later tests.
+    """
+    templates._env.cache_clear()
+    yield
+    templates._env.cache_clear()
 
 
 @pytest.fixture
@@ -445,6 +462,91 @@ Also see 【cursor†book】 for more info."""
             assert "test" not in cleared_content
 
 
+class TestContextCapture:
+    """Test the sampled, background template context recorder."""
+
+    def test_capture_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("DEVUSSY_CAPTURE_TEMPLATE_CONTEXT", raising=False)
+        templates.get_context_recorder.cache_clear()
+        try:
+            assert templates.get_context_recorder() is None
+        finally:
+            templates.get_context_recorder.cache_clear()
+
+    def test_capture_enabled_from_env(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("DEVUSSY_CAPTURE_TEMPLATE_CONTEXT", "0.25")
+        monkeypatch.setenv("DEVUSSY_TEMPLATE_CAPTURE_DIR", str(tmp_path))
+        templates.get_context_recorder.cache_clear()
+        try:
+            recorder = templates.get_context_recorder()
+            assert recorder.sample_rate == 0.25
+            assert recorder.output_dir == tmp_path
+        finally:
+            templates.get_context_recorder.cache_clear()
+
+    def test_recorder_writes_in_background(self, tmp_path):
+        recorder = ContextRecorder(tmp_path)
+        context = {"name": "x", "when": datetime(2024, 1, 1)}
+
+        assert recorder.capture("docs/readme.jinja", context)
+        recorder.close()
+
+        data = (tmp_path / "docs_readme.jinja.json").read_text(encoding="utf-8")
+        assert '"2024-01-01T00:00:00"' in data
+        assert recorder.written == 1
+
+    def test_recorder_serializes_before_the_caller_mutates(self, tmp_path):
+        recorder = ContextRecorder(tmp_path)
+        # Stall the writer so the capture is still queued when the caller moves on
+        recorder._thread = threading.Thread(target=lambda: None)
+        context = {"phases": [1]}
+
+        assert recorder.capture("a.jinja", context)
+        context["phases"].append(2)
+        recorder._queue.put(None)
+        recorder._run()
+
+        assert json.loads((tmp_path / "a.jinja.json").read_text(encoding="utf-8")) == {"phases": [1]}
+
+    def test_recorder_sampling_and_drops(self, tmp_path):
+        assert not ContextRecorder(tmp_path, sample_rate=0.0).capture("a.jinja", {})
+
+        recorder = ContextRecorder(tmp_path, max_pending=1)
+        # Pretend the writer thread is stalled so the queue stays full
+        recorder._thread = threading.Thread(target=lambda: None)
+        assert recorder.capture("a.jinja", {})
+        assert not recorder.capture("b.jinja", {})
+        assert recorder.dropped == 1
+
+
+class TestCompiledTemplates:
+    """Test precompiled template bundles."""
+
+    def test_compiled_bundle_is_used_and_renders(self, monkeypatch, tmp_path):
+        bundle = compile_templates(tmp_path / "templates.zip")
+        monkeypatch.setenv("DEVUSSY_COMPILED_TEMPLATES", str(bundle))
+        loader = templates._env().loader
+        assert type(loader.loaders[0]).__name__ == "ModuleLoader"
+        assert templates.warm_templates() > 0
+        assert "Test" in render_template(
+            "project_design.jinja",
+            {"project_name": "Test", "requirements": "", "languages": [], "frameworks": [], "apis": []},
+        )
+
+    def test_stale_bundle_is_ignored(self, monkeypatch, tmp_path, temp_templates_dir):
+        bundle = compile_templates(tmp_path / "templates.zip", temp_templates_dir)
+        (temp_templates_dir / "basic.jinja").write_text("Bye {{ name }}!", encoding="utf-8")
+        monkeypatch.setenv("DEVUSSY_COMPILED_TEMPLATES", str(bundle))
+        monkeypatch.setattr(templates, "_templates_dir", lambda: temp_templates_dir)
+        assert templates._env().loader.__class__.__name__ == "FileSystemLoader"
+        assert render_template("basic.jinja", {"name": "Ann"}) == "Bye Ann!"
+
+    def test_bytecode_cache_from_env(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("DEVUSSY_TEMPLATE_CACHE_DIR", str(tmp_path))
+        load_template("project_design.jinja")
+        assert any(tmp_path.iterdir())
+
+
 class TestTemplateErrorHandling:
     """Test error handling in template operations."""
 
@@ -0,0 +1,179 @@
+"""Tests for span tracing and the stack sampler."""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from src.artifact_writer import ArtifactWriter
+from src.tracing import (
+    StackSampler,
+    Tracer,
+    disable_tracing,
+    enable_tracing,
+    profile_session,
+    trace_span,
+    traced,
+)
+
+
+@pytest.fixture
+def tracer():
+    t = enable_tracing(Tracer())
+    yield t
+    disable_tracing()
+
+
+def _by_name(tracer):
+    return {s.name: s for s in tracer.spans}
+
+
+def test_trace_span_is_noop_when_disabled():
+    disable_tracing()
+    with trace_span("ignored") as span:
+        assert span is None
+
+
+def test_spans_nest_across_tasks_and_record_await_time(tracer):
+    @traced("phase", attributes=lambda n: {"phase": n})
+    async def phase(n):
+        with trace_span("llm.attempt", attempt=1):
+            await asyncio.sleep(0.02)
+
+    async def run():
+        with trace_span("stage"):
+            await asyncio.gather(phase(1), phase(2))
+
+    asyncio.run(run())
+
+    stage = _by_name(tracer)["stage"]
+    phases = [s for s in tracer.spans if s.name == "phase"]
+    attempts = [s for s in tracer.spans if s.name == "llm.attempt"]
+    assert sorted(s.attributes["phase"] for s in phases) == [1, 2]
+    assert all(p.parent_id == stage.span_id for p in phases)
+    assert {a.parent_id for a in attempts} == {p.span_id for p in phases}
+    assert len({p.lane for p in phases}) == 2
+    assert all(a.wall >= 0.015 for a in attempts)
+
+
+def test_overlapping_async_spans_do_not_claim_each_others_cpu(tracer):
+    def burn(seconds):
+        end = time.thread_time() + seconds
+        while time.thread_time() < end:
+            pass
+
+    async def worker(name):
+        with trace_span(name):
+            for _ in range(3):
+                burn(0.01)
+                await asyncio.sleep(0)
+
+    def threaded():
+        with trace_span("thread"):
+            burn(0.01)
+
+    async def run():
+        await asyncio.gather(worker("a"), worker("b"))
+        await asyncio.to_thread(threaded)
+
+    asyncio.run(run())
+    with trace_span("sync"):
+        burn(0.01)
+
+    spans = _by_name(tracer)
+    # Each task span was suspended while the other burned CPU on the same thread
+    assert spans["a"].cpu is None and spans["b"].cpu is None
+    assert spans["a"].await_time is None
+    assert spans["a"].wall >= 0.03 and spans["b"].wall >= 0.03
+    assert spans["sync"].cpu >= 0.009 and spans["thread"].cpu >= 0.009
+    summary = tracer.summary()
+    assert summary["a"]["cpu"] == 0.0 and summary["sync"]["cpu"] >= 0.009
+    event = next(e for e in tracer.to_chrome_trace()["traceEvents"] if e["name"] == "a")
+    assert "cpu_ms" not in event["args"]
+
+
+def test_error_status_and_chrome_trace(tracer):
+    with pytest.raises(ValueError):
+        with trace_span("parse"):
+            raise ValueError("bad")
+
+    assert tracer.spans[0].status == "error"
+    event = tracer.to_chrome_trace()["traceEvents"][0]
+    assert event["ph"] == "X" and event["name"] == "parse"
+    assert "cpu_ms" in event["args"]
+
+
+def test_artifact_writes_nest_under_caller(tracer, tmp_path):
+    writer = ArtifactWriter(max_workers=1)
+    try:
+        with trace_span("stage"):
+            writer.submit(tmp_path / "a.md", "hello")
+            writer.flush()
+    finally:
+        writer.close()
+
+    spans = _by_name(tracer)
+    assert spans["write"].parent_id == spans["stage"].span_id
+
+
+def test_otlp_export_to_local_collector(tracer):
+    received = []
+
+    class Collector(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            received.append((self.path, json.loads(body)))
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Collector)
+    thread = threading.Thread(target=server.handle_request, daemon=True)
+    thread.start()
+    with trace_span("run"):
+        with trace_span("stage", name="design"):
+            pass
+
+    assert tracer.export_otlp(f"http://127.0.0.1:{server.server_port}")
+    thread.join(5)
+    server.server_close()
+
+    path, payload = received[0]
+    assert path == "/v1/traces"
+    spans = payload["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    run = next(s for s in spans if s["name"] == "run")
+    stage = next(s for s in spans if s["name"] == "stage")
+    assert stage["parentSpanId"] == run["spanId"]
+
+
+def test_stack_sampler_captures_busy_function():
+    sampler = StackSampler(interval=0.001)
+
+    def busy_loop():
+        end = time.perf_counter() + 0.1
+        while time.perf_counter() < end:
+            pass
+
+    sampler.start()
+    busy_loop()
+    sampler.stop()
+
+    assert any("busy_loop" in leaf for leaf, _ in sampler.top(3))
+
+
+def test_profile_session_writes_outputs(tmp_path):
+    with profile_session(tmp_path, interval=0.001):
+        with trace_span("stage"):
+            time.sleep(0.01)
+
+    spans = json.loads((tmp_path / "spans.json").read_text())["spans"]
+    assert {s["name"] for s in spans} == {"run", "stage"}
+    assert json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    assert (tmp_path / "stacks.folded").exists()
+    with trace_span("after") as span:
+        assert span is None